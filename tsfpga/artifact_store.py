@@ -0,0 +1,349 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import json
+import shutil
+from abc import ABC, abstractmethod
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING, Any
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from uuid import uuid4
+
+from tsfpga.system_utils import calculate_file_hash, create_directory, create_file, delete
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class ArtifactStoreBackend(ABC):
+    """
+    Base class for the storage of an :class:`.ArtifactStore`.
+
+    Objects are identified by a name, which is a relative path with forward slashes.
+    E.g. ``blobs/ab/ab12...`` or ``builds/cd34....json``.
+    Objects are never modified once they have been stored, only added.
+    """
+
+    @abstractmethod
+    def exists(self, name: str) -> bool:
+        """
+        Return True if there is an object with the given name in the store.
+        """
+
+    @abstractmethod
+    def upload(self, name: str, file: Path) -> None:
+        """
+        Store the contents of a file as an object.
+        Must make sure that no one ever sees a partially written object.
+
+        Arguments:
+            name: Name of the object.
+            file: The file that shall be stored.
+        """
+
+    @abstractmethod
+    def download(self, name: str, file: Path) -> bool:
+        """
+        Fetch the contents of an object to a file.
+
+        Arguments:
+            name: Name of the object.
+            file: The file that shall be written.
+                Any existing file will be overwritten.
+
+        Return:
+            True if the object was found and fetched. False otherwise.
+        """
+
+
+class LocalArtifactStoreBackend(ArtifactStoreBackend):
+    """
+    Stores objects as files in a local folder.
+    The folder can be e.g. on a network share, and be shared between many workspaces.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Arguments:
+            path: Path to the store folder.
+        """
+        self.path = path.resolve()
+
+    def exists(self, name: str) -> bool:
+        return (self.path / name).exists()
+
+    def upload(self, name: str, file: Path) -> None:
+        object_file = self.path / name
+        create_directory(object_file.parent, empty=False)
+
+        # Copy to a temporary file, which is then renamed.
+        # Makes sure that no one ever sees a partially written object.
+        temp_file = object_file.parent / f"{object_file.name}.{uuid4().hex}.tmp"
+        try:
+            shutil.copyfile(file, temp_file)
+            temp_file.replace(object_file)
+        finally:
+            delete(temp_file)
+
+    def download(self, name: str, file: Path) -> bool:
+        object_file = self.path / name
+        if not object_file.exists():
+            return False
+
+        create_directory(file.parent, empty=False)
+        shutil.copyfile(object_file, file)
+
+        return True
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+
+class HttpArtifactStoreBackend(ArtifactStoreBackend):
+    """
+    Stores objects on an HTTP server, with ``HEAD``, ``GET`` and ``PUT`` requests to
+    ``<url>/<name>``.
+    This is supported by e.g. a generic repository in Artifactory or Nexus, or a
+    WebDAV server.
+
+    The server is expected to respond with status 404 for objects that do not exist.
+    """
+
+    def __init__(
+        self, url: str, headers: dict[str, str] | None = None, timeout: float = 60
+    ) -> None:
+        """
+        Arguments:
+            url: Base URL of the store. E.g. ``https://artifacts.example.com/fpga``.
+            headers: Optional headers that will be sent with each request.
+                E.g. ``{"Authorization": "Bearer <token>"}``.
+            timeout: Timeout, in seconds, for each request.
+        """
+        self.url = url.rstrip("/")
+        self.headers = {} if headers is None else headers.copy()
+        self.timeout = timeout
+
+    def exists(self, name: str) -> bool:
+        try:
+            with self._request(name=name, method="HEAD"):
+                return True
+        except HTTPError as exception:
+            if exception.code == 404:
+                return False
+
+            raise
+
+    def upload(self, name: str, file: Path) -> None:
+        headers = {
+            "Content-Length": str(file.stat().st_size),
+            "Content-Type": "application/octet-stream",
+        }
+
+        with (
+            file.open("rb") as file_handle,
+            self._request(name=name, method="PUT", data=file_handle, headers=headers),
+        ):
+            pass
+
+    def download(self, name: str, file: Path) -> bool:
+        try:
+            response = self._request(name=name, method="GET")
+        except HTTPError as exception:
+            if exception.code == 404:
+                return False
+
+            raise
+
+        create_directory(file.parent, empty=False)
+
+        with response, file.open("wb") as file_handle:
+            shutil.copyfileobj(response, file_handle)
+
+        return True
+
+    def _request(
+        self,
+        name: str,
+        method: str,
+        data: Any = None,  # noqa: ANN401
+        headers: dict[str, str] | None = None,
+    ) -> Any:  # noqa: ANN401
+        request = Request(  # noqa: S310
+            url=f"{self.url}/{name}",
+            data=data,
+            headers={**self.headers, **(headers or {})},
+            method=method,
+        )
+
+        return urlopen(request, timeout=self.timeout)  # noqa: S310
+
+    def __str__(self) -> str:
+        return self.url
+
+
+class ArtifactStore:
+    """
+    A content-addressed store of build artifacts.
+
+    The contents of each artifact file are stored as a "blob", named after the hash of the
+    contents.
+    Files that are identical between builds, projects or branches are hence stored only once.
+
+    A "build" is a manifest that lists the files of a build, and the blob of each file.
+    It is identified by a fingerprint, which is a hash of all the inputs to the build.
+    See e.g. :meth:`.VivadoProject.get_fingerprint`.
+    The manifest also holds metadata about the build.
+
+    Builds that are stored in the store can be fetched by later builds, or by CI jobs,
+    instead of being rebuilt.
+    """
+
+    # The version of the store format.
+    # Can be bumped if e.g. the manifest format is changed.
+    _format_version_id = 1
+
+    def __init__(self, backend: ArtifactStoreBackend) -> None:
+        """
+        Arguments:
+            backend: Where the objects of the store are kept.
+        """
+        self.backend = backend
+
+    @staticmethod
+    def from_location(location: str) -> ArtifactStore:
+        """
+        Create a store with a backend that is suitable for the given location.
+
+        Arguments:
+            location: Either an ``http://`` or ``https://`` URL, or a path to a local folder.
+        """
+        if location.startswith(("http://", "https://")):
+            return ArtifactStore(backend=HttpArtifactStoreBackend(url=location))
+
+        return ArtifactStore(backend=LocalArtifactStoreBackend(path=Path(location)))
+
+    def has_build(self, fingerprint: str) -> bool:
+        """
+        Return True if there is a build with the given fingerprint in the store.
+        """
+        return self.backend.exists(name=self._get_build_name(fingerprint=fingerprint))
+
+    def put(
+        self,
+        fingerprint: str,
+        root_path: Path,
+        files: Iterable[Path],
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Store the files of a build.
+        Blobs that are already in the store are not uploaded again.
+
+        The manifest is stored last, so that a build is never visible in the store until all of
+        its blobs are in place.
+
+        Arguments:
+            fingerprint: Fingerprint of the build.
+            root_path: The files are stored with paths relative to this folder.
+            files: The files that shall be stored.
+            metadata: Optional information about the build, that will be returned by :meth:`.get`.
+                Must be JSON serializable.
+        """
+        manifest_files = {}
+        num_uploaded = 0
+
+        for file in files:
+            blob_hash = calculate_file_hash(file)
+            blob_name = self._get_blob_name(blob_hash=blob_hash)
+
+            if not self.backend.exists(name=blob_name):
+                self.backend.upload(name=blob_name, file=file)
+                num_uploaded += 1
+
+            manifest_files[file.relative_to(root_path).as_posix()] = blob_hash
+
+        manifest = {
+            "format_version": self._format_version_id,
+            "fingerprint": fingerprint,
+            "files": manifest_files,
+            "metadata": metadata or {},
+        }
+
+        with TemporaryDirectory() as temp_directory:
+            manifest_file = create_file(
+                Path(temp_directory) / "manifest.json", json.dumps(manifest, indent=2)
+            )
+            self.backend.upload(
+                name=self._get_build_name(fingerprint=fingerprint), file=manifest_file
+            )
+
+        print(
+            f"Stored {len(manifest_files)} artifact(s) in {self.backend}, "
+            f"of which {num_uploaded} were new."
+        )
+
+    def get(self, fingerprint: str, output_path: Path) -> dict[str, Any] | None:
+        """
+        Fetch the files of a build from the store.
+        The contents of each file are checked against the hash in the manifest.
+
+        Arguments:
+            fingerprint: Fingerprint of the build.
+            output_path: The files will be placed here, with the same relative paths as when
+                they were stored.
+                Existing files with the same names will be overwritten.
+
+        Return:
+            The metadata of the build, if it was found and fetched. ``None`` otherwise.
+        """
+        with TemporaryDirectory() as temp_directory:
+            manifest_file = Path(temp_directory) / "manifest.json"
+            if not self.backend.download(
+                name=self._get_build_name(fingerprint=fingerprint), file=manifest_file
+            ):
+                return None
+
+            manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+
+        if manifest["format_version"] != self._format_version_id:
+            return None
+
+        print(f"Fetching {len(manifest['files'])} artifact(s) from {self.backend}")
+
+        for relative_path, blob_hash in manifest["files"].items():
+            file = output_path / relative_path
+
+            if not self.backend.download(name=self._get_blob_name(blob_hash=blob_hash), file=file):
+                raise FileNotFoundError(
+                    f'Artifact store build "{fingerprint}" is missing blob for {relative_path}'
+                )
+
+            if calculate_file_hash(file) != blob_hash:
+                delete(file)
+                raise ValueError(
+                    f'Artifact store build "{fingerprint}" has bad contents for {relative_path}'
+                )
+
+        metadata: dict[str, Any] = manifest["metadata"]
+        return metadata
+
+    @staticmethod
+    def _get_blob_name(blob_hash: str) -> str:
+        # Split in sub-folders, to avoid very many files in the same folder.
+        return f"blobs/{blob_hash[:2]}/{blob_hash}"
+
+    @staticmethod
+    def _get_build_name(fingerprint: str) -> str:
+        return f"builds/{fingerprint}.json"
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}:{self.backend}"
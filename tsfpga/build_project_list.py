@@ -21,6 +21,7 @@ from vunit.test.report import TestReport, TestResult
 from vunit.test.runner import TestRunner
 
 from tsfpga.system_utils import create_directory, read_last_lines_of_file
+from tsfpga.vivado.ip_cache import VivadoIpCache
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Sequence
@@ -145,6 +146,41 @@ class BuildProjectList:
             num_parallel_builds=num_parallel_builds,
         )
 
+    def pre_warm_ip_cache(
+        self,
+        projects_path: Path,
+        ip_cache_path: Path,
+        num_parallel_builds: int,
+        vivado_path: Path | None = None,
+    ) -> bool:
+        """
+        Synthesize each unique IP core configuration, across all the projects in the list,
+        exactly once into the Vivado IP cache.
+        Should be called before :meth:`.create`, so that the projects find the IP cores in the
+        cache instead of all synthesizing the same IP cores at the same time.
+        IP cores are synthesized when creating the projects if ``num_ip_core_jobs`` is set,
+        otherwise when building them.
+
+        Arguments:
+            projects_path: The projects are placed here.
+                The IP cache pre-warm projects will be placed here as well.
+            ip_cache_path: Path to the Vivado IP cache.
+                Should be the same as was used when creating the projects.
+            num_parallel_builds: The number of IP core synthesis runs that will be launched
+                in parallel.
+            vivado_path: Path to Vivado executable.
+                Leave as ``None`` to use whatever is available in the system ``PATH``.
+
+        Return:
+            True if everything went well.
+        """
+        return VivadoIpCache(cache_path=ip_cache_path).pre_warm(
+            projects=list(self.projects),
+            project_path=projects_path / "ip_cache_pre_warm",
+            num_jobs=num_parallel_builds,
+            vivado_path=vivado_path,
+        )
+
     def build(
         self,
         projects_path: Path,
@@ -172,6 +208,12 @@ class BuildProjectList:
                 |  **output_path** (pathlib.Path): Where the build artifacts should be placed.
 
                 | Must return True.
+
+                .. Note::
+                    The callback must be thread-safe.
+                    It is called from many threads at the same time when parallel builds
+                    finish at the same time.
+                    Only calls with the same ``output_path`` are serialized.
             kwargs: Other arguments as accepted by :meth:`.VivadoProject.build`.
 
                 .. Note::
@@ -392,10 +434,17 @@ class BuildProjectBuildWrapper(BuildProjectWrapper):
 
         # Proceed to artifact collection only if build succeeded.
         if self._collect_artifacts is not None:
+            output_path = self._build_arguments["output_path"]
             build_result.success &= self._collect_artifacts(
-                project=self._project, output_path=self._build_arguments["output_path"]
+                project=self._project, output_path=output_path
             )
 
+            for variant in self._project.bitstream_variants:
+                build_result.success &= self._collect_artifacts(
+                    project=self._project,
+                    output_path=variant.get_output_path(output_path=output_path),
+                )
+
         # Print size at the absolute end.
         self._print_build_result(build_result=build_result)
         return build_result.success
@@ -484,22 +533,28 @@ class BuildRunner(TestRunner):
 class ThreadSafeCollectArtifacts:
     """
     A thread-safe wrapper around a user-supplied function that makes sure the function
-    is not launched more than once at the same time. When two builds finish at the
-    same time, race conditions can arise depending on what the function does.
+    is not launched more than once at the same time for the same output path. When two builds
+    with the same output path finish at the same time, race conditions can arise depending on
+    what the function does.
 
-    Note that this is a VERY fringe case, since builds usually take >20 minutes, and the
-    collection probably only takes a few seconds. But it happens sometimes with the tsfpga
-    example projects which are identical and quite fast (roughly three minutes).
+    Collection for different output paths, which is the normal case, runs in parallel.
+    So the function must be safe to call for different output paths at the same time.
     """
 
     def __init__(self, collect_artifacts: Callable[[VivadoProject, Path], bool]) -> None:
         self._collect_artifacts = collect_artifacts
-        self._lock = Lock()
+
+        self._locks: dict[Path, Lock] = {}
+        self._locks_lock = Lock()
 
     def collect_artifacts(self, project: VivadoProject, output_path: Path) -> bool:
-        with self._lock:
+        with self._get_lock(output_path=output_path):
             return self._collect_artifacts(project=project, output_path=output_path)
 
+    def _get_lock(self, output_path: Path) -> Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(output_path.resolve(), Lock())
+
 
 class BuildReport(TestReport):
     def add_result(
@@ -0,0 +1,208 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import TYPE_CHECKING, Any
+
+from vunit import __version__ as vunit_version
+
+from tsfpga.directory_cache import DirectoryCache
+from tsfpga.system_utils import calculate_file_hash, read_file
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+
+class CompiledLibraryCache(DirectoryCache):
+    """
+    A content-addressed cache of simulation libraries that have been compiled by a simulator.
+
+    Each entry holds one compiled library.
+    The entry is stored in a folder named after a hash of the library's source files, the
+    simulator and its version, the VUnit version, the VHDL standard, the compile options and the
+    keys of the other libraries that it uses.
+    A library that does not change, e.g. a dependency module, can hence be compiled once and
+    then used by many simulation projects, in many workspaces.
+
+    Note that GHDL records the absolute path of each source file in the compiled library.
+    With GHDL, the absolute paths are hence part of the key, and an entry can only be used by
+    workspaces at the same path.
+
+    The entries are used in place, typically as VUnit external libraries, and are never modified.
+
+    Note that libraries provided by the simulator or by VUnit, e.g. ``ieee``, ``osvvm`` or
+    ``vunit_lib``, are identified only by the simulator and VUnit version.
+    Other libraries that are not compiled into the cache, e.g. Vivado ``unisim``, must be given
+    a key of their own to :meth:`.get_keys`.
+    Otherwise they are identified only by their name.
+    """
+
+    _description = "compiled library"
+
+    # The version of the cache format.
+    # Can be bumped to invalidate all existing entries, if e.g. the folder structure is changed.
+    _format_version_id = 1
+
+    # Simulators that record the absolute path of each source file in the compiled library.
+    _simulators_with_absolute_paths = ("ghdl",)
+
+    # VHDL "library" clauses.
+    # Note that this does not consider that the clause might be in a block comment.
+    _library_clause_re = re.compile(
+        r"^\s*library\s+(\w+(?:\s*,\s*\w+)*)\s*;", re.IGNORECASE | re.MULTILINE
+    )
+
+    def __init__(
+        self,
+        cache_path: Path,
+        simulator_name: str,
+        simulator_version: str,
+        vhdl_standard: str,
+        compile_options: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Arguments:
+            cache_path: Path to the cache folder.
+                Can be shared between many projects, and between many workspaces.
+            simulator_name: Name of the simulator that compiles the libraries.
+            simulator_version: Version of the simulator.
+                Any string that identifies the simulator version exactly.
+                E.g. the output of ``ghdl --version``.
+            vhdl_standard: VHDL standard that the libraries are compiled with.
+            compile_options: Compile options that are set for all the source files of the
+                cached libraries.
+                In the VUnit format, e.g. ``{"ghdl.a_flags": ["-frelaxed"]}``.
+                Must be JSON serializable.
+        """
+        super().__init__(cache_path=cache_path)
+
+        self.simulator_name = simulator_name
+        self.simulator_version = simulator_version
+        self.vhdl_standard = vhdl_standard
+        self.compile_options = {} if compile_options is None else compile_options.copy()
+
+    def get_keys(
+        self,
+        libraries: dict[str, list[Path]],
+        uncached_library_names: Iterable[str] = (),
+        external_library_keys: dict[str, str] | None = None,
+    ) -> dict[str, str | None]:
+        """
+        Calculate the cache keys for the given libraries.
+
+        The key of a library includes the keys of the other libraries that it uses.
+        So a library will be compiled again if any library that it uses changes.
+
+        Arguments:
+            libraries: The name of each library, and the source files that shall be compiled
+                into it.
+            uncached_library_names: Libraries that are compiled on each run, and are hence not
+                possible to identify with a key.
+                Libraries that use any of these will get no key.
+            external_library_keys: Keys of other libraries that are not compiled into the cache,
+                but that the libraries might use.
+                E.g. the :attr:`.VivadoSimlibCommon.artifact_name` for the Vivado simlib libraries.
+
+        Return:
+            The cache key of each library.
+            ``None`` for libraries that can not be cached.
+        """
+        uncached_library_names = {name.lower() for name in uncached_library_names}
+        external_library_keys = (
+            {}
+            if external_library_keys is None
+            else {name.lower(): key for name, key in external_library_keys.items()}
+        )
+        keys: dict[str, str | None] = {}
+
+        def get_key(library_name: str, visiting: tuple[str, ...]) -> str | None:
+            if library_name not in keys:
+                if library_name in visiting:
+                    # Libraries that use each other.
+                    # Is hopefully a rare case, which we do not bother to handle.
+                    return None
+
+                keys[library_name] = calculate_key(
+                    library_name=library_name, visiting=(*visiting, library_name)
+                )
+
+            return keys[library_name]
+
+        def calculate_key(library_name: str, visiting: tuple[str, ...]) -> str | None:
+            files = libraries[library_name]
+
+            dependency_keys = {}
+            for dependency_name in self._get_used_library_names(
+                library_name=library_name, files=files
+            ):
+                if dependency_name in uncached_library_names:
+                    return None
+
+                if dependency_name in libraries:
+                    dependency_key = get_key(library_name=dependency_name, visiting=visiting)
+                    if dependency_key is None:
+                        return None
+
+                    dependency_keys[dependency_name] = dependency_key
+                else:
+                    dependency_keys[dependency_name] = external_library_keys.get(
+                        dependency_name, dependency_name
+                    )
+
+            return self._calculate_key(
+                library_name=library_name, files=files, dependency_keys=dependency_keys
+            )
+
+        for library_name in libraries:
+            get_key(library_name=library_name, visiting=())
+
+        return keys
+
+    def _calculate_key(
+        self, library_name: str, files: list[Path], dependency_keys: dict[str, str]
+    ) -> str:
+        data = {
+            "format_version": self._format_version_id,
+            "vunit_version": vunit_version,
+            "simulator": f"{self.simulator_name} {self.simulator_version}",
+            "vhdl_standard": self.vhdl_standard,
+            "compile_options": self.compile_options,
+            "library": library_name,
+            "files": sorted(self._get_library_file_data(file) for file in files),
+            "dependencies": dependency_keys,
+        }
+
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+    def _get_library_file_data(self, file: Path) -> str:
+        if self.simulator_name in self._simulators_with_absolute_paths:
+            return f"{file.resolve()} {calculate_file_hash(file)}"
+
+        return self._get_file_data(file)
+
+    def _get_used_library_names(self, library_name: str, files: list[Path]) -> set[str]:
+        """
+        Get the names of all the other libraries that are used by the given VHDL files.
+        """
+        result = set()
+
+        for file in files:
+            if file.suffix.lower() not in [".vhd", ".vhdl"]:
+                continue
+
+            for match in self._library_clause_re.finditer(read_file(file)):
+                result.update(name.strip().lower() for name in match.group(1).split(","))
+
+        result.discard(library_name.lower())
+
+        return result
@@ -0,0 +1,114 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import shutil
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from tsfpga.system_utils import calculate_file_hash, create_file, delete
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class DirectoryCache:
+    """
+    Base class for a content-addressed cache where each entry is a copy of a directory.
+    The entry is stored in a folder named after a key, which is a hash of all the inputs that were
+    used to produce the directory contents.
+    The key calculation is implemented by the subclasses.
+
+    Since the key is based on file contents, and not on file paths, the cache can be shared between
+    different workspaces, e.g. between CI jobs.
+    """
+
+    # Description of what is cached, for printouts.
+    _description = "directory"
+
+    # Name of the file that marks an entry as complete.
+    _done_file_name = "tsfpga_cache_entry_done.txt"
+
+    def __init__(self, cache_path: Path) -> None:
+        """
+        Arguments:
+            cache_path: Path to the cache folder.
+                Can be shared between many projects, and between many workspaces.
+        """
+        self.cache_path = cache_path.resolve()
+
+    def get_entry_path(self, key: str) -> Path:
+        """
+        The path to the cache entry with the given key.
+        """
+        return self.cache_path / key
+
+    def has_entry(self, key: str) -> bool:
+        """
+        Return True if there is a complete entry with the given key in the cache.
+        """
+        return (self.get_entry_path(key=key) / self._done_file_name).exists()
+
+    def restore(self, key: str, path: Path) -> bool:
+        """
+        Restore a directory from the cache.
+
+        Arguments:
+            key: The cache key.
+            path: The directory that shall be restored.
+                Any existing contents will be deleted.
+
+        Return:
+            True if the entry was found and restored. False otherwise.
+        """
+        if not self.has_entry(key=key):
+            return False
+
+        entry_path = self.get_entry_path(key=key)
+        print(f"Restoring {self._description} from cache: {entry_path}")
+
+        delete(path)
+        shutil.copytree(entry_path, path, ignore=shutil.ignore_patterns(self._done_file_name))
+
+        return True
+
+    def store(self, key: str, path: Path) -> None:
+        """
+        Store a directory in the cache.
+        Will do nothing if there already is an entry with the same key.
+
+        The entry is first copied to a temporary folder, which is then renamed.
+        This makes sure that no other build ever sees a partially written entry.
+
+        Arguments:
+            key: The cache key.
+            path: The directory that shall be stored.
+        """
+        if self.has_entry(key=key):
+            return
+
+        entry_path = self.get_entry_path(key=key)
+        print(f"Storing {self._description} in cache: {entry_path}")
+
+        temp_path = self.cache_path / f"{key}.{uuid4().hex}.tmp"
+        shutil.copytree(path, temp_path)
+        create_file(temp_path / self._done_file_name, f"{path}\n")
+
+        try:
+            temp_path.rename(entry_path)
+        except OSError:
+            # Another build stored the same entry while we were copying.
+            # Since the key is the same, the contents are equivalent.
+            delete(temp_path)
+
+    @staticmethod
+    def _get_file_data(file: Path) -> str:
+        # Use only the file name, not the full path, so that the key is the same regardless
+        # of where the repository is checked out.
+        return f"{file.name} {calculate_file_hash(file)}"
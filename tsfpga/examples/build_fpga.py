@@ -7,6 +7,7 @@
 # --------------------------------------------------------------------------------------------------
 
 import sys
+from functools import partial
 from pathlib import Path
 
 # Do PYTHONPATH insert() instead of append() to prefer any local repo checkout over any pip install.
@@ -42,7 +43,9 @@ def main() -> None:
             modules=modules,
             project_list=project_list,
             args=args,
-            collect_artifacts_function=collect_artifacts,
+            collect_artifacts_function=partial(
+                collect_artifacts, register_artifact_cache_path=args.register_artifact_cache_path
+            ),
         )
     )
 
@@ -18,6 +18,7 @@ The benefit of building one by one is that build status is written directly to S
 from __future__ import annotations
 
 import sys
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -60,7 +61,9 @@ def main() -> None:
             modules=modules,
             projects=projects,
             args=args,
-            collect_artifacts_function=collect_artifacts,
+            collect_artifacts_function=partial(
+                collect_artifacts, register_artifact_cache_path=args.register_artifact_cache_path
+            ),
         )
     )
 
@@ -131,7 +134,10 @@ def setup_and_run(  # noqa: C901, PLR0911, PLR0912
 
             if (not args.use_existing_project) or (not project_path.exists()):
                 create_ok &= project.create(
-                    project_path=project_path, ip_cache_path=args.ip_cache_path
+                    project_path=project_path,
+                    ip_cache_path=args.ip_cache_path,
+                    block_design_cache_path=args.block_design_cache_path,
+                    num_ip_core_jobs=args.num_threads_per_build if args.parallel_ip_cores else None,
                 )
 
     if not create_ok:
@@ -171,6 +177,8 @@ def setup_and_run(  # noqa: C901, PLR0911, PLR0912
             output_path=project_output_path,
             synth_only=args.synth_only,
             from_impl=args.from_impl,
+            synthesis_checkpoint_cache_path=args.synthesis_checkpoint_cache_path,
+            artifact_store=args.artifact_store,
         )
         build_ok &= build_result.success
 
@@ -10,7 +10,7 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from shutil import copy2, make_archive
+from tempfile import TemporaryDirectory
 from typing import TYPE_CHECKING
 
 from hdl_registers.generator.c.header import CHeaderGenerator
@@ -21,7 +21,10 @@ from hdl_registers.generator.html.page import HtmlPageGenerator
 from hdl_registers.generator.python.accessor import PythonAccessorGenerator
 from hdl_registers.generator.python.pickle import PythonPickleGenerator
 
-from tsfpga.system_utils import create_directory, delete
+from tsfpga.artifact_store import ArtifactStore
+from tsfpga.register_artifact_cache import RegisterArtifactCache
+from tsfpga.system_utils import create_directory, create_zip_file
+from tsfpga.vivado.ip_cache import VivadoIpCache
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -66,6 +69,15 @@ def arguments(default_temp_dir: Path) -> argparse.Namespace:
 
     group.add_argument("--open", action="store_true", help="open existing projects in the GUI")
 
+    group.add_argument(
+        "--prune-ip-cache",
+        action="store_true",
+        help=(
+            "remove the least recently used entries from the IP cache until it is within "
+            "--ip-cache-max-size-gb. Waits until the cache is not used by any build"
+        ),
+    )
+
     group.add_argument(
         "--collect-artifacts-only",
         action="store_true",
@@ -98,6 +110,52 @@ def arguments(default_temp_dir: Path) -> argparse.Namespace:
         help="location of Vivado IP cache",
     )
 
+    parser.add_argument(
+        "--ip-cache-max-size-gb",
+        type=float,
+        required=False,
+        help=(
+            "maximum size of the IP cache. "
+            "If set, the least recently used entries are removed after the build"
+        ),
+    )
+
+    parser.add_argument(
+        "--block-design-cache-path",
+        type=Path,
+        required=False,
+        help="location of block design cache. If not set, block designs will always be generated",
+    )
+
+    parser.add_argument(
+        "--register-artifact-cache-path",
+        type=Path,
+        required=False,
+        help=(
+            "location of register artifact cache. "
+            "If not set, register artifacts will be generated for each project"
+        ),
+    )
+
+    parser.add_argument(
+        "--synthesis-checkpoint-cache-path",
+        type=Path,
+        required=False,
+        help=(
+            "location of synthesized design checkpoint cache. If not set, synthesis will always run"
+        ),
+    )
+
+    parser.add_argument(
+        "--artifact-store",
+        type=ArtifactStore.from_location,
+        required=False,
+        help=(
+            "location (folder or HTTP URL) of artifact store. "
+            "If set, builds with unchanged sources are fetched from the store instead of rebuilt"
+        ),
+    )
+
     parser.add_argument(
         "--output-path",
         type=Path,
@@ -116,6 +174,24 @@ def arguments(default_temp_dir: Path) -> argparse.Namespace:
         help="number of threads for each build process",
     )
 
+    parser.add_argument(
+        "--pre-warm-ip-cache",
+        action="store_true",
+        help=(
+            "synthesize each unique IP core configuration once into the IP cache "
+            "before the projects are created"
+        ),
+    )
+
+    parser.add_argument(
+        "--parallel-ip-cores",
+        action="store_true",
+        help=(
+            "generate and synthesize IP cores in parallel when creating projects, "
+            "using the number of threads per build"
+        ),
+    )
+
     parser.add_argument("--no-color", action="store_true", help="disable color in printouts")
 
     parser.add_argument(
@@ -133,7 +209,7 @@ def arguments(default_temp_dir: Path) -> argparse.Namespace:
     return args
 
 
-def setup_and_run(  # noqa: C901, PLR0911
+def setup_and_run(
     modules: ModuleList,
     project_list: BuildProjectList,
     args: argparse.Namespace,
@@ -152,6 +228,7 @@ def setup_and_run(  # noqa: C901, PLR0911
             Will be run after a successful implementation build.
             The function must return ``True`` if successful and ``False`` otherwise.
             It will receive the ``project`` and ``output_path`` as arguments.
+            Must be thread-safe, see :meth:`.BuildProjectList.build`.
 
             Can be ``None`` if no special artifact collection operation shall be run.
             Which is typically the case for synthesis-only builds such as netlist builds.
@@ -176,6 +253,75 @@ def setup_and_run(  # noqa: C901, PLR0911
         project_list.open(projects_path=args.projects_path)
         return 0
 
+    ip_cache = VivadoIpCache(cache_path=args.ip_cache_path)
+    ip_cache_max_size = (
+        None if args.ip_cache_max_size_gb is None else int(args.ip_cache_max_size_gb * 1e9)
+    )
+
+    if args.prune_ip_cache:
+        assert ip_cache_max_size is not None, "Must set --ip-cache-max-size-gb to prune IP cache"
+
+        prune_ip_cache(ip_cache=ip_cache, max_size=ip_cache_max_size, wait=True)
+        return 0
+
+    # Make sure that no IP cache entries are removed while the projects are using them.
+    with ip_cache.use():
+        result = create_and_build(
+            project_list=project_list,
+            args=args,
+            collect_artifacts_function=collect_artifacts_function,
+        )
+
+    if ip_cache_max_size is not None:
+        # Do not hold up this build flow if the cache is used by other builds.
+        # The cache will be pruned the next time it is not in use.
+        prune_ip_cache(ip_cache=ip_cache, max_size=ip_cache_max_size, wait=False)
+
+    return result
+
+
+def create_and_build(
+    project_list: BuildProjectList,
+    args: argparse.Namespace,
+    collect_artifacts_function: Callable[[VivadoProject, Path], bool] | None,
+) -> int:
+    """
+    Create and build projects, as instructed by the arguments.
+    Arguments are the same as for :func:`.setup_and_run`.
+
+    Return:
+        0 if everything passed, otherwise non-zero.
+    """
+    # Pre-warm before the projects are created, since IP cores are synthesized already when
+    # creating the projects, if '--parallel-ip-cores' is given.
+    if (
+        args.pre_warm_ip_cache
+        and not (args.collect_artifacts_only or args.from_impl)
+        and not project_list.pre_warm_ip_cache(
+            projects_path=args.projects_path,
+            ip_cache_path=args.ip_cache_path,
+            num_parallel_builds=args.num_parallel_builds,
+        )
+    ):
+        return 1
+
+    # Vivado writes to the IP cache when it synthesizes IP cores, both when creating and when
+    # building the projects.
+    # Hold a shared lock meanwhile, so that this is not done at the same time as another process
+    # pre-warms or prunes the cache.
+    with VivadoIpCache(cache_path=args.ip_cache_path).lock(shared=True):
+        return _create_and_build(
+            project_list=project_list,
+            args=args,
+            collect_artifacts_function=collect_artifacts_function,
+        )
+
+
+def _create_and_build(
+    project_list: BuildProjectList,
+    args: argparse.Namespace,
+    collect_artifacts_function: Callable[[VivadoProject, Path], bool] | None,
+) -> int:
     if args.collect_artifacts_only:
         # We have to assume that the projects exist if the user sent this argument.
         # The 'collect_artifacts_function' call below will probably fail if it does not.
@@ -186,6 +332,8 @@ def setup_and_run(  # noqa: C901, PLR0911
             projects_path=args.projects_path,
             num_parallel_builds=args.num_parallel_builds,
             ip_cache_path=args.ip_cache_path,
+            block_design_cache_path=args.block_design_cache_path,
+            num_ip_core_jobs=args.num_threads_per_build if args.parallel_ip_cores else None,
         )
 
     else:
@@ -193,6 +341,8 @@ def setup_and_run(  # noqa: C901, PLR0911
             projects_path=args.projects_path,
             num_parallel_builds=args.num_parallel_builds,
             ip_cache_path=args.ip_cache_path,
+            block_design_cache_path=args.block_design_cache_path,
+            num_ip_core_jobs=args.num_threads_per_build if args.parallel_ip_cores else None,
         )
 
     if not create_ok:
@@ -230,6 +380,8 @@ def setup_and_run(  # noqa: C901, PLR0911
         collect_artifacts=collect_artifacts_function,
         synth_only=args.synth_only,
         from_impl=args.from_impl,
+        synthesis_checkpoint_cache_path=args.synthesis_checkpoint_cache_path,
+        artifact_store=args.artifact_store,
     )
 
     if build_ok:
@@ -238,7 +390,43 @@ def setup_and_run(  # noqa: C901, PLR0911
     return 1
 
 
-def generate_register_artifacts(modules: ModuleList, output_path: Path) -> None:
+def prune_ip_cache(ip_cache: VivadoIpCache, max_size: int, wait: bool) -> None:
+    """
+    Remove the least recently used entries from the IP cache, until it is within the given size.
+
+    Arguments:
+        ip_cache: The IP cache.
+        max_size: Maximum size of the cache, in bytes.
+        wait: Wait until no other process is using the cache.
+    """
+    removed = ip_cache.prune(max_size=max_size, wait=wait)
+
+    if removed is None:
+        print(f"IP cache is in use, will not prune: {ip_cache.cache_path}")
+        return
+
+    if removed:
+        size_gb = sum(entry.size for entry in removed) / 1e9
+        print(
+            f"Removed {len(removed)} IP cache entries ({size_gb:.1f} GB) from {ip_cache.cache_path}"
+        )
+
+
+# The register artifacts that are generated, and the sub-folder where each is placed.
+REGISTER_ARTIFACT_GENERATORS = {
+    CHeaderGenerator: "c",
+    CppInterfaceGenerator: "cpp/include",
+    CppHeaderGenerator: "cpp/include",
+    CppImplementationGenerator: "cpp",
+    HtmlPageGenerator: "html",
+    PythonPickleGenerator: "python",
+    PythonAccessorGenerator: "python",
+}
+
+
+def generate_register_artifacts(
+    modules: ModuleList, output_path: Path, cache_path: Path | None = None
+) -> None:
     """
     Example of a function to generate register artifacts from the given modules.
     Will generate pretty much all register artifacts available.
@@ -247,51 +435,70 @@ def generate_register_artifacts(modules: ModuleList, output_path: Path) -> None:
     Arguments:
         modules: Registers from these modules will be included.
         output_path: Register artifacts will be placed here.
+        cache_path: Optional path to a :class:`.RegisterArtifactCache` folder.
+            If set, the artifacts of each unique register list are generated only once, in
+            parallel, and then linked from the cache.
     """
     print(f"Generating register artifacts in {output_path.resolve()}...")
 
     # Empty the output directory so we don't have leftover old artifacts.
     create_directory(directory=output_path, empty=True)
 
-    for module in modules:
-        if module.registers is not None:
-            CHeaderGenerator(module.registers, output_path / "c").create()
-
-            CppInterfaceGenerator(module.registers, output_path / "cpp" / "include").create()
-            CppHeaderGenerator(module.registers, output_path / "cpp" / "include").create()
-            CppImplementationGenerator(module.registers, output_path / "cpp").create()
+    register_lists = [module.registers for module in modules if module.registers is not None]
 
-            HtmlPageGenerator(module.registers, output_path / "html").create()
+    if cache_path is not None:
+        RegisterArtifactCache(
+            cache_path=cache_path, generators=REGISTER_ARTIFACT_GENERATORS
+        ).create(register_lists=register_lists, output_path=output_path)
+        return
 
-            PythonPickleGenerator(module.registers, output_path / "python").create()
-            PythonAccessorGenerator(module.registers, output_path / "python").create()
+    for register_list in register_lists:
+        for generator, folder in REGISTER_ARTIFACT_GENERATORS.items():
+            generator(register_list, output_path / folder).create()
 
 
-def collect_artifacts(project: VivadoProject, output_path: Path) -> bool:
+def collect_artifacts(
+    project: VivadoProject, output_path: Path, register_artifact_cache_path: Path | None = None
+) -> bool:
     """
     Example of a function to collect build artifacts.
     Will create a zip file with the bitstream, hardware definition (.xsa) and register artifacts.
+    As well as partial bitstreams, if the project has reconfigurable partitions.
 
     Arguments:
         project: Project object that has been built, and who's artifacts shall now be collected.
         output_path: Path to the build output. Artifact zip will be placed here as well.
+        register_artifact_cache_path: Optional path to a cache of register artifacts.
+            See :func:`.generate_register_artifacts`.
 
     Return:
         True if everything went well.
     """
     version = "0.0.0"
-    release_dir = create_directory(output_path / f"{project.name}-{version}", empty=True)
-    print(f"Creating release in {release_dir.resolve()}.zip")
+    zip_file = output_path / f"{project.name}-{version}.zip"
+    print(f"Creating release in {zip_file.resolve()}")
 
-    generate_register_artifacts(modules=project.modules, output_path=release_dir / "registers")
-    copy2(output_path / f"{project.name}.bit", release_dir)
-    copy2(output_path / f"{project.name}.bin", release_dir)
+    contents = {
+        f"{project.name}.bit": output_path / f"{project.name}.bit",
+        f"{project.name}.bin": output_path / f"{project.name}.bin",
+    }
     if (output_path / f"{project.name}.xsa").exists():
-        copy2(output_path / f"{project.name}.xsa", release_dir)
+        contents[f"{project.name}.xsa"] = output_path / f"{project.name}.xsa"
+
+    for partition in project.reconfigurable_partitions:
+        contents[partition.name] = partition.get_output_path(output_path=output_path)
 
-    make_archive(str(release_dir), "zip", release_dir)
+    # Register artifacts are generated in a temporary folder.
+    # Everything else is written to the zip directly from where it was placed by the build.
+    with TemporaryDirectory() as temp_directory:
+        register_path = Path(temp_directory) / "registers"
+        generate_register_artifacts(
+            modules=project.modules,
+            output_path=register_path,
+            cache_path=register_artifact_cache_path,
+        )
+        contents["registers"] = register_path
 
-    # Remove folder so that only zip remains
-    delete(release_dir)
+        create_zip_file(file=zip_file, contents=contents)
 
     return True
@@ -34,7 +34,7 @@ class Module(BaseModule):
                 name="artyz7",
                 modules=modules,
                 part=part,
-                tcl_sources=[block_design],
+                block_designs=[block_design],
                 constraints=[pinning],
                 defined_at=THIS_FILE,
             )
@@ -46,7 +46,7 @@ class Module(BaseModule):
                 top="artyz7_top",
                 modules=modules,
                 part=part,
-                tcl_sources=[block_design],
+                block_designs=[block_design],
                 constraints=[pinning],
                 impl_explore=True,
                 defined_at=THIS_FILE,
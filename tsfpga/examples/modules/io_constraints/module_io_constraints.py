@@ -46,7 +46,7 @@ class Module(BaseModule):
                 name="io_constraints",
                 modules=modules,
                 part=part,
-                tcl_sources=[block_design],
+                block_designs=[block_design],
                 constraints=constraints,
                 defined_at=THIS_FILE,
             )
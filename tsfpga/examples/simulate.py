@@ -24,10 +24,10 @@ from tsfpga.examples.example_env import (
 )
 from tsfpga.examples.simulation_utils import (
     SimulationProject,
-    create_vhdl_ls_configuration,
     get_arguments_cli,
     set_git_test_pattern,
 )
+from tsfpga.vivado.simlib_commercial import get_simlib_family
 
 
 def main() -> None:
@@ -53,21 +53,24 @@ def main() -> None:
         # No git diff. Don't run anything.
         return
 
-    ip_core_vivado_project_directory = simulation_project.add_vivado_ip_cores(
-        modules=modules + modules_no_test
+    # Compile commercial simlib only for the device families that are in use.
+    # Open source simlib does not depend on the family, so skip the slow project listing.
+    simlib_families = (
+        [
+            get_simlib_family(part=project.part)
+            for module in modules
+            for project in module.get_build_projects()
+        ]
+        if simulation_project.has_commercial_simulator
+        else None
     )
 
-    # Generate before modules are added to VUnit project, to avoid duplicate files.
-    create_vhdl_ls_configuration(
-        output_path=tsfpga.REPO_ROOT,
-        modules=modules + modules_no_test,
-        vunit_proj=simulation_project.vunit_proj,
-        ip_core_vivado_project_directory=ip_core_vivado_project_directory,
-    )
-
-    simulation_project.add_modules(
+    # Generate IP cores and register artifacts concurrently, and add to VUnit project.
+    simulation_project.prepare(
         modules=modules,
         modules_no_test=modules_no_test,
+        simlib_families=simlib_families,
+        vhdl_ls_output_path=tsfpga.REPO_ROOT,
         include_verilog_files=False,
         include_systemverilog_files=False,
     )
@@ -75,10 +78,11 @@ def main() -> None:
     # Synopsys is needed by unisim MMCME2_ADV primitive.
     # Relaxed rules needed by unisim VITAL2000 package.
     # Do not use in any new code.
-    simulation_project.add_vivado_simlib()
     simulation_project.vunit_proj.set_sim_option("ghdl.elab_flags", ["-fsynopsys", "-frelaxed"])
 
-    simulation_project.vunit_proj.main()
+    simulation_project.set_shard_test_pattern()
+
+    simulation_project.vunit_proj.main(post_run=simulation_project.post_run)
 
 
 if __name__ == "__main__":
@@ -9,7 +9,13 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import glob
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from fnmatch import fnmatch
 from pathlib import Path
+from threading import Event, Thread
 from typing import TYPE_CHECKING, Any
 
 import hdl_registers
@@ -19,13 +25,26 @@ from vunit_vivado.vivado import add_from_compile_order_file, create_compile_orde
 
 import tsfpga
 import tsfpga.create_vhdl_ls_config
+from tsfpga.compiled_library_cache import CompiledLibraryCache
 from tsfpga.git_simulation_subset import GitSimulationSubset
 from tsfpga.module_list import ModuleList
+from tsfpga.simulation_timing_history import SimulationTimingHistory
+from tsfpga.system_utils import run_command
 from tsfpga.vivado.common import get_vivado_path
 from tsfpga.vivado.ip_cores import VivadoIpCores
 from tsfpga.vivado.simlib import VivadoSimlib
+from tsfpga.vivado.simlib_commercial import VivadoSimlibCommercial
+from tsfpga.vivado.simlib_common import get_fast_archive_format
+from tsfpga.vivado.simlib_open_source import VivadoSimlibOpenSource
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from vunit.sim_if import SimulatorInterface
+    from vunit.ui.results import Results
+
+    from tsfpga.hdl_file import HdlFile
+    from tsfpga.module import BaseModule
     from tsfpga.vivado.project import VivadoIpCoreProject
     from tsfpga.vivado.simlib_common import VivadoSimlibCommon
 
@@ -73,6 +92,54 @@ def get_arguments_cli(default_output_path: Path) -> VUnitCLI:
         "--simlib-compile", action="store_true", help="force (re)compile of Vivado simlib"
     )
 
+    cli.parser.add_argument(
+        "--simlib-subset",
+        action="store_true",
+        help=(
+            "compile only the Vivado simlib primitives that are used by the simulation sources. "
+            "Only for GHDL and NVC"
+        ),
+    )
+
+    cli.parser.add_argument(
+        "--compiled-library-cache-path",
+        type=Path,
+        help=(
+            "use a cache of compiled libraries, at this path, for the modules that are not tested. "
+            "Can be shared between workspaces, but with GHDL only between workspaces at the "
+            "same path"
+        ),
+    )
+
+    cli.parser.add_argument(
+        "--shard",
+        type=_parse_shard,
+        help=(
+            "run only shard i of N, e.g. '3/8'. "
+            "Test cases are split between shards based on the run times in --timing-history-file "
+            "if given, otherwise based on the number of test cases"
+        ),
+    )
+
+    cli.parser.add_argument(
+        "--timing-history-file",
+        type=Path,
+        help=(
+            "run times of the test cases from earlier runs. Is only read, never written. "
+            "Must be the same file for all the jobs that run different shards"
+        ),
+    )
+
+    cli.parser.add_argument(
+        "--timing-history-output-file",
+        type=Path,
+        help=(
+            "write the run times of the test cases of this run to this file. "
+            "Use one file for each shard, and merge them into --timing-history-file when "
+            "all the jobs are done"
+        ),
+    )
+
     cli.parser.add_argument(
         "--vcs-minimal",
         action="store_true",
@@ -88,11 +155,31 @@ def get_arguments_cli(default_output_path: Path) -> VUnitCLI:
     return cli
 
 
+def _parse_shard(value: str) -> tuple[int, int]:
+    """
+    Parse a shard argument on the format "i/N", where "i" is 1 to "N".
+    """
+    try:
+        shard, num_shards = (int(part) for part in value.split("/"))
+    except ValueError as exception:
+        raise argparse.ArgumentTypeError(
+            f'Expected shard on the format "i/N", got "{value}"'
+        ) from exception
+
+    if not 1 <= shard <= num_shards:
+        raise argparse.ArgumentTypeError(f'Expected shard "i/N" with 1 <= i <= N, got "{value}"')
+
+    return shard, num_shards
+
+
 class SimulationProject:
     """
     Class for setting up and handling a VUnit simulation project. Should be reusable in most cases.
     """
 
+    # How long to wait for the archive of compiled simlib after all tests have been run.
+    _simlib_archive_timeout_s = 600
+
     def __init__(self, args: argparse.Namespace, enable_preprocessing: bool = False) -> None:
         """
         Create a VUnit project, configured according to the given arguments.
@@ -114,6 +201,197 @@ class SimulationProject:
 
         self.has_commercial_simulator = self.vunit_proj.get_simulator_name() not in ["ghdl", "nvc"]
 
+        # Holds resources, e.g. locks, that shall be kept for as long as the simulation
+        # is running.
+        # Released when the process exits, which is when VUnit is done.
+        self._resources = ExitStack()
+
+        # Cache of compiled libraries, for the modules that are not tested.
+        # Can be replaced by the user, e.g. to set compile options for the cached libraries.
+        self.compiled_library_cache = (
+            None
+            if args.compiled_library_cache_path is None
+            else CompiledLibraryCache(
+                cache_path=args.compiled_library_cache_path,
+                simulator_name=self.vunit_proj.get_simulator_name(),
+                simulator_version=self._get_simulator_version(),
+                vhdl_standard=self.vunit_proj.vhdl_standard,
+            )
+        )
+        # Run times of the test cases from earlier runs, that are used to split the test cases
+        # between shards.
+        # Is only read, the run times of this run are written to a separate file.
+        self.timing_history = (
+            None
+            if args.timing_history_file is None
+            else SimulationTimingHistory(file=args.timing_history_file)
+        )
+
+        # Creates the archive of compiled simlib, if simlib was compiled.
+        self._simlib_archive_thread: Thread | None = None
+        self._simlib_archive_cancel = Event()
+
+        # Key of each Vivado simlib library, for the compiled library cache.
+        # Is set when simlib has been added.
+        self._simlib_library_keys: dict[str, str] | None = None
+
+        # Libraries of IP cores, which are compiled on each run.
+        self._ip_core_library_names: set[str] = set()
+
+        # Libraries that are not in the cache, and will be stored once they have been compiled.
+        # The cache key, and the compile options of the files when the library was added.
+        self._libraries_to_store: dict[str, tuple[str, list[Any]]] = {}
+
+    def prepare(
+        self,
+        modules: ModuleList,
+        modules_no_test: ModuleList | None = None,
+        vivado_part_name: str = "xc7z020clg400-1",
+        vivado_ip_core_project_class: type[VivadoIpCoreProject] | None = None,
+        simlib_families: Iterable[str] | None = None,
+        vhdl_ls_output_path: Path | None = None,
+        **add_modules_kwargs: Any,  # noqa: ANN401
+    ) -> Path | None:
+        """
+        Generate register artifacts and IP cores, compile simlib, and add it all to the
+        VUnit project.
+        Gives the same result as calling :meth:`.add_vivado_ip_cores`, :meth:`.add_modules` and
+        :meth:`.add_vivado_simlib` one after the other, but is faster since the slow steps
+        run concurrently.
+
+        IP cores are generated in a thread of their own, while register artifacts are generated
+        in other threads.
+        Simlib is compiled in yet another thread, once the files of the modules have been listed.
+        The simlib compile does not wait for the IP cores.
+        The module files are added to VUnit after simlib, so that libraries that use simlib can be
+        taken from the compiled library cache.
+        With a commercial simulator, simlib is compiled for both VHDL and Verilog if there are
+        any IP cores, since their simulation files might be in either language.
+        Only the calling thread makes changes to the VUnit project.
+
+        Arguments:
+            modules: See :meth:`.add_modules`.
+            modules_no_test: See :meth:`.add_modules`.
+                IP cores from these modules, as well as from ``modules``, will be included.
+            vivado_part_name: See :meth:`.add_vivado_ip_cores`.
+            vivado_ip_core_project_class: See :meth:`.add_vivado_ip_cores`.
+            simlib_families: See the ``families`` argument of :meth:`.add_vivado_simlib`.
+            vhdl_ls_output_path: If given, a vhdl_ls configuration will be created in this
+                directory.
+                See :func:`.create_vhdl_ls_configuration`.
+            add_modules_kwargs: Further arguments that will be sent to :meth:`.add_modules`.
+                Note that this is a "kwargs" style argument; any number of named arguments can
+                be sent.
+
+        Return:
+            Path to the Vivado IP core project's ``project`` directory.
+            ``None`` if Vivado IP cores were not added due to command line argument.
+        """
+        modules_no_test = ModuleList() if modules_no_test is None else modules_no_test
+        all_modules = modules + modules_no_test
+
+        if self.args.vivado_skip:
+            vivado_ip_cores = None
+            ip_core_vivado_project_directory = None
+        else:
+            vivado_ip_cores = VivadoIpCores(
+                modules=all_modules,
+                output_path=self.args.output_path_vivado,
+                part_name=vivado_part_name,
+                vivado_project_class=vivado_ip_core_project_class,
+            )
+            ip_core_vivado_project_directory = vivado_ip_cores.project_directory
+
+        # Arguments for listing the files of the modules, the rest are for setting up VUnit.
+        include_files_kwargs = {
+            name: add_modules_kwargs.pop(name)
+            for name in [
+                "include_vhdl_files",
+                "include_verilog_files",
+                "include_systemverilog_files",
+            ]
+            if name in add_modules_kwargs
+        }
+
+        with ThreadPoolExecutor() as executor:
+            ip_cores_future = (
+                None
+                if vivado_ip_cores is None
+                else executor.submit(
+                    self._update_ip_core_files,
+                    vivado_ip_cores=vivado_ip_cores,
+                    force_generate=self.args.ip_compile,
+                )
+            )
+
+            register_futures = [
+                executor.submit(self._create_register_files, module=module)
+                for module in all_modules
+            ]
+            for register_future in register_futures:
+                register_future.result()
+
+            module_files = self._get_module_files(
+                modules=modules, modules_no_test=modules_no_test, **include_files_kwargs
+            )
+
+            if self.args.vivado_skip:
+                simlib_future = None
+            else:
+                source_files = [
+                    hdl_file.path for _, hdl_files in module_files for hdl_file in hdl_files
+                ]
+                simlib_future = executor.submit(
+                    self._compile_simlib,
+                    output_path=self.args.output_path_vivado,
+                    force_compile=self.args.simlib_compile,
+                    design_files=source_files if self.args.simlib_subset else None,
+                    families=simlib_families,
+                    languages=self._get_simlib_languages(
+                        source_files=source_files,
+                        include_ip_cores=self.has_commercial_simulator
+                        and self._has_ip_cores(
+                            modules=all_modules, vivado_part_name=vivado_part_name
+                        ),
+                    ),
+                )
+
+            if ip_cores_future is not None:
+                ip_cores_future.result()
+
+            if vivado_ip_cores is not None and self.has_commercial_simulator:
+                self._add_ip_core_compile_order_file(
+                    compile_order_file=vivado_ip_cores.compile_order_file
+                )
+
+            if vhdl_ls_output_path is not None:
+                # Generate before modules are added to VUnit project, to avoid duplicate files.
+                create_vhdl_ls_configuration(
+                    output_path=vhdl_ls_output_path,
+                    modules=all_modules,
+                    vunit_proj=self.vunit_proj,
+                    ip_core_vivado_project_directory=ip_core_vivado_project_directory,
+                )
+
+            if simlib_future is not None:
+                vivado_simlib, compiled = simlib_future.result()
+                self._add_compiled_simlib(vivado_simlib=vivado_simlib, compiled=compiled)
+
+            self._add_module_files(
+                module_files=module_files, modules_no_test=modules_no_test, **add_modules_kwargs
+            )
+
+        return ip_core_vivado_project_directory
+
+    @staticmethod
+    def _create_register_files(module: BaseModule) -> None:
+        """
+        Create the register artifacts of the module.
+        Would otherwise be created when the module's simulation files are listed.
+        """
+        module.create_register_synthesis_files()
+        module.create_register_simulation_files()
+
     def add_modules(
         self,
         modules: ModuleList,
@@ -126,6 +404,16 @@ class SimulationProject:
         """
         Add module source files to the VUnit project.
 
+        The files of the modules are listed in parallel threads, meaning that
+        :meth:`.BaseModule.get_simulation_files` is called for many modules at the same time.
+        The files of each module are then added to the VUnit project with one call.
+
+        If ``compiled_library_cache`` is set, the libraries of ``modules_no_test`` that are
+        in the cache are added as external libraries, instead of being compiled.
+        Libraries that use Vivado simlib are taken from the cache only if simlib has been added
+        before, which is done by :meth:`.prepare`.
+        See also :meth:`.post_run`.
+
         Arguments:
             modules: These modules will be included in the simulation project.
             modules_no_test: Source and simulation files from these modules will be included in the
@@ -144,24 +432,81 @@ class SimulationProject:
         """
         modules_no_test = ModuleList() if modules_no_test is None else modules_no_test
 
+        module_files = self._get_module_files(
+            modules=modules,
+            modules_no_test=modules_no_test,
+            include_vhdl_files=include_vhdl_files,
+            include_verilog_files=include_verilog_files,
+            include_systemverilog_files=include_systemverilog_files,
+        )
+        self._add_module_files(
+            module_files=module_files, modules_no_test=modules_no_test, **setup_vunit_kwargs
+        )
+
+    def _get_module_files(
+        self,
+        modules: ModuleList,
+        modules_no_test: ModuleList,
+        include_vhdl_files: bool = True,
+        include_verilog_files: bool = True,
+        include_systemverilog_files: bool = True,
+    ) -> list[tuple[BaseModule, list[HdlFile]]]:
+        """
+        List the simulation files of each module.
+        Does not make any changes to the VUnit project.
+        Arguments are the same as for :meth:`.add_modules`.
+        """
         include_unisim = not self.args.vivado_skip
         include_ip_cores = self.has_commercial_simulator and not self.args.vivado_skip
 
-        for module in modules + modules_no_test:
-            vunit_library = self.vunit_proj.add_library(
-                library_name=module.library_name, allow_duplicate=True
-            )
-            simulate_this_module = module not in modules_no_test
-
-            for hdl_file in module.get_simulation_files(
-                include_tests=simulate_this_module,
+        def get_simulation_files(module: BaseModule) -> list[HdlFile]:
+            return module.get_simulation_files(
+                include_tests=module not in modules_no_test,
                 include_unisim=include_unisim,
                 include_ip_cores=include_ip_cores,
                 include_vhdl_files=include_vhdl_files,
                 include_verilog_files=include_verilog_files,
                 include_systemverilog_files=include_systemverilog_files,
-            ):
-                vunit_library.add_source_file(hdl_file.path)
+            )
+
+        # Listing the files of a module includes searching the file system and generating
+        # register artifacts, which can be done for many modules at the same time.
+        all_modules = modules + modules_no_test
+        with ThreadPoolExecutor() as executor:
+            return list(
+                zip(all_modules, executor.map(get_simulation_files, all_modules), strict=True)
+            )
+
+    def _add_module_files(
+        self,
+        module_files: list[tuple[BaseModule, list[HdlFile]]],
+        modules_no_test: ModuleList,
+        **setup_vunit_kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """
+        Add the listed simulation files of each module to the VUnit project.
+        Arguments are the same as for :meth:`.add_modules`.
+        """
+        include_unisim = not self.args.vivado_skip
+        include_ip_cores = self.has_commercial_simulator and not self.args.vivado_skip
+
+        cached_library_names = self._add_cached_libraries(
+            module_files=module_files, modules_no_test=modules_no_test
+        )
+
+        for module, hdl_files in module_files:
+            if module.library_name in cached_library_names:
+                continue
+
+            vunit_library = self.vunit_proj.add_library(
+                library_name=module.library_name, allow_duplicate=True
+            )
+            simulate_this_module = module not in modules_no_test
+
+            # Escape, since VUnit treats the file names as glob patterns.
+            vunit_library.add_source_files(
+                pattern=[glob.escape(str(hdl_file.path)) for hdl_file in hdl_files]
+            )
 
             if simulate_this_module:
                 module.setup_vunit(
@@ -172,24 +517,391 @@ class SimulationProject:
                     **setup_vunit_kwargs,
                 )
 
-    def add_vivado_simlib(self) -> VivadoSimlibCommon | None:
+        self._prepare_libraries_to_store()
+
+    def _add_cached_libraries(
+        self, module_files: list[tuple[BaseModule, list[HdlFile]]], modules_no_test: ModuleList
+    ) -> set[str]:
+        """
+        Add the libraries of the modules that are not tested, and that are in the compiled
+        library cache, as external libraries to the VUnit project.
+        Libraries that are not in the cache will be stored in the cache by :meth:`.post_run`.
+
+        Return:
+            The names of the libraries that were added.
+        """
+        if self.compiled_library_cache is None:
+            return set()
+
+        libraries: dict[str, list[Path]] = {}
+        uncached_library_names = set()
+        for module, hdl_files in module_files:
+            if module in modules_no_test:
+                libraries.setdefault(module.library_name, []).extend(
+                    hdl_file.path for hdl_file in hdl_files
+                )
+            else:
+                uncached_library_names.add(module.library_name)
+
+        # A library that is shared with a module that is tested is compiled on each run.
+        for library_name in uncached_library_names:
+            libraries.pop(library_name, None)
+
+        # IP core libraries are compiled on each run, so libraries that use them are also.
+        uncached_library_names.update(self._ip_core_library_names)
+
+        if self._simlib_library_keys is None and not self.args.vivado_skip:
+            # Vivado simlib will be added later, and it is not known yet which version.
+            # Libraries that use it are hence compiled on each run.
+            uncached_library_names.update(
+                VivadoSimlibCommercial.library_names + VivadoSimlibOpenSource.library_names
+            )
+
+        keys = self.compiled_library_cache.get_keys(
+            libraries=libraries,
+            uncached_library_names=uncached_library_names,
+            external_library_keys=self._simlib_library_keys,
+        )
+
+        result = set()
+        for library_name, key in keys.items():
+            if key is None:
+                continue
+
+            if self.compiled_library_cache.has_entry(key=key):
+                self.vunit_proj.add_external_library(
+                    library_name=library_name,
+                    path=self.compiled_library_cache.get_entry_path(key=key),
+                )
+                result.add(library_name)
+            else:
+                self._libraries_to_store[library_name] = (key, [])
+
+        print(f"Using {len(result)} of {len(libraries)} libraries from compiled library cache")
+
+        return result
+
+    def _prepare_libraries_to_store(self) -> None:
+        """
+        Set the compile options of the cache on the libraries that shall be stored in the cache,
+        and take note of the compile options of all their files.
+        """
+        if self.compiled_library_cache is None:
+            return
+
+        for library_name, (key, _) in self._libraries_to_store.items():
+            source_files = self.vunit_proj.library(library_name).get_source_files()
+            for name, value in self.compiled_library_cache.compile_options.items():
+                source_files.set_compile_option(name=name, value=value)
+
+            self._libraries_to_store[library_name] = (
+                key,
+                self._get_compile_options(library_name=library_name),
+            )
+
+    def _get_compile_options(self, library_name: str) -> list[Any]:
+        """
+        Get the values of all the simulator's compile options for all the files in a library.
+        """
+        simulator_class = self._get_simulator_class()
+
+        return [
+            (source_file.name, option.name, source_file.get_compile_option(option.name))
+            for source_file in self.vunit_proj.library(library_name).get_source_files()
+            for option in simulator_class.compile_options
+        ]
+
+    def _get_simulator_class(self) -> type[SimulatorInterface]:
+        # The simulator that VUnit has selected.
+        # Note that this is not public VUnit API, but it is the same that
+        # 'VivadoSimlib.init' uses.
+        simulator_class: type[SimulatorInterface] | None
+        simulator_class = self.vunit_proj._simulator_class  # noqa: SLF001
+        if simulator_class is None:
+            raise RuntimeError("VUnit found no simulator. Can not proceed.")
+
+        return simulator_class
+
+    def _get_simulator_version(self) -> str:
+        """
+        Get a string that identifies the version of the simulator.
+        """
+        simulator_class = self._get_simulator_class()
+        prefix = Path(simulator_class.find_prefix())
+
+        if simulator_class.name in ["ghdl", "nvc"]:
+            cmd = [str(prefix / simulator_class.name), "--version"]
+            return run_command(cmd, capture_output=True).stdout
+
+        # Commercial simulators are typically installed in a folder that is named after
+        # the version.
+        return str(prefix.resolve())
+
+    def set_shard_test_pattern(self) -> None:
+        """
+        Update the VUnit project's test pattern to run only the test cases of the shard that is
+        given by the ``--shard`` argument, if any.
+        The test cases are split between the shards based on their run times in
+        ``timing_history``, see :meth:`.SimulationTimingHistory.get_shards`.
+        If there is no ``timing_history``, each shard gets the same number of test cases.
+
+        Call after all the modules have been added, and after any other update of the
+        test pattern.
+        """
+        if self.args.shard is None:
+            return
+
+        shard, num_shards = self.args.shard
+
+        test_patterns = self._get_test_case_patterns()
+        test_names = sorted(test_patterns.keys())
+
+        if self.timing_history is None:
+            shard_test_names = test_names[shard - 1 :: num_shards]
+        else:
+            shard_test_names = self.timing_history.get_shards(
+                test_names=test_names, num_shards=num_shards
+            )[shard - 1]
+
+        print(f"Running shard {shard}/{num_shards}: {len(shard_test_names)} test case(s)")
+
+        self.args.test_patterns = [
+            test_pattern
+            for test_name in shard_test_names
+            for test_pattern in test_patterns[test_name]
+        ]
+
+    def _get_test_case_patterns(self) -> dict[str, list[str]]:
+        """
+        Get the test cases of the VUnit project that match the current test pattern.
+
+        Return:
+            The name of each test case, and the test patterns that select it in all
+            its configurations.
+        """
+        result = {}
+
+        for test_bench in self.vunit_proj.get_libraries().get_test_benches(allow_empty=True):
+            # Escape, since VUnit treats the test names as patterns.
+            test_bench_name = f"{test_bench.library.name}.{test_bench.name}"
+            test_bench_pattern = glob.escape(test_bench_name)
+
+            tests = test_bench.get_tests()
+            if not tests:
+                # Test bench without test cases, that is run as one test named "all".
+                result[f"{test_bench_name}.all"] = [f"{test_bench_pattern}.*"]
+
+            for test in tests:
+                test_pattern = glob.escape(test.name)
+                result[f"{test_bench_name}.{test.name}"] = [
+                    f"{test_bench_pattern}.{test_pattern}",
+                    f"{test_bench_pattern}.*.{test_pattern}",
+                ]
+
+        return {
+            test_name: test_patterns
+            for test_name, test_patterns in result.items()
+            if any(fnmatch(test_name, test_pattern) for test_pattern in self.args.test_patterns)
+        }
+
+    def post_run(self, results: Results) -> None:
+        """
+        Shall be given as the ``post_run`` argument to VUnit ``main``.
+        Is called by VUnit when all tests have been run.
+
+        Writes the run times of the test cases to the ``--timing-history-output-file``, if given.
+        Stores the libraries that have been compiled in the compiled library cache,
+        if one is used.
+
+        Arguments:
+            results: The results of the VUnit run.
+        """
+        if self.args.timing_history_output_file is not None:
+            run_times = SimulationTimingHistory()
+            run_times.update(times=self._get_test_case_times(results=results))
+            run_times.write(file=self.args.timing_history_output_file)
+
+        self._store_compiled_libraries()
+
+    def _get_test_case_times(self, results: Results) -> dict[str, float]:
+        """
+        Get the run time of each test case that was run, with the same names as in
+        ``_get_test_case_patterns``.
+        The times of all the configurations of a test case are summed, since they are always
+        run by the same shard.
+        """
+        test_benches = {
+            f"{test_bench.library.name}.{test_bench.name}": {
+                test.name for test in test_bench.get_tests()
+            }
+            for test_bench in self.vunit_proj.get_libraries().get_test_benches(allow_empty=True)
+        }
+
+        result: dict[str, float] = {}
+        for name, test_result in results.get_report().tests.items():
+            if test_result.status == "skipped":
+                continue
+
+            # VUnit names are "library.test_bench.test" or "library.test_bench.config.test".
+            parts = name.split(".", maxsplit=2)
+            test_bench_name = ".".join(parts[:2])
+            test_name = parts[2] if len(parts) == 3 else ""
+
+            tests = test_benches.get(test_bench_name)
+            if tests is None:
+                continue
+
+            if not tests:
+                test_name = "all"
+            elif test_name not in tests:
+                test_name = test_name.split(".", maxsplit=1)[-1]
+
+            test_case_name = f"{test_bench_name}.{test_name}"
+            result[test_case_name] = result.get(test_case_name, 0.0) + test_result.time
+
+        return result
+
+    def _wait_for_simlib_archive(self) -> None:
+        if self._simlib_archive_thread is None:
+            return
+
+        self._simlib_archive_thread.join(timeout=self._simlib_archive_timeout_s)
+        if self._simlib_archive_thread.is_alive():
+            print(
+                f"Vivado simlib archive was not finished after {self._simlib_archive_timeout_s} s. "
+                "Will not wait for it."
+            )
+
+            # Stops after the file that is currently being written, and removes the
+            # temporary file.
+            self._simlib_archive_cancel.set()
+            self._simlib_archive_thread.join()
+
+    def _store_compiled_libraries(self) -> None:
+        if self.compiled_library_cache is None or not self._libraries_to_store:
+            return
+
+        if self.args.minimal or self.args.keep_compiling:
+            # Not all files have been compiled, or some files might have failed to compile.
+            return
+
+        for library_name, (key, compile_options) in self._libraries_to_store.items():
+            if self._get_compile_options(library_name=library_name) != compile_options:
+                print(
+                    f'Not storing library "{library_name}" in compiled library cache, '
+                    "since compile options were changed after the library was added"
+                )
+                continue
+
+            # Where VUnit places the libraries that it compiles.
+            library_path = (
+                Path(self.args.output_path).resolve()
+                / self.vunit_proj.get_simulator_name()
+                / "libraries"
+                / library_name
+            )
+            if library_path.exists():
+                self.compiled_library_cache.store(key=key, path=library_path)
+
+        self._libraries_to_store = {}
+
+    def add_vivado_simlib(self, families: Iterable[str] | None = None) -> VivadoSimlibCommon | None:
         """
         Add Vivado simlib to the VUnit project, unless instructed not to by ``args``.
         Will compile simlib if necessary.
 
+        Call after all the simulation source files have been added.
+        With a commercial simulator, simlib is compiled only for the languages of the
+        source files.
+        With GHDL or NVC, only the primitives that are used by the source files are compiled,
+        if the ``--simlib-subset`` argument is given.
+
+        Arguments:
+            families: The device families that simlib shall be compiled for, when using a
+                commercial simulator.
+                See :meth:`.VivadoSimlib.init`.
+
         Return:
             The simlib object, ``None`` if simlib was not added due to command line argument.
         """
         if self.args.vivado_skip:
             return None
 
+        source_files = [
+            Path(source_file.name) for source_file in self.vunit_proj.get_source_files()
+        ]
+
         return self._add_simlib(
-            output_path=self.args.output_path_vivado, force_compile=self.args.simlib_compile
+            output_path=self.args.output_path_vivado,
+            force_compile=self.args.simlib_compile,
+            design_files=source_files if self.args.simlib_subset else None,
+            families=families,
+            languages=self._get_simlib_languages(source_files=source_files, include_ip_cores=False),
+        )
+
+    @staticmethod
+    def _get_simlib_languages(source_files: list[Path], include_ip_cores: bool) -> set[str]:
+        """
+        The languages that simlib shall be compiled for, when using a commercial simulator.
+
+        Arguments:
+            source_files: The simulation source files.
+            include_ip_cores: Set if there are IP cores whose simulation files are not among
+                ``source_files``.
+                Their files are generated by Vivado, and might be in either language.
+        """
+        if include_ip_cores:
+            return {"vhdl", "verilog"}
+
+        return {
+            "vhdl" if source_file.suffix.lower() in [".vhd", ".vhdl"] else "verilog"
+            for source_file in source_files
+        }
+
+    @staticmethod
+    def _has_ip_cores(modules: ModuleList, vivado_part_name: str) -> bool:
+        # Same arguments as are used by 'VivadoIpCores'.
+        return any(
+            module.get_ip_core_files(generics={}, part=vivado_part_name) for module in modules
         )
 
-    def _add_simlib(self, output_path: Path, force_compile: bool) -> VivadoSimlibCommon:
+    def _add_simlib(
+        self,
+        output_path: Path,
+        force_compile: bool,
+        design_files: list[Path] | None = None,
+        families: Iterable[str] | None = None,
+        languages: Iterable[str] | None = None,
+    ) -> VivadoSimlibCommon:
         """
         Add Vivado simlib to the VUnit project. Compile if needed.
+        Arguments are the same as for :meth:`._compile_simlib`.
+
+        Return:
+            The simlib object.
+        """
+        vivado_simlib, compiled = self._compile_simlib(
+            output_path=output_path,
+            force_compile=force_compile,
+            design_files=design_files,
+            families=families,
+            languages=languages,
+        )
+        self._add_compiled_simlib(vivado_simlib=vivado_simlib, compiled=compiled)
+
+        return vivado_simlib
+
+    def _compile_simlib(
+        self,
+        output_path: Path,
+        force_compile: bool,
+        design_files: list[Path] | None = None,
+        families: Iterable[str] | None = None,
+        languages: Iterable[str] | None = None,
+    ) -> tuple[VivadoSimlibCommon, bool]:
+        """
+        Compile Vivado simlib if needed.
+        Does not make any changes to the VUnit project, and can hence be called from any thread.
 
         .. note::
 
@@ -199,23 +911,78 @@ class SimulationProject:
         Arguments:
             output_path: Compiled simlib will be placed in sub-directory of this path.
             force_compile: Will (re)-compile simlib even if compiled artifacts exist.
+            design_files: If given, compile only the simlib primitives that are used by
+                these files.
+                See :meth:`.VivadoSimlib.init`.
+            families: See :meth:`.VivadoSimlib.init`.
+            languages: See :meth:`.VivadoSimlib.init`.
 
         Return:
-            The simlib object.
+            The simlib object, and whether it was compiled by this call.
         """
-        vivado_simlib = VivadoSimlib.init(output_path=output_path, vunit_proj=self.vunit_proj)
-        if force_compile or vivado_simlib.compile_is_needed:
+        vivado_simlib = VivadoSimlib.init(
+            output_path=output_path,
+            vunit_proj=self.vunit_proj,
+            num_threads=self.args.num_threads,
+            design_files=design_files,
+            families=families,
+            languages=languages,
+        )
+        if force_compile:
             vivado_simlib.compile()
-            vivado_simlib.to_archive()
+            return vivado_simlib, True
+
+        return vivado_simlib, vivado_simlib.compile_if_needed()
+
+    def _add_compiled_simlib(self, vivado_simlib: VivadoSimlibCommon, compiled: bool) -> None:
+        """
+        Add compiled Vivado simlib to the VUnit project.
+
+        Arguments:
+            vivado_simlib: The simlib object.
+            compiled: Set if simlib was compiled by this process, in which case an archive
+                is created.
+        """
+        # Make sure that the compiled simlib is not deleted while we simulate, in case another
+        # process compiles it again.
+        self._resources.enter_context(vivado_simlib.use())
 
         vivado_simlib.add_to_vunit_project()
 
+        self._simlib_library_keys = dict.fromkeys(
+            vivado_simlib.library_names, vivado_simlib.artifact_name
+        )
+
+        if compiled:
+            self._start_simlib_archive(vivado_simlib=vivado_simlib)
+
         # Code in the "vital2000" package gives GHDL errors such as "result subtype of a pure
         # function cannot have access sub-elements". Hence, relaxed rules need to be enabled when
         # using unisim.
         self.vunit_proj.set_sim_option("ghdl.elab_flags", ["-frelaxed-rules"])
 
-        return vivado_simlib
+    def _start_simlib_archive(self, vivado_simlib: VivadoSimlibCommon) -> None:
+        """
+        Create an archive of the compiled simlib, e.g. for uploading to Artifactory.
+        Is done in a thread, so that simulation can start while the archive is being created.
+        When the process exits, regardless of what VUnit was asked to do, we wait for a limited
+        time for the thread to finish.
+        The archive is cancelled after that.
+        """
+        self._simlib_archive_thread = Thread(
+            target=vivado_simlib.to_archive,
+            kwargs={
+                "archive_format": get_fast_archive_format(),
+                "cancel": self._simlib_archive_cancel,
+            },
+            name="simlib_archive",
+            daemon=True,
+        )
+        self._simlib_archive_thread.start()
+
+        # VUnit calls 'post_run' only when tests are run, not e.g. with '--compile' or '--list'.
+        # Exit handlers are called on every exit, also via 'sys.exit' as VUnit does.
+        atexit.register(self._wait_for_simlib_archive)
 
     def add_vivado_ip_cores(
         self,
@@ -255,12 +1022,26 @@ class SimulationProject:
             vivado_project_class=vivado_ip_core_project_class,
         )
         if self.has_commercial_simulator:
-            add_from_compile_order_file(
-                vunit_obj=self.vunit_proj, compile_order_file=ip_core_compile_order_file
-            )
+            self._add_ip_core_compile_order_file(compile_order_file=ip_core_compile_order_file)
 
         return ip_core_vivado_project_directory
 
+    def _add_ip_core_compile_order_file(self, compile_order_file: Path) -> None:
+        """
+        Add the IP core simulation files to the VUnit project, and take note of the libraries
+        that they are placed in.
+        """
+        library_names_before = self._get_library_names()
+        add_from_compile_order_file(
+            vunit_obj=self.vunit_proj, compile_order_file=compile_order_file
+        )
+        self._ip_core_library_names.update(self._get_library_names() - library_names_before)
+
+    def _get_library_names(self) -> set[str]:
+        return {
+            library.name for library in self.vunit_proj.get_libraries(pattern="*", allow_empty=True)
+        }
+
     @staticmethod
     def _generate_ip_core_files(
         modules: ModuleList,
@@ -286,7 +1067,17 @@ class SimulationProject:
             part_name=part_name,
             vivado_project_class=vivado_project_class,
         )
+        SimulationProject._update_ip_core_files(
+            vivado_ip_cores=vivado_ip_cores, force_generate=force_generate
+        )
+
+        return vivado_ip_cores.compile_order_file, vivado_ip_cores.project_directory
 
+    @staticmethod
+    def _update_ip_core_files(vivado_ip_cores: VivadoIpCores, force_generate: bool) -> None:
+        """
+        Create a new IP core project, and a new compile order file, if needed.
+        """
         if force_generate:
             vivado_ip_cores.create_vivado_project()
             vivado_project_created = True
@@ -294,15 +1085,13 @@ class SimulationProject:
             vivado_project_created = vivado_ip_cores.create_vivado_project_if_needed()
 
         if vivado_project_created:
-            # If the IP core Vivado project has been (re)created we need to create
+            # If the IP core Vivado project has been (re)created or updated we need to create
             # a new compile order file
             create_compile_order_file(
                 project_file=vivado_ip_cores.vivado_project_file,
                 compile_order_file=vivado_ip_cores.compile_order_file,
             )
 
-        return vivado_ip_cores.compile_order_file, vivado_ip_cores.project_directory
-
 
 def set_git_test_pattern(
     args: argparse.Namespace,
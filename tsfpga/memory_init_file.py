@@ -0,0 +1,329 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import operator
+from enum import Enum, auto
+from typing import TYPE_CHECKING, Any
+
+from tsfpga.math_utils import _check_unsigned_range, to_binary_string, to_hex_string
+from tsfpga.system_utils import create_directory
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+    from types import ModuleType
+    from typing import BinaryIO
+
+# The number of words that are formatted and written to the file at a time.
+# Limits the memory usage when writing large files.
+_CHUNK_SIZE = 2**14
+
+# Digit characters, indexed by digit value.
+_DIGITS = b"0123456789ABCDEF"
+
+
+class MemoryInitFileFormat(Enum):
+    """
+    Enumeration of supported memory initialization file formats.
+    """
+
+    # Hexadecimal words, one per line.
+    # Can be used with ``updatemem``, ``$readmemh`` in Verilog and ``xpm_memory``.
+    MEM = auto()
+    # Xilinx coefficient file, with hexadecimal words.
+    # Can be used with e.g. the Block Memory Generator IP core.
+    COE = auto()
+    # Intel memory initialization file, with hexadecimal addresses and words.
+    MIF = auto()
+    # Binary words, one per line.
+    # Can be used with ``$readmemb`` in Verilog, or read with ``textio`` in VHDL.
+    BINARY = auto()
+
+
+# Decides which file endings are associated with which file format.
+_file_endings_mapping = {
+    ".mem": MemoryInitFileFormat.MEM,
+    ".coe": MemoryInitFileFormat.COE,
+    ".mif": MemoryInitFileFormat.MIF,
+}
+
+
+def write_memory_init_file(
+    file: Path,
+    words: Iterable[int],
+    word_width: int,
+    file_format: MemoryInitFileFormat | None = None,
+) -> Path:
+    """
+    Write a memory initialization file with the given data words.
+
+    If ``numpy`` is available, formatting is vectorized and done a chunk of words at a time,
+    which is many times faster than formatting one word at a time for large memories.
+    Supports words that are up to 64 bits wide, given as a NumPy integer array or any other
+    sequence of integers.
+    Wider words, or if ``numpy`` is not available, are formatted one at a time with
+    :func:`.to_hex_string` and :func:`.to_binary_string`.
+
+    The output is streamed to the file, so the whole file contents are never held in memory.
+
+    Arguments:
+        file: Where to place the file.
+        words: The data words, starting at address zero.
+            Each word will be interpreted as an unsigned value of ``word_width`` bits.
+        word_width: Width of each data word, in bits.
+        file_format: Format of the file.
+            Leave as ``None`` to deduce the format from the file ending.
+
+    Return:
+        The path to the file that was created (i.e. the original ``file`` argument).
+    """
+    if word_width < 1:
+        raise ValueError(f'Invalid word width "{word_width}".')
+
+    if file_format is None:
+        if file.suffix.lower() not in _file_endings_mapping:
+            raise ValueError(f"Can not deduce memory initialization file format: {file}")
+
+        file_format = _file_endings_mapping[file.suffix.lower()]
+
+    np = _import_numpy()
+    if np is not None and word_width <= 64:
+        array = np.asarray(words)
+
+        if array.ndim == 1 and array.dtype.kind in "iu":
+            _check_array_range(words=array, word_width=word_width)
+
+            with _open_file(file=file) as file_handle:
+                _write_vectorized(
+                    np=np,
+                    file_handle=file_handle,
+                    words=array.astype(np.uint64),
+                    word_width=word_width,
+                    file_format=file_format,
+                )
+
+            return file
+
+    # Check types and ranges before anything is written, so we do not leave a half-written file.
+    word_list = [operator.index(word) for word in words]
+    if not word_list:
+        raise ValueError("Can not write memory initialization file without data words.")
+
+    for word in word_list:
+        _check_unsigned_range(value=word, width=word_width)
+
+    with _open_file(file=file) as file_handle:
+        _write_scalar(
+            file_handle=file_handle,
+            words=word_list,
+            word_width=word_width,
+            file_format=file_format,
+        )
+
+    return file
+
+
+def _import_numpy() -> ModuleType | None:
+    # Is an optional dependency, hence it can not be imported on top level.
+    try:
+        import numpy as np  # noqa: PLC0415
+    except ImportError:
+        return None
+
+    return np
+
+
+def _open_file(file: Path) -> BinaryIO:
+    # Create directory unless it already exists. Do not delete anything if it does exist.
+    create_directory(directory=file.parent, empty=False)
+
+    # Open in binary mode so that lines end with "\n" regardless of operating system.
+    return file.open("wb")
+
+
+def _check_array_range(words: Any, word_width: int) -> None:  # noqa: ANN401
+    if words.size == 0:
+        raise ValueError("Can not write memory initialization file without data words.")
+
+    if int(words.min()) < 0 or int(words.max()) >= 2**word_width:
+        # Find the first offending word, to get the same error message as the scalar functions.
+        for word in words.tolist():
+            _check_unsigned_range(value=word, width=word_width)
+
+
+def _get_header(file_format: MemoryInitFileFormat, word_width: int, depth: int) -> str:
+    if file_format == MemoryInitFileFormat.COE:
+        return "memory_initialization_radix=16;\nmemory_initialization_vector=\n"
+
+    if file_format == MemoryInitFileFormat.MIF:
+        return (
+            f"WIDTH={word_width};\n"
+            f"DEPTH={depth};\n"
+            "\n"
+            "ADDRESS_RADIX=HEX;\n"
+            "DATA_RADIX=HEX;\n"
+            "\n"
+            "CONTENT BEGIN\n"
+        )
+
+    return ""
+
+
+def _get_footer(file_format: MemoryInitFileFormat) -> str:
+    if file_format == MemoryInitFileFormat.MIF:
+        return "END;\n"
+
+    return ""
+
+
+def _get_line_end(file_format: MemoryInitFileFormat) -> str:
+    if file_format == MemoryInitFileFormat.COE:
+        # Note that the last word shall instead be followed by ";".
+        return ",\n"
+
+    if file_format == MemoryInitFileFormat.MIF:
+        return ";\n"
+
+    return "\n"
+
+
+def _get_address_width(depth: int) -> int:
+    return max(1, (depth - 1).bit_length())
+
+
+def _write_scalar(
+    file_handle: BinaryIO, words: list[int], word_width: int, file_format: MemoryInitFileFormat
+) -> None:
+    depth = len(words)
+
+    file_handle.write(
+        _get_header(file_format=file_format, word_width=word_width, depth=depth).encode()
+    )
+
+    line_end = _get_line_end(file_format=file_format)
+    address_width = _get_address_width(depth=depth)
+
+    for chunk_start in range(0, depth, _CHUNK_SIZE):
+        lines = []
+
+        for address in range(chunk_start, min(chunk_start + _CHUNK_SIZE, depth)):
+            word = words[address]
+
+            if file_format == MemoryInitFileFormat.BINARY:
+                line = to_binary_string(value=word, result_width=word_width)
+            else:
+                line = to_hex_string(value=word, result_width_bits=word_width)
+
+            if file_format == MemoryInitFileFormat.MIF:
+                address_string = to_hex_string(value=address, result_width_bits=address_width)
+                line = f"\t{address_string} : {line}"
+
+            if file_format == MemoryInitFileFormat.COE and address == depth - 1:
+                line += ";\n"
+            else:
+                line += line_end
+
+            lines.append(line)
+
+        file_handle.write("".join(lines).encode())
+
+    file_handle.write(_get_footer(file_format=file_format).encode())
+
+
+def _write_vectorized(
+    np: ModuleType,
+    file_handle: BinaryIO,
+    words: Any,  # noqa: ANN401
+    word_width: int,
+    file_format: MemoryInitFileFormat,
+) -> None:
+    """
+    Format each chunk of words as a two-dimensional array of characters, with one row per line,
+    and write the array to the file as is.
+    """
+    depth = words.size
+
+    file_handle.write(
+        _get_header(file_format=file_format, word_width=word_width, depth=depth).encode()
+    )
+
+    line_end = _get_line_end(file_format=file_format)
+    address_width = _get_address_width(depth=depth)
+    bits_per_character = 1 if file_format == MemoryInitFileFormat.BINARY else 4
+
+    for chunk_start in range(0, depth, _CHUNK_SIZE):
+        chunk = words[chunk_start : chunk_start + _CHUNK_SIZE]
+
+        columns = [
+            _to_characters(
+                np=np,
+                values=chunk,
+                width=word_width,
+                bits_per_character=bits_per_character,
+            ),
+            line_end,
+        ]
+
+        if file_format == MemoryInitFileFormat.MIF:
+            addresses = np.arange(chunk_start, chunk_start + chunk.size, dtype=np.uint64)
+            columns = [
+                "\t",
+                _to_characters(np=np, values=addresses, width=address_width, bits_per_character=4),
+                " : ",
+                *columns,
+            ]
+
+        lines = _join_columns(np=np, columns=columns, num_rows=chunk.size)
+
+        if file_format == MemoryInitFileFormat.COE and chunk_start + chunk.size == depth:
+            lines[-1, -2] = ord(";")
+
+        file_handle.write(lines.tobytes())
+
+    file_handle.write(_get_footer(file_format=file_format).encode())
+
+
+def _to_characters(
+    np: ModuleType,
+    values: Any,  # noqa: ANN401
+    width: int,
+    bits_per_character: int,
+) -> Any:  # noqa: ANN401
+    """
+    Convert unsigned 64-bit values to a two-dimensional array of digit characters, with one row
+    per value.
+    Most significant digit is the first (left-most) character in each row.
+    """
+    num_characters = (width + bits_per_character - 1) // bits_per_character
+
+    shifts = np.arange(num_characters - 1, -1, -1, dtype=np.uint64) * np.uint64(bits_per_character)
+    digits = (values[:, np.newaxis] >> shifts) & np.uint64(2**bits_per_character - 1)
+
+    return np.frombuffer(_DIGITS, dtype=np.uint8)[digits]
+
+
+def _join_columns(
+    np: ModuleType,
+    columns: list[Any],
+    num_rows: int,
+) -> Any:  # noqa: ANN401
+    """
+    Join character arrays, and constant strings that are repeated on every row, into one
+    array of characters.
+    """
+    arrays = []
+    for column in columns:
+        if isinstance(column, str):
+            characters = np.frombuffer(column.encode(), dtype=np.uint8)
+            arrays.append(np.broadcast_to(characters, (num_rows, characters.size)))
+        else:
+            arrays.append(column)
+
+    return np.concatenate(arrays, axis=1)
@@ -0,0 +1,187 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Lock
+from typing import TYPE_CHECKING, ClassVar
+
+from hdl_registers import __version__ as hdl_registers_version
+
+from tsfpga.directory_cache import DirectoryCache
+from tsfpga.system_utils import create_directory
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from hdl_registers.generator.register_code_generator import RegisterCodeGenerator
+    from hdl_registers.register_list import RegisterList
+
+
+class RegisterArtifactCache(DirectoryCache):
+    """
+    A content-addressed cache of generated register artifacts (C header, HTML page, etc).
+
+    Each entry holds the artifacts of one register list, from all the generators of the cache.
+    The entry is stored in a folder named after a hash of the register list, the generators and
+    the ``hdl_registers`` version.
+    Many build projects typically share many modules, so each unique register list needs to
+    be generated only once, instead of once for every project.
+
+    Note that the file header of a cached artifact, with time and git information, is from when
+    the entry was created.
+    The artifact contents are however the same as if the artifact had been generated again.
+    """
+
+    _description = "register artifacts"
+
+    # The version of the cache format.
+    # Can be bumped to invalidate all existing entries, if e.g. the folder structure is changed.
+    _format_version_id = 1
+
+    # One process pool that is shared by all instances, and by all threads.
+    # Artifacts are typically created from many build threads at the same time, and one pool for
+    # each of them would start far more processes than there are processors.
+    # Processes are started with "spawn", since forking a process that has other threads running
+    # can deadlock.
+    _executor: ClassVar[ProcessPoolExecutor | None] = None
+    _executor_lock: ClassVar[Lock] = Lock()
+
+    def __init__(
+        self, cache_path: Path, generators: dict[type[RegisterCodeGenerator], str]
+    ) -> None:
+        """
+        Arguments:
+            cache_path: Path to the cache folder.
+                Can be shared between many projects, and between many workspaces.
+            generators: The generators to run for each register list, and the sub-folder
+                where the artifacts of each generator shall be placed.
+                E.g. ``{CHeaderGenerator: "c", HtmlPageGenerator: "html"}``.
+                The generator classes must be possible to import from a module, since they are
+                run in separate processes.
+                The register lists are pickled to these processes, and must hence not contain any
+                objects that can not be pickled.
+        """
+        super().__init__(cache_path=cache_path)
+
+        self.generators = generators.copy()
+
+    def get_key(self, register_list: RegisterList) -> str:
+        """
+        Calculate the cache key for the artifacts of the given register list.
+        """
+        data = {
+            "format_version": self._format_version_id,
+            "hdl_registers_version": hdl_registers_version,
+            "register_list": register_list.object_hash,
+            "generators": [
+                f"{generator.__module__}.{generator.__qualname__} {generator.__version__} {folder}"
+                for generator, folder in self.generators.items()
+            ],
+        }
+
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+    def create(
+        self,
+        register_lists: Iterable[RegisterList],
+        output_path: Path,
+        parallel: bool = True,
+    ) -> None:
+        """
+        Place the artifacts of all the given register lists in a folder.
+
+        The artifacts of register lists that are not in the cache are generated and stored first.
+        The generators are run in a process pool that is shared by all calls.
+        This method is thread-safe.
+
+        The artifacts are then hard linked from the cache to the output folder, which takes no
+        time and no disk space.
+        Note that this means that the artifacts in the output folder must not be modified.
+        Falls back to copying if hard links are not possible, e.g. if the cache is on a different
+        file system.
+
+        Arguments:
+            register_lists: Artifacts of these register lists will be created.
+            output_path: Artifacts will be placed here.
+                The folder is not emptied before the artifacts are placed.
+            parallel: Set to ``False`` to run the generators in this process instead.
+        """
+        keys = {
+            self.get_key(register_list=register_list): register_list
+            for register_list in register_lists
+        }
+
+        missing_keys = [key for key in keys if not self.has_entry(key=key)]
+        if missing_keys:
+            print(f"Generating {self._description} for {len(missing_keys)} register list(s)")
+
+            with TemporaryDirectory() as temp_directory:
+                jobs = [
+                    (generator, keys[key], Path(temp_directory) / key / folder)
+                    for key in missing_keys
+                    for generator, folder in self.generators.items()
+                ]
+
+                if len(jobs) == 1 or not parallel:
+                    for job in jobs:
+                        _run_generator(*job)
+                else:
+                    executor = self._get_executor()
+                    futures = [executor.submit(_run_generator, *job) for job in jobs]
+
+                    # Raise any exception from the generators.
+                    for future in futures:
+                        future.result()
+
+                for key in missing_keys:
+                    self.store(key=key, path=Path(temp_directory) / key)
+
+        create_directory(output_path, empty=False)
+        for key in keys:
+            shutil.copytree(
+                self.get_entry_path(key=key),
+                output_path,
+                ignore=shutil.ignore_patterns(self._done_file_name),
+                copy_function=_link_or_copy,
+                dirs_exist_ok=True,
+            )
+
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+            return cls._executor
+
+
+def _run_generator(
+    generator: type[RegisterCodeGenerator], register_list: RegisterList, output_folder: Path
+) -> None:
+    generator(register_list=register_list, output_folder=output_folder).create()
+
+
+def _link_or_copy(source: str, destination: str) -> None:
+    # Remove any existing file, so that we never write through a hard link into the cache.
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(destination)  # noqa: PTH108
+
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
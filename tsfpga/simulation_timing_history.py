@@ -0,0 +1,140 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from tsfpga.system_utils import create_file, delete, read_file
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+
+class SimulationTimingHistory:
+    """
+    The run time of each simulation test case, from earlier runs.
+    Is used to split the test cases into shards, e.g. for many CI jobs, that take roughly the
+    same time to run.
+
+    The history is stored in a JSON file.
+    Jobs that run different shards must read the same history, so that they split the test cases
+    the same way.
+    Each job shall hence :meth:`.write` its run times to a file of its own, and these files are
+    then merged into the history with :meth:`.merge` when all the jobs are done.
+    """
+
+    # The version of the file format.
+    # Can be bumped to discard the history in existing files, if e.g. the format is changed.
+    _format_version_id = 1
+
+    def __init__(self, file: Path | None = None) -> None:
+        """
+        Arguments:
+            file: Path to the history file.
+                Does not need to exist, in which case the history is empty.
+                Leave as ``None`` to start with an empty history.
+        """
+        self.times = {} if file is None else self._read(file=file)
+
+    def _read(self, file: Path) -> dict[str, float]:
+        if not file.exists():
+            return {}
+
+        data = json.loads(read_file(file))
+        if data.get("format_version") != self._format_version_id:
+            return {}
+
+        times: dict[str, float] = data["times"]
+        return times
+
+    def update(self, times: dict[str, float]) -> None:
+        """
+        Update the history with the run times of some test cases.
+        The history of test cases that are not in ``times`` is kept.
+
+        Arguments:
+            times: The run time, in seconds, of each test case.
+        """
+        self.times = {**self.times, **times}
+
+    def merge(self, files: Iterable[Path]) -> None:
+        """
+        Update the history with the run times in some other history files, e.g. the files
+        written by the jobs of the different shards.
+        Files later in the list take precedence.
+
+        Arguments:
+            files: Paths to history files.
+                Files that do not exist are ignored.
+        """
+        for file in files:
+            self.update(times=self._read(file=file))
+
+    def write(self, file: Path) -> None:
+        """
+        Write the history to a file.
+
+        Arguments:
+            file: Path to the history file.
+        """
+        data = {"format_version": self._format_version_id, "times": self.times}
+
+        # Write to a temporary file, which is then renamed.
+        # Makes sure that no one ever sees a partially written file.
+        temp_file = file.parent / f"{file.name}.{uuid4().hex}.tmp"
+        try:
+            create_file(temp_file, json.dumps(data, indent=2, sort_keys=True))
+            temp_file.replace(file)
+        finally:
+            delete(temp_file)
+
+    def get_shards(self, test_names: Iterable[str], num_shards: int) -> list[list[str]]:
+        """
+        Split the test cases into shards with roughly the same total run time.
+
+        The test cases are placed, longest first, in the shard that has the least total run
+        time so far.
+        Test cases that are not in the history are assumed to take the average time of the
+        test cases that are.
+        If no test case is in the history, the shards get the same number of test cases.
+
+        The result depends only on the test case names and on the history.
+        Jobs that run different shards must hence read the same history, so that each test case
+        is run by exactly one of them.
+
+        Arguments:
+            test_names: Names of all the test cases.
+            num_shards: The number of shards to split the test cases into.
+
+        Return:
+            The test case names of each shard.
+        """
+        if num_shards < 1:
+            raise ValueError(f"Got bad number of shards: {num_shards}")
+
+        names = sorted(set(test_names))
+
+        known_times = [self.times[name] for name in names if name in self.times]
+        default_time = sum(known_times) / len(known_times) if known_times else 1.0
+
+        times = {name: self.times.get(name, default_time) for name in names}
+
+        result: list[list[str]] = [[] for _ in range(num_shards)]
+        shard_times = [0.0] * num_shards
+
+        for name in sorted(names, key=lambda name: -times[name]):
+            shard_index = min(range(num_shards), key=lambda index: shard_times[index])
+
+            result[shard_index].append(name)
+            shard_times[shard_index] += times[name]
+
+        return result
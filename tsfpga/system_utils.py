@@ -8,20 +8,27 @@
 
 from __future__ import annotations
 
+import hashlib
 import importlib.util
 import os
 import subprocess
+import zipfile
+import zlib
+from contextlib import contextmanager
 from os.path import commonpath, relpath
 from pathlib import Path
 from platform import system
 from shutil import rmtree
 from sys import modules
 from typing import TYPE_CHECKING
+from uuid import uuid4
 
 from tsfpga import DEFAULT_FILE_ENCODING
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from types import ModuleType
+    from typing import IO
 
 
 def create_file(file: Path, contents: str | None = None) -> Path:
@@ -86,6 +93,120 @@ def read_last_lines_of_file(file: Path, num_lines: int) -> str:
     return "".join(result_lines[-num_lines:])
 
 
+def calculate_file_hash(file: Path) -> str:
+    """
+    Calculate a hash of the file contents.
+    The file is read in blocks, so that large files do not have to be kept in memory.
+
+    Arguments:
+        file: The file that shall be hashed.
+
+    Return:
+        The hexadecimal SHA-256 digest of the file contents.
+    """
+    file_hash = hashlib.sha256()
+
+    with file.open("rb") as file_handle:
+        while block := file_handle.read(1024 * 1024):
+            file_hash.update(block)
+
+    return file_hash.hexdigest()
+
+
+@contextmanager
+def file_lock(file: Path, shared: bool = False, blocking: bool = True) -> Iterator[Path]:
+    """
+    Context manager that holds an advisory lock on the given file while inside the ``with`` block.
+    The lock is held by the process, and is released automatically if the process is killed.
+    It is intended to guard resources that are shared between processes,
+    e.g. a cache folder on a build server.
+
+    Arguments:
+        file: The lock file. Will be created, along with any parent directories, if it does
+            not exist.
+        shared: If true, a shared lock is acquired, which can be held by many processes at
+            the same time, but not at the same time as an exclusive lock.
+        blocking: If true, wait until the lock can be acquired.
+            If false, raise ``BlockingIOError`` straight away if the lock is held by
+            another process.
+
+    Return:
+        The lock file path (i.e. the original ``file`` argument).
+    """
+    create_directory(file.parent, empty=False)
+
+    with file.open("a") as file_handle:
+        if system_is_windows():
+            with _windows_file_lock(
+                file=file, file_handle=file_handle, shared=shared, blocking=blocking
+            ):
+                yield file
+
+        else:
+            import fcntl  # noqa: PLC0415
+
+            operation = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            if not blocking:
+                operation |= fcntl.LOCK_NB
+
+            # Will raise 'BlockingIOError' if non-blocking and the lock is held.
+            fcntl.flock(file_handle.fileno(), operation)
+
+            try:
+                yield file
+            finally:
+                fcntl.flock(file_handle.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def _windows_file_lock(
+    file: Path, file_handle: IO[str], shared: bool, blocking: bool
+) -> Iterator[None]:
+    """
+    Lock the file using the Windows API directly, since ``msvcrt.locking`` does not support
+    shared locks.
+    """
+    import ctypes  # noqa: PLC0415
+    import msvcrt  # noqa: PLC0415
+    from ctypes import wintypes  # noqa: PLC0415
+
+    class Overlapped(ctypes.Structure):
+        _fields_ = (
+            ("internal", ctypes.c_void_p),
+            ("internal_high", ctypes.c_void_p),
+            ("offset", wintypes.DWORD),
+            ("offset_high", wintypes.DWORD),
+            ("event", wintypes.HANDLE),
+        )
+
+    lockfile_fail_immediately = 0x1
+    lockfile_exclusive_lock = 0x2
+    error_lock_violation = 33
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    handle = wintypes.HANDLE(msvcrt.get_osfhandle(file_handle.fileno()))
+    # Lock the first byte of the file.
+    # Must use the same offset and length when unlocking.
+    overlapped = Overlapped()
+
+    flags = 0 if shared else lockfile_exclusive_lock
+    if not blocking:
+        flags |= lockfile_fail_immediately
+
+    # Will wait for as long as it takes if blocking.
+    if not kernel32.LockFileEx(handle, flags, 0, 1, 0, ctypes.byref(overlapped)):
+        error = ctypes.get_last_error()
+        if not blocking and error == error_lock_violation:
+            raise BlockingIOError(f"Lock is held: {file}")
+
+        raise ctypes.WinError(error)
+
+    try:
+        yield
+    finally:
+        kernel32.UnlockFileEx(handle, 0, 1, 0, ctypes.byref(overlapped))
+
+
 def prepend_file(file_path: Path, text: str) -> Path:
     """
     Insert the ``text`` at the beginning of the file, before any existing content.
@@ -101,6 +222,90 @@ def prepend_file(file_path: Path, text: str) -> Path:
     return file_path
 
 
+# File endings of formats that are already compressed.
+# Such files are stored without compression in zip files, since compressing them again costs time
+# but does not make them smaller.
+_COMPRESSED_FILE_ENDINGS = {
+    ".7z",
+    ".bz2",
+    ".gz",
+    ".jpg",
+    ".png",
+    ".xsa",
+    ".xz",
+    ".zip",
+    ".zst",
+}
+
+
+def create_zip_file(file: Path, contents: dict[str, Path]) -> Path:
+    """
+    Create a zip file, streaming the contents directly from the given files.
+    I.e. the contents do not have to be copied to a temporary folder first.
+
+    Each file is either compressed, or stored as is if compression would not make it
+    significantly smaller.
+    This is decided based on the file ending, and by test-compressing the start of the file.
+
+    The zip is written to a temporary file which is then renamed, so no one ever sees a partially
+    written zip file.
+
+    Arguments:
+        file: Path to the zip file.
+            Any existing file will be overwritten.
+        contents: Mapping from path within the zip file to the file on disk.
+            If the path on disk is a directory, all files in it are added, recursively.
+
+    Return:
+        The path to the file that was created (i.e. the original ``file`` argument).
+    """
+    # Create directory unless it already exists. Do not delete anything if it does exist.
+    create_directory(directory=file.parent, empty=False)
+
+    temp_file = file.parent / f"{file.name}.{uuid4().hex}.tmp"
+
+    try:
+        with zipfile.ZipFile(temp_file, "w") as zip_file:
+            for archive_path, path in contents.items():
+                source_files = (
+                    sorted(source for source in path.rglob("*") if source.is_file())
+                    if path.is_dir()
+                    else [path]
+                )
+
+                for source_file in source_files:
+                    archive_name = (
+                        Path(archive_path) / source_file.relative_to(path)
+                        if path.is_dir()
+                        else Path(archive_path)
+                    )
+
+                    zip_file.write(
+                        source_file,
+                        arcname=archive_name.as_posix(),
+                        compress_type=zipfile.ZIP_DEFLATED
+                        if _is_compressible(file=source_file)
+                        else zipfile.ZIP_STORED,
+                    )
+
+        temp_file.replace(file)
+    finally:
+        delete(temp_file)
+
+    return file
+
+
+def _is_compressible(file: Path) -> bool:
+    if file.suffix.lower() in _COMPRESSED_FILE_ENDINGS:
+        return False
+
+    # Test with the fastest compression level, on the start of the file.
+    with file.open("rb") as file_handle:
+        sample = file_handle.read(1024 * 1024)
+
+    return len(zlib.compress(sample, level=1)) < 0.9 * len(sample)
+
+
 def delete(path: Path, wait_until_deleted: bool = False) -> Path:
     """
     Delete a file or directory from the filesystem.
@@ -0,0 +1,179 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+import shutil
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+
+from tsfpga.artifact_store import (
+    ArtifactStore,
+    HttpArtifactStoreBackend,
+    LocalArtifactStoreBackend,
+)
+from tsfpga.system_utils import create_directory, create_file, read_file
+
+
+@pytest.fixture
+def http_server(tmp_path):
+    """
+    Stand-in for an HTTP artifact server, e.g. Artifactory.
+    Stores objects as files in a folder.
+    """
+    server_path = create_directory(tmp_path / "server")
+
+    class Handler(BaseHTTPRequestHandler):
+        def _get_file(self):
+            return server_path / self.path.lstrip("/")
+
+        def do_HEAD(self):
+            self.send_response(200 if self._get_file().exists() else 404)
+            self.end_headers()
+
+        def do_GET(self):
+            file = self._get_file()
+            if not file.exists():
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Length", str(file.stat().st_size))
+            self.end_headers()
+            with file.open("rb") as file_handle:
+                shutil.copyfileobj(file_handle, self.wfile)
+
+        def do_PUT(self):
+            file = self._get_file()
+            create_directory(file.parent, empty=False)
+            file.write_bytes(self.rfile.read(int(self.headers["Content-Length"])))
+
+            self.send_response(201)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    server.path = server_path
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/store"
+    yield server
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture(params=["local", "http"])
+def store_test(request, tmp_path):
+    class StoreTest:
+        def __init__(self):
+            if request.param == "local":
+                self.store_path = tmp_path / "store"
+                backend = LocalArtifactStoreBackend(path=self.store_path)
+            else:
+                server = request.getfixturevalue("http_server")
+                self.store_path = server.path / "store"
+                backend = HttpArtifactStoreBackend(url=server.url)
+
+            self.store = ArtifactStore(backend=backend)
+
+            self.build_path = tmp_path / "build"
+            self.bit_file = create_file(self.build_path / "apa.bit", "bit")
+            self.bin_file = create_file(self.build_path / "apa.bin", "bin")
+            self.variant_file = create_file(self.build_path / "variant" / "apa.bit", "bit")
+
+        def put(self, fingerprint="abc", metadata=None):
+            self.store.put(
+                fingerprint=fingerprint,
+                root_path=self.build_path,
+                files=[self.bit_file, self.bin_file, self.variant_file],
+                metadata=metadata,
+            )
+
+        def get_blob_files(self):
+            return [file for file in (self.store_path / "blobs").rglob("*") if file.is_file()]
+
+    return StoreTest()
+
+
+def test_put_and_get(store_test, tmp_path):
+    store_test.put(metadata={"size": {"LUT": 12}})
+    assert store_test.store.has_build(fingerprint="abc")
+
+    output_path = tmp_path / "output"
+    assert store_test.store.get(fingerprint="abc", output_path=output_path) == {"size": {"LUT": 12}}
+
+    assert read_file(output_path / "apa.bit") == "bit"
+    assert read_file(output_path / "apa.bin") == "bin"
+    assert read_file(output_path / "variant" / "apa.bit") == "bit"
+
+
+def test_get_missing_build_should_return_none(store_test, tmp_path):
+    assert not store_test.store.has_build(fingerprint="abc")
+    assert store_test.store.get(fingerprint="abc", output_path=tmp_path / "output") is None
+    assert not (tmp_path / "output").exists()
+
+
+def test_identical_files_should_be_stored_only_once(store_test):
+    store_test.put(fingerprint="abc")
+    # The two "apa.bit" files have the same contents.
+    assert len(store_test.get_blob_files()) == 2
+
+    store_test.put(fingerprint="def")
+    assert len(store_test.get_blob_files()) == 2
+
+    create_file(store_test.bin_file, "changed")
+    store_test.put(fingerprint="ghi")
+    assert len(store_test.get_blob_files()) == 3
+
+
+def test_get_with_bad_blob_contents_should_raise_exception(store_test, tmp_path):
+    store_test.put()
+
+    for blob_file in store_test.get_blob_files():
+        if read_file(blob_file) == "bin":
+            create_file(blob_file, "corrupt")
+
+    output_path = tmp_path / "output"
+    with pytest.raises(ValueError) as exception_info:
+        store_test.store.get(fingerprint="abc", output_path=output_path)
+    assert str(exception_info.value) == 'Artifact store build "abc" has bad contents for apa.bin'
+
+    assert not (output_path / "apa.bin").exists()
+
+
+def test_get_with_missing_blob_should_raise_exception(store_test, tmp_path):
+    store_test.put()
+
+    for blob_file in store_test.get_blob_files():
+        blob_file.unlink()
+
+    with pytest.raises(FileNotFoundError) as exception_info:
+        store_test.store.get(fingerprint="abc", output_path=tmp_path / "output")
+    assert str(exception_info.value).startswith('Artifact store build "abc" is missing blob for')
+
+
+def test_local_backend_should_leave_no_temporary_files(tmp_path):
+    backend = LocalArtifactStoreBackend(path=tmp_path / "store")
+    backend.upload(name="a/b", file=create_file(tmp_path / "file.txt", "data"))
+
+    assert [file.name for file in (tmp_path / "store" / "a").iterdir()] == ["b"]
+
+
+def test_from_location(tmp_path):
+    store = ArtifactStore.from_location(location=str(tmp_path))
+    assert isinstance(store.backend, LocalArtifactStoreBackend)
+    assert store.backend.path == tmp_path.resolve()
+
+    store = ArtifactStore.from_location(location="https://artifacts.example.com/fpga/")
+    assert isinstance(store.backend, HttpArtifactStoreBackend)
+    assert store.backend.url == "https://artifacts.example.com/fpga"
@@ -6,13 +6,21 @@
 # https://github.com/tsfpga/tsfpga
 # --------------------------------------------------------------------------------------------------
 
-from unittest.mock import MagicMock
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, Lock
+from unittest.mock import MagicMock, call
 
 import pytest
 
-from tsfpga.build_project_list import BuildProjectList, get_build_projects
+from tsfpga.build_project_list import (
+    BuildProjectList,
+    ThreadSafeCollectArtifacts,
+    get_build_projects,
+)
 from tsfpga.module import BaseModule
 from tsfpga.system_utils import create_directory
+from tsfpga.vivado.bitstream_variant import BitstreamVariant
 from tsfpga.vivado.project import BuildResult, VivadoProject
 
 
@@ -25,6 +33,7 @@ def build_project_list_test():
             project.name = name
             project.__str__.return_value = f"MockProject {name}"
             project.is_netlist_build = is_netlist_build
+            project.bitstream_variants = []
 
             # Note that his has 'success' set to True by default.
             project.build.return_value = BuildResult(name=name, synthesis_run_name="")
@@ -222,6 +231,31 @@ def test_build_with_collect_artifacts_and_output_path(build_project_list_test, t
     )
 
 
+def test_build_with_collect_artifacts_and_bitstream_variants(build_project_list_test, tmp_path):
+    build_project_list_test.project_one.bitstream_variants = [
+        BitstreamVariant(name="apa", memory_data={}),
+        BitstreamVariant(name="hest", memory_data={}),
+    ]
+    project_list = BuildProjectList([build_project_list_test.project_one])
+    collect_artifacts = MagicMock()
+    assert project_list.build(
+        projects_path=tmp_path / "projects_path",
+        num_parallel_builds=2,
+        num_threads_per_build=4,
+        output_path=tmp_path / "output_path",
+        collect_artifacts=collect_artifacts,
+    )
+
+    assert collect_artifacts.call_args_list == [
+        call(project=build_project_list_test.project_one, output_path=output_path)
+        for output_path in [
+            tmp_path / "output_path" / "one",
+            tmp_path / "output_path" / "one" / "apa",
+            tmp_path / "output_path" / "one" / "hest",
+        ]
+    ]
+
+
 def test_build_with_collect_artifacts_return_false_should_fail_build(
     build_project_list_test, tmp_path
 ):
@@ -250,3 +284,51 @@ def test_open(build_project_list_test, tmp_path):
     )
     build_project_list_test.project_one.open.assert_not_called()
     build_project_list_test.project_two.open.assert_not_called()
+
+
+def test_thread_safe_collect_artifacts_should_run_different_output_paths_in_parallel(tmp_path):
+    # Will raise 'BrokenBarrierError' if the two calls do not run at the same time.
+    barrier = Barrier(2, timeout=5)
+
+    def collect_artifacts(project, output_path):  # noqa: ARG001
+        barrier.wait()
+        return True
+
+    thread_safe = ThreadSafeCollectArtifacts(collect_artifacts=collect_artifacts)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = executor.map(
+            lambda name: thread_safe.collect_artifacts(project=None, output_path=tmp_path / name),
+            ["apa", "hest"],
+        )
+        assert list(results) == [True, True]
+
+
+def test_thread_safe_collect_artifacts_should_serialize_same_output_path(tmp_path):
+    num_running = []
+    max_num_running = []
+    lock = Lock()
+
+    def collect_artifacts(project, output_path):  # noqa: ARG001
+        with lock:
+            num_running.append(1)
+            max_num_running.append(len(num_running))
+
+        time.sleep(0.01)
+
+        with lock:
+            num_running.pop()
+
+        return True
+
+    thread_safe = ThreadSafeCollectArtifacts(collect_artifacts=collect_artifacts)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = executor.map(
+            # Same folder, but given in different ways.
+            lambda path: thread_safe.collect_artifacts(project=None, output_path=path),
+            [tmp_path / "apa", tmp_path / "apa" / ".." / "apa"] * 4,
+        )
+        assert all(results)
+
+    assert max(max_num_running) == 1
@@ -0,0 +1,146 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+import pytest
+
+from tsfpga.compiled_library_cache import CompiledLibraryCache
+from tsfpga.system_utils import create_file
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CompiledLibraryCache(
+        cache_path=tmp_path / "cache",
+        simulator_name="ghdl",
+        simulator_version="GHDL 4.1.0",
+        vhdl_standard="2008",
+    )
+
+
+@pytest.fixture
+def libraries(tmp_path):
+    return {
+        "apa": [
+            create_file(
+                tmp_path / "apa" / "apa.vhd",
+                "library ieee;\nuse ieee.std_logic_1164.all;\n\nlibrary apa;\n\nentity apa is\n",
+            )
+        ],
+        "hest": [
+            create_file(
+                tmp_path / "hest" / "hest.vhd",
+                "library IEEE, apa;\nuse apa.apa_pkg.all;\n\nentity hest is\n",
+            ),
+            create_file(tmp_path / "hest" / "hest.v", "module hest;\n"),
+        ],
+        "zebra": [
+            create_file(
+                tmp_path / "zebra" / "zebra.vhd",
+                "-- library hest;\nlibrary unisim;\n\nentity zebra is\n",
+            )
+        ],
+    }
+
+
+def test_get_keys(cache, libraries):
+    keys = cache.get_keys(libraries=libraries)
+
+    assert set(keys.keys()) == {"apa", "hest", "zebra"}
+    assert all(key is not None for key in keys.values())
+    assert len(set(keys.values())) == 3
+
+    assert cache.get_keys(libraries=libraries) == keys
+
+
+def test_changed_file_should_change_key_of_library_and_of_libraries_that_use_it(cache, libraries):
+    keys = cache.get_keys(libraries=libraries)
+
+    create_file(libraries["apa"][0], "library ieee;\n\nentity apa is -- Changed.\n")
+    new_keys = cache.get_keys(libraries=libraries)
+
+    assert new_keys["apa"] != keys["apa"]
+    assert new_keys["hest"] != keys["hest"]
+    # Uses "hest" only in a comment.
+    assert new_keys["zebra"] == keys["zebra"]
+
+
+def test_different_simulator_version_or_compile_options_should_change_key(
+    cache, libraries, tmp_path
+):
+    key = cache.get_keys(libraries=libraries)["apa"]
+
+    other_cache = CompiledLibraryCache(
+        cache_path=tmp_path / "cache",
+        simulator_name="ghdl",
+        simulator_version="GHDL 5.0.0",
+        vhdl_standard="2008",
+    )
+    assert other_cache.get_keys(libraries=libraries)["apa"] != key
+
+    other_cache = CompiledLibraryCache(
+        cache_path=tmp_path / "cache",
+        simulator_name="ghdl",
+        simulator_version="GHDL 4.1.0",
+        vhdl_standard="2008",
+        compile_options={"ghdl.a_flags": ["-frelaxed"]},
+    )
+    assert other_cache.get_keys(libraries=libraries)["apa"] != key
+
+
+def test_library_that_uses_uncached_library_should_have_no_key(cache, libraries):
+    keys = cache.get_keys(libraries=libraries, uncached_library_names=["APA"])
+
+    assert keys["apa"] is not None
+    assert keys["hest"] is None
+    assert keys["zebra"] is not None
+
+
+def test_libraries_that_use_each_other_should_have_no_key(cache, libraries):
+    create_file(libraries["apa"][0], "library hest;\n\nentity apa is\n")
+    keys = cache.get_keys(libraries=libraries)
+
+    assert keys["apa"] is None
+    assert keys["hest"] is None
+    assert keys["zebra"] is not None
+
+
+def test_external_library_key_should_change_key_of_libraries_that_use_it(cache, libraries):
+    keys = cache.get_keys(libraries=libraries)
+    simlib_keys = cache.get_keys(
+        libraries=libraries, external_library_keys={"UNISIM": "vivado-simlib-1"}
+    )
+
+    assert simlib_keys["apa"] == keys["apa"]
+    assert simlib_keys["zebra"] != keys["zebra"]
+    assert (
+        cache.get_keys(libraries=libraries, external_library_keys={"unisim": "vivado-simlib-2"})[
+            "zebra"
+        ]
+        != simlib_keys["zebra"]
+    )
+
+
+def test_moved_files_should_change_key_only_for_ghdl(cache, libraries, tmp_path):
+    moved_libraries = {"apa": [create_file(tmp_path / "moved" / "apa.vhd", "library ieee;\n")]}
+    create_file(libraries["apa"][0], "library ieee;\n")
+
+    assert (
+        cache.get_keys(libraries=moved_libraries)["apa"]
+        != cache.get_keys(libraries={"apa": libraries["apa"]})["apa"]
+    )
+
+    nvc_cache = CompiledLibraryCache(
+        cache_path=tmp_path / "cache",
+        simulator_name="nvc",
+        simulator_version="nvc 1.13.0",
+        vhdl_standard="2008",
+    )
+    assert (
+        nvc_cache.get_keys(libraries=moved_libraries)["apa"]
+        == nvc_cache.get_keys(libraries={"apa": libraries["apa"]})["apa"]
+    )
@@ -0,0 +1,199 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from unittest.mock import patch
+
+import pytest
+
+from tsfpga import memory_init_file
+from tsfpga.memory_init_file import MemoryInitFileFormat, write_memory_init_file
+from tsfpga.system_utils import read_file
+
+
+@pytest.fixture(params=["numpy", "scalar"])
+def write(request):
+    """
+    Run each test with and without the vectorized implementation that uses numpy.
+    """
+    if request.param == "numpy":
+        numpy = pytest.importorskip("numpy")
+
+        def write_numpy(words, **kwargs):
+            return write_memory_init_file(words=numpy.array(words, dtype=numpy.uint64), **kwargs)
+
+        yield write_numpy
+    else:
+        with patch("tsfpga.memory_init_file._import_numpy", return_value=None):
+            yield write_memory_init_file
+
+
+def test_mem(write, tmp_path):
+    file = write(file=tmp_path / "data.mem", words=[0, 60, 4095], word_width=12)
+    assert read_file(file) == "000\n03C\nFFF\n"
+
+
+def test_mem_with_width_not_multiple_of_four(write, tmp_path):
+    file = write(file=tmp_path / "data.mem", words=[0, 60, 511], word_width=9)
+    assert read_file(file) == "000\n03C\n1FF\n"
+
+
+def test_binary(write, tmp_path):
+    file = write(
+        file=tmp_path / "data.txt",
+        words=[0, 37, 63],
+        word_width=6,
+        file_format=MemoryInitFileFormat.BINARY,
+    )
+    assert read_file(file) == "000000\n100101\n111111\n"
+
+
+def test_coe(write, tmp_path):
+    file = write(file=tmp_path / "data.coe", words=[1, 2, 255], word_width=8)
+    expected = """\
+memory_initialization_radix=16;
+memory_initialization_vector=
+01,
+02,
+FF;
+"""
+    assert read_file(file) == expected
+
+
+def test_mif(write, tmp_path):
+    file = write(file=tmp_path / "data.mif", words=[1, 2, 255], word_width=8)
+    expected = """\
+WIDTH=8;
+DEPTH=3;
+
+ADDRESS_RADIX=HEX;
+DATA_RADIX=HEX;
+
+CONTENT BEGIN
+\t0 : 01;
+\t1 : 02;
+\t2 : FF;
+END;
+"""
+    assert read_file(file) == expected
+
+
+def test_64_bit_words(write, tmp_path):
+    words = [0, 2**63, 2**64 - 1]
+
+    file = write(file=tmp_path / "data.mem", words=words, word_width=64)
+    assert read_file(file) == "0000000000000000\n8000000000000000\nFFFFFFFFFFFFFFFF\n"
+
+    file = write(
+        file=tmp_path / "data.txt",
+        words=words,
+        word_width=64,
+        file_format=MemoryInitFileFormat.BINARY,
+    )
+    assert read_file(file).split("\n") == ["0" * 64, "1" + "0" * 63, "1" * 64, ""]
+
+
+def test_many_words_in_many_chunks(write, tmp_path):
+    depth = 1000
+    words = [(index * 7919) % 2**20 for index in range(depth)]
+
+    with patch("tsfpga.memory_init_file._CHUNK_SIZE", 64):
+        mif = write(file=tmp_path / "data.mif", words=words, word_width=20)
+        coe = write(file=tmp_path / "data.coe", words=words, word_width=20)
+
+    mif_lines = read_file(mif).split("\n")
+    assert len(mif_lines) == 7 + depth + 2
+    assert mif_lines[7] == "\t000 : 00000;"
+    assert mif_lines[7 + 999] == f"\t3E7 : {words[999]:05X};"
+
+    coe_lines = read_file(coe).split("\n")
+    assert coe_lines[2:-1] == [f"{word:05X}," for word in words[:-1]] + [f"{words[-1]:05X};"]
+
+
+def test_out_of_range_word_should_raise_exception_and_not_write_file(write, tmp_path):
+    file = tmp_path / "data.mem"
+
+    with pytest.raises(ValueError) as exception_info:
+        write(file=file, words=[0, 16, 300, 256], word_width=8)
+    assert str(exception_info.value) == 'Value "300" out of 8-bit range.'
+
+    assert not file.exists()
+
+
+def test_invalid_word_width_should_raise_exception(write, tmp_path):
+    with pytest.raises(ValueError) as exception_info:
+        write(file=tmp_path / "data.mem", words=[0], word_width=0)
+    assert str(exception_info.value) == 'Invalid word width "0".'
+
+
+def test_unknown_file_ending_should_raise_exception(write, tmp_path):
+    file = tmp_path / "data.txt"
+
+    with pytest.raises(ValueError) as exception_info:
+        write(file=file, words=[0], word_width=8)
+    assert str(exception_info.value) == f"Can not deduce memory initialization file format: {file}"
+
+
+def test_negative_word_should_raise_exception(tmp_path):
+    with pytest.raises(ValueError) as exception_info:
+        write_memory_init_file(file=tmp_path / "data.mem", words=[3, -1], word_width=8)
+    assert str(exception_info.value) == 'Value "-1" out of 8-bit range.'
+
+
+def test_empty_data_should_raise_exception(tmp_path):
+    with pytest.raises(ValueError) as exception_info:
+        write_memory_init_file(file=tmp_path / "data.mem", words=[], word_width=8)
+    assert str(exception_info.value) == (
+        "Can not write memory initialization file without data words."
+    )
+
+
+def test_words_wider_than_64_bits(tmp_path):
+    file = write_memory_init_file(
+        file=tmp_path / "data.mem", words=[2**64, 2**65 - 1, 1], word_width=65
+    )
+    assert read_file(file) == "10000000000000000\n1FFFFFFFFFFFFFFFF\n00000000000000001\n"
+
+
+def test_non_integer_word_should_raise_exception(tmp_path):
+    with pytest.raises(TypeError):
+        write_memory_init_file(file=tmp_path / "data.mem", words=[1.5], word_width=8)
+
+
+def test_numpy_signed_array(tmp_path):
+    numpy = pytest.importorskip("numpy")
+
+    file = write_memory_init_file(
+        file=tmp_path / "data.mem", words=numpy.array([0, 1, 127], dtype=numpy.int8), word_width=7
+    )
+    assert read_file(file) == "00\n01\n7F\n"
+
+    with pytest.raises(ValueError) as exception_info:
+        write_memory_init_file(
+            file=tmp_path / "data.mem",
+            words=numpy.array([0, -2], dtype=numpy.int16),
+            word_width=7,
+        )
+    assert str(exception_info.value) == 'Value "-2" out of 7-bit range.'
+
+
+def test_numpy_result_is_same_as_scalar(tmp_path):
+    numpy = pytest.importorskip("numpy")
+
+    words = numpy.random.default_rng(seed=0).integers(0, 2**33, size=5000, dtype=numpy.uint64)
+
+    for file_format in MemoryInitFileFormat:
+        vectorized = write_memory_init_file(
+            file=tmp_path / "vectorized", words=words, word_width=33, file_format=file_format
+        )
+
+        with patch.object(memory_init_file, "_import_numpy", return_value=None):
+            scalar = write_memory_init_file(
+                file=tmp_path / "scalar", words=words, word_width=33, file_format=file_format
+            )
+
+        assert read_file(vectorized) == read_file(scalar)
@@ -0,0 +1,147 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from unittest.mock import patch
+
+import pytest
+from hdl_registers.generator.c.header import CHeaderGenerator
+from hdl_registers.generator.html.page import HtmlPageGenerator
+from hdl_registers.generator.vhdl.register_package import VhdlRegisterPackageGenerator
+from hdl_registers.register_list import RegisterList
+from hdl_registers.register_modes import REGISTER_MODES
+
+from tsfpga import register_artifact_cache
+from tsfpga.register_artifact_cache import RegisterArtifactCache
+from tsfpga.system_utils import create_file, read_file
+
+
+def get_register_list(name, register_name="config"):
+    register_list = RegisterList(name=name)
+    register_list.append_register(
+        name=register_name, mode=REGISTER_MODES["r_w"], description="Configuration."
+    )
+    return register_list
+
+
+def mock_run_generator(generator, register_list, output_folder):  # noqa: ARG001
+    create_file(output_folder / f"{register_list.name}.txt")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RegisterArtifactCache(
+        cache_path=tmp_path / "cache", generators={CHeaderGenerator: "c", HtmlPageGenerator: "html"}
+    )
+
+
+def test_create(cache, tmp_path):
+    cache.create(
+        register_lists=[get_register_list("apa"), get_register_list("hest")],
+        output_path=tmp_path / "output",
+    )
+
+    for name in ["apa", "hest"]:
+        assert f"{name.upper()}_CONFIG" in read_file(tmp_path / "output" / "c" / f"{name}_regs.h")
+        assert (tmp_path / "output" / "html" / f"{name}_regs.html").exists()
+
+
+def test_create_in_parallel(tmp_path):
+    # Generate in the shared process pool, which means that the real register lists and
+    # generators must survive pickling.
+    RegisterArtifactCache(
+        cache_path=tmp_path / "cache",
+        generators={CHeaderGenerator: "c", VhdlRegisterPackageGenerator: "vhdl"},
+    ).create(
+        register_lists=[
+            get_register_list("apa"),
+            get_register_list("hest"),
+            get_register_list("zebra", register_name="status"),
+        ],
+        output_path=tmp_path / "output",
+        parallel=True,
+    )
+
+    assert "APA_CONFIG" in read_file(tmp_path / "output" / "c" / "apa_regs.h")
+    assert "HEST_CONFIG" in read_file(tmp_path / "output" / "c" / "hest_regs.h")
+    assert "ZEBRA_STATUS" in read_file(tmp_path / "output" / "c" / "zebra_regs.h")
+    assert "zebra_status" in read_file(tmp_path / "output" / "vhdl" / "zebra_regs_pkg.vhd")
+
+
+def test_cached_register_list_should_not_be_generated_again(cache, tmp_path):
+    cache.create(register_lists=[get_register_list("apa")], output_path=tmp_path / "output_1")
+
+    with patch.object(
+        register_artifact_cache, "_run_generator", autospec=True, side_effect=mock_run_generator
+    ) as run_generator:
+        cache.create(
+            register_lists=[get_register_list("apa"), get_register_list("hest")],
+            output_path=tmp_path / "output_2",
+            parallel=False,
+        )
+
+    # Only the new register list, once for each generator.
+    assert run_generator.call_count == 2
+    assert all(call.args[1].name == "hest" for call in run_generator.call_args_list)
+
+    assert (tmp_path / "output_2" / "c" / "apa_regs.h").exists()
+    assert (tmp_path / "output_2" / "html" / "hest.txt").exists()
+
+
+def test_same_register_list_twice_should_be_generated_once(cache, tmp_path):
+    with patch.object(
+        register_artifact_cache, "_run_generator", autospec=True, side_effect=mock_run_generator
+    ) as run_generator:
+        cache.create(
+            register_lists=[get_register_list("apa"), get_register_list("apa")],
+            output_path=tmp_path / "output",
+            parallel=False,
+        )
+
+    assert run_generator.call_count == 2
+
+
+def test_changed_register_list_should_have_different_key(cache):
+    assert cache.get_key(get_register_list("apa")) == cache.get_key(get_register_list("apa"))
+    assert cache.get_key(get_register_list("apa")) != cache.get_key(
+        get_register_list("apa", register_name="status")
+    )
+
+
+def test_different_generators_should_have_different_key(cache, tmp_path):
+    other_cache = RegisterArtifactCache(
+        cache_path=tmp_path / "cache", generators={CHeaderGenerator: "c"}
+    )
+
+    register_list = get_register_list("apa")
+    assert cache.get_key(register_list) != other_cache.get_key(register_list)
+
+
+def test_artifacts_should_be_hard_linked_from_cache(cache, tmp_path):
+    register_list = get_register_list("apa")
+    cache.create(register_lists=[register_list], output_path=tmp_path / "output")
+
+    output_file = tmp_path / "output" / "c" / "apa_regs.h"
+    cache_file = cache.get_entry_path(key=cache.get_key(register_list)) / "c" / "apa_regs.h"
+    assert output_file.stat().st_ino == cache_file.stat().st_ino
+
+
+def test_create_over_existing_output_should_not_modify_cache(cache, tmp_path):
+    register_list = get_register_list("apa")
+    cache.create(register_lists=[register_list], output_path=tmp_path / "output")
+
+    output_file = tmp_path / "output" / "c" / "apa_regs.h"
+    cache_file = cache.get_entry_path(key=cache.get_key(register_list)) / "c" / "apa_regs.h"
+    contents = read_file(cache_file)
+
+    # Replace the hard link with a separate file, and then create on top of it.
+    output_file.unlink()
+    create_file(output_file, "apa")
+    cache.create(register_lists=[register_list], output_path=tmp_path / "output")
+
+    assert read_file(cache_file) == contents
+    assert read_file(output_file) == contents
@@ -0,0 +1,94 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+import pytest
+
+from tsfpga.simulation_timing_history import SimulationTimingHistory
+from tsfpga.system_utils import create_file
+
+
+def test_write_and_read(tmp_path):
+    file = tmp_path / "history.json"
+
+    history = SimulationTimingHistory(file=file)
+    assert history.times == {}
+
+    history.update(times={"lib.tb_apa.test_a": 1.5, "lib.tb_apa.test_b": 2.0})
+    history.update(times={"lib.tb_apa.test_b": 3.0})
+    history.write(file=file)
+
+    assert SimulationTimingHistory(file=file).times == {
+        "lib.tb_apa.test_a": 1.5,
+        "lib.tb_apa.test_b": 3.0,
+    }
+    assert [path.name for path in tmp_path.iterdir()] == ["history.json"]
+
+
+def test_merge_should_keep_history_of_test_cases_that_were_not_run(tmp_path):
+    file = tmp_path / "history.json"
+    history = SimulationTimingHistory()
+    history.update(times={"apa": 1.0, "hest": 2.0, "zebra": 3.0})
+    history.write(file=file)
+
+    shard_files = [tmp_path / "shard_1.json", tmp_path / "shard_2.json", tmp_path / "shard_3.json"]
+    for shard_file, times in zip(shard_files[:2], [{"apa": 4.0}, {"hest": 5.0}], strict=True):
+        shard_history = SimulationTimingHistory()
+        shard_history.update(times=times)
+        shard_history.write(file=shard_file)
+
+    history = SimulationTimingHistory(file=file)
+    history.merge(files=shard_files)
+
+    assert history.times == {"apa": 4.0, "hest": 5.0, "zebra": 3.0}
+
+
+def test_history_with_other_format_version_should_be_ignored(tmp_path):
+    file = create_file(tmp_path / "history.json", '{"format_version": 0, "times": {"apa": 1.0}}')
+    assert SimulationTimingHistory(file=file).times == {}
+
+
+def test_get_shards_without_history_should_balance_number_of_test_cases(tmp_path):
+    history = SimulationTimingHistory(file=tmp_path / "history.json")
+    shards = history.get_shards(test_names=[f"test_{index}" for index in range(10)], num_shards=3)
+
+    assert sorted(len(shard) for shard in shards) == [3, 3, 4]
+    assert sorted(name for shard in shards for name in shard) == sorted(
+        f"test_{index}" for index in range(10)
+    )
+
+
+def test_get_shards_should_balance_run_time():
+    history = SimulationTimingHistory()
+    history.update(times={"a": 10.0, "b": 6.0, "c": 5.0, "d": 4.0, "e": 1.0})
+
+    shards = history.get_shards(test_names=["a", "b", "c", "d", "e", "f"], num_shards=2)
+
+    # "f" has no history, and is assumed to take the average time of the others.
+    assert shards == [["a", "c", "e"], ["b", "f", "d"]]
+
+
+def test_get_shards_should_not_depend_on_test_name_order():
+    history = SimulationTimingHistory()
+    history.update(times={"a": 2.0, "b": 2.0, "c": 2.0})
+
+    assert history.get_shards(test_names=["c", "b", "a", "d"], num_shards=3) == history.get_shards(
+        test_names=["a", "b", "c", "d"], num_shards=3
+    )
+
+
+def test_get_shards_with_more_shards_than_test_cases(tmp_path):
+    history = SimulationTimingHistory(file=tmp_path / "history.json")
+    assert history.get_shards(test_names=["a"], num_shards=3) == [["a"], [], []]
+
+
+def test_get_shards_with_bad_number_of_shards_should_raise_exception(tmp_path):
+    history = SimulationTimingHistory(file=tmp_path / "history.json")
+
+    with pytest.raises(ValueError) as exception_info:
+        history.get_shards(test_names=["a"], num_shards=0)
+    assert str(exception_info.value) == "Got bad number of shards: 0"
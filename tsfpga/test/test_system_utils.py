@@ -6,16 +6,22 @@
 # https://github.com/tsfpga/tsfpga
 # --------------------------------------------------------------------------------------------------
 
+import os
 import subprocess
+import sys
+import zipfile
 from pathlib import Path
 
 import pytest
 
 from tsfpga.system_utils import (
+    calculate_file_hash,
     create_directory,
     create_file,
+    create_zip_file,
     delete,
     file_is_in_directory,
+    file_lock,
     path_relative_to,
     prepend_file,
     read_file,
@@ -173,6 +179,123 @@ def test_prepend_file_with_empty_file(tmp_path):
     assert read_file(prepend_file(file_path=create_file(tmp_path / "data.txt"), text="a")) == "a"
 
 
+def test_calculate_file_hash(tmp_path):
+    apa = create_file(tmp_path / "apa.txt", contents="apa")
+    hest = create_file(tmp_path / "hest.txt", contents="hest")
+    zebra = create_file(tmp_path / "zebra.txt", contents="apa")
+
+    assert calculate_file_hash(apa) == calculate_file_hash(zebra)
+    assert calculate_file_hash(apa) != calculate_file_hash(hest)
+    assert calculate_file_hash(apa) == (
+        "b3e1886e6a0073cfe52722c15ad6639e8143690c2769a2eed2cfb01044debfe6"
+    )
+
+
+def test_create_zip_file(tmp_path):
+    text_file = create_file(tmp_path / "apa.txt", "apa\n" * 1000)
+    random_file = tmp_path / "hest.bit"
+    random_file.write_bytes(os.urandom(10000))
+    create_file(tmp_path / "folder" / "zebra.txt", "zebra")
+    create_file(tmp_path / "folder" / "sub" / "foo.txt", "foo")
+
+    zip_file = create_zip_file(
+        file=tmp_path / "output" / "release.zip",
+        contents={
+            "apa.txt": text_file,
+            "bitstream/hest.bit": random_file,
+            "registers": tmp_path / "folder",
+        },
+    )
+
+    with zipfile.ZipFile(zip_file) as zip_handle:
+        infos = {info.filename: info for info in zip_handle.infolist()}
+        assert list(infos) == [
+            "apa.txt",
+            "bitstream/hest.bit",
+            "registers/sub/foo.txt",
+            "registers/zebra.txt",
+        ]
+
+        # Text compresses well. Random data does not.
+        assert infos["apa.txt"].compress_type == zipfile.ZIP_DEFLATED
+        assert infos["bitstream/hest.bit"].compress_type == zipfile.ZIP_STORED
+
+        assert zip_handle.read("bitstream/hest.bit") == random_file.read_bytes()
+        assert zip_handle.read("registers/sub/foo.txt") == b"foo"
+
+    assert [path.name for path in (tmp_path / "output").iterdir()] == ["release.zip"]
+
+
+def test_create_zip_file_should_store_already_compressed_file_endings(tmp_path):
+    xsa_file = create_file(tmp_path / "apa.xsa", "apa\n" * 1000)
+
+    zip_file = create_zip_file(file=tmp_path / "release.zip", contents={"apa.xsa": xsa_file})
+
+    with zipfile.ZipFile(zip_file) as zip_handle:
+        assert zip_handle.getinfo("apa.xsa").compress_type == zipfile.ZIP_STORED
+
+
+@pytest.mark.skipif(system_is_windows(), reason="Shared locks are not supported on Windows")
+def test_file_lock(tmp_path):
+    lock_file = tmp_path / "locks" / "apa.lock"
+
+    def try_lock(shared):
+        # Run in a separate process, since the lock is held per process.
+        # Exits with a non-zero code if the lock can not be acquired straight away.
+        lock = "fcntl.LOCK_SH" if shared else "fcntl.LOCK_EX"
+        return subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                f"import fcntl; f = open('{lock_file}'); fcntl.flock(f, {lock} | fcntl.LOCK_NB)",
+            ],
+            check=False,
+        ).returncode
+
+    with file_lock(lock_file) as path:
+        assert path == lock_file
+        assert lock_file.exists()
+
+        assert try_lock(shared=True) != 0
+        assert try_lock(shared=False) != 0
+
+    assert try_lock(shared=False) == 0
+
+    with file_lock(lock_file, shared=True):
+        assert try_lock(shared=True) == 0
+        assert try_lock(shared=False) != 0
+
+
+@pytest.mark.skipif(system_is_windows(), reason="Shared locks are not supported on Windows")
+def test_file_lock_non_blocking(tmp_path):
+    lock_file = tmp_path / "apa.lock"
+
+    # Hold the lock in a separate process, since the lock is held per process.
+    with subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            (
+                f"import fcntl, sys; f = open('{lock_file}', 'a'); fcntl.flock(f, fcntl.LOCK_EX); "
+                "print('locked', flush=True); sys.stdin.read()"
+            ),
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    ) as process:
+        assert process.stdout.readline() == "locked\n"
+
+        with pytest.raises(BlockingIOError), file_lock(lock_file, blocking=False):
+            pass
+
+        process.stdin.close()
+        process.wait()
+
+    with file_lock(lock_file, blocking=False):
+        pass
+
+
 def test_run_command_called_with_nonexisting_binary_should_raise_exception():
     cmd = ["/apa/hest/zebra.exe", "foobar"]
     with pytest.raises(FileNotFoundError):
@@ -0,0 +1,89 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class BitstreamVariant:
+    """
+    A variant of a bitstream, that differs from the implemented design only in the contents of
+    one or more block RAMs.
+    E.g. a different firmware image or lookup table.
+
+    The variant bitstream is produced with ``updatemem`` from the bitstream of the
+    implemented design, so no further synthesis or implementation is needed.
+    """
+
+    def __init__(self, name: str, memory_data: dict[str, Path]) -> None:
+        """
+        Arguments:
+            name: Name of the variant.
+                Is used as a folder name for the variant's artifacts, so should only contain
+                characters that are valid in a file name.
+            memory_data: The data to load into each memory.
+                Key is the instance path of the memory, as it appears in the memory information
+                (``.mmi``) file written by ``write_mem_info``.
+                E.g. ``"system_i/microblaze_0"`` for a MicroBlaze processor, or the instance path
+                of an ``xpm_memory`` instance.
+                Value is a path to a ``.mem`` or ``.elf`` file with the data.
+        """
+        self.name = name
+        self.memory_data = memory_data.copy()
+
+    def get_output_path(self, output_path: Path) -> Path:
+        """
+        Arguments:
+            output_path: The output path of the project build.
+
+        Return:
+            Where the artifacts of this variant are placed.
+        """
+        return output_path / self.name
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}:{self.name}:{self.memory_data}"
+
+
+def write_bin_file(bit_file: Path, bin_file: Path) -> None:
+    """
+    Write the configuration data of a bitstream to a ``.bin`` file, without the header of the
+    ``.bit`` file.
+    Gives the same result as the ``-bin_file`` argument to ``write_bitstream``.
+
+    Arguments:
+        bit_file: The bitstream to read.
+        bin_file: Path where the result will be written.
+    """
+    data = bit_file.read_bytes()
+
+    # The header starts with a field of its own length, followed by a two-byte field.
+    # After that come fields with a one-byte key and a two-byte length.
+    # The last one has key 'e' and a four-byte length, and holds the configuration data.
+    index = 2 + int.from_bytes(data[0:2], "big") + 2
+    while index < len(data):
+        key = data[index : index + 1]
+        index += 1
+
+        if key == b"e":
+            length = int.from_bytes(data[index : index + 4], "big")
+            index += 4
+
+            if index + length > len(data):
+                break
+
+            bin_file.write_bytes(data[index : index + length])
+            return
+
+        index += 2 + int.from_bytes(data[index : index + 2], "big")
+
+    raise ValueError(f"Could not find configuration data in bitstream: {bit_file}")
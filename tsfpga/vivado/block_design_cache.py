@@ -0,0 +1,60 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+import tsfpga
+from tsfpga.directory_cache import DirectoryCache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class BlockDesignCache(DirectoryCache):
+    """
+    A content-addressed cache of block designs with generated output products.
+
+    Each entry in the cache is a copy of a remote block design folder, containing the ``.bd`` file
+    as well as all the output products from ``generate_target``.
+    The entry is stored in a folder named after a hash of the block design TCL script, the part
+    and the Vivado version.
+    A project that uses the same block design TCL script can add the cached block design instead
+    of sourcing the script, and does not have to generate the output products again.
+
+    Note that any IP repository paths, board settings, etc, that the block design depends on
+    and that are set up outside of the block design script, are not part of the key.
+    """
+
+    _description = "block design"
+
+    # The version of the cache format.
+    # Can be bumped to invalidate all existing entries, if e.g. the folder structure is changed.
+    _format_version_id = 1
+
+    def get_key(self, tcl_file: Path, part: str, vivado_version: str) -> str:
+        """
+        Calculate a key that is unique for the given block design.
+
+        Arguments:
+            tcl_file: The TCL script that creates the block design.
+            part: The part that the block design is generated for.
+            vivado_version: The version of the Vivado installation that generates the block design.
+
+        Return:
+            A hexadecimal hash string.
+        """
+        data = f"format: {self._format_version_id}\n"
+        data += f"tsfpga: {tsfpga.__version__}\n"
+        data += f"vivado: {vivado_version}\n"
+        data += f"part: {part}\n"
+        data += f"tcl_file: {self._get_file_data(tcl_file)}\n"
+
+        return hashlib.sha256(data.encode()).hexdigest()
@@ -29,6 +29,10 @@ class BuildResult:
         logic_level_distribution (str): A table with logic level distribution as reported by Vivado.
             Will be ``None`` for non-netlist builds.
             Will be ``None`` if synthesis failed or did not run.
+        incremental_reuse (`dict`): A dictionary with the percentage of cells, nets, etc, that
+            were reused from the reference checkpoint by incremental implementation.
+            Will be ``None`` if the build did not use incremental implementation with a
+            reference checkpoint.
     """
 
     def __init__(self, name: str, synthesis_run_name: str) -> None:
@@ -51,6 +55,8 @@ class BuildResult:
 
         self.maximum_synthesis_frequency_hz: float | None = None
 
+        self.incremental_reuse: dict[str, float] | None = None
+
     def size_summary(self) -> str | None:
         """
         Return a string with a formatted message of the size.
@@ -102,6 +108,11 @@ class BuildResult:
         if self.logic_level_distribution:
             result += f"\nLogic level distribution:\n{self.logic_level_distribution}"
 
+        if self.incremental_reuse:
+            result += "\nIncremental implementation reuse:"
+            for key, value in self.incremental_reuse.items():
+                result += f"\n - {key}: {value:.2f}%"
+
         return result
 
     @property
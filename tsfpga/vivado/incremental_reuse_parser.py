@@ -0,0 +1,60 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+
+class IncrementalReuseParser:
+    """
+    Used for parsing the ``report_incremental_reuse`` report generated by Vivado.
+
+    This code is very hard coded for how the report and table is formatted. See the unit tests
+    for examples of this formatting.
+    """
+
+    @staticmethod
+    def get_reuse_summary(report: str) -> dict[str, float]:
+        """
+        Takes a report as a string and returns the reuse percentage for each object type
+        (cells, nets, etc.) in the "Reuse Summary" table.
+
+        Arguments:
+            report: A string containing the entire Vivado ``report_incremental_reuse`` report.
+
+        Return:
+            The reuse percentage for each object type.
+            Empty if the report does not contain a reuse summary.
+        """
+        result: dict[str, float] = {}
+        headers: list[str] | None = None
+
+        for line in report.split("\n"):
+            if not line.startswith("|"):
+                if result:
+                    # Reached the end of the table.
+                    break
+
+                continue
+
+            # First and last items are empty, due to leading and trailing "|" in the table.
+            columns = [column.strip() for column in line.split("|")[1:-1]]
+
+            if headers is None:
+                if columns and columns[0] == "Type" and any("Reuse" in item for item in columns):
+                    headers = columns
+
+                continue
+
+            reuse = columns[next(idx for idx, item in enumerate(headers) if "Reuse" in item)]
+            try:
+                result[columns[0]] = float(reuse)
+            except ValueError:
+                # Not applicable for this object type (marked with "-").
+                continue
+
+        return result
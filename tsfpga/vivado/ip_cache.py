@@ -0,0 +1,309 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import TYPE_CHECKING
+
+import tsfpga
+from tsfpga.system_utils import calculate_file_hash, create_file, delete, file_lock, read_file
+
+from .common import get_vivado_version, run_vivado_tcl
+from .tcl import VivadoTcl
+
+if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
+    from pathlib import Path
+
+    from tsfpga.ip_core_file import IpCoreFile
+
+    from .project import VivadoProject
+
+
+class IpCacheEntry:
+    """
+    An entry in the Vivado IP cache, i.e. one synthesized IP core configuration.
+
+    Attributes:
+        path (pathlib.Path): The folder of the entry.
+        size (int): Total size of the files in the entry, in bytes.
+        last_use (float): Time of the latest use of the entry, in seconds since the epoch.
+            Is the newest access or modification time of any file in the entry.
+    """
+
+    def __init__(self, path: Path, size: int, last_use: float) -> None:
+        self.path = path
+        self.size = size
+        self.last_use = last_use
+
+    def __str__(self) -> str:
+        return f"{self.path.name} {self.size} {self.last_use}"
+
+
+class VivadoIpCache:
+    """
+    Handle a Vivado IP cache folder that is shared between many projects.
+
+    Can pre-warm the cache, i.e. synthesize each unique IP core configuration exactly once before
+    the projects are built.
+    Otherwise, projects that are built in parallel would all miss the cache at the same time,
+    and synthesize the same IP cores over and over again.
+
+    Writes to the cache are guarded by a lock file, so that the cache can be used safely by many
+    processes at the same time.
+    Pre-warming and pruning hold the lock exclusively.
+    Processes that create or build projects, where Vivado might write to the cache, shall hold
+    a shared :meth:`.lock` meanwhile.
+
+    The size of the cache can be limited with :meth:`.prune`, which removes the least recently
+    used entries.
+    Processes that use the cache, e.g. for creating and building projects, shall do so within
+    :meth:`.use`, so that no entries are removed while they are in use.
+    """
+
+    # The version of the pre-warm key format.
+    # Can be bumped to pre-warm all IP cores again, if e.g. the key calculation is changed.
+    _format_version_id = 1
+
+    def __init__(self, cache_path: Path) -> None:
+        """
+        Arguments:
+            cache_path: Path to the Vivado IP cache folder.
+                Is the same path that is given as ``ip_cache_path`` to
+                :meth:`.VivadoProject.create`.
+        """
+        self.cache_path = cache_path.resolve()
+
+        self._lock_file = self.cache_path / "tsfpga_ip_cache.lock"
+        self._usage_lock_file = self.cache_path / "tsfpga_ip_cache_usage.lock"
+        self._pre_warmed_file = self.cache_path / "tsfpga_ip_cache_pre_warmed.json"
+
+    def lock(self, shared: bool = False) -> AbstractContextManager[Path]:
+        """
+        Lock the cache for the duration of a ``with`` block.
+
+        Arguments:
+            shared: Acquire a shared lock, which can be held by many processes that use the cache
+                at the same time, instead of an exclusive lock.
+        """
+        return file_lock(file=self._lock_file, shared=shared)
+
+    def use(self) -> AbstractContextManager[Path]:
+        """
+        Mark the cache as being in use for the duration of a ``with`` block.
+        Many processes can use the cache at the same time, but :meth:`.prune` will wait until no
+        process is using it.
+        """
+        return file_lock(file=self._usage_lock_file, shared=True)
+
+    def get_entries(self) -> list[IpCacheEntry]:
+        """
+        Get the entries in the cache.
+
+        Return:
+            All entries, with the least recently used first.
+        """
+        if not self.cache_path.exists():
+            return []
+
+        result = []
+        for path in self.cache_path.iterdir():
+            if not path.is_dir():
+                continue
+
+            size = 0
+            last_use = path.stat().st_mtime
+            for file in path.rglob("*"):
+                if file.is_file():
+                    stat = file.stat()
+                    size += stat.st_size
+                    last_use = max(last_use, stat.st_atime, stat.st_mtime)
+
+            result.append(IpCacheEntry(path=path, size=size, last_use=last_use))
+
+        return sorted(result, key=lambda entry: entry.last_use)
+
+    def prune(self, max_size: int, wait: bool = True) -> list[IpCacheEntry] | None:
+        """
+        Remove the least recently used entries from the cache, until the total size of the
+        cache is at most the given size.
+        Nothing is removed while another process is using the cache.
+
+        Arguments:
+            max_size: Maximum size of the cache, in bytes.
+            wait: If true, wait until no other process is using the cache.
+                If false, return straight away if the cache is in use.
+
+        Return:
+            The entries that were removed.
+            ``None`` if nothing was done since the cache is in use.
+        """
+        try:
+            with file_lock(file=self._usage_lock_file, shared=False, blocking=wait):
+                return self._prune(max_size=max_size)
+        except BlockingIOError:
+            return None
+
+    def _prune(self, max_size: int) -> list[IpCacheEntry]:
+        with self.lock():
+            entries = self.get_entries()
+            total_size = sum(entry.size for entry in entries)
+
+            removed = []
+            for entry in entries:
+                if total_size <= max_size:
+                    break
+
+                delete(entry.path)
+                total_size -= entry.size
+                removed.append(entry)
+
+            if removed:
+                # We do not know which pre-warmed configurations are in the removed entries.
+                # Forget all of them, so that they are pre-warmed again.
+                # The ones that are still in the cache will be cache hits.
+                delete(self._pre_warmed_file)
+
+        return removed
+
+    def get_key(self, ip_core_file: IpCoreFile, part: str, vivado_version: str) -> str:
+        """
+        Calculate a key that is unique for the given IP core configuration.
+
+        Arguments:
+            ip_core_file: The IP core.
+            part: The part that the IP core is synthesized for.
+            vivado_version: The version of the Vivado installation that synthesizes the IP core.
+
+        Return:
+            A hexadecimal hash string.
+        """
+        data = f"format: {self._format_version_id}\n"
+        data += f"tsfpga: {tsfpga.__version__}\n"
+        data += f"vivado: {vivado_version}\n"
+        data += f"part: {part}\n"
+        data += f"ip_core: {calculate_file_hash(ip_core_file.path)}\n"
+        data += f"variables: {json.dumps(ip_core_file.variables, sort_keys=True, default=str)}\n"
+
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def pre_warm(
+        self,
+        projects: list[VivadoProject],
+        project_path: Path,
+        num_jobs: int,
+        vivado_path: Path | None = None,
+    ) -> bool:
+        """
+        Synthesize all unique IP core configurations of the projects into the cache.
+        IP core configurations that have been pre-warmed before are skipped.
+
+        Should be called inside a :meth:`.use` block, so that the entries are not removed
+        before the projects use them.
+
+        Arguments:
+            projects: IP cores of these projects will be included.
+            project_path: The Vivado projects that synthesize the IP cores will be placed here.
+            num_jobs: The number of IP core synthesis runs that will be launched in parallel.
+            vivado_path: Path to Vivado executable.
+                Leave as ``None`` to use whatever is available in the system ``PATH``.
+
+        Return:
+            True if everything went well.
+        """
+        vivado_version = get_vivado_version(vivado_path)
+
+        with self.lock():
+            pre_warmed = self._read_pre_warmed()
+
+            configurations: dict[str, dict[str, IpCoreFile]] = {}
+            for project in projects:
+                for ip_core_file in project.get_ip_core_files():
+                    key = self.get_key(
+                        ip_core_file=ip_core_file, part=project.part, vivado_version=vivado_version
+                    )
+                    if key not in pre_warmed:
+                        configurations.setdefault(project.part, {})[key] = ip_core_file
+
+            project_index = 0
+            for part, part_configurations in configurations.items():
+                for layer in self._split_on_name(configurations=part_configurations):
+                    name = f"ip_cache_pre_warm_{project_index}"
+                    project_index += 1
+
+                    print(f"Pre-warming IP cache with {len(layer)} IP core(s) for {part}")
+                    if not self._run_pre_warm_project(
+                        name=name,
+                        project_path=project_path / name,
+                        part=part,
+                        ip_core_files=list(layer.values()),
+                        num_jobs=num_jobs,
+                        vivado_path=vivado_path,
+                    ):
+                        return False
+
+                    pre_warmed.update(layer)
+                    self._save_pre_warmed(pre_warmed=pre_warmed)
+
+        return True
+
+    @staticmethod
+    def _split_on_name(configurations: dict[str, IpCoreFile]) -> list[dict[str, IpCoreFile]]:
+        """
+        Split the configurations so that the same IP core file name appears only once in each
+        group.
+        Different configurations of the same IP core file will typically create IPs with the same
+        name, which can not be done in the same project.
+        """
+        layers: list[dict[str, IpCoreFile]] = []
+
+        for key, ip_core_file in configurations.items():
+            for layer in layers:
+                if ip_core_file.name not in [other.name for other in layer.values()]:
+                    layer[key] = ip_core_file
+                    break
+            else:
+                layers.append({key: ip_core_file})
+
+        return layers
+
+    def _run_pre_warm_project(
+        self,
+        name: str,
+        project_path: Path,
+        part: str,
+        ip_core_files: list[IpCoreFile],
+        num_jobs: int,
+        vivado_path: Path | None,
+    ) -> bool:
+        delete(project_path)
+
+        tcl = VivadoTcl(name=name).pre_warm_ip_cache(
+            project_folder=project_path,
+            part=part,
+            ip_core_files=ip_core_files,
+            ip_cache_path=self.cache_path,
+            num_jobs=num_jobs,
+        )
+        tcl_file = create_file(project_path / "pre_warm_ip_cache.tcl", tcl)
+
+        return run_vivado_tcl(vivado_path, tcl_file)
+
+    def _read_pre_warmed(self) -> set[str]:
+        if not self._pre_warmed_file.exists():
+            return set()
+
+        try:
+            return set(json.loads(read_file(self._pre_warmed_file)))
+        except json.JSONDecodeError:
+            return set()
+
+    def _save_pre_warmed(self, pre_warmed: set[str]) -> None:
+        create_file(self._pre_warmed_file, json.dumps(sorted(pre_warmed), indent=2))
@@ -10,7 +10,7 @@ from __future__ import annotations
 
 import hashlib
 import json
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from tsfpga.system_utils import create_file, delete, read_file
 
@@ -27,6 +27,8 @@ class VivadoIpCores:
     """
     Handle a list of IP core sources. Has a mechanism to detect whether a regenerate of IP files
     is needed.
+    The hash of each IP core file is tracked separately, so that a change in one IP core
+    will only regenerate that IP core in the existing project.
     """
 
     project_name = "vivado_ip_project"
@@ -53,7 +55,7 @@ class VivadoIpCores:
             VivadoIpCoreProject if vivado_project_class is None else vivado_project_class
         )
 
-        self._hash_file = self.project_directory / "ip_files_hash.txt"
+        self._hash_file = self.project_directory / "ip_files_hash.json"
 
         self._setup(modules=modules, vivado_project_class=vivado_project_class)
 
@@ -92,40 +94,85 @@ class VivadoIpCores:
         * and contents of these files,
 
         is the same then it will not create. But if anything is added or removed from the list,
-        or the contents of a TCL file is changed, there will be a recreation.
+        or the contents of a TCL file is changed, the project will be updated.
+
+        If the project exists, only the IP cores that have been added or changed will be
+        (re)created in the existing project, and the IPs of removed IP cores will be removed.
+        Otherwise, the whole project will be recreated.
 
         Return:
-            True if Vivado project was created. False otherwise.
+            True if Vivado project was created or updated, meaning that the compile order file
+            needs to be refreshed. False otherwise.
         """
-        if self._should_create():
+        saved_hash = self._read_hash()
+        if saved_hash is None or not self.compile_order_file.exists():
+            self.create_vivado_project()
+            return True
+
+        if {name: entry["hash"] for name, entry in saved_hash.items()} == self._hash:
+            return False
+
+        update = self._get_update(saved_hash=saved_hash)
+        if update is None:
             self.create_vivado_project()
             return True
 
-        return False
+        ip_core_files, remove_ips = update
+        self.update_vivado_project(ip_core_files=ip_core_files, remove_ips=remove_ips)
+
+        return True
+
+    def update_vivado_project(self, ip_core_files: list[IpCoreFile], remove_ips: list[str]) -> None:
+        """
+        Update the IP cores of the existing IP core Vivado project.
+
+        Arguments:
+            ip_core_files: IP core files that shall be (re)created.
+            remove_ips: Names of IPs that shall be removed before the IP core files are sourced.
+        """
+        print(
+            f"Updating {len(ip_core_files)} IP core(s) and removing {len(remove_ips)} IP(s) "
+            f"in {self.project_directory}"
+        )
+        delete(self._vivado_project.ip_core_ips_file(self.project_directory))
+
+        if not self._vivado_project.update_ip_cores(
+            project_path=self.project_directory,
+            ip_core_files=ip_core_files,
+            remove_ips=remove_ips,
+        ):
+            raise RuntimeError("Failed to update Vivado IP core project")
+
+        self._save_hash()
 
     def _setup(self, modules: ModuleList, vivado_project_class: type[VivadoIpCoreProject]) -> None:
         self._vivado_project = vivado_project_class(
             name=self.project_name, modules=modules, part=self._part_name
         )
 
-        ip_core_files = []
+        self._ip_core_files: dict[str, list[IpCoreFile]] = {}
         for module in modules:
             # Send the same two arguments that are sent in the VivadoProject create flow
-            ip_core_files += module.get_ip_core_files(generics={}, part=self._part_name)
+            for ip_core_file in module.get_ip_core_files(generics={}, part=self._part_name):
+                self._ip_core_files.setdefault(ip_core_file.name, []).append(ip_core_file)
 
-        self._hash = self._calculate_hash(ip_core_files)
+        self._hash = {
+            name: self._calculate_hash(ip_core_files)
+            for name, ip_core_files in self._ip_core_files.items()
+        }
 
     @staticmethod
     def _calculate_hash(ip_core_files: list[IpCoreFile]) -> str:
         """
-        A string with hashes of the different IP core files.
+        A hash of the IP core files with the same name.
+        Is typically only one file, unless the same file name is used in more than one module.
         """
         data = ""
 
-        def sort_by_file_name(ip_core_file: IpCoreFile) -> str:
-            return ip_core_file.path.name
+        def sort_by_path(ip_core_file: IpCoreFile) -> str:
+            return str(ip_core_file.path)
 
-        for ip_core_file in sorted(ip_core_files, key=sort_by_file_name):
+        for ip_core_file in sorted(ip_core_files, key=sort_by_path):
             data += f"{ip_core_file.path}\n"
 
             if ip_core_file.variables:
@@ -139,16 +186,75 @@ class VivadoIpCores:
                 ip_hash.update(file_handle.read())
                 data += f"{ip_hash.hexdigest()}\n"
 
-        return data
+        return hashlib.md5(data.encode()).hexdigest()  # noqa: S324
+
+    def _read_hash(self) -> dict[str, dict[str, Any]] | None:
+        if not self._hash_file.exists():
+            return None
+
+        try:
+            return json.loads(read_file(self._hash_file))
+        except json.JSONDecodeError:
+            return None
+
+    def _read_ip_core_ips(self) -> dict[str, list[str]]:
+        """
+        Read the names of the IPs that were created by each IP core file, as reported by Vivado
+        when the IP core files were sourced.
+        """
+        ip_core_ips_file = self._vivado_project.ip_core_ips_file(self.project_directory)
+        if not ip_core_ips_file.exists():
+            return {}
+
+        result = {}
+        for line in read_file(ip_core_ips_file).splitlines():
+            if line.strip():
+                name, *ips = line.split()
+                result[name] = ips
+
+        return result
 
     def _save_hash(self) -> None:
-        create_file(self._hash_file, self._hash)
+        """
+        Save the hash of each IP core, along with the names of the IPs it created.
+        The IP names will be ``None`` if they are not known, in which case a change in the IP core
+        will result in a complete recreate.
+        """
+        saved_hash = self._read_hash() or {}
+        ip_core_ips = self._read_ip_core_ips()
+
+        data = {}
+        for name, ip_hash in self._hash.items():
+            ips = ip_core_ips.get(name, saved_hash.get(name, {}).get("ips"))
+            data[name] = {"hash": ip_hash, "ips": ips}
+
+        create_file(self._hash_file, json.dumps(data, indent=2))
 
-    def _should_create(self) -> bool:
+    def _get_update(
+        self, saved_hash: dict[str, dict[str, Any]]
+    ) -> tuple[list[IpCoreFile], list[str]] | None:
         """
-        Return True if a Vivado project create is needed, i.e. if anything has changed.
+        Get the IP core files that shall be (re)created, and the IPs that shall be removed, in
+        order to bring the existing project up to date.
+
+        Return:
+            ``None`` if the project can not be updated, and must instead be recreated.
         """
-        if not (self._hash_file.exists() and self.compile_order_file.exists()):
-            return True
+        if not self.vivado_project_file.exists():
+            return None
+
+        ip_core_files = []
+        remove_ips = []
+
+        for name, entry in saved_hash.items():
+            if self._hash.get(name) != entry["hash"]:
+                if entry["ips"] is None:
+                    return None
+
+                remove_ips += entry["ips"]
+
+        for name, ip_hash in self._hash.items():
+            if name not in saved_hash or saved_hash[name]["hash"] != ip_hash:
+                ip_core_files += self._ip_core_files[name]
 
-        return read_file(self._hash_file) != self._hash
+        return ip_core_files, remove_ips
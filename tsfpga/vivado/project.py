@@ -9,6 +9,8 @@
 from __future__ import annotations
 
 import contextlib
+import hashlib
+import json
 import re
 import shutil
 from copy import deepcopy
@@ -19,20 +21,38 @@ from tsfpga import TSFPGA_TCL
 from tsfpga.build_step_tcl_hook import BuildStepTclHook
 from tsfpga.constraint import Constraint
 from tsfpga.hdl_file import HdlFile
-from tsfpga.system_utils import create_file, read_file
-
+from tsfpga.system_utils import (
+    calculate_file_hash,
+    create_directory,
+    create_file,
+    delete,
+    read_file,
+)
+
+from .bitstream_variant import BitstreamVariant, write_bin_file
+from .block_design_cache import BlockDesignCache
 from .build_result import BuildResult
-from .common import run_vivado_gui, run_vivado_tcl, to_tcl_path
+from .common import get_vivado_version, run_vivado_gui, run_vivado_tcl, to_tcl_path
 from .hierarchical_utilization_parser import HierarchicalUtilizationParser
+from .incremental_reuse_parser import IncrementalReuseParser
 from .logic_level_distribution_parser import LogicLevelDistributionParser
-from .tcl import VivadoTcl
+from .reconfigurable_partition import (
+    ReconfigurablePartition,
+    get_configuration_run_name,
+    get_configurations,
+)
+from .synthesis_checkpoint_cache import SynthesisCheckpointCache
+from .tcl import VIVADO_STRATEGIES, VivadoTcl
 from .timing_parser import FoundNoSlackError, TimingParser
 
 if TYPE_CHECKING:
+    from tsfpga.artifact_store import ArtifactStore
+    from tsfpga.ip_core_file import IpCoreFile
     from tsfpga.module_list import ModuleList
     from tsfpga.vivado.generics import BitVectorGenericValue, StringGenericValue
 
     from .build_result_checker import MaximumLogicLevel, SizeChecker
+    from .reconfigurable_partition import ReconfigurableModule
 
 
 class VivadoProject:
@@ -40,7 +60,7 @@ class VivadoProject:
     Used for handling a Xilinx Vivado HDL project
     """
 
-    def __init__(  # noqa: PLR0913
+    def __init__(  # noqa: C901, PLR0912, PLR0913
         self,
         name: str,
         modules: ModuleList,
@@ -54,6 +74,13 @@ class VivadoProject:
         vivado_path: Path | None = None,
         default_run_index: int = 1,
         impl_explore: bool = False,
+        impl_explore_strategies: list[str] | None = None,
+        impl_explore_terminate_runs: bool = True,
+        incremental_implementation: bool = False,
+        out_of_context_entities: list[str] | None = None,
+        block_designs: list[Path] | None = None,
+        bitstream_variants: list[BitstreamVariant] | None = None,
+        reconfigurable_partitions: list[ReconfigurablePartition] | None = None,
         defined_at: Path | None = None,
         **other_arguments: Any,  # noqa: ANN401
     ) -> None:
@@ -83,6 +110,12 @@ class VivadoProject:
                 * :class:`.StringGenericValue` (suitable for VHDL type ``string``).
             constraints: Constraints that will be applied to the project.
             tcl_sources: A list of TCL files. Use for e.g. block design, pinning, settings, etc.
+            block_designs: A list of TCL files that each create a block design.
+                Shall be scripts as generated by ``write_bd_tcl`` for a remote block design.
+                The block designs will be placed in the project folder.
+                Compared to adding the scripts to ``tcl_sources``, this enables caching of the
+                generated block design, see the ``block_design_cache_path`` argument
+                to :meth:`.create`.
             build_step_hooks: Build step hooks that will be applied to the project.
             vivado_path: A path to the Vivado executable.
                 If omitted, the default location from the system PATH will be used.
@@ -91,6 +124,56 @@ class VivadoProject:
                 Can also use the argument to :meth:`build() <VivadoProject.build>` to
                 specify at build-time.
             impl_explore: Run multiple implementation strategies in parallel.
+            impl_explore_strategies: Optional subset of the implementation strategies that shall be
+                used when ``impl_explore`` is enabled.
+                See ``VIVADO_STRATEGIES`` in :mod:`tsfpga.vivado.tcl` for available names.
+                If omitted, all strategies will be used.
+
+                The strategies are launched in order of how many times each one has been the
+                successful strategy in earlier builds of this project.
+                So that the most promising strategies get to run first.
+            impl_explore_terminate_runs: Stop all other runs that are in progress as soon as one
+                run has met timing, instead of waiting for them to finish.
+                Saves build time, but note that Vivado has been observed to leave zombie processes
+                when runs are stopped in some environments.
+                Set to ``False`` to wait for the runs instead.
+            incremental_implementation: Use Vivado incremental implementation, with the routed
+                checkpoint from the latest successful build of this project as reference.
+                Can save a lot of implementation time when only a small part of a large design
+                has changed since the last build.
+                If the reference checkpoint is not compatible with the current design,
+                the build falls back to a regular implementation run.
+                Can not be combined with ``impl_explore``.
+            out_of_context_entities: Names of entities that shall be synthesized out-of-context,
+                i.e. in separate synthesis runs that are launched in parallel before the top level
+                synthesis.
+                Suitable for large and stable parts of the design.
+                Note that out-of-context synthesis uses the default values of the
+                entity's generics.
+                When the ``synthesis_checkpoint_cache_path`` argument to :meth:`.build` is used,
+                the out-of-context checkpoints are cached separately from the top level.
+                So an entity that has not changed will not be synthesized again, even if other
+                parts of the design have changed.
+            bitstream_variants: Variants of the bitstream that differ only in block RAM
+                contents.
+                After implementation, the variant bitstreams are produced by updating the memory
+                contents in the bitstream of the implemented design.
+                So there is only one synthesis and implementation, regardless of the number
+                of variants.
+                The artifacts of each variant are placed in a sub-folder of the build output path,
+                see :meth:`.BitstreamVariant.get_output_path`.
+            reconfigurable_partitions: Partitions of the design that shall be reconfigurable,
+                using Dynamic Function eXchange (DFX).
+                Each reconfigurable module is synthesized out-of-context.
+                The full bitstream contains the first module of each partition.
+                The partial bitstreams of all modules are placed in a sub-folder of the build
+                output path, see :meth:`.ReconfigurablePartition.get_output_path`.
+
+                The modules that are not in the full bitstream are implemented in parallel runs,
+                on top of the locked static design.
+                If only such modules have changed since the latest successful build, the next
+                build will implement only the changed modules, and re-use the static design.
+                Can not be combined with ``impl_explore`` or ``incremental_implementation``.
             defined_at: Optional path to the file where you defined this project.
                 To get a useful ``build_fpga.py --list`` message. Is useful when you have many
                 projects set up.
@@ -120,10 +203,23 @@ class VivadoProject:
         self.static_generics = {} if generics is None else generics.copy()
         self.constraints = [] if constraints is None else constraints.copy()
         self.tcl_sources = [] if tcl_sources is None else tcl_sources.copy()
+        self.block_designs = [] if block_designs is None else block_designs.copy()
+        self.bitstream_variants = [] if bitstream_variants is None else bitstream_variants.copy()
+        self.reconfigurable_partitions = (
+            [] if reconfigurable_partitions is None else reconfigurable_partitions.copy()
+        )
         self.build_step_hooks = [] if build_step_hooks is None else build_step_hooks.copy()
         self._vivado_path = vivado_path
         self.default_run_index = default_run_index
         self.impl_explore = impl_explore
+        self.impl_explore_strategies = (
+            None if impl_explore_strategies is None else impl_explore_strategies.copy()
+        )
+        self.impl_explore_terminate_runs = impl_explore_terminate_runs
+        self.incremental_implementation = incremental_implementation
+        self.out_of_context_entities = (
+            [] if out_of_context_entities is None else out_of_context_entities.copy()
+        )
         self.defined_at = defined_at
         self.other_arguments = None if other_arguments is None else other_arguments.copy()
 
@@ -136,6 +232,18 @@ class VivadoProject:
 
         self.tcl = VivadoTcl(name=self.name)
 
+        if self.impl_explore and self.incremental_implementation:
+            raise ValueError(
+                f'Project "{self.name}": Can not use both "impl_explore" and '
+                '"incremental_implementation".'
+            )
+
+        for strategy in self.impl_explore_strategies or []:
+            if strategy not in VIVADO_STRATEGIES:
+                raise ValueError(
+                    f'Project "{self.name}": Got unknown implementation strategy "{strategy}".'
+                )
+
         for constraint in self.constraints:
             if not isinstance(constraint, Constraint):
                 raise TypeError(f'Got bad type for "constraints" element: {constraint}')
@@ -144,10 +252,56 @@ class VivadoProject:
             if not isinstance(tcl_source, Path):
                 raise TypeError(f'Got bad type for "tcl_sources" element: {tcl_source}')
 
+        for block_design in self.block_designs:
+            if not isinstance(block_design, Path):
+                raise TypeError(f'Got bad type for "block_designs" element: {block_design}')
+
         for build_step_hook in self.build_step_hooks:
             if not isinstance(build_step_hook, BuildStepTclHook):
                 raise TypeError(f'Got bad type for "build_step_hooks" element: {build_step_hook}')
 
+        for bitstream_variant in self.bitstream_variants:
+            if not isinstance(bitstream_variant, BitstreamVariant):
+                raise TypeError(
+                    f'Got bad type for "bitstream_variants" element: {bitstream_variant}'
+                )
+
+        variant_names = [variant.name for variant in self.bitstream_variants]
+        if len(set(variant_names)) != len(variant_names):
+            raise ValueError(f'Project "{self.name}": Got duplicate bitstream variant names.')
+
+        self._check_reconfigurable_partitions()
+
+    def _check_reconfigurable_partitions(self) -> None:
+        for partition in self.reconfigurable_partitions:
+            if not isinstance(partition, ReconfigurablePartition):
+                raise TypeError(
+                    f'Got bad type for "reconfigurable_partitions" element: {partition}'
+                )
+
+        if not self.reconfigurable_partitions:
+            return
+
+        if self.impl_explore or self.incremental_implementation:
+            raise ValueError(
+                f'Project "{self.name}": Can not use "reconfigurable_partitions" together with '
+                '"impl_explore" or "incremental_implementation".'
+            )
+
+        partition_names = [partition.name for partition in self.reconfigurable_partitions]
+        if len(set(partition_names)) != len(partition_names):
+            raise ValueError(
+                f'Project "{self.name}": Got duplicate reconfigurable partition names.'
+            )
+
+        module_names = [
+            reconfigurable_module.name
+            for partition in self.reconfigurable_partitions
+            for reconfigurable_module in partition.reconfigurable_modules
+        ]
+        if len(set(module_names)) != len(module_names):
+            raise ValueError(f'Project "{self.name}": Got duplicate reconfigurable module names.')
+
     def project_file(self, project_path: Path) -> Path:
         """
         Arguments:
@@ -158,7 +312,19 @@ class VivadoProject:
         """
         return project_path / f"{self.name}.xpr"
 
-    def _setup_tcl_sources(self) -> None:
+    @staticmethod
+    def ip_core_ips_file(project_path: Path) -> Path:
+        """
+        Arguments:
+            project_path: A path containing a Vivado project.
+
+        Return:
+            File where the names of the IPs created by each IP core file are written,
+            for a project that contains only IP cores.
+        """
+        return project_path / "ip_core_ips.txt"
+
+    def _get_tsfpga_tcl_sources(self) -> list[Path]:
         tsfpga_tcl_sources = [
             TSFPGA_TCL / "vivado_default_run.tcl",
             TSFPGA_TCL / "vivado_fast_run.tcl",
@@ -168,9 +334,20 @@ class VivadoProject:
         if self.impl_explore:
             tsfpga_tcl_sources.append(TSFPGA_TCL / "vivado_strategies.tcl")
 
+        return tsfpga_tcl_sources
+
+    def _get_all_tcl_sources(self) -> list[Path]:
+        """
+        The TCL sources list might or might not contain the tsfpga sources, depending on whether
+        the project was created in this same Python session.
+        Make the list unique in order to get the same result in both cases.
+        """
+        return list(dict.fromkeys(self._get_tsfpga_tcl_sources() + self.tcl_sources))
+
+    def _setup_tcl_sources(self) -> None:
         # Add tsfpga TCL sources first. The user might want to change something in the tsfpga
         # settings. Conversely, tsfpga should not modify something that the user has set up.
-        self.tcl_sources = tsfpga_tcl_sources + self.tcl_sources
+        self.tcl_sources = self._get_tsfpga_tcl_sources() + self.tcl_sources
 
     def _setup_and_create_build_step_hooks(
         self, project_path: Path
@@ -212,6 +389,13 @@ class VivadoProject:
             BuildStepTclHook(TSFPGA_TCL / "check_cdc.tcl", "STEPS.WRITE_BITSTREAM.TCL.PRE")
         )
 
+        if self.incremental_implementation:
+            build_step_hooks.append(
+                BuildStepTclHook(
+                    TSFPGA_TCL / "report_incremental_reuse.tcl", "STEPS.WRITE_BITSTREAM.TCL.PRE"
+                )
+            )
+
         if not self.open_and_analyze_synthesized_design:
             # In this special case, used only by the fastest netlist builds, the synthesized design
             # is never opened (to save execution time).
@@ -286,12 +470,15 @@ class VivadoProject:
 """,
             )
 
-    def _create_tcl(
+    def _create_tcl(  # noqa: PLR0913
         self,
         project_path: Path,
         ip_cache_path: Path | None,
         build_step_hooks: dict[str, tuple[Path, list[BuildStepTclHook]]],
         all_arguments: dict[str, Any],
+        restored_block_designs: list[Path] | None = None,
+        generate_block_designs: bool = False,
+        num_ip_core_jobs: int | None = None,
     ) -> Path:
         """
         Make a TCL file that creates a Vivado project
@@ -316,6 +503,23 @@ class VivadoProject:
             disable_io_buffers=self.is_netlist_build,
             ip_cores_only=self.ip_cores_only,
             other_arguments=all_arguments,
+            out_of_context_entities={
+                entity: self._get_out_of_context_file_list(project_path=project_path, entity=entity)
+                for entity in self.out_of_context_entities
+            },
+            block_designs={
+                block_design: self._get_block_design_folder(
+                    project_path=project_path, tcl_file=block_design
+                )
+                for block_design in self.block_designs
+            },
+            restored_block_designs=restored_block_designs,
+            generate_block_designs=generate_block_designs,
+            num_ip_core_jobs=num_ip_core_jobs,
+            reconfigurable_partitions=self.reconfigurable_partitions,
+            ip_core_ips_file=self.ip_core_ips_file(project_path=project_path)
+            if self.ip_cores_only
+            else None,
         )
         create_file(create_vivado_project_tcl, tcl)
 
@@ -325,6 +529,8 @@ class VivadoProject:
         self,
         project_path: Path,
         ip_cache_path: Path | None = None,
+        block_design_cache_path: Path | None = None,
+        num_ip_core_jobs: int | None = None,
         **other_arguments: Any,  # noqa: ANN401
     ) -> bool:
         """
@@ -334,6 +540,17 @@ class VivadoProject:
             project_path: Path where the project shall be placed.
             ip_cache_path: Path to a folder where the Vivado IP cache can be
                 placed. If omitted, the Vivado IP cache mechanism will not be enabled.
+            block_design_cache_path: Path to a folder where block designs, along with their
+                generated output products, can be cached.
+                Keyed on a hash of the block design TCL script, the part and the Vivado version.
+                Can be shared between projects and between workspaces.
+                If omitted, the block design cache mechanism will not be enabled.
+            num_ip_core_jobs: If set, the output products of all IP cores will be generated,
+                and the IP cores will be synthesized out-of-context, when the project is created.
+                The IP core synthesis runs will be launched in parallel with this many jobs.
+                Typically set to the same number of threads as is used for the build.
+                If omitted, this will instead be done in the beginning of synthesis, one IP core
+                at a time.
             other_arguments: Optional further arguments. Will not be used by tsfpga, but will
                 instead be sent to
 
@@ -376,13 +593,56 @@ class VivadoProject:
             print("ERROR: Project pre-create hook returned False. Failing the build.")
             return False
 
+        block_design_cache = (
+            None
+            if block_design_cache_path is None or not self.block_designs
+            else BlockDesignCache(cache_path=block_design_cache_path)
+        )
+        block_design_keys = {}
+        restored_block_designs = []
+
+        if block_design_cache is not None:
+            vivado_version = get_vivado_version(self._vivado_path)
+
+            for block_design in self.block_designs:
+                key = block_design_cache.get_key(
+                    tcl_file=block_design, part=self.part, vivado_version=vivado_version
+                )
+                block_design_folder = self._get_block_design_folder(
+                    project_path=project_path, tcl_file=block_design
+                )
+
+                if block_design_cache.restore(key=key, path=block_design_folder):
+                    restored_block_designs.append(block_design)
+                else:
+                    block_design_keys[block_design] = key
+
         create_vivado_project_tcl = self._create_tcl(
             project_path=project_path,
             ip_cache_path=ip_cache_path,
             build_step_hooks=build_step_hooks,
             all_arguments=all_arguments,
+            restored_block_designs=restored_block_designs,
+            generate_block_designs=block_design_cache is not None,
+            num_ip_core_jobs=num_ip_core_jobs,
         )
-        return run_vivado_tcl(self._vivado_path, create_vivado_project_tcl)
+        if not run_vivado_tcl(self._vivado_path, create_vivado_project_tcl):
+            return False
+
+        if block_design_cache is not None:
+            for block_design, key in block_design_keys.items():
+                block_design_cache.store(
+                    key=key,
+                    path=self._get_block_design_folder(
+                        project_path=project_path, tcl_file=block_design
+                    ),
+                )
+
+        return True
+
+    @staticmethod
+    def _get_block_design_folder(project_path: Path, tcl_file: Path) -> Path:
+        return project_path / "block_designs" / tcl_file.stem
 
     def pre_create(
         self,
@@ -419,6 +679,12 @@ class VivadoProject:
         synth_only: bool,
         from_impl: bool,
         impl_explore: bool,
+        synthesis_checkpoint_restored: bool = False,
+        incremental_reference_checkpoint: Path | None = None,
+        impl_explore_runs: list[str] | None = None,
+        restored_out_of_context_runs: list[str] | None = None,
+        reconfigurable_runs: list[str] | None = None,
+        reconfigurable_synthesis_runs: list[str] | None = None,
     ) -> Path:
         """
         Make a TCL file that builds a Vivado project
@@ -440,6 +706,14 @@ class VivadoProject:
             from_impl=from_impl,
             open_and_analyze_synthesized_design=self.open_and_analyze_synthesized_design,
             impl_explore=impl_explore,
+            synthesis_checkpoint_restored=synthesis_checkpoint_restored,
+            incremental_reference_checkpoint=incremental_reference_checkpoint,
+            impl_explore_runs=impl_explore_runs,
+            impl_explore_terminate_runs=self.impl_explore_terminate_runs,
+            impl_explore_run_file=self._get_impl_explore_run_file(project_path=project_path),
+            restored_out_of_context_runs=restored_out_of_context_runs,
+            reconfigurable_runs=reconfigurable_runs,
+            reconfigurable_synthesis_runs=reconfigurable_synthesis_runs,
         )
         create_file(build_vivado_project_tcl, tcl)
 
@@ -488,7 +762,7 @@ class VivadoProject:
         """
         return True
 
-    def build(  # noqa: C901, PLR0912, PLR0913
+    def build(  # noqa: C901, PLR0911, PLR0912, PLR0913, PLR0915
         self,
         project_path: Path,
         output_path: Path | None = None,
@@ -498,6 +772,8 @@ class VivadoProject:
         synth_only: bool = False,
         from_impl: bool = False,
         num_threads: int = 12,
+        synthesis_checkpoint_cache_path: Path | None = None,
+        artifact_store: ArtifactStore | None = None,
         **pre_and_post_build_parameters: Any,  # noqa: ANN401
     ) -> BuildResult:
         """
@@ -516,6 +792,20 @@ class VivadoProject:
             synth_only: Run synthesis and then stop.
             from_impl: Run the ``impl`` steps and onward on an existing synthesized design.
             num_threads: Number of parallel threads to use during run.
+            synthesis_checkpoint_cache_path: Optional path to a folder where synthesized designs
+                are cached, keyed on a hash of all the synthesis inputs.
+                If a matching entry is found, synthesis is skipped and the build continues
+                straight to implementation from the cached checkpoint.
+                Otherwise, the synthesized design is stored in the cache after the build.
+                The folder can be shared between projects and between workspaces.
+                If omitted, the cache mechanism will not be enabled.
+            artifact_store: Optional store of build artifacts, keyed on the fingerprint of
+                the project (see :meth:`.get_fingerprint`).
+                If the store has a build with a matching fingerprint, the artifacts are fetched to
+                ``output_path`` and Vivado is not run at all.
+                Otherwise, the artifacts are stored in the store after the build.
+                Is not used when ``synth_only`` is set.
+                Artifacts are not fetched when ``from_impl`` is set, but they are stored.
             pre_and_post_build_parameters: Optional further arguments. Will not be used by tsfpga,
                 but will instead be sent to
 
@@ -586,6 +876,97 @@ class VivadoProject:
             result.success = False
             return result
 
+        # Calculated after the pre-build hooks, since they might change e.g. register constants.
+        fingerprint = (
+            None
+            if artifact_store is None or synth_only
+            else self.get_fingerprint(run_index=run_index, generics=generics)
+        )
+
+        if artifact_store is not None and fingerprint is not None and not from_impl:
+            metadata = artifact_store.get(fingerprint=fingerprint, output_path=output_path)
+
+            if metadata is not None:
+                print("Fetched build from artifact store. Skipping Vivado run.")
+
+                result.synthesis_size = metadata["synthesis_size"]
+                result.implementation_run_name = metadata["implementation_run_name"]
+                result.implementation_size = metadata["implementation_size"]
+
+                return self._run_post_build(result=result, all_parameters=all_parameters)
+
+        if self.reconfigurable_partitions and not synth_only:
+            reconfigurable_keys = self._get_build_keys(
+                run_index=run_index, all_generics=all_generics
+            )
+            changed_reconfigurable_modules = (
+                None
+                if from_impl
+                else self._get_changed_reconfigurable_modules(
+                    project_path=project_path, keys=reconfigurable_keys
+                )
+            )
+            reconfigurable_runs, reconfigurable_synthesis_runs = self._get_reconfigurable_runs(
+                run_index=run_index, changed_modules=changed_reconfigurable_modules
+            )
+
+            # Will be written again once the build has succeeded.
+            delete(self._get_reconfigurable_keys_file(project_path=project_path))
+        else:
+            reconfigurable_keys = None
+            reconfigurable_runs = None
+            reconfigurable_synthesis_runs = None
+
+        # When only reconfigurable modules are built, the static design is not synthesized.
+        synthesis_checkpoint_cache = (
+            None
+            if synthesis_checkpoint_cache_path is None
+            or from_impl
+            or reconfigurable_synthesis_runs is not None
+            else SynthesisCheckpointCache(cache_path=synthesis_checkpoint_cache_path)
+        )
+        synthesis_run_path = project_path / f"{self.name}.runs" / f"synth_{run_index}"
+
+        if synthesis_checkpoint_cache is None:
+            synthesis_checkpoint_key = None
+            synthesis_checkpoint_restored = False
+            out_of_context_keys = {}
+            restored_out_of_context_runs = []
+        else:
+            out_of_context_keys = self._get_out_of_context_keys(
+                synthesis_checkpoint_cache=synthesis_checkpoint_cache, project_path=project_path
+            )
+            restored_out_of_context_runs = [
+                run_name
+                for run_name, key in out_of_context_keys.items()
+                if synthesis_checkpoint_cache.restore(
+                    key=key, path=project_path / f"{self.name}.runs" / run_name
+                )
+            ]
+
+            synthesis_checkpoint_key = self._get_synthesis_checkpoint_key(
+                synthesis_checkpoint_cache=synthesis_checkpoint_cache,
+                run_index=run_index,
+                all_generics=all_generics,
+            )
+            synthesis_checkpoint_restored = synthesis_checkpoint_cache.restore(
+                key=synthesis_checkpoint_key, path=synthesis_run_path
+            )
+
+        incremental_reference_checkpoint = (
+            self._get_incremental_reference_checkpoint(
+                project_path=project_path, run_index=run_index
+            )
+            if self.incremental_implementation and not synth_only
+            else None
+        )
+
+        impl_explore_runs = (
+            self._get_impl_explore_runs(project_path=project_path) if self.impl_explore else None
+        )
+        # Is written by Vivado, so make sure that we do not read a file from an earlier build.
+        delete(self._get_impl_explore_run_file(project_path=project_path))
+
         # We ignore the type of 'output_path' going from 'Path | None' to 'Path'.
         # It is only used if 'synth_only' is False, and we have an assertion that 'output_path' is
         # not None in that case above.
@@ -599,11 +980,33 @@ class VivadoProject:
             synth_only=synth_only,
             from_impl=from_impl,
             impl_explore=self.impl_explore,
+            synthesis_checkpoint_restored=synthesis_checkpoint_restored,
+            incremental_reference_checkpoint=incremental_reference_checkpoint,
+            impl_explore_runs=impl_explore_runs,
+            restored_out_of_context_runs=restored_out_of_context_runs,
+            reconfigurable_runs=reconfigurable_runs,
+            reconfigurable_synthesis_runs=reconfigurable_synthesis_runs,
         )
 
-        if not run_vivado_tcl(self._vivado_path, build_vivado_project_tcl):
-            result.success = False
-            return result
+        # If synthesis was restored from the cache, and we shall not do implementation, there is
+        # nothing for Vivado to do. The reports of the restored run are used below.
+        # Same if no reconfigurable module has changed since the latest build.
+        if reconfigurable_synthesis_runs == []:
+            print("Design has not changed since the latest build. Skipping Vivado run.")
+        elif not (synth_only and synthesis_checkpoint_restored):
+            if not run_vivado_tcl(self._vivado_path, build_vivado_project_tcl):
+                result.success = False
+                return result
+
+            if synthesis_checkpoint_cache is not None and synthesis_checkpoint_key is not None:
+                synthesis_checkpoint_cache.store(
+                    key=synthesis_checkpoint_key, path=synthesis_run_path
+                )
+
+                for run_name, key in out_of_context_keys.items():
+                    synthesis_checkpoint_cache.store(
+                        key=key, path=project_path / f"{self.name}.runs" / run_name
+                    )
 
         result.synthesis_size = self._get_size(
             project_path=project_path, run_name=f"synth_{run_index}"
@@ -611,20 +1014,20 @@ class VivadoProject:
 
         if not synth_only:
             if self.impl_explore:
-                runs_path = project_path / f"{self.name}.runs"
-                for run_path in runs_path.iterdir():
-                    if "impl_explore_" in run_path.name:
-                        # Check files for existence, since not all runs may have completed
-                        bit_file = run_path / f"{self.top}.bit"
-                        bin_file = run_path / f"{self.top}.bin"
-                        if bit_file.exists() or bin_file.exists():
-                            result.implementation_run_name = run_path.name
-                            break
+                # The run that met timing first, as noted by Vivado.
+                result.implementation_run_name = read_file(
+                    self._get_impl_explore_run_file(project_path=project_path)
+                ).strip()
+
+                self._update_impl_explore_history(
+                    project_path=project_path, run_name=result.implementation_run_name
+                )
             else:
                 result.implementation_run_name = f"impl_{run_index}"
-                impl_folder = project_path / f"{self.name}.runs" / result.implementation_run_name
-                bit_file = impl_folder / f"{self.top}.bit"
-                bin_file = impl_folder / f"{self.top}.bin"
+
+            impl_folder = project_path / f"{self.name}.runs" / result.implementation_run_name
+            bit_file = impl_folder / f"{self.top}.bit"
+            bin_file = impl_folder / f"{self.top}.bin"
 
             shutil.copy2(bit_file, output_path / f"{self.name}.bit")
             shutil.copy2(bin_file, output_path / f"{self.name}.bin")
@@ -632,6 +1035,53 @@ class VivadoProject:
                 project_path=project_path, run_name=result.implementation_run_name
             )
 
+            if incremental_reference_checkpoint is not None:
+                # Keep the routed design as reference for the next build.
+                create_directory(incremental_reference_checkpoint.parent, empty=False)
+                shutil.copy2(
+                    impl_folder / f"{self.top}_routed.dcp", incremental_reference_checkpoint
+                )
+
+                result.incremental_reuse = self._get_incremental_reuse(run_path=impl_folder)
+
+            if reconfigurable_keys is not None:
+                if not self._copy_partial_bitstreams(
+                    project_path=project_path, output_path=output_path, run_index=run_index
+                ):
+                    result.success = False
+                    return result
+
+                create_file(
+                    self._get_reconfigurable_keys_file(project_path=project_path),
+                    json.dumps(reconfigurable_keys, indent=2),
+                )
+
+            if self.bitstream_variants and not self._build_bitstream_variants(
+                project_path=project_path,
+                output_path=output_path,
+                run_name=result.implementation_run_name,
+            ):
+                result.success = False
+                return result
+
+            if artifact_store is not None and fingerprint is not None:
+                artifact_store.put(
+                    fingerprint=fingerprint,
+                    root_path=output_path,
+                    files=self._get_artifact_files(output_path=output_path),
+                    metadata={
+                        "name": self.name,
+                        "part": self.part,
+                        "top": self.top,
+                        "synthesis_size": result.synthesis_size,
+                        "implementation_run_name": result.implementation_run_name,
+                        "implementation_size": result.implementation_size,
+                    },
+                )
+
+        return self._run_post_build(result=result, all_parameters=all_parameters)
+
+    def _run_post_build(self, result: BuildResult, all_parameters: dict[str, Any]) -> BuildResult:
         # Send the result object, along with everything else, to the post-build function
         all_parameters.update(build_result=result)
 
@@ -641,6 +1091,464 @@ class VivadoProject:
 
         return result
 
+    def get_fingerprint(
+        self,
+        run_index: int | None = None,
+        generics: dict[str, bool | float | StringGenericValue | BitVectorGenericValue]
+        | None = None,
+    ) -> str:
+        """
+        Calculate a fingerprint that is unique for all the inputs to a build of this project.
+        I.e. the source files, constraints, build step hooks, generics, Vivado version, etc.
+        Two builds with the same fingerprint will produce equivalent artifacts.
+
+        Note that the project and module pre-build hooks might have side effects that change
+        the inputs, e.g. register constants.
+        Which is why :meth:`.build` calculates the fingerprint after the hooks have been called.
+
+        Arguments:
+            run_index: Same as for :meth:`.build`.
+            generics: Same as for :meth:`.build`.
+
+        Return:
+            A hexadecimal hash string.
+        """
+        all_generics = copy_and_combine_dicts(self.static_generics, generics)
+        run_index = self.default_run_index if run_index is None else run_index
+
+        data = self._get_build_keys(run_index=run_index, all_generics=all_generics)
+        data.update(
+            impl_explore=self.impl_explore,
+            impl_explore_strategies=self.impl_explore_strategies,
+            bitstream_variants={
+                variant.name: {
+                    instance: calculate_file_hash(file)
+                    for instance, file in variant.memory_data.items()
+                }
+                for variant in self.bitstream_variants
+            },
+        )
+
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+    def _get_artifact_files(self, output_path: Path) -> list[Path]:
+        """
+        The build artifacts that are produced by :meth:`.build` in the output folder.
+        """
+        files = [output_path / f"{self.name}.bit", output_path / f"{self.name}.bin"]
+
+        # Is not produced by all projects.
+        xsa_file = output_path / f"{self.name}.xsa"
+        if xsa_file.exists():
+            files.append(xsa_file)
+
+        folders = [
+            partition.get_output_path(output_path=output_path)
+            for partition in self.reconfigurable_partitions
+        ] + [
+            variant.get_output_path(output_path=output_path) for variant in self.bitstream_variants
+        ]
+
+        for folder in folders:
+            files += sorted(file for file in folder.rglob("*") if file.is_file())
+
+        return files
+
+    def _build_bitstream_variants(
+        self, project_path: Path, output_path: Path, run_name: str | None
+    ) -> bool:
+        """
+        Produce the bitstreams of all variants, from the implemented design of the given run.
+        """
+        run_path = project_path / f"{self.name}.runs" / str(run_name)
+        memory_info_path = create_directory(project_path / "bitstream_variants", empty=False)
+
+        variants = {}
+        for variant in self.bitstream_variants:
+            variant_output_path = create_directory(
+                variant.get_output_path(output_path=output_path), empty=True
+            )
+            variants[variant_output_path / f"{self.name}.bit"] = variant.memory_data
+
+        print(f"Building {len(variants)} bitstream variant(s) from {run_path}")
+
+        bitstream_variants_tcl = create_file(
+            project_path / "build_bitstream_variants.tcl",
+            self.tcl.bitstream_variants(
+                routed_checkpoint=run_path / f"{self.top}_routed.dcp",
+                bit_file=run_path / f"{self.top}.bit",
+                memory_info_file=memory_info_path / f"{self.top}.mmi",
+                variants=variants,
+            ),
+        )
+
+        if not run_vivado_tcl(self._vivado_path, bitstream_variants_tcl):
+            return False
+
+        # Same format as the '.bin' file of the regular bitstream, from 'write_bitstream -bin_file'.
+        for variant_bit_file in variants:
+            write_bin_file(bit_file=variant_bit_file, bin_file=variant_bit_file.with_suffix(".bin"))
+
+        return True
+
+    @staticmethod
+    def _get_reconfigurable_keys_file(project_path: Path) -> Path:
+        return project_path / "reconfigurable_keys.json"
+
+    def _get_build_keys(
+        self,
+        run_index: int,
+        all_generics: dict[str, bool | float | StringGenericValue | BitVectorGenericValue],
+    ) -> dict[str, Any]:
+        """
+        Calculate a key for the static design, and for each reconfigurable module, that is
+        unique for the inputs to the build.
+        The static key includes also the constraints and build step hooks that are used only
+        in implementation, since they affect the implemented design.
+        """
+        # Is only used to calculate the keys. Nothing is stored in the cache folder.
+        synthesis_checkpoint_cache = SynthesisCheckpointCache(cache_path=Path())
+        all_arguments = self._get_synthesis_checkpoint_arguments()
+        constraints = self._get_all_constraints(all_arguments=all_arguments)
+
+        static_key = self._get_synthesis_checkpoint_key(
+            synthesis_checkpoint_cache=synthesis_checkpoint_cache,
+            run_index=run_index,
+            all_generics=all_generics,
+            other_data={
+                "constraints": [
+                    f"{constraint.ref} {calculate_file_hash(constraint.file)}"
+                    for constraint in constraints
+                ],
+                "build_step_hooks": [
+                    f"{build_step_hook.hook_step} {calculate_file_hash(build_step_hook.tcl_file)}"
+                    for build_step_hook in self.build_step_hooks
+                ],
+            },
+        )
+
+        module_keys = {
+            reconfigurable_module.name: synthesis_checkpoint_cache.get_key(
+                modules=reconfigurable_module.modules,
+                part=self.part,
+                top=partition.module,
+                run_index=1,
+                generics={},
+                constraints=constraints,
+                tcl_sources=self._get_all_tcl_sources(),
+                build_step_hooks=self.build_step_hooks,
+                vivado_version=get_vivado_version(self._vivado_path),
+                other_data={"block_designs": self._get_block_design_data()},
+                other_arguments=all_arguments,
+            )
+            for partition in self.reconfigurable_partitions
+            for reconfigurable_module in partition.reconfigurable_modules
+        }
+
+        return {"static": static_key, "reconfigurable_modules": module_keys}
+
+    def _get_changed_reconfigurable_modules(
+        self, project_path: Path, keys: dict[str, Any]
+    ) -> list[ReconfigurableModule] | None:
+        """
+        Find the reconfigurable modules that have changed since the latest successful build.
+
+        Return:
+            The changed modules, which can be implemented on top of the locked static design
+            from the latest build.
+            ``None`` if the full design must be built, i.e. if the static design, or any of the
+            modules that are implemented together with it, has changed.
+        """
+        keys_file = self._get_reconfigurable_keys_file(project_path=project_path)
+        if not keys_file.exists():
+            return None
+
+        try:
+            previous_keys = json.loads(read_file(keys_file))
+        except json.JSONDecodeError:
+            return None
+
+        if previous_keys.get("static") != keys["static"]:
+            return None
+
+        previous_module_keys = previous_keys.get("reconfigurable_modules", {})
+        result = []
+
+        for partition in self.reconfigurable_partitions:
+            for index, reconfigurable_module in enumerate(partition.reconfigurable_modules):
+                key = keys["reconfigurable_modules"][reconfigurable_module.name]
+
+                if previous_module_keys.get(reconfigurable_module.name) != key:
+                    if index == 0:
+                        # Is implemented together with the static design.
+                        return None
+
+                    result.append(reconfigurable_module)
+
+        return result
+
+    def _get_reconfigurable_runs(
+        self, run_index: int, changed_modules: list[ReconfigurableModule] | None
+    ) -> tuple[list[str], list[str] | None]:
+        """
+        Return:
+            The implementation runs that shall be launched, and the synthesis runs that shall be
+            launched before them.
+            The synthesis runs are ``None`` if the full design shall be built, in which case
+            Vivado launches the needed synthesis runs.
+        """
+        configurations = get_configurations(partitions=self.reconfigurable_partitions)
+
+        if changed_modules is None:
+            return [
+                get_configuration_run_name(run_index=run_index, configuration_index=index)
+                for index in range(len(configurations))
+            ], None
+
+        implementation_runs = [
+            get_configuration_run_name(run_index=run_index, configuration_index=index)
+            for index, configuration in enumerate(configurations)
+            if any(module in changed_modules for module in configuration.values())
+        ]
+        synthesis_runs = [f"{module.name}_synth_1" for module in changed_modules]
+
+        return implementation_runs, synthesis_runs
+
+    def _copy_partial_bitstreams(
+        self, project_path: Path, output_path: Path, run_index: int
+    ) -> bool:
+        """
+        Copy the partial bitstream of each reconfigurable module from the implementation run of
+        its configuration.
+        Vivado names the files after the partition instance and the module,
+        e.g. "<top>_filter_inst_lowpass_partial.bit".
+        """
+        runs_path = project_path / f"{self.name}.runs"
+
+        for index, configuration in enumerate(
+            get_configurations(partitions=self.reconfigurable_partitions)
+        ):
+            run_path = runs_path / get_configuration_run_name(
+                run_index=run_index, configuration_index=index
+            )
+
+            for partition, reconfigurable_module in configuration.items():
+                if reconfigurable_module is None:
+                    continue
+
+                instance = partition.instance.replace("/", "_")
+                bit_files = list(
+                    run_path.glob(f"*{instance}_{reconfigurable_module.name}_partial.bit")
+                )
+                if len(bit_files) != 1:
+                    print(
+                        "ERROR: Could not find partial bitstream of reconfigurable module "
+                        f'"{reconfigurable_module.name}" in {run_path}'
+                    )
+                    return False
+
+                partition_output_path = create_directory(
+                    partition.get_output_path(output_path=output_path), empty=False
+                )
+                shutil.copy2(
+                    bit_files[0], partition_output_path / f"{reconfigurable_module.name}.bit"
+                )
+
+                bin_file = bit_files[0].with_suffix(".bin")
+                if bin_file.exists():
+                    shutil.copy2(
+                        bin_file, partition_output_path / f"{reconfigurable_module.name}.bin"
+                    )
+
+        return True
+
+    def _get_synthesis_checkpoint_key(
+        self,
+        synthesis_checkpoint_cache: SynthesisCheckpointCache,
+        run_index: int,
+        all_generics: dict[str, bool | float | StringGenericValue | BitVectorGenericValue],
+        other_data: dict[str, Any] | None = None,
+    ) -> str:
+        """
+        Calculate the synthesis checkpoint cache key for this project.
+        """
+        all_arguments = self._get_synthesis_checkpoint_arguments()
+
+        return synthesis_checkpoint_cache.get_key(
+            modules=self.modules,
+            part=self.part,
+            top=self.top,
+            run_index=run_index,
+            generics=all_generics,
+            constraints=self._get_all_constraints(all_arguments=all_arguments),
+            tcl_sources=self._get_all_tcl_sources(),
+            build_step_hooks=self.build_step_hooks,
+            vivado_version=get_vivado_version(self._vivado_path),
+            other_data={
+                "is_netlist_build": self.is_netlist_build,
+                "open_and_analyze_synthesized_design": self.open_and_analyze_synthesized_design,
+                "block_designs": self._get_block_design_data(),
+                **(other_data or {}),
+            },
+            other_arguments=all_arguments,
+        )
+
+    def _get_block_design_data(self) -> list[str]:
+        """
+        The block designs are not among the TCL sources, but affect the synthesized design just
+        the same.
+        """
+        return [
+            f"{block_design.name} {calculate_file_hash(block_design)}"
+            for block_design in self.block_designs
+        ]
+
+    def get_ip_core_files(self) -> list[IpCoreFile]:
+        """
+        Get the IP cores of this project.
+        The module getters are called with the same arguments as in the create flow.
+        Note that ``other_arguments`` given at run-time to :meth:`.create` are not included.
+
+        Return:
+            The IP core files of all modules in the project.
+        """
+        all_arguments = self._get_synthesis_checkpoint_arguments()
+
+        return [
+            ip_core_file
+            for module in self.modules
+            for ip_core_file in module.get_ip_core_files(**all_arguments)
+        ]
+
+    def _get_synthesis_checkpoint_arguments(self) -> dict[str, Any]:
+        """
+        Send the same arguments to the module getters as in the create flow.
+        """
+        all_arguments = copy_and_combine_dicts(self.other_arguments, None)
+        all_arguments.update(generics=self.static_generics, part=self.part)
+
+        return all_arguments
+
+    def _get_all_constraints(self, all_arguments: dict[str, Any]) -> list[Constraint]:
+        return [
+            constraint
+            for module in self.modules
+            for constraint in module.get_scoped_constraints(**all_arguments)
+        ] + self.constraints
+
+    @staticmethod
+    def _get_out_of_context_file_list(project_path: Path, entity: str) -> Path:
+        return project_path / "out_of_context" / f"{entity}_files.txt"
+
+    def _get_out_of_context_keys(
+        self, synthesis_checkpoint_cache: SynthesisCheckpointCache, project_path: Path
+    ) -> dict[str, str]:
+        """
+        Calculate the synthesis checkpoint cache key for each out-of-context run.
+        Based on the list of files that Vivado placed in each block set when the project
+        was created.
+
+        Return:
+            Run name: cache key.
+        """
+        result: dict[str, str] = {}
+        if not self.out_of_context_entities:
+            return result
+
+        constraints = self._get_all_constraints(
+            all_arguments=self._get_synthesis_checkpoint_arguments()
+        )
+
+        for entity in self.out_of_context_entities:
+            file_list = self._get_out_of_context_file_list(project_path=project_path, entity=entity)
+            if not file_list.exists():
+                # Project was created without this entity being out-of-context.
+                continue
+
+            result[f"{entity}_synth_1"] = synthesis_checkpoint_cache.get_out_of_context_key(
+                files=[Path(line) for line in read_file(file_list).splitlines() if line],
+                part=self.part,
+                top=entity,
+                constraints=constraints,
+                tcl_sources=self._get_all_tcl_sources(),
+                build_step_hooks=self.build_step_hooks,
+                vivado_version=get_vivado_version(self._vivado_path),
+            )
+
+        return result
+
+    @staticmethod
+    def _get_impl_explore_run_file(project_path: Path) -> Path:
+        return project_path / "impl_explore_run.txt"
+
+    @staticmethod
+    def _get_impl_explore_history_file(project_path: Path) -> Path:
+        return project_path / "impl_explore_history.json"
+
+    def _get_impl_explore_history(self, project_path: Path) -> dict[str, int]:
+        """
+        The number of times that each strategy has been the successful one in earlier builds.
+        """
+        history_file = self._get_impl_explore_history_file(project_path=project_path)
+        if not history_file.exists():
+            return {}
+
+        return json.loads(read_file(history_file))
+
+    def _get_impl_explore_runs(self, project_path: Path) -> list[str] | None:
+        """
+        Get the runs that shall be launched, in the order that they shall be launched.
+        Strategies that have been successful in earlier builds are launched first.
+        Will return ``None`` if all runs shall be launched in the default order.
+        """
+        history = self._get_impl_explore_history(project_path=project_path)
+        if self.impl_explore_strategies is None and not history:
+            return None
+
+        strategies = (
+            VIVADO_STRATEGIES
+            if self.impl_explore_strategies is None
+            else self.impl_explore_strategies
+        )
+        # Note that the sort is stable, so strategies that are equally successful will be
+        # launched in the order given by the user.
+        strategies = sorted(strategies, key=lambda strategy: -history.get(strategy, 0))
+
+        return [f"impl_explore_{VIVADO_STRATEGIES.index(strategy) + 1}" for strategy in strategies]
+
+    def _update_impl_explore_history(self, project_path: Path, run_name: str | None) -> None:
+        if run_name is None:
+            return
+
+        strategy = VIVADO_STRATEGIES[int(run_name.split("_")[-1]) - 1]
+
+        history = self._get_impl_explore_history(project_path=project_path)
+        history[strategy] = history.get(strategy, 0) + 1
+
+        create_file(
+            self._get_impl_explore_history_file(project_path=project_path),
+            json.dumps(history, indent=2),
+        )
+
+    def _get_incremental_reference_checkpoint(self, project_path: Path, run_index: int) -> Path:
+        """
+        The reference checkpoint is kept outside of the ``.runs`` folder, since the run folder is
+        cleared when the run is reset at the start of each build.
+        """
+        return project_path / "incremental_reference" / f"impl_{run_index}_routed.dcp"
+
+    @staticmethod
+    def _get_incremental_reuse(run_path: Path) -> dict[str, float] | None:
+        """
+        Read the incremental reuse report, which is only available if the run actually used
+        a reference checkpoint.
+        """
+        report_file = run_path / "incremental_reuse.rpt"
+        if not report_file.exists():
+            return None
+
+        return IncrementalReuseParser.get_reuse_summary(read_file(report_file)) or None
+
     def open(self, project_path: Path) -> bool:
         """
         Open the project in Vivado GUI.
@@ -925,6 +1833,34 @@ class VivadoIpCoreProject(VivadoProject):
         """
         raise NotImplementedError("IP core project can not be built")
 
+    def update_ip_cores(
+        self, project_path: Path, ip_core_files: list[IpCoreFile], remove_ips: list[str]
+    ) -> bool:
+        """
+        Update the IP cores of an existing project, without recreating the project.
+
+        Arguments:
+            project_path: Path where the project is placed.
+            ip_core_files: IP core files that shall be (re)created in the project.
+            remove_ips: Names of IPs that shall be removed from the project before the IP core
+                files are sourced.
+
+        Return:
+            True if everything went well.
+        """
+        print(f"Updating IP cores of Vivado project in {project_path}")
+
+        update_ip_cores_tcl = project_path / "update_ip_cores.tcl"
+        tcl = self.tcl.update_ip_cores(
+            project_file=self.project_file(project_path=project_path),
+            ip_core_files=ip_core_files,
+            remove_ips=remove_ips,
+            ip_core_ips_file=self.ip_core_ips_file(project_path=project_path),
+        )
+        create_file(update_ip_cores_tcl, tcl)
+
+        return run_vivado_tcl(self._vivado_path, update_ip_cores_tcl)
+
 
 def copy_and_combine_dicts(
     dict_first: dict[str, Any] | None, dict_second: dict[str, Any] | None
@@ -0,0 +1,139 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tsfpga.module_list import ModuleList
+
+
+class ReconfigurableModule:
+    """
+    One variant of the logic in a :class:`.ReconfigurablePartition`.
+    """
+
+    def __init__(self, name: str, modules: ModuleList) -> None:
+        """
+        Arguments:
+            name: Name of the reconfigurable module.
+                Must be unique within the project.
+                Is used as the name of the partial bitstream file.
+            modules: The synthesis files of these modules make up the reconfigurable module.
+                The reconfigurable module is synthesized out-of-context, separately from the
+                static design, so this must include all the modules that it depends on.
+        """
+        self.name = name
+        self.modules = modules.copy()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}:{self.name}"
+
+
+class ReconfigurablePartition:
+    """
+    A reconfigurable partition in a Dynamic Function eXchange (DFX) design.
+    I.e. a part of the design that can be reconfigured with a partial bitstream, while the
+    rest of the design (the static region) keeps running.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        instance: str,
+        module: str,
+        reconfigurable_modules: list[ReconfigurableModule],
+    ) -> None:
+        """
+        Arguments:
+            name: Name of the partition.
+                Is used as a folder name for the partial bitstreams of the partition, so should
+                only contain characters that are valid in a file name.
+            instance: Hierarchical path of the partition instance in the static design.
+                E.g. ``"filter_inst"`` or ``"processing_inst/filter_inst"``.
+            module: Name of the entity that is instantiated.
+                All the reconfigurable modules of the partition implement this entity.
+                The static design must instantiate it as a component, i.e. as a black box, since
+                the entity is not part of the static design sources.
+            reconfigurable_modules: The variants of the logic in the partition.
+                The first one is the one that is included in the full bitstream.
+        """
+        self.name = name
+        self.instance = instance
+        self.module = module
+        self.reconfigurable_modules = reconfigurable_modules.copy()
+
+        if not self.reconfigurable_modules:
+            raise ValueError(f'Partition "{self.name}": Must have at least one module.')
+
+        for reconfigurable_module in self.reconfigurable_modules:
+            if not isinstance(reconfigurable_module, ReconfigurableModule):
+                raise TypeError(
+                    f'Got bad type for "reconfigurable_modules" element: {reconfigurable_module}'
+                )
+
+    def get_output_path(self, output_path: Path) -> Path:
+        """
+        Arguments:
+            output_path: The output path of the project build.
+
+        Return:
+            Where the partial bitstreams of this partition are placed.
+        """
+        return output_path / self.name
+
+    def __str__(self) -> str:
+        modules = ", ".join(module.name for module in self.reconfigurable_modules)
+        return f"{self.__class__.__name__}:{self.name}:{self.instance}:{modules}"
+
+
+def get_configurations(
+    partitions: list[ReconfigurablePartition],
+) -> list[dict[ReconfigurablePartition, ReconfigurableModule | None]]:
+    """
+    Get the configurations that are needed to implement all reconfigurable modules of the
+    partitions.
+    Configuration N uses the module at index N of each partition.
+    A partition that has fewer modules than that is left as a grey box, i.e. with no logic.
+
+    The first configuration is the one that is implemented together with the static design,
+    and is included in the full bitstream.
+    The other configurations are implemented on top of the locked static design.
+
+    Return:
+        One dictionary for each configuration, with the module (or ``None`` for a grey box) of
+        each partition.
+    """
+    num_configurations = max(
+        (len(partition.reconfigurable_modules) for partition in partitions), default=0
+    )
+
+    return [
+        {
+            partition: partition.reconfigurable_modules[index]
+            if index < len(partition.reconfigurable_modules)
+            else None
+            for partition in partitions
+        }
+        for index in range(num_configurations)
+    ]
+
+
+def get_configuration_run_name(run_index: int, configuration_index: int) -> str:
+    """
+    Get the name of the Vivado implementation run that implements the given configuration.
+    The first configuration is implemented by the regular implementation run.
+    The others are implemented by child runs of it.
+    """
+    if configuration_index == 0:
+        return f"impl_{run_index}"
+
+    return f"impl_{run_index}_config_{configuration_index + 1}"
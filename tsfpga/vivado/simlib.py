@@ -15,6 +15,7 @@ from .simlib_ghdl import VivadoSimlibGhdl
 from .simlib_nvc import VivadoSimlibNvc
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from pathlib import Path
 
     from vunit.ui import VUnit
@@ -28,8 +29,14 @@ class VivadoSimlib:
     """
 
     @staticmethod
-    def init(
-        output_path: Path, vunit_proj: VUnit, vivado_path: Path | None = None
+    def init(  # noqa: PLR0913
+        output_path: Path,
+        vunit_proj: VUnit,
+        vivado_path: Path | None = None,
+        num_threads: int = 1,
+        design_files: Iterable[Path] | None = None,
+        families: Iterable[str] | None = None,
+        languages: Iterable[str] | None = None,
     ) -> VivadoSimlibCommon:
         """
         Get a Vivado simlib API suitable for your current simulator.
@@ -42,6 +49,24 @@ class VivadoSimlib:
             vunit_proj: The VUnit project that is used to run simulation.
             vivado_path: Path to Vivado executable.
                 If left out, the default from system ``PATH`` will be used.
+            num_threads: The number of compile processes to run in parallel, when compiling
+                simlib for GHDL or NVC.
+                Is not used for commercial simulators, where Vivado handles the compilation.
+            design_files: The simulation source files of the design.
+                If given, when compiling simlib for GHDL or NVC, only the primitives that are used
+                by these files will be compiled.
+                See :class:`.VivadoSimlibOpenSource` for details.
+                Is not used for commercial simulators.
+            families: The device families that simlib shall be compiled for, when using a
+                commercial simulator.
+                Can be found from part names with :func:`.get_simlib_family`.
+                If left out, or if more than one family is given, all families are compiled.
+                Is not used for GHDL or NVC.
+            languages: The languages of the simulation source files, when using a commercial
+                simulator.
+                Either ``vhdl``, ``verilog`` or ``systemverilog``.
+                If left out, or if both VHDL and Verilog are given, both languages are compiled.
+                Is not used for GHDL or NVC.
         """
         simulator_interface = vunit_proj._simulator_class  # noqa: SLF001
 
@@ -54,6 +79,8 @@ class VivadoSimlib:
                 output_path=output_path,
                 vunit_proj=vunit_proj,
                 simulator_interface=simulator_interface,
+                num_threads=num_threads,
+                design_files=design_files,
             )
 
         if simulator_interface.name == "nvc":
@@ -62,6 +89,8 @@ class VivadoSimlib:
                 output_path=output_path,
                 vunit_proj=vunit_proj,
                 simulator_interface=simulator_interface,
+                num_threads=num_threads,
+                design_files=design_files,
             )
 
         return VivadoSimlibCommercial(
@@ -69,4 +98,6 @@ class VivadoSimlib:
             output_path=output_path,
             vunit_proj=vunit_proj,
             simulator_interface=simulator_interface,
+            families=families,
+            languages=languages,
         )
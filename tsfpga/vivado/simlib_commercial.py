@@ -8,6 +8,7 @@
 
 from __future__ import annotations
 
+import re
 from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar
 
@@ -17,6 +18,8 @@ from .common import run_vivado_tcl, to_tcl_path
 from .simlib_common import VivadoSimlibCommon
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from vunit.sim_if import SimulatorInterface
     from vunit.ui import VUnit
 
@@ -25,12 +28,27 @@ class VivadoSimlibCommercial(VivadoSimlibCommon):
     """
     Handle Vivado simlib with a commercial simulator.
 
+    Compiling simlib for all device families and both languages takes a very long time.
+    It can be narrowed to the families and the language that are in use, using the ``families``
+    and ``languages`` arguments.
+    The choices are included in the :meth:`artifact_name <.VivadoSimlibCommon.artifact_name>`,
+    so that simlib compiled with different choices is kept apart.
+
     Do not instantiate this class directly.
     Use factory class :class:`.VivadoSimlib` instead.
     """
 
     library_names: ClassVar = ["unisim", "secureip", "unimacro", "unifast", "xpm"]
 
+    # The libraries that are added to the VUnit project when only Verilog is compiled.
+    _verilog_library_names: ClassVar = [
+        "unisims_ver",
+        "secureip",
+        "unimacro_ver",
+        "unifast_ver",
+        "xpm",
+    ]
+
     _tcl = (
         "set_param general.maxthreads 8\n"
         "compile_simlib "
@@ -38,8 +56,8 @@ class VivadoSimlibCommercial(VivadoSimlibCommon):
         "-simulator_exec_path {{{simulator_folder}}} "
         "-directory {{{output_path}}} "
         "-force "
-        "-family all "
-        "-language all "
+        "-family {family} "
+        "-language {language} "
         "-library all "
         "-no_ip_compile "
         "-no_systemc_compile "
@@ -51,13 +69,35 @@ class VivadoSimlibCommercial(VivadoSimlibCommon):
         output_path: Path,
         vunit_proj: VUnit,
         simulator_interface: SimulatorInterface,
+        families: Iterable[str] | None = None,
+        languages: Iterable[str] | None = None,
     ) -> None:
         """
         See superclass :class:`.VivadoSimlibCommon` constructor for details.
+        See :meth:`.VivadoSimlib.init` for ``families`` and ``languages``.
         """
         self._simulator_folder = Path(simulator_interface.find_prefix())
         self._simulator_name = self._get_simulator_name(simulator_interface=simulator_interface)
 
+        # The "compile_simlib" command takes only one family, so compile for all if there
+        # are many.
+        unique_families = set() if families is None else set(families)
+        self._family = unique_families.pop() if len(unique_families) == 1 else "all"
+
+        unique_languages = set() if languages is None else set(languages)
+        for language in unique_languages:
+            if language not in ["vhdl", "verilog", "systemverilog"]:
+                raise ValueError(f'Got unknown simlib language: "{language}"')
+
+        # SystemVerilog uses the Verilog libraries.
+        unique_languages = {
+            "verilog" if language == "systemverilog" else language for language in unique_languages
+        }
+        self._language = unique_languages.pop() if len(unique_languages) == 1 else "all"
+
+        if self._language == "verilog":
+            self.library_names = self._verilog_library_names
+
         super().__init__(
             vivado_path=vivado_path,
             output_path=output_path,
@@ -98,6 +138,8 @@ class VivadoSimlibCommercial(VivadoSimlibCommon):
             simulator_name=self._simulator_name,
             simulator_folder=to_tcl_path(self._simulator_folder),
             output_path=to_tcl_path(self.output_path),
+            family=self._family,
+            language=self._language,
         )
         create_file(tcl_file, tcl)
         compile_ok = run_vivado_tcl(self._vivado_path, tcl_file)
@@ -105,9 +147,61 @@ class VivadoSimlibCommercial(VivadoSimlibCommon):
         if not compile_ok:
             raise RuntimeError("Vivado simlib compile call failed!")
 
+    def _get_version_tag(self) -> str:
+        """
+        Add the family and language to the tag if they are narrowed, e.g. "zynq_vhdl".
+        Simlib compiled for all families and languages keeps the same tag as before.
+        """
+        tag = super()._get_version_tag()
+
+        if self._family == "all" and self._language == "all":
+            return tag
+
+        return tag + f".{self._format_version(f'{self._family}_{self._language}')}"
+
     def _get_simulator_tag(self) -> str:
         """
         Return e.g. modelsim_modeltech_pe_10_6c or riviera_riviera_pro_2018_10_x64.
         """
         simulator_version = self._simulator_folder.parent.name
         return self._format_version(f"{self._simulator_name}_{simulator_version}")
+
+
+# The "compile_simlib" family of each part name prefix.
+# Checked in order, so more specific prefixes must come before less specific ones.
+_SIMLIB_FAMILIES = [
+    (r"x[acq]7a", "artix7"),
+    (r"x[acq]7k", "kintex7"),
+    (r"x[acq]7v", "virtex7"),
+    (r"x[acq]7s", "spartan7"),
+    (r"x[acq]7z", "zynq"),
+    (r"x[acq]au", "artixuplus"),
+    (r"x[acq]ku\d+p", "kintexuplus"),
+    (r"x[acq]ku", "kintexu"),
+    (r"x[acq]vu\d+p", "virtexuplus"),
+    (r"x[acq]vu", "virtexu"),
+    (r"x[acq]zu\d+dr", "zynquplusRFSOC"),
+    (r"x[acq]zu", "zynquplus"),
+    (r"x[acq]v[cehmp]", "versal"),
+]
+
+
+def get_simlib_family(part: str) -> str:
+    """
+    Get the device family, as used by the Vivado ``compile_simlib`` command, of a part.
+    Can be used to find the ``families`` argument for :meth:`.VivadoSimlib.init` from the
+    parts of the build projects.
+
+    Arguments:
+        part: Part name, e.g. ``xc7z020clg400-1``.
+
+    Return:
+        The family, e.g. ``zynq``.
+        ``all`` if the family of the part is not known, in which case simlib will be compiled
+        for all families.
+    """
+    for pattern, family in _SIMLIB_FAMILIES:
+        if re.match(pattern, part.lower()):
+            return family
+
+    return "all"
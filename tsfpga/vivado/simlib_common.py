@@ -8,19 +8,34 @@
 
 from __future__ import annotations
 
+import gzip
+import hashlib
+import io
+import json
+import os
 import platform
+import shutil
+import tarfile
+import time
 import zipfile
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import PurePosixPath
 from shutil import make_archive
-from typing import TYPE_CHECKING
+from typing import IO, TYPE_CHECKING, BinaryIO
+from uuid import uuid4
 
-from tsfpga.system_utils import create_directory, create_file
+from tsfpga.system_utils import create_directory, create_file, delete, file_lock
 from tsfpga.vivado.common import get_vivado_version
 
 from .common import get_vivado_path
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from contextlib import AbstractContextManager
     from pathlib import Path
+    from threading import Event
+    from types import ModuleType
 
     from vunit.sim_if import SimulatorInterface
     from vunit.ui import VUnit
@@ -31,6 +46,15 @@ class VivadoSimlibCommon(ABC):
     Class for handling Vivado simlib used for simulation.
     Keeps track of when a (re)compile is needed.
 
+    The compiled simlib can be shared between many processes, e.g. simulation jobs on the same
+    CI runner.
+    A compile is done into a temporary folder, that is published as a new version once it is
+    finished.
+    Published versions are never modified, so a process that is using one of them is not
+    affected by a compile in another process.
+    Compiles are guarded by :meth:`.lock`, so that the processes that need a compile at the same
+    time wait for one of them to compile, instead of all compiling.
+
     This is a base class that defines an interface and some common methods.
     See subclasses for details: :class:`.VivadoSimlibOpenSource`, :class:`.VivadoSimlibCommercial`.
 
@@ -41,7 +65,7 @@ class VivadoSimlibCommon(ABC):
     # The version of this class.
     # Can be bumped to force a re-compile if e.g. the TCL script changes or the output folder
     # structure is updated.
-    _format_version_id = 4
+    _format_version_id = 5
 
     # Set in subclass to a list of strings.
     # The libraries that shall be compiled and added to VUnit project.
@@ -66,7 +90,9 @@ class VivadoSimlibCommon(ABC):
         self._vivado_path = get_vivado_path(vivado_path)
         self._libraries_path = (self._vivado_path.parent.parent / "data" / "vhdl" / "src").resolve()
 
-        self.output_path = output_path.resolve() / self._get_version_tag()
+        # Each published version is placed in a sub-folder of this folder.
+        self._versions_path = output_path.resolve() / self._get_version_tag()
+        self.output_path = self._get_published_path()
 
         self._vunit_proj = vunit_proj
 
@@ -74,12 +100,24 @@ class VivadoSimlibCommon(ABC):
         """
         Compile if needed (if :meth:`compile_is_needed <.compile_is_needed>` condition is not
         fulfilled).
+        If another process is compiling, wait for it to finish and then check again.
+
+        Return:
+            True if a compile was done by this process. False otherwise.
         """
-        if self.compile_is_needed:
-            self.compile()
-            return True
+        if not self.compile_is_needed:
+            return False
+
+        with self.lock():
+            # Another process might have compiled while we were waiting for the lock.
+            self.output_path = self._get_published_path()
+            if not self.compile_is_needed:
+                print(f"Vivado simlib in {self.output_path} was compiled by another process.")
+                return False
 
-        return False
+            self._compile_outdated()
+
+        return True
 
     @property
     def compile_is_needed(self) -> bool:
@@ -103,16 +141,120 @@ class VivadoSimlibCommon(ABC):
     def compile(self) -> None:
         """
         Compile simlib.
+        The result is published as a new version once the compile is finished.
+        """
+        with self.lock():
+            self._compile_all()
+
+    def lock(self) -> AbstractContextManager[Path]:
+        """
+        Lock the compiled simlib for the duration of a ``with`` block, so that no other process
+        compiles it at the same time.
         """
-        # Delete any existing artifacts, which might be fully or partially compiled.
-        # This also deletes the "done" token file if it exists.
-        # Specifically GHDL compilation fails if there are existing compiled artifacts
-        create_directory(self.output_path, empty=True)
+        return file_lock(file=self._versions_path.parent / f"{self._versions_path.name}.lock")
 
+    def use(self) -> AbstractContextManager[Path]:
+        """
+        Mark the compiled simlib as being in use for the duration of a ``with`` block.
+        Many processes can use it at the same time.
+        A version that is replaced by a compile in another process is not deleted while
+        it is in use.
+        """
+        return file_lock(file=self._usage_lock_file, shared=True)
+
+    def _compile_outdated(self) -> None:
+        """
+        Compile what is needed to fulfill the :meth:`compile_is_needed <.compile_is_needed>`
+        condition.
+        Is called with :meth:`.lock` held.
+        Compiles everything by default, but can be overloaded in a subclass.
+        """
+        self._compile_all()
+
+    def _compile_all(self) -> None:
         print(f"Compiling Vivado simlib from {self._libraries_path} into {self.output_path}...")
-        self._compile()
 
-        create_file(self._done_token, "Done!")
+        # Compile into an empty folder.
+        # Specifically GHDL compilation fails if there are existing compiled artifacts.
+        with self._publish(copy_existing=False):
+            self._compile()
+
+            create_file(self._done_token, "Done!")
+
+    @contextmanager
+    def _publish(self, copy_existing: bool) -> Iterator[None]:
+        """
+        Redirect the output of the compile in the ``with`` block to a temporary folder.
+        The temporary folder is published as a new version when the block is finished,
+        so that other processes never see a partially compiled simlib.
+        Must be called with :meth:`.lock` held.
+
+        Arguments:
+            copy_existing: If true, the temporary folder starts as a copy of the latest
+                version. Otherwise it starts empty.
+        """
+        output_path = self._get_published_path()
+
+        # Folders left by processes that were killed during compile.
+        # No other process is compiling, since the lock is held.
+        for stale_path in self._versions_path.glob("*.tmp"):
+            delete(stale_path)
+
+        temp_path = self._versions_path / f"{uuid4().hex}.tmp"
+        if copy_existing and output_path.exists():
+            shutil.copytree(output_path, temp_path, symlinks=True)
+        else:
+            create_directory(temp_path, empty=True)
+
+        self.output_path = temp_path
+        try:
+            yield
+
+            # No other process publishes at the same time, since the lock is held.
+            published_path = self._versions_path / str(
+                max(self._get_published_versions(), default=0) + 1
+            )
+            temp_path.rename(published_path)
+            output_path = published_path
+        finally:
+            self.output_path = output_path
+            delete(temp_path)
+
+        self._delete_replaced()
+
+    def _get_published_versions(self) -> list[int]:
+        if not self._versions_path.exists():
+            return []
+
+        return [int(path.name) for path in self._versions_path.iterdir() if path.name.isdigit()]
+
+    def _get_published_path(self) -> Path:
+        """
+        Path to the latest published version.
+        Does not exist if nothing has been compiled yet.
+        """
+        return self._versions_path / str(max(self._get_published_versions(), default=0))
+
+    def _delete_replaced(self) -> None:
+        """
+        Delete versions that have been replaced, unless another process is using compiled simlib.
+        In that case, they are deleted after some later compile instead.
+        """
+        try:
+            with file_lock(file=self._usage_lock_file, blocking=False):
+                for version in self._get_published_versions():
+                    old_path = self._versions_path / str(version)
+                    if old_path != self.output_path:
+                        delete(old_path)
+        except BlockingIOError:
+            print("Replaced Vivado simlib is in use by another process. Will be deleted later.")
+
+    # Name of the manifest file in "tar" archives.
+    _archive_manifest_name = "tsfpga_simlib_manifest.json"
+
+    @property
+    def _usage_lock_file(self) -> Path:
+        return self._versions_path.parent / f"{self._versions_path.name}_usage.lock"
 
     @abstractmethod
     def _compile(self) -> None:
@@ -123,8 +265,12 @@ class VivadoSimlibCommon(ABC):
 
     def add_to_vunit_project(self) -> None:
         """
-        Add the compiled simlib to your VUnit project.
+        Add the latest version of the compiled simlib to your VUnit project.
+        Should be called inside a :meth:`.use` block, that is kept for as long as the simulation
+        is running, so that the version is not deleted by a compile in another process.
         """
+        self.output_path = self._get_published_path()
+
         for library_name in self.library_names:
             library_path = self.output_path / library_name
             if not library_path.exists():
@@ -139,27 +285,172 @@ class VivadoSimlibCommon(ABC):
         Follows a format ``vivado-simlib-WW.XX.YY.ZZ`` suitable for storage and versioning
         in Artifactory.
         """
-        return self.output_path.name
+        return self._versions_path.name
 
-    def to_archive(self) -> Path:
+    def to_archive(self, archive_format: str = "zip", cancel: Event | None = None) -> Path | None:
         """
         Compress compiled simlib to an archive.
 
+        Arguments:
+            archive_format: Either ``zip``, ``tar.gz`` or ``tar.zst``.
+                The ``tar`` formats are written and read as a stream, with fast compression.
+                They include a manifest with the hash of each file, which is checked
+                by :meth:`.from_archive`.
+                ``tar.zst`` is faster than ``tar.gz``, but requires the ``zstandard`` Python
+                package.
+                See :func:`.get_fast_archive_format`.
+            cancel: Only for the ``tar`` formats.
+                If this event is set while the archive is being created, creation is stopped
+                and the temporary file is removed.
+
         Return:
             Path to the archive.
+            ``None`` if creation was cancelled.
         """
-        make_archive(str(self.output_path), "zip", self.output_path)
-        return self.output_path.parent / (self.output_path.name + ".zip")
+        archive = self._versions_path.parent / f"{self.artifact_name}.{archive_format}"
+        # The attribute might be updated by another thread while the archive is being created.
+        output_path = self.output_path
+
+        if archive_format == "zip":
+            make_archive(str(self._versions_path), "zip", output_path)
+            return archive
+
+        if archive_format not in ["tar.gz", "tar.zst"]:
+            raise ValueError(f"Unknown archive format: {archive_format}")
+
+        print(f"Creating {archive}...")
+
+        # Write to a temporary file, so that no one ever sees a partially written archive.
+        temp_file = archive.parent / f"{archive.name}.{uuid4().hex}.tmp"
+        try:
+            with (
+                temp_file.open("wb") as file_handle,
+                _open_compressed_writer(
+                    file_handle=file_handle, archive_format=archive_format
+                ) as stream,
+                tarfile.open(fileobj=stream, mode="w|") as tar,
+            ):
+                if not self._write_tar_archive(tar=tar, output_path=output_path, cancel=cancel):
+                    print(f"Cancelled {archive}")
+                    return None
+
+            temp_file.replace(archive)
+        finally:
+            delete(temp_file)
+
+        return archive
+
+    def _write_tar_archive(
+        self, tar: tarfile.TarFile, output_path: Path, cancel: Event | None
+    ) -> bool:
+        """
+        Return:
+            ``False`` if cancelled before all files were written.
+        """
+        manifest = {}
+
+        for path in sorted(output_path.rglob("*")):
+            if cancel is not None and cancel.is_set():
+                return False
+
+            name = path.relative_to(output_path).as_posix()
+            tar_info = tar.gettarinfo(name=str(path), arcname=name)
+
+            if path.is_dir():
+                # Also empty library folders must be restored.
+                tar.addfile(tar_info)
+            elif path.is_file():
+                with path.open("rb") as file_handle:
+                    reader = _HashingReader(file_handle=file_handle)
+                    tar.addfile(tar_info, fileobj=reader)
+
+                manifest[name] = reader.hash.hexdigest()
+
+        # Placed last, so that the hashes can be calculated while the files are written.
+        manifest_data = json.dumps(manifest, indent=2).encode()
+        manifest_info = tarfile.TarInfo(name=self._archive_manifest_name)
+        manifest_info.size = len(manifest_data)
+        manifest_info.mtime = int(time.time())
+        tar.addfile(manifest_info, fileobj=io.BytesIO(manifest_data))
+
+        return True
 
     def from_archive(self, archive: Path) -> None:
         """
         Unpack compiled simlib from an existing archive.
+        The result is published as a new version once all files are unpacked.
 
         Arguments:
-            archive: Path to a zip archive with previously compiled simlib.
+            archive: Path to an archive with previously compiled simlib, created
+                by :meth:`.to_archive`.
+                The format is given by the file ending.
         """
-        with zipfile.ZipFile(archive, "r") as zip_handle:
-            zip_handle.extractall(self.output_path)
+        archive_format = next(
+            (
+                archive_format
+                for archive_format in ["zip", "tar.gz", "tar.zst"]
+                if archive.name.endswith(f".{archive_format}")
+            ),
+            None,
+        )
+        if archive_format is None:
+            raise ValueError(f"Unknown archive format: {archive}")
+
+        with self.lock(), self._publish(copy_existing=False):
+            if archive_format == "zip":
+                with zipfile.ZipFile(archive, "r") as zip_handle:
+                    zip_handle.extractall(self.output_path)  # noqa: S202
+                return
+
+            with (
+                archive.open("rb") as file_handle,
+                _open_compressed_reader(
+                    file_handle=file_handle, archive_format=archive_format
+                ) as stream,
+                tarfile.open(fileobj=stream, mode="r|") as tar,
+            ):
+                self._read_tar_archive(tar=tar, archive=archive)
+
+    def _read_tar_archive(self, tar: tarfile.TarFile, archive: Path) -> None:
+        manifest = None
+        file_hashes = {}
+
+        for tar_info in tar:
+            if PurePosixPath(tar_info.name).is_absolute() or ".." in tar_info.name.split("/"):
+                raise ValueError(f"Bad path in archive {archive}: {tar_info.name}")
+
+            path = self.output_path / tar_info.name
+
+            if tar_info.isdir():
+                create_directory(path, empty=False)
+                continue
+
+            member_handle = tar.extractfile(tar_info)
+            if member_handle is None or not tar_info.isfile():
+                raise ValueError(f"Unsupported member in archive {archive}: {tar_info.name}")
+
+            if tar_info.name == self._archive_manifest_name:
+                manifest = json.loads(member_handle.read())
+                continue
+
+            create_directory(path.parent, empty=False)
+            with path.open("wb") as file_handle:
+                reader = _HashingReader(file_handle=member_handle)
+                shutil.copyfileobj(reader, file_handle)
+
+            file_hashes[tar_info.name] = reader.hash.hexdigest()
+            os.utime(path, (tar_info.mtime, tar_info.mtime))
+
+        if manifest is None:
+            raise ValueError(f"Archive has no manifest: {archive}")
+
+        if file_hashes != manifest:
+            bad_files = sorted(
+                name
+                for name in file_hashes.keys() | manifest.keys()
+                if file_hashes.get(name) != manifest.get(name)
+            )
+            raise ValueError(f"Archive {archive} has bad contents for: {', '.join(bad_files)}")
 
     def _get_version_tag(self) -> str:
         tag = "vivado-simlib-"
@@ -204,3 +495,86 @@ class VivadoSimlibCommon(ABC):
         Path to "done" token file.
         """
         return self.output_path / "done.txt"
+
+
+def get_fast_archive_format() -> str:
+    """
+    Get the fastest archive format for :meth:`.VivadoSimlibCommon.to_archive` that is available in
+    this Python environment.
+    ``tar.zst`` if the ``zstandard`` package is installed, otherwise ``tar.gz``.
+    """
+    return "tar.gz" if _import_zstandard() is None else "tar.zst"
+
+
+def _import_zstandard() -> ModuleType | None:
+    # Is an optional dependency, hence it can not be imported on top level.
+    try:
+        import zstandard  # noqa: PLC0415
+    except ImportError:
+        return None
+
+    return zstandard
+
+
+def _get_zstandard(archive_format: str) -> ModuleType:
+    zstandard = _import_zstandard()
+    if zstandard is None:
+        raise ModuleNotFoundError(
+            f'Archive format "{archive_format}" requires the "zstandard" Python package.'
+        )
+
+    return zstandard
+
+
+def _open_compressed_writer(
+    file_handle: BinaryIO, archive_format: str
+) -> AbstractContextManager[BinaryIO]:
+    """
+    Open a stream that compresses to the file.
+    The file handle is not closed when the stream is closed.
+    """
+    if archive_format == "tar.zst":
+        # Use all processor cores.
+        compressor = _get_zstandard(archive_format=archive_format).ZstdCompressor(
+            level=3, threads=-1
+        )
+        writer: AbstractContextManager[BinaryIO] = compressor.stream_writer(
+            file_handle, closefd=False
+        )
+        return writer
+
+    # Fastest level, since the compression ratio is much less important than the time.
+    return gzip.GzipFile(fileobj=file_handle, mode="wb", compresslevel=1)
+
+
+def _open_compressed_reader(
+    file_handle: BinaryIO, archive_format: str
+) -> AbstractContextManager[BinaryIO]:
+    """
+    Open a stream that decompresses from the file.
+    The file handle is not closed when the stream is closed.
+    """
+    if archive_format == "tar.zst":
+        decompressor = _get_zstandard(archive_format=archive_format).ZstdDecompressor()
+        reader: AbstractContextManager[BinaryIO] = decompressor.stream_reader(
+            file_handle, closefd=False
+        )
+        return reader
+
+    return gzip.GzipFile(fileobj=file_handle, mode="rb")
+
+
+class _HashingReader:
+    """
+    Wrap a file handle, and calculate the hash of all data that is read through it.
+    """
+
+    def __init__(self, file_handle: IO[bytes]) -> None:
+        self._file_handle = file_handle
+        self.hash = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._file_handle.read(size)
+        self.hash.update(data)
+
+        return data
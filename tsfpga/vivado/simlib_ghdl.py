@@ -10,13 +10,15 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from tsfpga.system_utils import run_command
 
 from .simlib_open_source import VivadoSimlibOpenSource
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from vunit.sim_if import SimulatorInterface
     from vunit.ui import VUnit
 
@@ -33,16 +35,35 @@ class VivadoSimlibGhdl(VivadoSimlibOpenSource):
     # is executed.
     _create_library_folder_before_compile = True
 
+    # GHDL rewrites the library index file at the end of each analysis.
+    # So design units would be lost if many processes analyze into the same library.
+    _supports_parallel_compile_within_library = False
+
+    _compile_flags: ClassVar = [
+        "--ieee=synopsys",
+        "--std=08",
+        "-fexplicit",
+        "-frelaxed-rules",
+        "--no-vital-checks",
+        "--warn-binding",
+        "--mb-comments",
+    ]
+
     def __init__(
         self,
         vivado_path: Path | None,
         output_path: Path,
         vunit_proj: VUnit,
         simulator_interface: SimulatorInterface,
+        num_threads: int = 1,
+        design_files: Iterable[Path] | None = None,
     ) -> None:
         """
         See superclass :class:`.VivadoSimlibCommon` constructor for details.
+        See :meth:`.VivadoSimlib.init` for ``num_threads`` and ``design_files``.
         """
+        self.num_threads = num_threads
+        self.design_files = None if design_files is None else list(design_files)
         self.ghdl_binary = Path(simulator_interface.find_prefix()) / "ghdl"
 
         super().__init__(
@@ -56,15 +77,9 @@ class VivadoSimlibGhdl(VivadoSimlibOpenSource):
         cmd = [
             str(self.ghdl_binary),
             "-a",
-            "--ieee=synopsys",
-            "--std=08",
+            *self._compile_flags,
             f"--workdir={output_path}",
             f"-P{self.output_path / 'unisim'}",
-            "-fexplicit",
-            "-frelaxed-rules",
-            "--no-vital-checks",
-            "--warn-binding",
-            "--mb-comments",
             f"--work={library_name}",
             *vhd_files,
         ]
@@ -10,13 +10,15 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from tsfpga.system_utils import run_command
 
 from .simlib_open_source import VivadoSimlibOpenSource
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from vunit.sim_if import SimulatorInterface
     from vunit.ui import VUnit
 
@@ -32,16 +34,26 @@ class VivadoSimlibNvc(VivadoSimlibOpenSource):
     # NVC compilation gives a warning if the folder exist when the analyze command is executed.
     _create_library_folder_before_compile = False
 
+    # NVC stores each design unit in a file of its own, and locks the library while it is updated.
+    _supports_parallel_compile_within_library = True
+
+    _compile_flags: ClassVar = ["--std=2008", "-M", "64m"]
+
     def __init__(
         self,
         vivado_path: Path | None,
         output_path: Path,
         vunit_proj: VUnit,
         simulator_interface: SimulatorInterface,
+        num_threads: int = 1,
+        design_files: Iterable[Path] | None = None,
     ) -> None:
         """
         See superclass :class:`.VivadoSimlibCommon` constructor for details.
+        See :meth:`.VivadoSimlib.init` for ``num_threads`` and ``design_files``.
         """
+        self.num_threads = num_threads
+        self.design_files = None if design_files is None else list(design_files)
         self.nvc_binary = Path(simulator_interface.find_prefix()) / "nvc"
 
         super().__init__(
@@ -60,9 +72,7 @@ class VivadoSimlibNvc(VivadoSimlibOpenSource):
         cmd = [
             str(self.nvc_binary),
             f"--work={library_name}",
-            "--std=2008",
-            "-M",
-            "64m",
+            *self._compile_flags,
         ]
         if library_name != "unisim":
             cmd.append(
@@ -8,11 +8,21 @@
 
 from __future__ import annotations
 
+import json
+import re
 from abc import abstractmethod
-from typing import TYPE_CHECKING, ClassVar
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from tsfpga import DEFAULT_FILE_ENCODING
-from tsfpga.system_utils import create_directory, system_is_windows
+from tsfpga.system_utils import (
+    calculate_file_hash,
+    create_directory,
+    create_file,
+    delete,
+    read_file,
+    system_is_windows,
+)
 
 from .simlib_common import VivadoSimlibCommon
 
@@ -25,22 +35,296 @@ class VivadoSimlibOpenSource(VivadoSimlibCommon):
     Common methods for handling Vivado simlib with an open-source simulator.
     See subclasses for details: :class:`.VivadoSimlibGhdl`, :class:`.VivadoSimlibNvc`.
 
+    If ``design_files`` are given, only the primitives that are used by the design are compiled,
+    along with the packages of the libraries and the primitives that they in turn use.
+    This is much faster than compiling all the thousands of primitives.
+    If the design starts using a primitive that is not compiled, :meth:`.compile_if_needed` will
+    compile only the missing files into the existing libraries.
+
+    A manifest of the compiled source files is kept for each library, so that only libraries
+    that are out of date are compiled again.
+    See :meth:`.compile_is_needed`.
+
     Do not instantiate this class directly.
     Use factory class :class:`.VivadoSimlib` instead.
     """
 
     library_names: ClassVar = ["unisim", "secureip", "unimacro", "unifast"]
 
+    # Files that define the packages of the libraries.
+    # Are always compiled, also when compiling only a subset of the primitives.
+    _package_file_names: ClassVar = {"unisim_vpkg", "unisim_retarget_vcomp", "unimacro_vcomp"}
+
+    # Finds component instantiations (e.g. "inst : BUFG port map") and references to design units
+    # in the libraries (e.g. "entity unisim.bufg" or "unisim.vcomponents.bufg").
+    _primitive_reference_re = re.compile(
+        r":\s*(?:component\s+)?(\w+)\s+(?:generic|port)\s+map\b"
+        r"|\b(?:unisim|unimacro)\.(?:\w+\.)?(\w+)"
+    )
+
     # Set in subclass.
     _create_library_folder_before_compile: bool
 
+    # Set in subclass.
+    # The flags that are given to the simulator for each compile.
+    # Are stored in the manifest of each library, so that a change leads to a recompile.
+    _compile_flags: ClassVar[list[str]]
+
+    # Set in subclass.
+    # True if the simulator can analyze files into the same library in many processes at
+    # the same time.
+    # If False, parallel compilation is only done between libraries.
+    _supports_parallel_compile_within_library: bool
+
+    # The number of compile processes to run in parallel.
+    # Set by the subclass constructor.
+    num_threads: int = 1
+
+    # If set, only the primitives that are used by these files will be compiled.
+    # Set by the subclass constructor.
+    design_files: list[Path] | None = None
+
+    @property
+    def compile_is_needed(self) -> bool:
+        """
+        See superclass :meth:`.VivadoSimlibCommon.compile_is_needed` for details.
+
+        Additionally, a compile is needed if any library is out of date, or if there are files
+        that shall be compiled that are not in the library.
+
+        Each library has a manifest, with the compile flags and the hash, size and modification
+        time of each source file that has been compiled into the library.
+        A library is out of date if the flags, or any of the source files, have changed.
+        A source file with the same size and modification time as in the manifest is considered
+        unchanged, without calculating its hash.
+        E.g. after a Vivado patch that updates the simulation sources, without changing the
+        Vivado version.
+
+        A compile with :meth:`.compile_if_needed` compiles only the libraries that are out of date.
+        All libraries use ``unisim``, so they are also compiled again if ``unisim`` is.
+        The other libraries are kept as they are.
+        When compiling a subset, and the design uses primitives that are not in the compiled
+        subset, only the missing files are compiled into the existing libraries.
+        """
+        if super().compile_is_needed:
+            return True
+
+        libraries_to_recompile, files_to_add = self._get_outdated_libraries()
+        return bool(libraries_to_recompile or files_to_add)
+
+    def _compile_outdated(self) -> None:
+        if super().compile_is_needed:
+            self._compile_all()
+            return
+
+        libraries_to_recompile, files_to_add = self._get_outdated_libraries()
+
+        libraries = {
+            library_name: libraries_to_recompile.get(
+                library_name, files_to_add.get(library_name, [])
+            )
+            for library_name in self.library_names
+        }
+        num_files = sum(len(vhd_files) for vhd_files in libraries.values())
+        print(f"Compiling {num_files} file(s) into Vivado simlib in {self.output_path}...")
+
+        with self._publish(copy_existing=True):
+            for library_name in libraries_to_recompile:
+                print(f"Vivado simlib library {library_name} is out of date.")
+                delete(self.output_path / library_name)
+                delete(self._get_manifest_file(library_name=library_name))
+
+            self._compile_libraries(libraries=libraries)
+
     def _compile(self) -> None:
-        self._compile_unisim()
-        self._compile_secureip()
-        self._compile_unimacro()
-        self._compile_unifast()
+        self._compile_libraries(libraries=self._get_libraries_to_compile())
+
+    def _get_libraries_to_compile(self) -> dict[str, list[Path]]:
+        """
+        Get the files that shall be compiled into each library, in compile order.
+        All files, or the subset that is needed by ``design_files``.
+        """
+        libraries = {
+            "unisim": self._get_unisim_files(),
+            "secureip": self._get_secureip_files(),
+            "unimacro": self._get_unimacro_files(),
+            "unifast": self._get_unifast_files(),
+        }
+
+        if self.design_files is None:
+            return libraries
+
+        return self._get_subset(libraries=libraries, design_files=self.design_files)
+
+    def _get_outdated_libraries(
+        self,
+    ) -> tuple[dict[str, list[Path]], dict[str, list[Path]]]:
+        """
+        Compare the files that shall be compiled with the manifest of each library.
+
+        Return:
+            Two dictionaries.
+            The first one has the libraries that must be compiled again from scratch, with all
+            the files that shall be compiled into them.
+            The second one has the libraries that are up to date but lack some files, with the
+            files that are missing.
+        """
+        libraries_to_recompile = {}
+        files_to_add = {}
+
+        for library_name, vhd_files in self._get_libraries_to_compile().items():
+            manifest = self._read_manifest(library_name=library_name)
+
+            if (
+                manifest is None
+                or manifest["flags"] != self._compile_flags
+                or "unisim" in libraries_to_recompile
+                or not self._manifest_files_are_unchanged(manifest_files=manifest["files"])
+            ):
+                libraries_to_recompile[library_name] = vhd_files
+                continue
+
+            missing_files = [
+                vhd_file
+                for vhd_file in vhd_files
+                if self._get_relative_path(vhd_file=vhd_file) not in manifest["files"]
+            ]
+            if missing_files:
+                files_to_add[library_name] = missing_files
+
+        return libraries_to_recompile, files_to_add
+
+    def _manifest_files_are_unchanged(self, manifest_files: dict[str, dict[str, Any]]) -> bool:
+        for relative_path, file_data in manifest_files.items():
+            vhd_file = self._libraries_path / relative_path
+            if not vhd_file.exists():
+                return False
+
+            stat = vhd_file.stat()
+            if stat.st_size != file_data["size"]:
+                return False
+
+            # Hashing all the source files is slow.
+            # Do it only if the file might have been changed.
+            if stat.st_mtime_ns != file_data["mtime_ns"] and (
+                calculate_file_hash(vhd_file) != file_data["hash"]
+            ):
+                return False
+
+        return True
+
+    @staticmethod
+    def _get_manifest_file_data(vhd_file: Path) -> dict[str, Any]:
+        # Before the hash, so that a change during hashing is seen by the next check.
+        stat = vhd_file.stat()
+
+        return {
+            "hash": calculate_file_hash(vhd_file),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def _compile_libraries(self, libraries: dict[str, list[Path]]) -> None:
+        """
+        Compile the files into each library, and add them to the manifest of the library.
+        Must have an entry for each library.
+        """
+        if self.num_threads > 1:
+            self._compile_in_parallel(libraries=libraries)
+        else:
+            for library_name, vhd_files in libraries.items():
+                self._compile_library(vhd_files=vhd_files, library_name=library_name)
+
+        for library_name, vhd_files in libraries.items():
+            # Libraries that have no files in the subset are not created by the compile,
+            # but they must exist when added to the VUnit project.
+            create_directory(self.output_path / library_name, empty=False)
+
+            manifest = self._read_manifest(library_name=library_name) or {"files": {}}
+            manifest["flags"] = self._compile_flags
+            for vhd_file in vhd_files:
+                manifest["files"][self._get_relative_path(vhd_file=vhd_file)] = (
+                    self._get_manifest_file_data(vhd_file=vhd_file)
+                )
+
+            create_file(
+                self._get_manifest_file(library_name=library_name), json.dumps(manifest, indent=2)
+            )
+
+    def _get_subset(
+        self, libraries: dict[str, list[Path]], design_files: list[Path]
+    ) -> dict[str, list[Path]]:
+        """
+        Get the files of each library that are needed by the design, in compile order.
+
+        The primitives used by the design are found by looking for instantiations and references
+        in the design files.
+        The files of these primitives are in turn searched for other primitives that they use,
+        until no new primitives are found.
+        The primitive name of a file is given by its file name, which is how the files are named
+        in the Vivado installation.
+        """
+        primitive_files: dict[str, list[Path]] = {}
+        for vhd_files in libraries.values():
+            for vhd_file in vhd_files:
+                name = vhd_file.stem.lower()
+                if name not in self._package_file_names:
+                    primitive_files.setdefault(name, []).append(vhd_file)
+
+        names_to_check = [
+            name
+            for design_file in design_files
+            for name in self._get_primitive_references(vhd_file=design_file)
+        ]
+        used_names = set()
+
+        while names_to_check:
+            name = names_to_check.pop()
+            if name in used_names or name not in primitive_files:
+                continue
+
+            used_names.add(name)
+            for vhd_file in primitive_files[name]:
+                names_to_check += self._get_primitive_references(vhd_file=vhd_file)
+
+        return {
+            library_name: [
+                vhd_file
+                for vhd_file in vhd_files
+                if vhd_file.stem.lower() in used_names | self._package_file_names
+            ]
+            for library_name, vhd_files in libraries.items()
+        }
+
+    @classmethod
+    def _get_primitive_references(cls, vhd_file: Path) -> set[str]:
+        """
+        Get the lower case names of all units that might be primitives, that are referenced
+        in the file.
+        """
+        # Some files are not valid UTF-8, but all the keywords and names are ASCII.
+        code = vhd_file.read_text(encoding=DEFAULT_FILE_ENCODING, errors="ignore").lower()
+        code = re.sub(r"--.*", "", code)
+
+        return {
+            name for match in cls._primitive_reference_re.findall(code) for name in match if name
+        }
 
-    def _compile_unisim(self) -> None:
+    def _get_relative_path(self, vhd_file: Path) -> str:
+        return vhd_file.relative_to(self._libraries_path).as_posix()
+
+    def _get_manifest_file(self, library_name: str) -> Path:
+        return self.output_path / f"{library_name}_manifest.json"
+
+    def _read_manifest(self, library_name: str) -> dict[str, Any] | None:
+        manifest_file = self._get_manifest_file(library_name=library_name)
+        if not manifest_file.exists():
+            return None
+
+        manifest: dict[str, Any] = json.loads(read_file(manifest_file))
+        return manifest
+
+    def _get_unisim_files(self) -> list[Path]:
         library_path = self._libraries_path / "unisims"
 
         vhd_files = []
@@ -62,13 +346,12 @@ class VivadoSimlibOpenSource(VivadoSimlibCommon):
         for vhd_file in retarget_dir.glob("*.vhd"):
             vhd_files.append(vhd_file)
 
-        self._compile_library(vhd_files=vhd_files, library_name="unisim")
+        return vhd_files
 
-    def _compile_secureip(self) -> None:
-        vhd_files = list((self._libraries_path / "unisims" / "secureip").glob("*.vhd"))
-        self._compile_library(vhd_files=vhd_files, library_name="secureip")
+    def _get_secureip_files(self) -> list[Path]:
+        return list((self._libraries_path / "unisims" / "secureip").glob("*.vhd"))
 
-    def _compile_unimacro(self) -> None:
+    def _get_unimacro_files(self) -> list[Path]:
         library_path = self._libraries_path / "unimacro"
 
         vhd_files = []
@@ -80,13 +363,11 @@ class VivadoSimlibOpenSource(VivadoSimlibCommon):
 
         vhd_files += self._get_compile_order(library_path=library_path)
 
-        self._compile_library(vhd_files=vhd_files, library_name="unimacro")
+        return vhd_files
 
-    def _compile_unifast(self) -> None:
+    def _get_unifast_files(self) -> list[Path]:
         library_path = self._libraries_path / "unifast" / "primitive"
-        vhd_files = self._get_compile_order(library_path=library_path)
-
-        self._compile_library(vhd_files=vhd_files, library_name="unifast")
+        return self._get_compile_order(library_path=library_path)
 
     @staticmethod
     def _get_compile_order(library_path: Path) -> list[Path]:
@@ -108,13 +389,136 @@ class VivadoSimlibOpenSource(VivadoSimlibCommon):
 
         return vhd_files
 
+    @staticmethod
+    def _get_compile_levels(vhd_files: list[Path], library_name: str) -> list[list[Path]]:
+        """
+        Split the files of a library, given in compile order, into levels.
+        The files of one level depend only on files of earlier levels, so they can be compiled
+        in parallel once the earlier levels are done.
+
+        Dependencies are found by looking for references to design units within the same
+        library (e.g. ``use unisim.vpkg.all`` or ``entity work.apa``), that are defined in files
+        earlier in the compile order.
+        Component instantiations are not dependencies, since components are bound first
+        when elaborating.
+        """
+        definition_re = re.compile(r"^\s*(?:entity|package)\s+(\w+)\s+is\b", re.MULTILINE)
+        reference_re = re.compile(rf"\b(?:work|{library_name})\.(\w+)")
+
+        unit_levels: dict[str, int] = {}
+        levels: list[list[Path]] = []
+
+        for vhd_file in vhd_files:
+            # Some files are not valid UTF-8, but all the keywords and names are ASCII.
+            code = vhd_file.read_text(encoding=DEFAULT_FILE_ENCODING, errors="ignore").lower()
+            code = re.sub(r"--.*", "", code)
+
+            level = max(
+                (
+                    unit_levels[unit_name] + 1
+                    for unit_name in reference_re.findall(code)
+                    if unit_name in unit_levels
+                ),
+                default=0,
+            )
+
+            for unit_name in definition_re.findall(code):
+                unit_levels[unit_name] = level
+
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(vhd_file)
+
+        return levels
+
+    def _compile_in_parallel(self, libraries: dict[str, list[Path]]) -> None:
+        """
+        Compile the libraries with many compile processes in parallel.
+
+        The other libraries use unisim, so it is compiled first.
+        The other libraries are then compiled at the same time.
+        Within each library, the files of each level (see :meth:`._get_compile_levels`) are split
+        between many processes, if supported by the simulator.
+        """
+        print(f"Compiling with {self.num_threads} parallel processes...")
+
+        with ThreadPoolExecutor(max_workers=self.num_threads) as compile_executor:
+            self._compile_library_in_parallel(
+                vhd_files=libraries["unisim"],
+                library_name="unisim",
+                compile_executor=compile_executor,
+            )
+
+            # Each library is handled by a thread of its own, that dispatches compile jobs.
+            other_libraries = [name for name in libraries if name != "unisim"]
+            with ThreadPoolExecutor(max_workers=len(other_libraries)) as library_executor:
+                futures = [
+                    library_executor.submit(
+                        self._compile_library_in_parallel,
+                        vhd_files=libraries[library_name],
+                        library_name=library_name,
+                        compile_executor=compile_executor,
+                    )
+                    for library_name in other_libraries
+                ]
+
+                for future in futures:
+                    future.result()
+
+    def _compile_library_in_parallel(
+        self, vhd_files: list[Path], library_name: str, compile_executor: ThreadPoolExecutor
+    ) -> None:
+        output_path = self._create_library_folder(library_name=library_name)
+
+        if not self._supports_parallel_compile_within_library:
+            future = compile_executor.submit(
+                self._compile_files,
+                output_path=output_path,
+                library_name=library_name,
+                vhd_files=vhd_files,
+            )
+            future.result()
+            return
+
+        for level in self._get_compile_levels(vhd_files=vhd_files, library_name=library_name):
+            num_chunks = min(self.num_threads, len(level))
+            futures = [
+                compile_executor.submit(
+                    self._compile_files,
+                    output_path=output_path,
+                    library_name=library_name,
+                    vhd_files=level[chunk_index::num_chunks],
+                )
+                for chunk_index in range(num_chunks)
+            ]
+
+            # Wait for the whole level to finish before the next one, which depends on it.
+            # Will raise any exception from the compile.
+            for future in futures:
+                future.result()
+
     def _compile_library(self, vhd_files: list[Path], library_name: str) -> None:
         """
         Compile all files of the library.
         """
+        output_path = self._create_library_folder(library_name=library_name)
+        self._compile_files(output_path=output_path, library_name=library_name, vhd_files=vhd_files)
+
+    def _create_library_folder(self, library_name: str) -> Path:
         output_path = self.output_path / library_name
         if self._create_library_folder_before_compile:
-            create_directory(output_path, empty=True)
+            # A compile starts with an empty output folder, so any existing library folder is from
+            # an earlier step of this compile, or from a library that shall be extended.
+            create_directory(output_path, empty=False)
+
+        return output_path
+
+    def _compile_files(self, output_path: Path, library_name: str, vhd_files: list[Path]) -> None:
+        """
+        Compile the files into the library, which must already have been set up.
+        """
+        if not vhd_files:
+            return
 
         # There seems to be a command length limit on Windows.
         # While compiling all files in one command gives a huge performance boost
@@ -0,0 +1,203 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import tsfpga
+from tsfpga.directory_cache import DirectoryCache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from tsfpga.build_step_tcl_hook import BuildStepTclHook
+    from tsfpga.constraint import Constraint
+    from tsfpga.ip_core_file import IpCoreFile
+    from tsfpga.module_list import ModuleList
+
+    from .generics import BitVectorGenericValue, StringGenericValue
+
+
+class SynthesisCheckpointCache(DirectoryCache):
+    """
+    A content-addressed cache of synthesized designs.
+
+    Each entry in the cache is a copy of a completed Vivado synthesis run directory, containing the
+    design checkpoint (``.dcp``) as well as the reports that tsfpga reads after synthesis.
+    The entry is stored in a folder named after a hash of all the inputs to synthesis.
+    If none of the inputs change, a later build can restore the synthesized design from the cache
+    and continue straight to implementation.
+    """
+
+    _description = "synthesized design"
+
+    # The version of the cache format.
+    # Can be bumped to invalidate all existing entries, if e.g. the folder structure is changed.
+    _format_version_id = 1
+
+    def get_key(  # noqa: PLR0913
+        self,
+        modules: ModuleList,
+        part: str,
+        top: str,
+        run_index: int,
+        generics: dict[str, bool | float | StringGenericValue | BitVectorGenericValue],
+        constraints: Iterable[Constraint],
+        tcl_sources: list[Path],
+        build_step_hooks: list[BuildStepTclHook],
+        vivado_version: str,
+        other_data: dict[str, Any] | None = None,
+        other_arguments: dict[str, Any] | None = None,
+    ) -> str:
+        """
+        Calculate a key that is unique for the given set of synthesis inputs.
+
+        Arguments:
+            modules: Synthesis source files and IP cores from these modules will be included.
+            part: The part that the design is synthesized for.
+            top: Name of the top level entity.
+            run_index: The index of the synthesis run (synth_X).
+            generics: All generics that are set for the synthesis.
+            constraints: All constraints of the project.
+                The ones not used in synthesis will be ignored.
+            tcl_sources: TCL files that are sourced when creating the project.
+            build_step_hooks: Build step hooks of the project.
+                The ones not used in synthesis will be ignored.
+            vivado_version: The version of the Vivado installation that runs the synthesis.
+            other_data: Any further data that affects the synthesized design.
+            other_arguments: Will be passed on to the module file getters.
+
+        Return:
+            A hexadecimal hash string.
+        """
+        other_arguments = {} if other_arguments is None else other_arguments
+
+        data = self._get_common_data(part=part, top=top, vivado_version=vivado_version)
+        data += f"run_index: {run_index}\n"
+
+        for name in sorted(generics):
+            data += f"generic: {name}={self._get_generic_data(generics[name])}\n"
+
+        if other_data:
+            data += f"other: {json.dumps(other_data, sort_keys=True, default=str)}\n"
+
+        for module in modules:
+            hdl_files = module.get_synthesis_files(**other_arguments)
+            for hdl_file in sorted(hdl_files, key=lambda hdl_file: hdl_file.path.name):
+                data += f"source: {module.library_name}.{self._get_file_data(hdl_file.path)}\n"
+
+            ip_core_files = module.get_ip_core_files(**other_arguments)
+            data += self._get_ip_core_files_data(ip_core_files=ip_core_files)
+
+        data += self._get_settings_data(
+            constraints=constraints, tcl_sources=tcl_sources, build_step_hooks=build_step_hooks
+        )
+
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def get_out_of_context_key(  # noqa: PLR0913
+        self,
+        files: list[Path],
+        part: str,
+        top: str,
+        constraints: Iterable[Constraint],
+        tcl_sources: list[Path],
+        build_step_hooks: list[BuildStepTclHook],
+        vivado_version: str,
+    ) -> str:
+        """
+        Calculate a key that is unique for the given set of out-of-context synthesis inputs.
+        Note that out-of-context synthesis always uses the default values of the generics.
+
+        Arguments:
+            files: The files in the out-of-context block set.
+            part: The part that the design is synthesized for.
+            top: Name of the out-of-context entity.
+            constraints: All constraints of the project.
+                The ones not used in synthesis will be ignored.
+            tcl_sources: TCL files that are sourced when creating the project.
+            build_step_hooks: Build step hooks of the project.
+                The ones not used in synthesis will be ignored.
+            vivado_version: The version of the Vivado installation that runs the synthesis.
+
+        Return:
+            A hexadecimal hash string.
+        """
+        data = self._get_common_data(part=part, top=top, vivado_version=vivado_version)
+        data += "out_of_context: true\n"
+
+        for file in sorted(files, key=lambda file: file.name):
+            data += f"source: {self._get_file_data(file)}\n"
+
+        data += self._get_settings_data(
+            constraints=constraints, tcl_sources=tcl_sources, build_step_hooks=build_step_hooks
+        )
+
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _get_common_data(self, part: str, top: str, vivado_version: str) -> str:
+        data = f"format: {self._format_version_id}\n"
+        data += f"tsfpga: {tsfpga.__version__}\n"
+        data += f"vivado: {vivado_version}\n"
+        data += f"part: {part}\n"
+        data += f"top: {top}\n"
+
+        return data
+
+    def _get_settings_data(
+        self,
+        constraints: Iterable[Constraint],
+        tcl_sources: list[Path],
+        build_step_hooks: list[BuildStepTclHook],
+    ) -> str:
+        data = ""
+
+        for constraint in constraints:
+            if constraint.used_in_synthesis:
+                data += (
+                    f"constraint: {constraint.ref} {constraint.processing_order} "
+                    f"{self._get_file_data(constraint.file)}\n"
+                )
+
+        for tcl_source in tcl_sources:
+            data += f"tcl_source: {self._get_file_data(tcl_source)}\n"
+
+        for build_step_hook in build_step_hooks:
+            if build_step_hook.step_is_synth:
+                data += (
+                    f"build_step_hook: {build_step_hook.hook_step} "
+                    f"{self._get_file_data(build_step_hook.tcl_file)}\n"
+                )
+
+        return data
+
+    def _get_generic_data(
+        self, value: bool | float | StringGenericValue | BitVectorGenericValue
+    ) -> str:
+        result = str(value)
+
+        # A string generic might be a path to e.g. a memory initialization file that is read
+        # during synthesis.
+        # In that case we want the key to depend on the contents, not the path.
+        path = Path(result)
+        if path.is_absolute() and path.is_file():
+            return self._get_file_data(path)
+
+        return result
+
+    def _get_ip_core_files_data(self, ip_core_files: list[IpCoreFile]) -> str:
+        data = ""
+        for ip_core_file in sorted(ip_core_files, key=lambda ip_core_file: ip_core_file.path.name):
+            variables = json.dumps(ip_core_file.variables, sort_keys=True, default=str)
+            data += f"ip_core: {self._get_file_data(ip_core_file.path)} {variables}\n"
+
+        return data
@@ -14,6 +14,7 @@ from tsfpga.hdl_file import HdlFile
 
 from .common import to_tcl_path
 from .generics import BitVectorGenericValue, StringGenericValue, get_vivado_tcl_generic_value
+from .reconfigurable_partition import get_configuration_run_name, get_configurations
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -21,11 +22,54 @@ if TYPE_CHECKING:
 
     from tsfpga.build_step_tcl_hook import BuildStepTclHook
     from tsfpga.constraint import Constraint
+    from tsfpga.ip_core_file import IpCoreFile
     from tsfpga.module_list import ModuleList
 
+    from .reconfigurable_partition import ReconfigurableModule, ReconfigurablePartition
+
+
+# Vivado implementation strategies that are set up by 'vivado_strategies.tcl' for
+# implementation explore.
+# The strategy at index N is used by the run "impl_explore_<N + 1>".
+# Must be kept in sync with the TCL file.
+VIVADO_STRATEGIES = [
+    "Vivado Implementation Defaults",
+    "Performance_ExplorePostRoutePhysOpt",
+    "Area_Explore",
+    "Congestion_SpreadLogic_medium",
+    "Congestion_SSI_SpreadLogic_high",
+    "Performance_WLBlockPlacementFanoutOpt",
+    "Flow_RuntimeOptimized",
+    "Area_ExploreSequential",
+    "Power_ExploreArea",
+    "Area_ExploreWithRemap",
+    "Flow_Quick",
+    "Flow_RunPhysOpt",
+    "Performance_ExtraTimingOpt",
+    "Power_DefaultOpt",
+    "Performance_NetDelay_low",
+    "Performance_EarlyBlockPlacement",
+    "Performance_Auto_3",
+    "Performance_WLBlockPlacement",
+    "Performance_ExploreWithRemap",
+    "Flow_RunPostRoutePhysOpt",
+    "Congestion_SSI_SpreadLogic_low",
+    "Performance_Auto_1",
+    "Performance_Explore",
+    "Performance_BalanceSLRs",
+    "Performance_Retiming",
+    "Performance_Auto_2",
+    "Performance_HighUtilSLRs",
+    "Performance_BalanceSLLs",
+    "Congestion_SpreadLogic_high",
+    "Performance_NetDelay_high",
+    "Performance_SpreadSLLs",
+    "Performance_RefinePlacement",
+    "Congestion_SpreadLogic_low",
+]
 
 # Number of available Vivado implementation strategies
-NUM_VIVADO_STRATEGIES = 33
+NUM_VIVADO_STRATEGIES = len(VIVADO_STRATEGIES)
 
 
 class VivadoTcl:
@@ -57,6 +101,20 @@ class VivadoTcl:
         ip_cores_only: bool = False,
         # Will be passed on to module functions. Enables parameterization of e.g. IP cores.
         other_arguments: dict[str, Any] | None = None,
+        # Entity name: file where the list of files in the out-of-context block set is written.
+        out_of_context_entities: dict[str, Path] | None = None,
+        # Block design TCL script: folder where the block design shall be placed.
+        block_designs: dict[Path, Path] | None = None,
+        # Scripts of the block designs that have been restored from cache, and shall only be added.
+        restored_block_designs: list[Path] | None = None,
+        # Generate output products of the block designs that are created.
+        generate_block_designs: bool = False,
+        # Write the names of the IPs that are created by each IP core file to this file.
+        ip_core_ips_file: Path | None = None,
+        # Generate output products and synthesize IP cores, with this many parallel jobs.
+        num_ip_core_jobs: int | None = None,
+        # Set up the project for Dynamic Function eXchange with these partitions.
+        reconfigurable_partitions: list[ReconfigurablePartition] | None = None,
     ) -> str:
         generics = {} if generics is None else generics
         other_arguments = {} if other_arguments is None else other_arguments
@@ -72,6 +130,16 @@ set_property "target_language" "VHDL" [current_project]
         if not ip_cores_only:
             tcl += self._add_module_source_files(modules=modules, other_arguments=other_arguments)
             tcl += self._add_tcl_sources(tcl_sources)
+            tcl += self._add_block_designs(
+                block_designs=block_designs,
+                restored_block_designs=restored_block_designs,
+                generate=generate_block_designs,
+            )
+            tcl += self._add_reconfigurable_partitions(
+                partitions=reconfigurable_partitions,
+                run_index=run_index,
+                other_arguments=other_arguments,
+            )
             tcl += self._add_generics(generics=generics)
 
             constraints = list(
@@ -82,7 +150,9 @@ set_property "target_language" "VHDL" [current_project]
             tcl += self._add_constraints(constraints=constraints)
             tcl += self._add_build_step_hooks(build_step_hooks=build_step_hooks)
 
-        tcl += self._add_ip_cores(modules=modules, other_arguments=other_arguments)
+        tcl += self._add_ip_cores(
+            modules=modules, other_arguments=other_arguments, ip_core_ips_file=ip_core_ips_file
+        )
         tcl += self._add_project_settings()
 
         tcl += f"""
@@ -92,6 +162,12 @@ set_property "top" "{top}" [current_fileset]
 reorder_files -auto -disable_unused
 
 """
+        if num_ip_core_jobs is not None and not ip_cores_only:
+            tcl += self._generate_ip_cores(num_jobs=num_ip_core_jobs)
+
+        if out_of_context_entities and not ip_cores_only:
+            tcl += self._add_out_of_context_entities(entities=out_of_context_entities)
+
         if disable_io_buffers:
             tcl += f"""\
 set_property -name "STEPS.SYNTH_DESIGN.ARGS.MORE OPTIONS" \
@@ -104,6 +180,185 @@ exit
 """
         return tcl
 
+    @staticmethod
+    def _add_block_designs(
+        block_designs: dict[Path, Path] | None,
+        restored_block_designs: list[Path] | None,
+        generate: bool,
+    ) -> str:
+        """
+        Create or add block designs, each one in a separate folder.
+        The TCL scripts are expected to be generated by 'write_bd_tcl' for a remote block design,
+        meaning that they honor the '::origin_dir_loc' variable.
+        """
+        if not block_designs:
+            return ""
+
+        restored_block_designs = [] if restored_block_designs is None else restored_block_designs
+
+        tcl = """
+# ------------------------------------------------------------------------------
+"""
+        for tcl_file, folder in block_designs.items():
+            folder_path = to_tcl_path(folder)
+            bd_files = f'[glob -directory {{{folder_path}}} "*/*.bd"]'
+
+            if tcl_file in restored_block_designs:
+                tcl += f"add_files -norecurse {bd_files}\n\n"
+                continue
+
+            tcl += f"""\
+set ::origin_dir_loc {{{folder_path}}}
+source -notrace {{{to_tcl_path(tcl_file)}}}
+unset ::origin_dir_loc
+"""
+            if generate:
+                tcl += f"""\
+foreach bd_file {bd_files} {{
+  generate_target "all" [get_files ${{bd_file}}]
+}}
+"""
+            tcl += "\n"
+
+        return tcl
+
+    @staticmethod
+    def _add_out_of_context_entities(entities: dict[str, Path]) -> str:
+        """
+        Create an out-of-context block set for each entity.
+        Vivado will create a separate synthesis run for each block set, that is launched
+        automatically (and in parallel) before the top level synthesis.
+        The entity is a black box in top level synthesis, and the out-of-context checkpoint
+        is linked in when the design is opened.
+
+        Write the list of files that Vivado moves to each block set, so that the
+        synthesis checkpoint cache knows what the out-of-context run depends on.
+        """
+        tcl = """
+# ------------------------------------------------------------------------------
+"""
+        for entity, file_list in entities.items():
+            file_list_path = to_tcl_path(file_list)
+            tcl += f"""\
+create_fileset -blockset -define_from "{entity}" "{entity}"
+
+file mkdir [file dirname {{{file_list_path}}}]
+set file_handle [open {{{file_list_path}}} "w"]
+foreach file [get_files -of_objects [get_filesets "{entity}"]] {{
+  puts ${{file_handle}} ${{file}}
+}}
+close ${{file_handle}}
+
+"""
+
+        return tcl
+
+    def _add_reconfigurable_partitions(
+        self,
+        partitions: list[ReconfigurablePartition] | None,
+        run_index: int,
+        other_arguments: dict[str, Any],
+    ) -> str:
+        """
+        Set up the project for Dynamic Function eXchange (DFX).
+        Vivado will create a separate out-of-context synthesis run for each reconfigurable module.
+
+        The first configuration is implemented by the regular implementation run, together with
+        the static design.
+        Each other configuration is implemented by a child run, which uses the locked static
+        design from the parent run.
+        Child runs can be launched in parallel, and can be re-launched on their own when only
+        the reconfigurable modules in their configuration have changed.
+        """
+        if not partitions:
+            return ""
+
+        tcl = """
+# ------------------------------------------------------------------------------
+set_property "PR_FLOW" true [current_project]
+
+"""
+        for partition in partitions:
+            tcl += f'create_partition_def -name "{partition.name}" -module "{partition.module}"\n'
+
+            for reconfigurable_module in partition.reconfigurable_modules:
+                tcl += f"""\
+create_reconfig_module -name "{reconfigurable_module.name}" \
+-partition_def [get_partition_defs "{partition.name}"]
+"""
+                tcl += self._add_reconfigurable_module_files(
+                    reconfigurable_module=reconfigurable_module, other_arguments=other_arguments
+                )
+
+            tcl += "\n"
+
+        impl_run = get_configuration_run_name(run_index=run_index, configuration_index=0)
+
+        for index, configuration in enumerate(get_configurations(partitions=partitions)):
+            configuration_name = f"config_{index + 1}"
+
+            modules = " ".join(
+                f"{{{partition.instance}:{reconfigurable_module.name}}}"
+                for partition, reconfigurable_module in configuration.items()
+                if reconfigurable_module is not None
+            )
+            tcl += (
+                f'create_pr_configuration -name "{configuration_name}" -partitions [list {modules}]'
+            )
+
+            greyboxes = " ".join(
+                f"{{{partition.instance}}}"
+                for partition, reconfigurable_module in configuration.items()
+                if reconfigurable_module is None
+            )
+            if greyboxes:
+                tcl += f" -greyboxes [list {greyboxes}]"
+
+            tcl += "\n"
+
+            if index == 0:
+                tcl += (
+                    f'set_property "PR_CONFIGURATION" "{configuration_name}" '
+                    f'[get_runs "{impl_run}"]\n\n'
+                )
+            else:
+                run_name = get_configuration_run_name(
+                    run_index=run_index, configuration_index=index
+                )
+                tcl += f"""\
+create_run "{run_name}" -parent_run [get_runs "{impl_run}"] \
+-flow [get_property "FLOW" [get_runs "{impl_run}"]] -pr_config "{configuration_name}"
+
+"""
+
+        return tcl
+
+    def _add_reconfigurable_module_files(
+        self, reconfigurable_module: ReconfigurableModule, other_arguments: dict[str, Any]
+    ) -> str:
+        get_module = f'[get_reconfig_modules "{reconfigurable_module.name}"]'
+
+        tcl = ""
+        for module in reconfigurable_module.modules:
+            hdl_files = module.get_synthesis_files(**other_arguments)
+            if not hdl_files:
+                continue
+
+            files_string = self._to_file_list([hdl_file.path for hdl_file in hdl_files])
+            tcl += f"add_files -norecurse -of_objects {get_module} {files_string}\n"
+
+            vhdl_files = [
+                hdl_file.path for hdl_file in hdl_files if hdl_file.type == HdlFile.Type.VHDL
+            ]
+            if vhdl_files:
+                files_string = self._to_file_list(vhdl_files)
+                tcl += f"""\
+set_property -dict [list "LIBRARY" "{module.library_name}" "FILE_TYPE" "VHDL 2008"] \
+[get_files -of_objects {get_module} {files_string}]
+"""
+
+        return tcl
+
     def _add_module_source_files(self, modules: ModuleList, other_arguments: dict[str, Any]) -> str:
         if len(modules) == 0:
             return ""
@@ -171,32 +426,234 @@ exit
 
         return f"{tcl}\n"
 
+    def _add_ip_cores(
+        self,
+        modules: ModuleList,
+        other_arguments: dict[str, Any],
+        ip_core_ips_file: Path | None = None,
+    ) -> str:
+        ip_core_files = []
+        for module in modules:
+            ip_core_files += module.get_ip_core_files(**other_arguments)
+
+        return self._source_ip_cores(ip_core_files=ip_core_files, ip_core_ips_file=ip_core_ips_file)
+
     @staticmethod
-    def _add_ip_cores(modules: ModuleList, other_arguments: dict[str, Any]) -> str:
+    def _source_ip_cores(ip_core_files: list[IpCoreFile], ip_core_ips_file: Path | None) -> str:
         tcl = ""
-        for module in modules:
-            for ip_core_file in module.get_ip_core_files(**other_arguments):
-                create_function_name = f"create_ip_core_{ip_core_file.name}"
-                tcl += f"proc {create_function_name} {{}} {{\n"
+        for ip_core_file in ip_core_files:
+            create_function_name = f"create_ip_core_{ip_core_file.name}"
+            tcl += f"proc {create_function_name} {{}} {{\n"
 
-                if ip_core_file.variables:
-                    for key, value in ip_core_file.variables.items():
-                        tcl += f'  set {key} "{value}"\n'
+            if ip_core_file.variables:
+                for key, value in ip_core_file.variables.items():
+                    tcl += f'  set {key} "{value}"\n'
 
-                tcl += f"""\
+            tcl += f"""\
   source -notrace {{{to_tcl_path(ip_core_file.path)}}}
 }}
+"""
+            if ip_core_ips_file is None:
+                tcl += f"{create_function_name}\n\n"
+            else:
+                tcl += f"""\
+set ips_before [get_ips -quiet]
 {create_function_name}
+puts ${{ip_core_ips_file}} "{ip_core_file.name} [get_new_ips ${{ips_before}}]"
 
 """
         if tcl == "":
             return ""
 
+        if ip_core_ips_file is None:
+            return f"""
+# ------------------------------------------------------------------------------
+{tcl}\
+"""
+
         return f"""
 # ------------------------------------------------------------------------------
+proc get_new_ips {{ips_before}} {{
+  set result {{}}
+  foreach ip [get_ips -quiet] {{
+    if {{[lsearch -exact ${{ips_before}} ${{ip}}] == -1}} {{
+      lappend result ${{ip}}
+    }}
+  }}
+  return ${{result}}
+}}
+
+set ip_core_ips_file [open {{{to_tcl_path(ip_core_ips_file)}}} "w"]
+
 {tcl}\
+close ${{ip_core_ips_file}}
+
 """
 
+    @staticmethod
+    def _generate_ip_cores(num_jobs: int) -> str:
+        """
+        Generate output products of all IP cores, and synthesize the out-of-context IP cores in
+        parallel runs.
+        Otherwise, this would be done serially in the beginning of the top level synthesis.
+        """
+        return f"""
+# ------------------------------------------------------------------------------
+set ips [get_ips -quiet]
+
+if {{[llength ${{ips}}] > 0}} {{
+  generate_target "all" ${{ips}}
+
+  set ip_runs {{}}
+  foreach ip ${{ips}} {{
+    set ip_file [get_files -quiet [get_property "IP_FILE" ${{ip}}]]
+    if {{[get_property "GENERATE_SYNTH_CHECKPOINT" ${{ip_file}}]}} {{
+      lappend ip_runs [create_ip_run ${{ip_file}}]
+    }}
+  }}
+
+  if {{[llength ${{ip_runs}}] > 0}} {{
+    launch_runs ${{ip_runs}} -jobs {num_jobs}
+
+    foreach run ${{ip_runs}} {{
+      wait_on_run ${{run}}
+
+      if {{[get_property "PROGRESS" ${{run}}] != "100%"}} {{
+        puts "ERROR: Run ${{run}} failed."
+        exit 1
+      }}
+    }}
+  }}
+}}
+
+"""
+
+    @staticmethod
+    def bitstream_variants(
+        routed_checkpoint: Path,
+        bit_file: Path,
+        memory_info_file: Path,
+        variants: dict[Path, dict[str, Path]],
+    ) -> str:
+        """
+        Make a TCL script that produces bitstream variants, where the contents of block RAMs
+        are updated in the bitstream of an implemented design.
+
+        Arguments:
+            routed_checkpoint: The routed design checkpoint, from which the memory information
+                is written.
+            bit_file: The bitstream of the implemented design.
+            memory_info_file: The memory information will be written to this file.
+            variants: Bitstream file of each variant, along with the data to load into each
+                memory of that variant.
+
+        Return:
+            The TCL script.
+        """
+        tcl = f"""\
+open_checkpoint {{{to_tcl_path(routed_checkpoint)}}}
+write_mem_info -force {{{to_tcl_path(memory_info_file)}}}
+close_design
+
+set updatemem [file join $::env(XILINX_VIVADO) "bin" "updatemem"]
+"""
+        for variant_bit_file, memory_data in variants.items():
+            data = "".join(
+                f" -data {{{to_tcl_path(data_file)}}} -proc {{{instance}}}"
+                for instance, data_file in memory_data.items()
+            )
+
+            tcl += f"""
+# ------------------------------------------------------------------------------
+exec -ignorestderr ${{updatemem}} -force -meminfo {{{to_tcl_path(memory_info_file)}}} \
+-bit {{{to_tcl_path(bit_file)}}}{data} -out {{{to_tcl_path(variant_bit_file)}}}
+"""
+
+        tcl += """
+# ------------------------------------------------------------------------------
+exit
+"""
+        return tcl
+
+    def pre_warm_ip_cache(
+        self,
+        project_folder: Path,
+        part: str,
+        ip_core_files: list[IpCoreFile],
+        ip_cache_path: Path,
+        num_jobs: int,
+    ) -> str:
+        """
+        Make a TCL script that creates a project with the given IP cores, and synthesizes them
+        so that they are stored in the IP cache.
+
+        Arguments:
+            project_folder: The project will be placed here.
+            part: The part that the IP cores are synthesized for.
+            ip_core_files: IP cores that shall be synthesized.
+            ip_cache_path: Path to the IP cache.
+            num_jobs: The number of IP core synthesis runs that will be launched in parallel.
+
+        Return:
+            The TCL script.
+        """
+        tcl = f"""\
+create_project -part "{part}" "{self.name}" {{{to_tcl_path(project_folder)}}}
+set_property "target_language" "VHDL" [current_project]
+
+config_ip_cache -use_cache_location {{{to_tcl_path(ip_cache_path)}}}
+"""
+        tcl += self._source_ip_cores(ip_core_files=ip_core_files, ip_core_ips_file=None)
+        tcl += self._generate_ip_cores(num_jobs=num_jobs)
+
+        tcl += """
+# ------------------------------------------------------------------------------
+exit
+"""
+        return tcl
+
+    def update_ip_cores(
+        self,
+        project_file: Path,
+        ip_core_files: list[IpCoreFile],
+        remove_ips: list[str],
+        ip_core_ips_file: Path,
+    ) -> str:
+        """
+        Make a TCL script that updates the IP cores of an existing project.
+        Will remove the given IPs, and then (re)create the IPs of the given IP core files.
+
+        Arguments:
+            project_file: The Vivado project file.
+            ip_core_files: IP core files that shall be sourced.
+            remove_ips: Names of IPs that shall be removed from the project.
+            ip_core_ips_file: The names of the IPs that are created by each IP core file will be
+                written to this file.
+
+        Return:
+            The TCL script.
+        """
+        tcl = f"open_project {{{to_tcl_path(project_file)}}}\n"
+
+        if remove_ips:
+            ips = " ".join(f'"{ip}"' for ip in remove_ips)
+            tcl += f"""
+# ------------------------------------------------------------------------------
+foreach ip [get_ips -quiet {{{ips}}}] {{
+  set ip_file [get_property "IP_FILE" ${{ip}}]
+  remove_files ${{ip_file}}
+  file delete -force [file dirname ${{ip_file}}]
+}}
+"""
+
+        tcl += self._source_ip_cores(ip_core_files=ip_core_files, ip_core_ips_file=ip_core_ips_file)
+
+        tcl += """
+# ------------------------------------------------------------------------------
+exit
+"""
+        return tcl
+
     def _add_build_step_hooks(
         self, build_step_hooks: dict[str, tuple[Path, list[BuildStepTclHook]]] | None
     ) -> str:
@@ -318,7 +775,7 @@ set_property "generic" {{{generics_string}}} [current_fileset]
 
         return f"{tcl}\n"
 
-    def build(  # noqa: PLR0913
+    def build(  # noqa: C901, PLR0912, PLR0913
         self,
         project_file: Path,
         output_path: Path | None,
@@ -330,12 +787,28 @@ set_property "generic" {{{generics_string}}} [current_fileset]
         from_impl: bool = False,
         impl_explore: bool = False,
         open_and_analyze_synthesized_design: bool = True,
+        synthesis_checkpoint_restored: bool = False,
+        incremental_reference_checkpoint: Path | None = None,
+        impl_explore_runs: list[str] | None = None,
+        impl_explore_terminate_runs: bool = False,
+        impl_explore_run_file: Path | None = None,
+        restored_out_of_context_runs: list[str] | None = None,
+        # Implementation runs of the Dynamic Function eXchange configurations that shall be
+        # launched, instead of only the regular implementation run.
+        reconfigurable_runs: list[str] | None = None,
+        # Synthesis runs of the changed reconfigurable modules.
+        # If set, only these runs and the 'reconfigurable_runs' are launched, since the static
+        # design has not changed.
+        reconfigurable_synthesis_runs: list[str] | None = None,
     ) -> str:
         if impl_explore:
             # For implementation explore, threads are divided to one each per job.
             # Number of jobs in parallel are the number of threads specified for build.
             # Clamp max threads between 1 and 32, which are allowed by Vivado 2018.3+.
-            num_threads_general = min(max(1, num_threads // NUM_VIVADO_STRATEGIES), 32)
+            num_runs = (
+                NUM_VIVADO_STRATEGIES if impl_explore_runs is None else len(impl_explore_runs)
+            )
+            num_threads_general = min(max(1, num_threads // num_runs), 32)
         else:
             # Max value in Vivado 2018.3+. set_param will give an error if higher number.
             num_threads_general = min(num_threads, 32)
@@ -347,20 +820,45 @@ set_property "generic" {{{generics_string}}} [current_fileset]
         tcl += f'set_param "synth.maxThreads" {num_threads_synth}\n\n'
         tcl += self._add_generics(generics=generics)
 
-        if not from_impl:
+        if reconfigurable_synthesis_runs is not None:
+            tcl += self._run_together(runs=reconfigurable_synthesis_runs, num_threads=num_threads)
+        elif not from_impl:
             synth_run = f"synth_{run_index}"
 
-            tcl += self._synthesis(
+            if restored_out_of_context_runs:
+                tcl += self._restored_out_of_context_runs(runs=restored_out_of_context_runs)
+
+            synthesis_tcl = self._synthesis(
                 run=synth_run,
                 num_threads=num_threads,
                 open_and_analyze=open_and_analyze_synthesized_design,
             )
 
+            if synthesis_checkpoint_restored:
+                tcl += self._restored_synthesis(run=synth_run, synthesis_tcl=synthesis_tcl)
+            else:
+                tcl += synthesis_tcl
+
         if not synth_only:
             impl_run = f"impl_{run_index}"
 
-            if impl_explore:
-                tcl += self._run_multiple(num_jobs=num_threads)
+            if reconfigurable_runs:
+                tcl += self._run_together(
+                    runs=reconfigurable_runs, num_threads=num_threads, to_step="write_bitstream"
+                )
+            elif impl_explore:
+                tcl += self._run_multiple(
+                    num_jobs=num_threads,
+                    runs=impl_explore_runs,
+                    terminate_runs=impl_explore_terminate_runs,
+                    run_file=impl_explore_run_file,
+                )
+            elif incremental_reference_checkpoint is not None:
+                tcl += self._incremental_run(
+                    run=impl_run,
+                    num_threads=num_threads,
+                    reference_checkpoint=incremental_reference_checkpoint,
+                )
             else:
                 tcl += self._run(impl_run, num_threads, to_step="write_bitstream")
 
@@ -477,6 +975,49 @@ if {${should_exit} eq 1} {
 """
         return tcl
 
+    @staticmethod
+    def _restored_synthesis(run: str, synthesis_tcl: str) -> str:
+        """
+        The run directory has been restored from a synthesis checkpoint cache.
+        Mark the run as up-to-date, so that implementation can continue from the restored
+        checkpoint.
+        If Vivado does not consider the restored run to be complete, fall back to running a
+        regular synthesis.
+        """
+        return f"""
+# ------------------------------------------------------------------------------
+# The synthesis run has been restored from the synthesis checkpoint cache.
+set run [get_runs "{run}"]
+set_property "NEEDS_REFRESH" false ${{run}}
+
+if {{[get_property "PROGRESS" ${{run}}] != "100%"}} {{
+puts "WARNING: Restored run ${{run}} is not complete. Running synthesis instead."
+{synthesis_tcl}
+}}
+
+"""
+
+    @staticmethod
+    def _restored_out_of_context_runs(runs: list[str]) -> str:
+        """
+        The run directories have been restored from a synthesis checkpoint cache.
+        Mark them as up-to-date, so that they are not run again when top level synthesis
+        is launched.
+        If Vivado does not consider a restored run to be complete, it will be run as usual.
+        """
+        return f"""
+# ------------------------------------------------------------------------------
+# The out-of-context runs have been restored from the synthesis checkpoint cache.
+foreach run [get_runs {{{" ".join(runs)}}}] {{
+  if {{[get_property "PROGRESS" ${{run}}] == "100%"}} {{
+    set_property "NEEDS_REFRESH" false ${{run}}
+  }} else {{
+    puts "WARNING: Restored run ${{run}} is not complete. It will be synthesized again."
+  }}
+}}
+
+"""
+
     @staticmethod
     def _run(run: str, num_threads: int, to_step: str | None = None) -> str:
         to_step = "" if to_step is None else f' -to_step "{to_step}"'
@@ -499,22 +1040,142 @@ if {[get_property "PROGRESS" ${run}] != "100%"} {
 """
         return tcl
 
-    def _run_multiple(self, num_jobs: int = 4, base_name: str = "impl_explore_") -> str:
+    @staticmethod
+    def _run_together(runs: list[str], num_threads: int, to_step: str | None = None) -> str:
+        """
+        Launch the runs at the same time, and let Vivado schedule them.
+        Child runs will be started once their parent run has finished.
+        """
+        to_step = "" if to_step is None else f' -to_step "{to_step}"'
+
+        return f"""
+# ------------------------------------------------------------------------------
+set runs [get_runs {{{" ".join(runs)}}}]
+reset_runs ${{runs}}
+launch_runs ${{runs}} -jobs {num_threads}{to_step}
+
+foreach run ${{runs}} {{
+  wait_on_run ${{run}}
+}}
+
+foreach run ${{runs}} {{
+  if {{[get_property "PROGRESS" ${{run}}] != "100%"}} {{
+    puts "ERROR: Run ${{run}} failed."
+    exit 1
+  }}
+}}
+
+"""
+
+    def _incremental_run(self, run: str, num_threads: int, reference_checkpoint: Path) -> str:
         """
-        Currently, this creates a .tcl that waits for all active runs to complete.
+        Run implementation with the reference checkpoint, if it exists.
+        If the run fails when using a reference checkpoint, e.g. because the reference is not
+        compatible with the current design, the reference is discarded and the run is
+        restarted as a regular, non-incremental, run.
+        """
+        to_step = "write_bitstream"
+        fallback_run_tcl = self._run(run=run, num_threads=num_threads, to_step=to_step)
+
+        return f"""
+# ------------------------------------------------------------------------------
+set run [get_runs "{run}"]
+set reference_checkpoint {{{to_tcl_path(reference_checkpoint)}}}
+
+if {{[file exists ${{reference_checkpoint}}]}} {{
+  puts "Using incremental implementation reference checkpoint: ${{reference_checkpoint}}"
+  set_property "INCREMENTAL_CHECKPOINT" ${{reference_checkpoint}} ${{run}}
+}} else {{
+  reset_property "INCREMENTAL_CHECKPOINT" ${{run}}
+}}
+
+reset_run ${{run}}
+launch_runs ${{run}} -jobs {num_threads} -to_step "{to_step}"
+wait_on_run ${{run}}
+
+if {{[get_property "PROGRESS" ${{run}}] != "100%"}} {{
+  if {{[get_property "INCREMENTAL_CHECKPOINT" ${{run}}] == ""}} {{
+    puts "ERROR: Run ${{run}} failed."
+    exit 1
+  }}
+
+  puts "WARNING: Incremental run ${{run}} failed. Running without reference checkpoint instead."
+  reset_property "INCREMENTAL_CHECKPOINT" ${{run}}
+  file delete -force ${{reference_checkpoint}}
+{fallback_run_tcl}
+}}
+
+"""
+
+    def _run_multiple(
+        self,
+        num_jobs: int = 4,
+        base_name: str = "impl_explore_",
+        runs: list[str] | None = None,
+        terminate_runs: bool = False,
+        run_file: Path | None = None,
+    ) -> str:
+        """
+        Launch the runs and wait until any one of them has met timing.
+
+        Arguments:
+            num_jobs: Number of runs that are executed in parallel.
+            base_name: Name prefix of all the runs.
+            runs: Names of the runs that shall be launched, in the order that they shall be
+                launched.
+                If omitted, all runs will be launched.
+            terminate_runs: Stop the runs that are in progress as soon as one run has
+                met timing.
+                Otherwise, wait for them to finish.
+            run_file: If given, the name of the run that met timing first is written to
+                this file.
         """
         tcl = "\nset build_succeeded 0\n"
         tcl += f'reset_runs [get_runs "{base_name}*"]\n'
-        tcl += (
-            f'launch_runs -jobs {num_jobs} [get_runs "{base_name}*"] -to_step "write_bitstream"\n'
-        )
+
+        if runs is None:
+            runs_tcl = f'[get_runs "{base_name}*"]'
+        else:
+            # Build the list one by one, so that Vivado launches the runs in the given order.
+            runs_tcl = "${explore_runs}"
+            tcl += "set explore_runs [list]\n"
+            tcl += f"foreach run_name {{{' '.join(runs)}}} {{\n"
+            tcl += "  lappend explore_runs [get_runs ${run_name}]\n"
+            tcl += "}\n"
+
+        tcl += f'launch_runs -jobs {num_jobs} {runs_tcl} -to_step "write_bitstream"\n'
         tcl += "\n"
 
-        tcl += f'wait_on_runs -quiet -exit_condition ANY_ONE_MET_TIMING [get_runs "{base_name}*"]\n'
+        tcl += f"wait_on_runs -quiet -exit_condition ANY_ONE_MET_TIMING {runs_tcl}\n"
         tcl += "\n"
 
+        if run_file is not None:
+            # Other runs might finish while we wait for them below, so take note of the first one.
+            tcl += f"""\
+set first_run [lindex [get_runs -filter {{PROGRESS == "100%"}} "{base_name}*"] 0]
+if {{${{first_run}} != ""}} {{
+  set run_file [open {{{to_tcl_path(run_file)}}} w]
+  puts ${{run_file}} ${{first_run}}
+  close ${{run_file}}
+}}
+
+"""
+
         tcl += 'reset_runs [get_runs -filter {STATUS == "Queued..."}]\n'
 
+        if terminate_runs:
+            # Resetting a run that is in progress will stop it.
+            # Note that this has been observed to leave zombie processes in some environments.
+            tcl += f"""\
+set in_progress_runs [
+  get_runs -filter {{PROGRESS != "100%" && STATUS != "Not started"}} "{base_name}*"
+]
+if {{${{in_progress_runs}} != ""}} {{
+  puts "Stopping runs that are still in progress: ${{in_progress_runs}}"
+  reset_runs ${{in_progress_runs}}
+}}
+"""
+
         # Wait on runs that are still going, since Vivado can't kill runs in progress reliably.
         # Killing runs in progress causes a zombie process which will lock up VUnit's Process class.
         tcl += (
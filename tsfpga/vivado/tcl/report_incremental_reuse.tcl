@@ -0,0 +1,14 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+
+# Report how much of the reference checkpoint was reused by incremental implementation.
+# The report command gives an error if the run does not use a reference checkpoint.
+# For example, when the reference was incompatible and the build fell back to a regular run.
+# Hence the '-quiet' flag, which makes sure that no ERROR message is posted in that case.
+report_incremental_reuse -quiet -file "incremental_reuse.rpt"
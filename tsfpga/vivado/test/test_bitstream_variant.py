@@ -0,0 +1,51 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+import pytest
+
+from tsfpga.vivado.bitstream_variant import write_bin_file
+
+
+def _get_field(key, value):
+    return key + len(value).to_bytes(2, "big") + value
+
+
+def _get_bit_file_data(configuration_data):
+    return (
+        b"\x00\x09\x0f\xf0\x0f\xf0\x0f\xf0\x0f\xf0\x00\x00\x01"
+        + _get_field(b"a", b"apa_top;UserID=0XFFFFFFFF;Version=2024.2\x00")
+        + _get_field(b"b", b"xc7z020clg400\x00")
+        + _get_field(b"c", b"2025/01/01\x00")
+        + _get_field(b"d", b"12:00:00\x00")
+        + b"e"
+        + len(configuration_data).to_bytes(4, "big")
+        + configuration_data
+    )
+
+
+def test_write_bin_file_should_strip_header(tmp_path):
+    configuration_data = b"\xff" * 32 + b"\xaa\x99\x55\x66" + bytes(range(256))
+    bit_file = tmp_path / "apa.bit"
+    bit_file.write_bytes(_get_bit_file_data(configuration_data))
+
+    bin_file = tmp_path / "apa.bin"
+    write_bin_file(bit_file=bit_file, bin_file=bin_file)
+
+    assert bin_file.read_bytes() == configuration_data
+
+
+def test_write_bin_file_with_truncated_bit_file_should_raise_exception(tmp_path):
+    bit_file = tmp_path / "apa.bit"
+    bit_file.write_bytes(_get_bit_file_data(b"\x01\x02\x03\x04")[:-1])
+
+    with pytest.raises(ValueError) as exception_info:
+        write_bin_file(bit_file=bit_file, bin_file=tmp_path / "apa.bin")
+    assert str(exception_info.value) == (
+        f"Could not find configuration data in bitstream: {bit_file}"
+    )
+    assert not (tmp_path / "apa.bin").exists()
@@ -0,0 +1,50 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from tsfpga.system_utils import create_file, read_file
+from tsfpga.vivado.block_design_cache import BlockDesignCache
+
+
+def test_key(tmp_path):
+    cache = BlockDesignCache(cache_path=tmp_path / "cache")
+    tcl_file = create_file(tmp_path / "block_design.tcl", "apa")
+
+    def get_key(tcl_file=tcl_file, part="part", vivado_version="2023.2"):
+        return cache.get_key(tcl_file=tcl_file, part=part, vivado_version=vivado_version)
+
+    key = get_key()
+    assert get_key() == key
+    assert get_key(part="other_part") != key
+    assert get_key(vivado_version="2024.1") != key
+
+    # Location of the file does not affect the key.
+    assert get_key(tcl_file=create_file(tmp_path / "other" / "block_design.tcl", "apa")) == key
+
+    create_file(tcl_file, "changed")
+    assert get_key() != key
+
+
+def test_store_and_restore(tmp_path):
+    cache = BlockDesignCache(cache_path=tmp_path / "cache")
+    key = cache.get_key(
+        tcl_file=create_file(tmp_path / "block_design.tcl"), part="part", vivado_version="2023.2"
+    )
+
+    folder = tmp_path / "project" / "block_designs" / "block_design"
+    create_file(folder / "apa" / "apa.bd", "apa")
+    create_file(folder / "apa" / "hdl" / "apa.vhd", "generated")
+
+    assert not cache.restore(key=key, path=tmp_path / "other_project")
+
+    cache.store(key=key, path=folder)
+
+    restored_folder = tmp_path / "other_project" / "block_designs" / "block_design"
+    assert cache.restore(key=key, path=restored_folder)
+    assert read_file(restored_folder / "apa" / "apa.bd") == "apa"
+    assert read_file(restored_folder / "apa" / "hdl" / "apa.vhd") == "generated"
+    assert not (restored_folder / "tsfpga_cache_entry_done.txt").exists()
@@ -69,3 +69,17 @@ def test_maximum_logic_level_should_be_none_if_no_logic_level_distribution_is_se
     assert build_result.logic_level_distribution is None
     assert build_result.maximum_logic_level is None
     assert "level" not in build_result.report()
+
+
+def test_report_with_incremental_reuse():
+    build_result = BuildResult(name="apa", synthesis_run_name="")
+
+    build_result.implementation_size = {"LUT": 3}
+    build_result.incremental_reuse = {"Cells": 97.5, "Nets": 96.125}
+    expected = """\
+Size of apa after implementation:
+ - LUT: 3
+Incremental implementation reuse:
+ - Cells: 97.50%
+ - Nets: 96.12%"""
+    assert build_result.report() == expected
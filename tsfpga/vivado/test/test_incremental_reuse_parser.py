@@ -0,0 +1,54 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from tsfpga.vivado.incremental_reuse_parser import IncrementalReuseParser
+
+
+def test_get_reuse_summary():
+    report = """\
+Copyright 1986-2022 Xilinx, Inc. All Rights Reserved.
+| Command      : report_incremental_reuse -file incremental_reuse.rpt
+| Design       : apa_top
+----------------------------------------------------------------------------------------------------
+
+Incremental Implementation Information
+
+Table of Contents
+-----------------
+1. Reuse Summary
+2. Reference Checkpoint Information
+
+1. Reuse Summary
+----------------
+
++-------+----------------------+--------------------+--------------------+-------+
+|  Type | Matched % (of Total) | Reuse % (of Total) | Fixed % (of Total) | Total |
++-------+----------------------+--------------------+--------------------+-------+
+| Cells |                99.83 |              97.50 |               0.00 | 15213 |
+| Nets  |                99.91 |              97.45 |               0.00 | 22814 |
+| Pins  |                    - |              96.88 |                  - | 75890 |
+| Ports |               100.00 |                  - |             100.00 |    92 |
++-------+----------------------+--------------------+--------------------+-------+
+
+
+2. Reference Checkpoint Information
+-----------------------------------
+
++----------------+---------------------+
+| DCP Location:  | /apa/impl_1.dcp     |
++----------------+---------------------+
+"""
+    assert IncrementalReuseParser.get_reuse_summary(report) == {
+        "Cells": 97.50,
+        "Nets": 97.45,
+        "Pins": 96.88,
+    }
+
+
+def test_get_reuse_summary_with_no_table_should_return_empty():
+    assert IncrementalReuseParser.get_reuse_summary("WARNING: No reference checkpoint.\n") == {}
@@ -0,0 +1,226 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tsfpga.ip_core_file import IpCoreFile
+from tsfpga.system_utils import create_file, read_file
+from tsfpga.vivado.ip_cache import VivadoIpCache
+from tsfpga.vivado.project import VivadoProject
+
+
+@pytest.fixture
+def ip_cache_test(tmp_path):
+    class IpCacheTest:
+        def __init__(self):
+            self.apa_tcl = create_file(tmp_path / "apa" / "fifo.tcl", "apa")
+            self.hest_tcl = create_file(tmp_path / "hest" / "ram.tcl", "hest")
+
+            self.cache = VivadoIpCache(cache_path=tmp_path / "cache")
+            self.project_path = tmp_path / "projects"
+
+        @staticmethod
+        def get_project(part, ip_core_files):
+            project = MagicMock(spec=VivadoProject)
+            project.part = part
+            project.get_ip_core_files.return_value = ip_core_files
+
+            return project
+
+        def get_key(self, ip_core_file, part="part", vivado_version="2023.2"):
+            return self.cache.get_key(
+                ip_core_file=ip_core_file, part=part, vivado_version=vivado_version
+            )
+
+        def pre_warm(self, projects):
+            return self.cache.pre_warm(
+                projects=projects, project_path=self.project_path, num_jobs=4
+            )
+
+    return IpCacheTest()
+
+
+def test_key(ip_cache_test, tmp_path):
+    apa = IpCoreFile(path=ip_cache_test.apa_tcl, width=8)
+    key = ip_cache_test.get_key(apa)
+
+    assert ip_cache_test.get_key(IpCoreFile(path=ip_cache_test.apa_tcl, width=8)) == key
+    assert ip_cache_test.get_key(IpCoreFile(path=ip_cache_test.apa_tcl, width=16)) != key
+    assert ip_cache_test.get_key(IpCoreFile(path=ip_cache_test.apa_tcl)) != key
+    assert ip_cache_test.get_key(apa, part="other_part") != key
+    assert ip_cache_test.get_key(apa, vivado_version="2024.1") != key
+
+    # Location of the file does not affect the key.
+    other_apa_tcl = create_file(tmp_path / "other" / "fifo.tcl", "apa")
+    assert ip_cache_test.get_key(IpCoreFile(path=other_apa_tcl, width=8)) == key
+
+    create_file(ip_cache_test.apa_tcl, "changed")
+    assert ip_cache_test.get_key(apa) != key
+
+
+@patch("tsfpga.vivado.ip_cache.get_vivado_version", autospec=True)
+@patch("tsfpga.vivado.ip_cache.run_vivado_tcl", autospec=True)
+def test_pre_warm_should_synthesize_each_configuration_once(
+    run_vivado_tcl, get_vivado_version, ip_cache_test
+):
+    get_vivado_version.return_value = "2023.2"
+    run_vivado_tcl.return_value = True
+
+    projects = [
+        ip_cache_test.get_project(
+            part="part",
+            ip_core_files=[IpCoreFile(ip_cache_test.apa_tcl), IpCoreFile(ip_cache_test.hest_tcl)],
+        ),
+        ip_cache_test.get_project(
+            part="part",
+            ip_core_files=[IpCoreFile(ip_cache_test.apa_tcl)],
+        ),
+    ]
+    assert ip_cache_test.pre_warm(projects=projects)
+
+    run_vivado_tcl.assert_called_once()
+    tcl = read_file(run_vivado_tcl.call_args.args[1])
+    assert tcl.startswith('create_project -part "part" "ip_cache_pre_warm_0"')
+    assert tcl.count("source -notrace") == 2
+    assert "config_ip_cache -use_cache_location" in tcl
+    assert "launch_runs ${ip_runs} -jobs 4" in tcl
+
+    # Should not run again, when all configurations have been pre-warmed.
+    assert ip_cache_test.pre_warm(projects=projects)
+    run_vivado_tcl.assert_called_once()
+
+    # Should run only the new configuration.
+    projects.append(
+        ip_cache_test.get_project(
+            part="other_part",
+            ip_core_files=[IpCoreFile(ip_cache_test.apa_tcl)],
+        )
+    )
+    assert ip_cache_test.pre_warm(projects=projects)
+    assert run_vivado_tcl.call_count == 2
+
+    tcl = read_file(run_vivado_tcl.call_args.args[1])
+    assert tcl.startswith('create_project -part "other_part"')
+    assert tcl.count("source -notrace") == 1
+
+
+@patch("tsfpga.vivado.ip_cache.get_vivado_version", autospec=True)
+@patch("tsfpga.vivado.ip_cache.run_vivado_tcl", autospec=True)
+def test_pre_warm_should_put_configurations_of_same_ip_core_in_different_projects(
+    run_vivado_tcl, get_vivado_version, ip_cache_test
+):
+    get_vivado_version.return_value = "2023.2"
+    run_vivado_tcl.return_value = True
+
+    projects = [
+        ip_cache_test.get_project(
+            part="part",
+            ip_core_files=[
+                IpCoreFile(ip_cache_test.apa_tcl, width=8),
+                IpCoreFile(ip_cache_test.apa_tcl, width=16),
+                IpCoreFile(ip_cache_test.hest_tcl),
+            ],
+        )
+    ]
+    assert ip_cache_test.pre_warm(projects=projects)
+
+    assert run_vivado_tcl.call_count == 2
+    first_tcl, second_tcl = [read_file(call.args[1]) for call in run_vivado_tcl.call_args_list]
+
+    assert '  set width "8"\n' in first_tcl
+    assert "create_ip_core_ram\n" in first_tcl
+    assert '  set width "16"\n' in second_tcl
+    assert "create_ip_core_ram\n" not in second_tcl
+
+
+@patch("tsfpga.vivado.ip_cache.get_vivado_version", autospec=True)
+@patch("tsfpga.vivado.ip_cache.run_vivado_tcl", autospec=True)
+def test_pre_warm_failing_should_return_false_and_run_again_next_time(
+    run_vivado_tcl, get_vivado_version, ip_cache_test
+):
+    get_vivado_version.return_value = "2023.2"
+    run_vivado_tcl.return_value = False
+
+    projects = [
+        ip_cache_test.get_project(part="part", ip_core_files=[IpCoreFile(ip_cache_test.apa_tcl)])
+    ]
+    assert not ip_cache_test.pre_warm(projects=projects)
+
+    run_vivado_tcl.return_value = True
+    assert ip_cache_test.pre_warm(projects=projects)
+    assert run_vivado_tcl.call_count == 2
+
+
+def create_entry(cache_path, name, size, last_use):
+    entry_path = cache_path / name
+    for file in [entry_path / "a.dcp", entry_path / "sim" / "b.vhd"]:
+        create_file(file, "a" * (size // 2))
+        os.utime(file, (last_use, last_use))
+
+    os.utime(entry_path, (0, 0))
+
+    return entry_path
+
+
+@pytest.fixture
+def cache_with_entries(ip_cache_test):
+    cache_path = ip_cache_test.cache.cache_path
+
+    create_entry(cache_path=cache_path, name="hest", size=200, last_use=2000)
+    create_entry(cache_path=cache_path, name="apa", size=100, last_use=1000)
+    create_entry(cache_path=cache_path, name="zebra", size=300, last_use=3000)
+
+    # Files that are not entries.
+    create_file(cache_path / "tsfpga_ip_cache_pre_warmed.json", "[]")
+
+    return ip_cache_test.cache
+
+
+def test_get_entries(cache_with_entries):
+    entries = cache_with_entries.get_entries()
+
+    assert [entry.path.name for entry in entries] == ["apa", "hest", "zebra"]
+    assert [entry.size for entry in entries] == [100, 200, 300]
+    assert [entry.last_use for entry in entries] == [1000, 2000, 3000]
+
+
+def test_get_entries_with_no_cache(tmp_path):
+    assert VivadoIpCache(cache_path=tmp_path / "cache").get_entries() == []
+
+
+def test_prune_should_remove_least_recently_used_entries(cache_with_entries):
+    removed = cache_with_entries.prune(max_size=350)
+
+    assert [entry.path.name for entry in removed] == ["apa", "hest"]
+    assert [entry.path.name for entry in cache_with_entries.get_entries()] == ["zebra"]
+
+    # Since we do not know which pre-warmed configurations were removed.
+    assert not (cache_with_entries.cache_path / "tsfpga_ip_cache_pre_warmed.json").exists()
+
+
+def test_prune_when_within_max_size_should_do_nothing(cache_with_entries):
+    assert cache_with_entries.prune(max_size=600) == []
+    assert len(cache_with_entries.get_entries()) == 3
+    assert (cache_with_entries.cache_path / "tsfpga_ip_cache_pre_warmed.json").exists()
+
+
+def test_prune_without_wait_should_do_nothing_when_cache_is_in_use(cache_with_entries):
+    lock_file = cache_with_entries.cache_path / "tsfpga_ip_cache_usage.lock"
+
+    with patch("tsfpga.vivado.ip_cache.file_lock", autospec=True) as mocked_file_lock:
+        mocked_file_lock.side_effect = BlockingIOError
+        assert cache_with_entries.prune(max_size=0, wait=False) is None
+
+    mocked_file_lock.assert_called_once_with(file=lock_file, shared=False, blocking=False)
+    assert len(cache_with_entries.get_entries()) == 3
+
+    # Cache is not in use.
+    assert len(cache_with_entries.prune(max_size=0, wait=False)) == 3
@@ -14,6 +14,7 @@ from tsfpga.ip_core_file import IpCoreFile
 from tsfpga.module import BaseModule, get_modules
 from tsfpga.system_utils import create_file, delete
 from tsfpga.vivado.ip_cores import VivadoIpCores
+from tsfpga.vivado.project import VivadoIpCoreProject
 
 
 def test_get_ip_core_files_is_called_with_the_correct_arguments(tmp_path):
@@ -160,3 +161,159 @@ def test_ip_core_variables(create, ip_cores_test):
 
     assert not vivado_ip_cores.create_vivado_project_if_needed()
     assert create.call_count == 2
+
+
+@pytest.fixture
+def ip_cores_update_test(ip_cores_test):
+    """
+    An IP core project that exists, and where the IPs created by each IP core file are known.
+    """
+    vivado_ip_cores = ip_cores_test.vivado_ip_cores
+
+    create_file(vivado_ip_cores.vivado_project_file)
+    create_file(
+        VivadoIpCoreProject.ip_core_ips_file(vivado_ip_cores.project_directory),
+        "apa apa_fifo apa_ram\nhest\n",
+    )
+    vivado_ip_cores._save_hash()  # noqa: SLF001
+
+    return ip_cores_test
+
+
+def get_ip_cores_and_assert_update(ip_cores_test, update_ip_cores, expected_names, expected_ips):
+    modules = get_modules(ip_cores_test.modules_folder)
+    vivado_ip_cores = VivadoIpCores(modules, ip_cores_test.project_folder, part_name="-")
+
+    assert vivado_ip_cores.create_vivado_project_if_needed()
+    update_ip_cores.assert_called_once()
+
+    arguments = update_ip_cores.call_args.kwargs
+    names = sorted(ip_core_file.name for ip_core_file in arguments["ip_core_files"])
+    assert names == expected_names
+    assert sorted(arguments["remove_ips"]) == expected_ips
+
+    return vivado_ip_cores
+
+
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.update_ip_cores", autospec=True)
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.create", autospec=True)
+def test_should_update_only_ip_core_file_that_is_changed(
+    create, update_ip_cores, ip_cores_update_test
+):
+    create_file(ip_cores_update_test.apa_tcl, "blaha blaha")
+
+    get_ip_cores_and_assert_update(
+        ip_cores_test=ip_cores_update_test,
+        update_ip_cores=update_ip_cores,
+        expected_names=["apa"],
+        expected_ips=["apa_fifo", "apa_ram"],
+    )
+    create.assert_not_called()
+
+
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.update_ip_cores", autospec=True)
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.create", autospec=True)
+def test_should_update_only_ip_core_file_that_is_added(
+    create, update_ip_cores, ip_cores_update_test
+):
+    create_file(ip_cores_update_test.modules_folder / "zebra" / "ip_cores" / "zebra.tcl", "zebra")
+
+    get_ip_cores_and_assert_update(
+        ip_cores_test=ip_cores_update_test,
+        update_ip_cores=update_ip_cores,
+        expected_names=["zebra"],
+        expected_ips=[],
+    )
+    create.assert_not_called()
+
+
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.update_ip_cores", autospec=True)
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.create", autospec=True)
+def test_should_remove_ips_of_ip_core_file_that_is_removed(
+    create, update_ip_cores, ip_cores_update_test
+):
+    delete(ip_cores_update_test.apa_tcl)
+
+    vivado_ip_cores = get_ip_cores_and_assert_update(
+        ip_cores_test=ip_cores_update_test,
+        update_ip_cores=update_ip_cores,
+        expected_names=[],
+        expected_ips=["apa_fifo", "apa_ram"],
+    )
+    create.assert_not_called()
+
+    # The removed IP core should no longer be in the saved hash
+    assert not vivado_ip_cores.create_vivado_project_if_needed()
+    update_ip_cores.assert_called_once()
+
+
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.update_ip_cores", autospec=True)
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.create", autospec=True)
+def test_ips_created_by_update_should_be_saved(create, update_ip_cores, ip_cores_update_test):
+    def mock_update_ip_cores(self, project_path, ip_core_files, remove_ips):  # noqa: ARG001
+        create_file(self.ip_core_ips_file(project_path), "apa apa_new_fifo\n")
+        return True
+
+    update_ip_cores.side_effect = mock_update_ip_cores
+
+    create_file(ip_cores_update_test.apa_tcl, "blaha blaha")
+    get_ip_cores_and_assert_update(
+        ip_cores_test=ip_cores_update_test,
+        update_ip_cores=update_ip_cores,
+        expected_names=["apa"],
+        expected_ips=["apa_fifo", "apa_ram"],
+    )
+
+    # Changing the same IP core again should remove the IPs that were created by the update.
+    # The IPs of the IP core that was not updated should be kept.
+    update_ip_cores.reset_mock()
+    create_file(ip_cores_update_test.apa_tcl, "blaha blaha blaha")
+    create_file(ip_cores_update_test.hest_tcl, "blaha blaha blaha")
+    get_ip_cores_and_assert_update(
+        ip_cores_test=ip_cores_update_test,
+        update_ip_cores=update_ip_cores,
+        expected_names=["apa", "hest"],
+        expected_ips=["apa_new_fifo"],
+    )
+    create.assert_not_called()
+
+
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.update_ip_cores", autospec=True)
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.create", autospec=True)
+def test_should_recreate_if_project_file_is_missing(create, update_ip_cores, ip_cores_update_test):
+    delete(ip_cores_update_test.vivado_ip_cores.vivado_project_file)
+    create_file(ip_cores_update_test.apa_tcl, "blaha blaha")
+    modules = get_modules(ip_cores_update_test.modules_folder)
+    vivado_ip_cores = VivadoIpCores(modules, ip_cores_update_test.project_folder, part_name="-")
+
+    assert vivado_ip_cores.create_vivado_project_if_needed()
+    create.assert_called_once()
+    update_ip_cores.assert_not_called()
+
+
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.update_ip_cores", autospec=True)
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.create", autospec=True)
+def test_should_recreate_if_ips_of_changed_ip_core_are_not_known(
+    create, update_ip_cores, ip_cores_test
+):
+    create_file(ip_cores_test.vivado_ip_cores.vivado_project_file)
+    create_file(ip_cores_test.apa_tcl, "blaha blaha")
+    modules = get_modules(ip_cores_test.modules_folder)
+    vivado_ip_cores = VivadoIpCores(modules, ip_cores_test.project_folder, part_name="-")
+
+    assert vivado_ip_cores.create_vivado_project_if_needed()
+    create.assert_called_once()
+    update_ip_cores.assert_not_called()
+
+
+@patch("tsfpga.vivado.ip_cores.VivadoIpCoreProject.update_ip_cores", autospec=True)
+def test_update_failing_should_raise_exception(update_ip_cores, ip_cores_update_test):
+    update_ip_cores.return_value = False
+    create_file(ip_cores_update_test.apa_tcl, "blaha blaha")
+    modules = get_modules(ip_cores_update_test.modules_folder)
+    vivado_ip_cores = VivadoIpCores(modules, ip_cores_update_test.project_folder, part_name="-")
+
+    with pytest.raises(RuntimeError) as exception_info:
+        vivado_ip_cores.create_vivado_project_if_needed()
+
+    assert str(exception_info.value) == "Failed to update Vivado IP core project"
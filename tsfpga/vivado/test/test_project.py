@@ -6,20 +6,25 @@
 # https://github.com/tsfpga/tsfpga
 # --------------------------------------------------------------------------------------------------
 
+import json
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from tsfpga.artifact_store import ArtifactStore, LocalArtifactStoreBackend
 from tsfpga.build_step_tcl_hook import BuildStepTclHook
 from tsfpga.constraint import Constraint
 from tsfpga.module import BaseModule, get_modules
-from tsfpga.system_utils import create_directory, create_file, read_file
+from tsfpga.system_utils import create_directory, create_file, delete, read_file
 from tsfpga.test.test_utils import file_contains_string
+from tsfpga.vivado.bitstream_variant import BitstreamVariant
 from tsfpga.vivado.common import to_tcl_path
 from tsfpga.vivado.generics import StringGenericValue
 from tsfpga.vivado.project import VivadoNetlistProject, VivadoProject, copy_and_combine_dicts
+from tsfpga.vivado.reconfigurable_partition import ReconfigurableModule, ReconfigurablePartition
+from tsfpga.vivado.synthesis_checkpoint_cache import SynthesisCheckpointCache
 
 # ruff: noqa: ARG002
 
@@ -252,10 +257,19 @@ def vivado_project_test(tmp_path):
                     **other_arguments,
                 )
 
-        def build(self, project):
+        def build(self, project, impl_explore_run=None):
+            def run_vivado_tcl(*args, **kwargs):  # noqa: ARG001
+                if impl_explore_run is not None:
+                    # Written by Vivado when the first run has met timing.
+                    create_file(self.project_path / "impl_explore_run.txt", f"{impl_explore_run}\n")
+
+                return True
+
             with (
                 patch(
-                    "tsfpga.vivado.project.run_vivado_tcl", autospec=True
+                    "tsfpga.vivado.project.run_vivado_tcl",
+                    autospec=True,
+                    side_effect=run_vivado_tcl,
                 ) as self.mocked_run_vivado_tcl,
                 patch("tsfpga.vivado.project.VivadoProject._get_size", autospec=True) as _,
                 patch("tsfpga.vivado.project.shutil.copy2", autospec=True) as _,
@@ -773,3 +787,764 @@ def test_netlist_build_result_maximum_frequency(vivado_project_test):
 
     _build_with_slack(analyze_synthesis_timing=False)
     _build_with_slack(analyze_synthesis_timing=True)
+
+
+@pytest.fixture
+def synthesis_checkpoint_cache_test(vivado_project_test, tmp_path):
+    class SynthesisCheckpointCacheTest:
+        def __init__(self):
+            self.cache_path = tmp_path / "synthesis_checkpoint_cache"
+            self.run_path = vivado_project_test.project_path / "apa.runs" / "synth_3"
+
+            self.modules_path = vivado_project_test.modules_path
+            create_file(self.modules_path / "apa" / "apa.vhd", "apa")
+
+            self.mocked_run_vivado_tcl = None
+
+        def build(self, synth_only=False):
+            project = VivadoProject(name="apa", modules=get_modules(self.modules_path), part="part")
+
+            def run_vivado_tcl(vivado_path, tcl_file):  # noqa: ARG001
+                # Emulate a Vivado synthesis run that produces a checkpoint.
+                if "NEEDS_REFRESH" not in read_file(tcl_file):
+                    create_file(self.run_path / "apa_top.dcp", "checkpoint")
+                return True
+
+            with (
+                patch(
+                    "tsfpga.vivado.project.run_vivado_tcl", autospec=True
+                ) as self.mocked_run_vivado_tcl,
+                patch("tsfpga.vivado.project.get_vivado_version", autospec=True) as version,
+                patch("tsfpga.vivado.project.VivadoProject._get_size", autospec=True) as _,
+                patch("tsfpga.vivado.project.shutil.copy2", autospec=True) as _,
+            ):
+                self.mocked_run_vivado_tcl.side_effect = run_vivado_tcl
+                version.return_value = "2023.2"
+
+                create_file(vivado_project_test.project_path / "apa.xpr")
+                return project.build(
+                    project_path=vivado_project_test.project_path,
+                    output_path=vivado_project_test.output_path,
+                    run_index=vivado_project_test.run_index,
+                    synth_only=synth_only,
+                    synthesis_checkpoint_cache_path=self.cache_path,
+                )
+
+        def build_tcl(self):
+            return read_file(vivado_project_test.project_path / "build_vivado_project.tcl")
+
+    return SynthesisCheckpointCacheTest()
+
+
+def test_synthesis_checkpoint_cache_miss_should_synthesize_and_store(
+    synthesis_checkpoint_cache_test,
+):
+    assert synthesis_checkpoint_cache_test.build().success
+    synthesis_checkpoint_cache_test.mocked_run_vivado_tcl.assert_called_once()
+
+    assert "NEEDS_REFRESH" not in synthesis_checkpoint_cache_test.build_tcl()
+    assert len(list(synthesis_checkpoint_cache_test.cache_path.iterdir())) == 1
+
+
+def test_synthesis_checkpoint_cache_hit_should_restore_and_continue_to_implementation(
+    synthesis_checkpoint_cache_test,
+):
+    assert synthesis_checkpoint_cache_test.build().success
+
+    # Remove the synthesized design from the project, as would be the case in a fresh workspace.
+    delete(synthesis_checkpoint_cache_test.run_path)
+
+    assert synthesis_checkpoint_cache_test.build().success
+    synthesis_checkpoint_cache_test.mocked_run_vivado_tcl.assert_called_once()
+
+    assert (synthesis_checkpoint_cache_test.run_path / "apa_top.dcp").exists()
+    build_tcl = synthesis_checkpoint_cache_test.build_tcl()
+    assert 'set_property "NEEDS_REFRESH" false ${run}' in build_tcl
+    assert '-to_step "write_bitstream"' in build_tcl
+
+
+def test_synthesis_checkpoint_cache_hit_with_synth_only_should_not_call_vivado(
+    synthesis_checkpoint_cache_test,
+):
+    assert synthesis_checkpoint_cache_test.build(synth_only=True).success
+    synthesis_checkpoint_cache_test.mocked_run_vivado_tcl.assert_called_once()
+
+    assert synthesis_checkpoint_cache_test.build(synth_only=True).success
+    synthesis_checkpoint_cache_test.mocked_run_vivado_tcl.assert_not_called()
+
+
+def test_synthesis_checkpoint_cache_miss_after_source_file_change(
+    synthesis_checkpoint_cache_test,
+):
+    assert synthesis_checkpoint_cache_test.build().success
+
+    create_file(synthesis_checkpoint_cache_test.modules_path / "apa" / "apa.vhd", "changed")
+
+    assert synthesis_checkpoint_cache_test.build().success
+    assert "NEEDS_REFRESH" not in synthesis_checkpoint_cache_test.build_tcl()
+    assert len(list(synthesis_checkpoint_cache_test.cache_path.iterdir())) == 2
+
+
+def test_impl_explore_and_incremental_implementation_should_raise_exception():
+    with pytest.raises(ValueError) as exception_info:
+        VivadoProject(
+            name="apa", modules=[], part="", impl_explore=True, incremental_implementation=True
+        )
+    assert str(exception_info.value) == (
+        'Project "apa": Can not use both "impl_explore" and "incremental_implementation".'
+    )
+
+
+def test_incremental_implementation_should_keep_routed_checkpoint_and_read_reuse(
+    vivado_project_test,
+):
+    project = VivadoProject(name="apa", modules=[], part="", incremental_implementation=True)
+
+    impl_path = vivado_project_test.project_path / "apa.runs" / "impl_3"
+    create_file(impl_path / "apa_top.bit")
+    create_file(impl_path / "apa_top.bin")
+    create_file(impl_path / "apa_top_routed.dcp", "routed")
+    create_file(
+        impl_path / "incremental_reuse.rpt",
+        """\
++-------+----------------------+--------------------+--------------------+-------+
+|  Type | Matched % (of Total) | Reuse % (of Total) | Fixed % (of Total) | Total |
++-------+----------------------+--------------------+--------------------+-------+
+| Cells |                99.83 |              97.50 |               0.00 | 15213 |
++-------+----------------------+--------------------+--------------------+-------+
+""",
+    )
+
+    with (
+        patch("tsfpga.vivado.project.run_vivado_tcl", autospec=True) as _,
+        patch("tsfpga.vivado.project.VivadoProject._get_size", autospec=True) as _,
+    ):
+        create_file(vivado_project_test.project_path / "apa.xpr")
+        result = project.build(
+            project_path=vivado_project_test.project_path,
+            output_path=vivado_project_test.output_path,
+            run_index=vivado_project_test.run_index,
+        )
+
+    assert result.success
+    assert result.incremental_reuse == {"Cells": 97.5}
+
+    reference_checkpoint = (
+        vivado_project_test.project_path / "incremental_reference" / "impl_3_routed.dcp"
+    )
+    assert read_file(reference_checkpoint) == "routed"
+
+    build_tcl = read_file(vivado_project_test.project_path / "build_vivado_project.tcl")
+    assert f"set reference_checkpoint {{{to_tcl_path(reference_checkpoint)}}}" in build_tcl
+
+
+def test_incremental_implementation_should_add_reuse_report_hook(vivado_project_test):
+    project = VivadoProject(name="apa", modules=[], part="", incremental_implementation=True)
+    vivado_project_test.create(project)
+
+    hook_file = vivado_project_test.project_path / "hook_STEPS_WRITE_BITSTREAM_TCL_PRE.tcl"
+    assert "report_incremental_reuse.tcl" in read_file(hook_file)
+
+
+def test_unknown_impl_explore_strategy_should_raise_exception():
+    with pytest.raises(ValueError) as exception_info:
+        VivadoProject(
+            name="apa", modules=[], part="", impl_explore=True, impl_explore_strategies=["Apa"]
+        )
+    assert str(exception_info.value) == (
+        'Project "apa": Got unknown implementation strategy "Apa".'
+    )
+
+
+def test_impl_explore_should_launch_strategies_in_order_of_earlier_success(vivado_project_test):
+    project = VivadoProject(
+        name="apa",
+        modules=[],
+        part="",
+        impl_explore=True,
+        impl_explore_strategies=["Area_Explore", "Flow_Quick", "Performance_Explore"],
+    )
+    runs_path = vivado_project_test.project_path / "apa.runs"
+
+    def build_and_get_tcl(successful_run):
+        # Other runs might also have finished, but only the first one shall be used.
+        delete(runs_path)
+        for run_name in ["impl_explore_3", "impl_explore_11", "impl_explore_23"]:
+            create_file(runs_path / run_name / "apa_top.bit")
+
+        result = vivado_project_test.build(project, impl_explore_run=successful_run)
+        assert result.success
+        assert result.implementation_run_name == successful_run
+
+        return read_file(vivado_project_test.project_path / "build_vivado_project.tcl")
+
+    # No history, so the order given by the user is used.
+    build_tcl = build_and_get_tcl(successful_run="impl_explore_23")
+    assert "foreach run_name {impl_explore_3 impl_explore_11 impl_explore_23} {" in build_tcl
+    assert "Stopping runs" in build_tcl
+
+    build_tcl = build_and_get_tcl(successful_run="impl_explore_11")
+    assert "foreach run_name {impl_explore_23 impl_explore_3 impl_explore_11} {" in build_tcl
+
+    # Equally successful, so the order given by the user is used between the two.
+    build_tcl = build_and_get_tcl(successful_run="impl_explore_11")
+    assert "foreach run_name {impl_explore_11 impl_explore_23 impl_explore_3} {" in build_tcl
+
+    build_tcl = build_and_get_tcl(successful_run="impl_explore_11")
+    assert "foreach run_name {impl_explore_11 impl_explore_23 impl_explore_3} {" in build_tcl
+
+    assert json.loads(
+        read_file(vivado_project_test.project_path / "impl_explore_history.json")
+    ) == {"Performance_Explore": 1, "Flow_Quick": 3}
+
+
+def test_impl_explore_with_no_strategies_and_no_history_should_launch_all_runs(
+    vivado_project_test,
+):
+    project = VivadoProject(name="apa", modules=[], part="", impl_explore=True)
+
+    assert vivado_project_test.build(project, impl_explore_run="impl_explore_1").success
+
+    build_tcl = read_file(vivado_project_test.project_path / "build_vivado_project.tcl")
+    assert "explore_runs" not in build_tcl
+
+
+def test_out_of_context_entities_should_be_restored_from_synthesis_checkpoint_cache(
+    vivado_project_test, tmp_path
+):
+    project = VivadoProject(
+        name="apa", modules=[], part="part", out_of_context_entities=["hest", "zebra"]
+    )
+    assert vivado_project_test.create(project)
+
+    create_vivado_project_tcl = read_file(
+        vivado_project_test.project_path / "create_vivado_project.tcl"
+    )
+    assert 'create_fileset -blockset -define_from "hest" "hest"' in create_vivado_project_tcl
+    assert 'create_fileset -blockset -define_from "zebra" "zebra"' in create_vivado_project_tcl
+
+    # Emulate the file lists that Vivado writes when creating the project.
+    hest_vhd = create_file(tmp_path / "hest.vhd", "hest")
+    out_of_context_path = vivado_project_test.project_path / "out_of_context"
+    create_file(out_of_context_path / "hest_files.txt", f"{hest_vhd}\n")
+    create_file(out_of_context_path / "zebra_files.txt", f"{create_file(tmp_path / 'zebra.vhd')}\n")
+
+    create_file(vivado_project_test.project_path / "apa.xpr")
+    runs_path = vivado_project_test.project_path / "apa.runs"
+    cache_path = tmp_path / "cache"
+
+    def build():
+        def run_vivado_tcl(vivado_path, tcl_file):  # noqa: ARG001
+            # Emulate the synthesis runs that were not restored.
+            for run_name, checkpoint in [
+                ("synth_1", "apa_top"),
+                ("hest_synth_1", "hest"),
+                ("zebra_synth_1", "zebra"),
+            ]:
+                run_path = runs_path / run_name
+                if not run_path.exists():
+                    create_file(run_path / f"{checkpoint}.dcp", checkpoint)
+            return True
+
+        with (
+            patch("tsfpga.vivado.project.run_vivado_tcl", autospec=True) as mocked_run_vivado_tcl,
+            patch("tsfpga.vivado.project.get_vivado_version", autospec=True) as version,
+            patch("tsfpga.vivado.project.VivadoProject._get_size", autospec=True) as _,
+        ):
+            mocked_run_vivado_tcl.side_effect = run_vivado_tcl
+            version.return_value = "2023.2"
+
+            assert project.build(
+                project_path=vivado_project_test.project_path,
+                synth_only=True,
+                synthesis_checkpoint_cache_path=cache_path,
+            ).success
+
+        return read_file(vivado_project_test.project_path / "build_vivado_project.tcl")
+
+    build_tcl = build()
+    assert "NEEDS_REFRESH" not in build_tcl
+
+    # Top level and the two out-of-context runs.
+    assert len(list(cache_path.iterdir())) == 3
+
+    # Change the top level but not the out-of-context entities.
+    project.static_generics["apa"] = 1
+    delete(runs_path)
+
+    build_tcl = build()
+    assert "foreach run [get_runs {hest_synth_1 zebra_synth_1}] {" in build_tcl
+    assert read_file(runs_path / "hest_synth_1" / "hest.dcp") == "hest"
+
+    # Change one of the out-of-context entities.
+    create_file(hest_vhd, "changed")
+    delete(runs_path)
+
+    build_tcl = build()
+    assert "foreach run [get_runs {zebra_synth_1}] {" in build_tcl
+
+
+def test_bad_block_designs_type_should_raise_error():
+    with pytest.raises(TypeError) as exception_info:
+        VivadoProject(name="apa", modules=[], part="", block_designs=["bd.tcl"])
+    assert str(exception_info.value) == 'Got bad type for "block_designs" element: bd.tcl'
+
+
+def test_block_design_cache(tmp_path):
+    block_design_tcl = create_file(tmp_path / "block_design.tcl", "apa")
+    project = VivadoProject(name="apa", modules=[], part="part", block_designs=[block_design_tcl])
+    cache_path = tmp_path / "block_design_cache"
+
+    def create(project_path):
+        def run_vivado_tcl(vivado_path, tcl_file):  # noqa: ARG001
+            if "source -notrace {" + to_tcl_path(block_design_tcl) in read_file(tcl_file):
+                # Emulate Vivado creating and generating the block design.
+                create_file(
+                    project_path / "block_designs" / "block_design" / "apa" / "apa.bd", "generated"
+                )
+            return True
+
+        with (
+            patch("tsfpga.vivado.project.run_vivado_tcl", autospec=True) as mocked_run_vivado_tcl,
+            patch("tsfpga.vivado.project.get_vivado_version", autospec=True) as version,
+        ):
+            mocked_run_vivado_tcl.side_effect = run_vivado_tcl
+            version.return_value = "2023.2"
+
+            assert project.create(project_path=project_path, block_design_cache_path=cache_path)
+
+        return read_file(project_path / "create_vivado_project.tcl")
+
+    create_tcl = create(project_path=tmp_path / "project_1")
+    assert 'generate_target "all"' in create_tcl
+    assert len(list(cache_path.iterdir())) == 1
+
+    create_tcl = create(project_path=tmp_path / "project_2")
+    assert "add_files -norecurse [glob -directory" in create_tcl
+    assert "generate_target" not in create_tcl
+    assert (
+        read_file(tmp_path / "project_2" / "block_designs" / "block_design" / "apa" / "apa.bd")
+        == "generated"
+    )
+
+
+def test_bad_bitstream_variants_type_should_raise_error():
+    with pytest.raises(TypeError) as exception_info:
+        VivadoProject(name="apa", modules=[], part="", bitstream_variants=["apa"])
+    assert str(exception_info.value) == 'Got bad type for "bitstream_variants" element: apa'
+
+
+def test_duplicate_bitstream_variant_names_should_raise_error():
+    with pytest.raises(ValueError) as exception_info:
+        VivadoProject(
+            name="apa",
+            modules=[],
+            part="",
+            bitstream_variants=[
+                BitstreamVariant(name="hest", memory_data={}),
+                BitstreamVariant(name="hest", memory_data={}),
+            ],
+        )
+    assert str(exception_info.value) == 'Project "apa": Got duplicate bitstream variant names.'
+
+
+def test_bitstream_variants(vivado_project_test, tmp_path):
+    firmware_a = tmp_path / "firmware_a.mem"
+    firmware_b = tmp_path / "firmware_b.mem"
+    project = VivadoProject(
+        name="apa",
+        modules=[],
+        part="",
+        bitstream_variants=[
+            BitstreamVariant(name="a", memory_data={"cpu_inst/ram_inst": firmware_a}),
+            BitstreamVariant(name="b", memory_data={"cpu_inst/ram_inst": firmware_b}),
+        ],
+    )
+
+    with patch("tsfpga.vivado.project.write_bin_file", autospec=True) as write_bin_file:
+        assert vivado_project_test.build(project).success
+
+    # One call for the build, one for the variants.
+    assert vivado_project_test.mocked_run_vivado_tcl.call_count == 2
+    variants_tcl_file = vivado_project_test.mocked_run_vivado_tcl.call_args.args[1]
+    assert variants_tcl_file == vivado_project_test.project_path / "build_bitstream_variants.tcl"
+    variants_tcl = read_file(variants_tcl_file)
+
+    impl_path = vivado_project_test.project_path / "apa.runs" / "impl_3"
+    assert f"open_checkpoint {{{to_tcl_path(impl_path / 'apa_top_routed.dcp')}}}" in variants_tcl
+
+    memory_info_path = vivado_project_test.project_path / "bitstream_variants"
+    assert memory_info_path.exists()
+    assert (
+        f"write_mem_info -force {{{to_tcl_path(memory_info_path / 'apa_top.mmi')}}}" in variants_tcl
+    )
+
+    assert write_bin_file.call_count == 2
+
+    for name, firmware in [("a", firmware_a), ("b", firmware_b)]:
+        variant_output_path = vivado_project_test.output_path / name
+        assert variant_output_path.exists()
+
+        assert (
+            f"-bit {{{to_tcl_path(impl_path / 'apa_top.bit')}}} "
+            f"-data {{{to_tcl_path(firmware)}}} -proc {{cpu_inst/ram_inst}} "
+            f"-out {{{to_tcl_path(variant_output_path / 'apa.bit')}}}"
+        ) in variants_tcl
+
+        write_bin_file.assert_any_call(
+            bit_file=variant_output_path / "apa.bit", bin_file=variant_output_path / "apa.bin"
+        )
+
+
+def test_bitstream_variants_failing_should_fail_build(vivado_project_test):
+    project = VivadoProject(
+        name="apa",
+        modules=[],
+        part="",
+        bitstream_variants=[BitstreamVariant(name="a", memory_data={})],
+    )
+
+    with (
+        patch("tsfpga.vivado.project.run_vivado_tcl", autospec=True) as run_vivado_tcl,
+        patch("tsfpga.vivado.project.VivadoProject._get_size", autospec=True) as _,
+        patch("tsfpga.vivado.project.shutil.copy2", autospec=True) as _,
+    ):
+        run_vivado_tcl.side_effect = [True, False]
+        create_file(vivado_project_test.project_path / "apa.xpr")
+        result = project.build(
+            project_path=vivado_project_test.project_path,
+            output_path=vivado_project_test.output_path,
+        )
+
+    assert not result.success
+
+
+def test_bitstream_variants_should_not_be_built_for_synth_only(vivado_project_test):
+    project = VivadoProject(
+        name="apa",
+        modules=[],
+        part="",
+        bitstream_variants=[BitstreamVariant(name="a", memory_data={})],
+    )
+    vivado_project_test.synth_only = True
+
+    assert vivado_project_test.build(project).success
+    vivado_project_test.mocked_run_vivado_tcl.assert_called_once()
+
+
+def test_bad_reconfigurable_partitions_type_should_raise_error():
+    with pytest.raises(TypeError) as exception_info:
+        VivadoProject(name="apa", modules=[], part="", reconfigurable_partitions=["apa"])
+    assert str(exception_info.value) == 'Got bad type for "reconfigurable_partitions" element: apa'
+
+
+def test_duplicate_reconfigurable_module_names_should_raise_error():
+    partitions = [
+        ReconfigurablePartition(
+            name=name,
+            instance=f"{name}_inst",
+            module=name,
+            reconfigurable_modules=[ReconfigurableModule(name="hest", modules=[])],
+        )
+        for name in ["apa", "zebra"]
+    ]
+
+    with pytest.raises(ValueError) as exception_info:
+        VivadoProject(name="apa", modules=[], part="", reconfigurable_partitions=partitions)
+    assert str(exception_info.value) == (
+        'Project "apa": Got duplicate reconfigurable module names.'
+    )
+
+
+def test_reconfigurable_partitions_with_impl_explore_should_raise_error():
+    partition = ReconfigurablePartition(
+        name="apa",
+        instance="apa_inst",
+        module="apa",
+        reconfigurable_modules=[ReconfigurableModule(name="hest", modules=[])],
+    )
+
+    with pytest.raises(ValueError) as exception_info:
+        VivadoProject(
+            name="apa",
+            modules=[],
+            part="",
+            impl_explore=True,
+            reconfigurable_partitions=[partition],
+        )
+    assert str(exception_info.value) == (
+        'Project "apa": Can not use "reconfigurable_partitions" together with '
+        '"impl_explore" or "incremental_implementation".'
+    )
+
+
+@pytest.fixture
+def reconfigurable_test(vivado_project_test, tmp_path):
+    class ReconfigurableTest:
+        def __init__(self):
+            self.static_vhd = create_file(tmp_path / "static" / "apa" / "apa.vhd", "static")
+            self.lowpass_vhd = create_file(tmp_path / "rm" / "lowpass" / "lowpass.vhd", "low")
+            self.highpass_vhd = create_file(tmp_path / "rm" / "highpass" / "highpass.vhd", "high")
+
+            rm_modules = {module.name: module for module in get_modules(tmp_path / "rm")}
+            self.project = VivadoProject(
+                name="apa",
+                modules=get_modules(tmp_path / "static"),
+                part="part",
+                reconfigurable_partitions=[
+                    ReconfigurablePartition(
+                        name="filter",
+                        instance="filter_inst",
+                        module="filter",
+                        reconfigurable_modules=[
+                            ReconfigurableModule(name="lowpass", modules=[rm_modules["lowpass"]]),
+                            ReconfigurableModule(name="highpass", modules=[rm_modules["highpass"]]),
+                        ],
+                    )
+                ],
+            )
+
+            runs_path = vivado_project_test.project_path / "apa.runs"
+            self.partial_bit_files = [
+                runs_path / "impl_3" / "apa_top_filter_inst_lowpass_partial.bit",
+                runs_path / "impl_3_config_2" / "apa_top_filter_inst_highpass_partial.bit",
+            ]
+            for bit_file in self.partial_bit_files:
+                create_file(bit_file)
+
+        def build(self):
+            with patch("tsfpga.vivado.project.get_vivado_version", autospec=True) as version:
+                version.return_value = "2023.2"
+                return vivado_project_test.build(self.project)
+
+        @property
+        def mocked_run_vivado_tcl(self):
+            return vivado_project_test.mocked_run_vivado_tcl
+
+        @staticmethod
+        def get_build_tcl():
+            return read_file(vivado_project_test.project_path / "build_vivado_project.tcl")
+
+    return ReconfigurableTest()
+
+
+def test_reconfigurable_partitions_first_build_should_build_everything(
+    reconfigurable_test, vivado_project_test
+):
+    assert reconfigurable_test.build().success
+    reconfigurable_test.mocked_run_vivado_tcl.assert_called_once()
+
+    build_tcl = reconfigurable_test.get_build_tcl()
+    assert 'set run [get_runs "synth_3"]' in build_tcl
+    assert "set runs [get_runs {impl_3 impl_3_config_2}]" in build_tcl
+
+    assert (vivado_project_test.output_path / "filter").exists()
+
+
+def test_reconfigurable_partitions_unchanged_should_not_run_vivado(reconfigurable_test):
+    assert reconfigurable_test.build().success
+    assert reconfigurable_test.build().success
+
+    reconfigurable_test.mocked_run_vivado_tcl.assert_not_called()
+
+
+def test_reconfigurable_partitions_changed_module_should_build_only_that_module(
+    reconfigurable_test,
+):
+    assert reconfigurable_test.build().success
+
+    create_file(reconfigurable_test.highpass_vhd, "changed")
+    assert reconfigurable_test.build().success
+    reconfigurable_test.mocked_run_vivado_tcl.assert_called_once()
+
+    build_tcl = reconfigurable_test.get_build_tcl()
+    assert 'set run [get_runs "synth_3"]' not in build_tcl
+    assert "set runs [get_runs {highpass_synth_1}]" in build_tcl
+    assert "set runs [get_runs {impl_3_config_2}]" in build_tcl
+
+
+@pytest.mark.parametrize("changed_file", ["static_vhd", "lowpass_vhd"])
+def test_reconfigurable_partitions_changed_static_design_should_build_everything(
+    reconfigurable_test, changed_file
+):
+    assert reconfigurable_test.build().success
+
+    create_file(getattr(reconfigurable_test, changed_file), "changed")
+    assert reconfigurable_test.build().success
+
+    build_tcl = reconfigurable_test.get_build_tcl()
+    assert 'set run [get_runs "synth_3"]' in build_tcl
+    assert "set runs [get_runs {impl_3 impl_3_config_2}]" in build_tcl
+
+
+def test_reconfigurable_partitions_failed_build_should_build_everything_next_time(
+    reconfigurable_test,
+):
+    assert reconfigurable_test.build().success
+
+    create_file(reconfigurable_test.highpass_vhd, "changed")
+    delete(reconfigurable_test.partial_bit_files[1])
+    assert not reconfigurable_test.build().success
+
+    create_file(reconfigurable_test.partial_bit_files[1])
+    assert reconfigurable_test.build().success
+    assert "set runs [get_runs {impl_3 impl_3_config_2}]" in reconfigurable_test.get_build_tcl()
+
+
+@pytest.fixture
+def artifact_store_test(vivado_project_test, tmp_path):
+    class ArtifactStoreTest:
+        def __init__(self):
+            self.apa_vhd = create_file(vivado_project_test.modules_path / "apa" / "apa.vhd", "apa")
+            self.artifact_store = ArtifactStore(
+                backend=LocalArtifactStoreBackend(path=tmp_path / "artifact_store")
+            )
+            self.output_path = vivado_project_test.output_path
+
+            self.mocked_run_vivado_tcl = None
+
+        def build(self, from_impl=False):
+            project = VivadoProject(
+                name="apa", modules=get_modules(vivado_project_test.modules_path), part="part"
+            )
+
+            def run_vivado_tcl(vivado_path, tcl_file):  # noqa: ARG001
+                # Emulate a Vivado build that produces artifacts in the output folder.
+                create_file(self.output_path / "apa.bit", "bit")
+                create_file(self.output_path / "apa.bin", "bin")
+                create_file(self.output_path / "apa.xsa", "xsa")
+                return True
+
+            with (
+                patch(
+                    "tsfpga.vivado.project.run_vivado_tcl", autospec=True
+                ) as self.mocked_run_vivado_tcl,
+                patch("tsfpga.vivado.project.get_vivado_version", autospec=True) as version,
+                patch("tsfpga.vivado.project.VivadoProject._get_size", autospec=True) as get_size,
+                patch("tsfpga.vivado.project.shutil.copy2", autospec=True) as _,
+            ):
+                self.mocked_run_vivado_tcl.side_effect = run_vivado_tcl
+                version.return_value = "2023.2"
+                get_size.return_value = {"Total LUTs": 12}
+
+                create_file(vivado_project_test.project_path / "apa.xpr")
+                return project.build(
+                    project_path=vivado_project_test.project_path,
+                    output_path=self.output_path,
+                    run_index=vivado_project_test.run_index,
+                    from_impl=from_impl,
+                    artifact_store=self.artifact_store,
+                )
+
+        def delete_artifacts(self):
+            for file_ending in ["bit", "bin", "xsa"]:
+                delete(self.output_path / f"apa.{file_ending}")
+
+    return ArtifactStoreTest()
+
+
+def test_artifact_store_miss_should_build_and_store(artifact_store_test):
+    assert artifact_store_test.build().success
+    artifact_store_test.mocked_run_vivado_tcl.assert_called_once()
+
+    assert len(list((artifact_store_test.artifact_store.backend.path / "builds").iterdir())) == 1
+    assert len(list((artifact_store_test.artifact_store.backend.path / "blobs").iterdir())) == 3
+
+
+def test_artifact_store_hit_should_fetch_artifacts_and_not_call_vivado(artifact_store_test):
+    assert artifact_store_test.build().success
+
+    # Remove the artifacts, as would be the case in a fresh workspace.
+    artifact_store_test.delete_artifacts()
+
+    result = artifact_store_test.build()
+    assert result.success
+    artifact_store_test.mocked_run_vivado_tcl.assert_not_called()
+
+    assert read_file(artifact_store_test.output_path / "apa.bit") == "bit"
+    assert read_file(artifact_store_test.output_path / "apa.xsa") == "xsa"
+    assert result.implementation_run_name == "impl_3"
+    assert result.implementation_size == {"Total LUTs": 12}
+
+
+def test_artifact_store_changed_source_file_should_build(artifact_store_test):
+    assert artifact_store_test.build().success
+
+    create_file(artifact_store_test.apa_vhd, "changed")
+
+    assert artifact_store_test.build().success
+    artifact_store_test.mocked_run_vivado_tcl.assert_called_once()
+
+    assert len(list((artifact_store_test.artifact_store.backend.path / "builds").iterdir())) == 2
+
+
+def test_artifact_store_from_impl_should_not_fetch(artifact_store_test):
+    assert artifact_store_test.build().success
+    assert artifact_store_test.build(from_impl=True).success
+    artifact_store_test.mocked_run_vivado_tcl.assert_called_once()
+
+
+def test_get_fingerprint(tmp_path):
+    create_file(tmp_path / "apa" / "apa.vhd", "apa")
+    project = VivadoProject(
+        name="apa", modules=get_modules(tmp_path), part="part", generics={"enable": True}
+    )
+
+    with patch("tsfpga.vivado.project.get_vivado_version", autospec=True) as version:
+        version.return_value = "2023.2"
+
+        fingerprint = project.get_fingerprint()
+        assert project.get_fingerprint() == fingerprint
+        assert project.get_fingerprint(generics={"enable": True}) == fingerprint
+
+        assert project.get_fingerprint(generics={"enable": False}) != fingerprint
+        assert project.get_fingerprint(run_index=2) != fingerprint
+
+        version.return_value = "2024.1"
+        assert project.get_fingerprint() != fingerprint
+
+
+def test_impl_explore_strategies_should_change_fingerprint():
+    def get_fingerprint(impl_explore_strategies):
+        return VivadoProject(
+            name="apa",
+            modules=[],
+            part="part",
+            impl_explore=True,
+            impl_explore_strategies=impl_explore_strategies,
+        ).get_fingerprint()
+
+    with patch("tsfpga.vivado.project.get_vivado_version", autospec=True) as version:
+        version.return_value = "2023.2"
+
+        fingerprint = get_fingerprint(impl_explore_strategies=None)
+        assert get_fingerprint(impl_explore_strategies=None) == fingerprint
+
+        strategies = ["Performance_Explore", "Performance_NetDelay_high"]
+        assert get_fingerprint(impl_explore_strategies=strategies) != fingerprint
+        assert get_fingerprint(impl_explore_strategies=strategies[:1]) != get_fingerprint(
+            impl_explore_strategies=strategies
+        )
+
+
+def test_changed_block_design_should_change_fingerprint_and_synthesis_checkpoint_key(tmp_path):
+    block_design = create_file(tmp_path / "block_design.tcl", "create_bd_design apa")
+    project = VivadoProject(name="apa", modules=[], part="part", block_designs=[block_design])
+
+    def get_synthesis_checkpoint_key():
+        return project._get_synthesis_checkpoint_key(  # noqa: SLF001
+            synthesis_checkpoint_cache=SynthesisCheckpointCache(cache_path=tmp_path / "cache"),
+            run_index=1,
+            all_generics={},
+        )
+
+    with patch("tsfpga.vivado.project.get_vivado_version", autospec=True) as version:
+        version.return_value = "2023.2"
+
+        fingerprint = project.get_fingerprint()
+        synthesis_checkpoint_key = get_synthesis_checkpoint_key()
+
+        create_file(block_design, "create_bd_design hest")
+
+        assert project.get_fingerprint() != fingerprint
+        assert get_synthesis_checkpoint_key() != synthesis_checkpoint_key
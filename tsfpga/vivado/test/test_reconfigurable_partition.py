@@ -0,0 +1,70 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+from pathlib import Path
+
+import pytest
+
+from tsfpga.vivado.reconfigurable_partition import (
+    ReconfigurableModule,
+    ReconfigurablePartition,
+    get_configuration_run_name,
+    get_configurations,
+)
+
+
+def test_partition_without_modules_should_raise_error():
+    with pytest.raises(ValueError) as exception_info:
+        ReconfigurablePartition(
+            name="apa", instance="apa_inst", module="apa", reconfigurable_modules=[]
+        )
+    assert str(exception_info.value) == 'Partition "apa": Must have at least one module.'
+
+
+def test_bad_reconfigurable_modules_type_should_raise_error():
+    with pytest.raises(TypeError) as exception_info:
+        ReconfigurablePartition(
+            name="apa", instance="apa_inst", module="apa", reconfigurable_modules=["hest"]
+        )
+    assert str(exception_info.value) == 'Got bad type for "reconfigurable_modules" element: hest'
+
+
+def test_get_output_path():
+    partition = ReconfigurablePartition(
+        name="apa",
+        instance="apa_inst",
+        module="apa",
+        reconfigurable_modules=[ReconfigurableModule(name="hest", modules=[])],
+    )
+    assert partition.get_output_path(output_path=Path("/output")) == Path("/output/apa")
+
+
+def test_get_configurations():
+    hest = ReconfigurableModule(name="hest", modules=[])
+    zebra = ReconfigurableModule(name="zebra", modules=[])
+    foo = ReconfigurableModule(name="foo", modules=[])
+    bar = ReconfigurableModule(name="bar", modules=[])
+
+    apa = ReconfigurablePartition(
+        name="apa", instance="apa_inst", module="apa", reconfigurable_modules=[hest, zebra, foo]
+    )
+    baz = ReconfigurablePartition(
+        name="baz", instance="baz_inst", module="baz", reconfigurable_modules=[bar]
+    )
+
+    assert get_configurations(partitions=[apa, baz]) == [
+        {apa: hest, baz: bar},
+        {apa: zebra, baz: None},
+        {apa: foo, baz: None},
+    ]
+    assert get_configurations(partitions=[]) == []
+
+
+def test_get_configuration_run_name():
+    assert get_configuration_run_name(run_index=2, configuration_index=0) == "impl_2"
+    assert get_configuration_run_name(run_index=2, configuration_index=1) == "impl_2_config_2"
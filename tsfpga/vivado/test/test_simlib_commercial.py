@@ -13,6 +13,7 @@ import pytest
 
 from tsfpga.test.test_utils import file_contains_string
 from tsfpga.vivado.simlib import VivadoSimlib
+from tsfpga.vivado.simlib_commercial import get_simlib_family
 
 # ruff: noqa: SLF001
 
@@ -29,7 +30,12 @@ def simlib_test(tmp_path):
             self.vivado_simlib = self.get_vivado_simlib(self.simulator_prefix, self.vivado_path)
 
         def get_vivado_simlib(
-            self, simulator_prefix, vivado_path, simulator_class_name="rivierapro"
+            self,
+            simulator_prefix,
+            vivado_path,
+            simulator_class_name="rivierapro",
+            families=None,
+            languages=None,
         ):
             simulator_class = MagicMock()
             simulator_class.name = simulator_class_name
@@ -38,7 +44,13 @@ def simlib_test(tmp_path):
             vunit_proj = MagicMock()
             vunit_proj._simulator_class = simulator_class
 
-            return VivadoSimlib.init(self.output_path, vunit_proj, vivado_path)
+            return VivadoSimlib.init(
+                self.output_path,
+                vunit_proj,
+                vivado_path,
+                families=families,
+                languages=languages,
+            )
 
         @staticmethod
         def assert_should_compile(vivado_simlib):
@@ -119,3 +131,76 @@ def test_remapping_of_vivado_simulator_names(simlib_test):
         simulator_class_name="rivierapro",
     )
     check_simulator_name(vivado_simlib=vivado_simlib, name="riviera")
+
+
+def test_narrowed_family_and_language(simlib_test):
+    vivado_simlib = simlib_test.get_vivado_simlib(
+        simulator_prefix=simlib_test.simulator_prefix,
+        vivado_path=simlib_test.vivado_path,
+        families=["zynquplusRFSOC", "zynquplusRFSOC"],
+        languages=["vhdl"],
+    )
+    assert vivado_simlib.artifact_name.endswith(".format_5.zynquplusrfsoc_vhdl")
+    assert vivado_simlib.library_names == ["unisim", "secureip", "unimacro", "unifast", "xpm"]
+
+    simlib_test.assert_should_compile(vivado_simlib)
+    assert file_contains_string(
+        file=vivado_simlib.output_path / "compile_simlib.tcl",
+        string="-family zynquplusRFSOC -language vhdl -library all ",
+    )
+
+    # Should not collide with the one compiled for all families and languages.
+    simlib_test.assert_should_compile(simlib_test.vivado_simlib)
+    assert simlib_test.vivado_simlib.artifact_name.endswith(".format_5")
+    assert file_contains_string(
+        file=simlib_test.vivado_simlib.output_path / "compile_simlib.tcl",
+        string="-family all -language all -library all ",
+    )
+
+
+def test_many_families_and_languages_should_compile_all(simlib_test):
+    vivado_simlib = simlib_test.get_vivado_simlib(
+        simulator_prefix=simlib_test.simulator_prefix,
+        vivado_path=simlib_test.vivado_path,
+        families=["zynq", "artix7"],
+        languages=["systemverilog", "vhdl"],
+    )
+    assert vivado_simlib.artifact_name == simlib_test.vivado_simlib.artifact_name
+
+
+def test_verilog_language_should_use_verilog_libraries(simlib_test):
+    vivado_simlib = simlib_test.get_vivado_simlib(
+        simulator_prefix=simlib_test.simulator_prefix,
+        vivado_path=simlib_test.vivado_path,
+        languages=["verilog", "systemverilog"],
+    )
+    assert vivado_simlib.artifact_name.endswith(".format_5.all_verilog")
+    assert "unisims_ver" in vivado_simlib.library_names
+
+
+def test_unknown_language_should_raise_exception(simlib_test):
+    with pytest.raises(ValueError) as exception_info:
+        simlib_test.get_vivado_simlib(
+            simulator_prefix=simlib_test.simulator_prefix,
+            vivado_path=simlib_test.vivado_path,
+            languages=["vhdl", "apa"],
+        )
+    assert str(exception_info.value) == 'Got unknown simlib language: "apa"'
+
+
+def test_get_simlib_family():
+    assert get_simlib_family(part="xc7z020clg400-1") == "zynq"
+    assert get_simlib_family(part="xc7a35tcpg236-1") == "artix7"
+    assert get_simlib_family(part="xa7s6cpga196-2I") == "spartan7"
+    assert get_simlib_family(part="xcku040-ffva1156-2-e") == "kintexu"
+    assert get_simlib_family(part="xcku5p-ffvb676-2-e") == "kintexuplus"
+    assert get_simlib_family(part="xcvu9p-flga2104-2L-e") == "virtexuplus"
+    assert get_simlib_family(part="XCZU9EG-FFVB1156-2-E") == "zynquplus"
+    assert get_simlib_family(part="xczu28dr-ffvg1517-2-e") == "zynquplusRFSOC"
+    assert get_simlib_family(part="xcvc1902-vsva2197-2MP-e-S") == "versal"
+
+
+def test_get_simlib_family_of_unknown_part_should_give_all():
+    assert get_simlib_family(part="xck26-sfvc784-2LV-c") == "all"
+    assert get_simlib_family(part="xc6slx9-2tqg144") == "all"
+    assert get_simlib_family(part="10cl025yu256i7g") == "all"
@@ -11,12 +11,21 @@ Test a subset of what is tested for commercial, since most of the code is inheri
 from the common class.
 """
 
+import io
+import json
+import os
+import tarfile
 from pathlib import Path
+from threading import Event, Lock, Thread
 from unittest.mock import MagicMock, call, patch
 
 import pytest
 
+from tsfpga.system_utils import create_file, delete, read_file
+from tsfpga.vivado import simlib_common
 from tsfpga.vivado.simlib import VivadoSimlib
+from tsfpga.vivado.simlib_common import get_fast_archive_format
+from tsfpga.vivado.simlib_ghdl import VivadoSimlibGhdl
 
 # ruff: noqa: SLF001
 
@@ -44,28 +53,19 @@ def simlib_test(tmp_path):
                     self.output_path, vunit_proj, Path("/tools/xilinx/Vivado/2019.2/bin/vivado")
                 )
 
-        def assert_should_compile(self):
-            assert self.vivado_simlib.compile_is_needed
-            with patch(
-                "tsfpga.vivado.simlib_ghdl.VivadoSimlibGhdl._compile", autospec=True
-            ) as mock:
-                self.vivado_simlib.compile_if_needed()
-                mock.assert_called_once()
-
-        def assert_should_not_compile(self):
-            assert not self.vivado_simlib.compile_is_needed
-            with patch(
-                "tsfpga.vivado.simlib_ghdl.VivadoSimlibGhdl._compile", autospec=True
-            ) as mock:
-                self.vivado_simlib.compile_if_needed()
-                mock.assert_not_called()
-
     return SimlibGhdlTestFixture()
 
 
-def test_should_not_recompile(simlib_test):
-    simlib_test.assert_should_compile()
-    simlib_test.assert_should_not_compile()
+def test_should_not_recompile(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+
+    assert vivado_simlib.compile_is_needed
+    assert compile_and_get_calls(vivado_simlib, if_needed=True)
+
+    assert not vivado_simlib.compile_is_needed
+    assert compile_and_get_calls(vivado_simlib, if_needed=True) == []
 
 
 def test_ghdl_version_string(simlib_test):
@@ -150,3 +150,571 @@ def test_should_compile_file_by_file_on_windows_but_not_on_linux(simlib_test):
         get_expected_call(vhd_files=[str(vhd_files[1])]),
     ]
     run_test(is_windows=True, expected_calls=expected_calls)
+
+
+def create_vivado_libraries(vivado_path):
+    """
+    Create a minimal Vivado simlib source tree, as is expected by the open-source simlib classes.
+    """
+    libraries_path = vivado_path.parent.parent / "data" / "vhdl" / "src"
+
+    unisim_path = libraries_path / "unisims"
+    create_file(unisim_path / "unisim_VPKG.vhd", "package vpkg is\nend package;\n")
+    create_file(unisim_path / "unisim_retarget_VCOMP.vhd", "package vcomponents is\nend package;\n")
+    create_file(
+        unisim_path / "primitive" / "vhdl_analyze_order", "bufg.vhd\nbufgce.vhd\nbufg_wrap.vhd\n"
+    )
+    for name in ["bufg", "bufgce"]:
+        create_file(
+            unisim_path / "primitive" / f"{name}.vhd",
+            f"use unisim.vpkg.all;\nentity {name} is\nend entity;\n",
+        )
+    create_file(
+        unisim_path / "primitive" / "bufg_wrap.vhd",
+        "entity bufg_wrap is\nend entity;\narchitecture a of bufg_wrap is\nbegin\n"
+        "  inst : entity unisim.bufg;\nend architecture;\n",
+    )
+    create_file(unisim_path / "retarget" / "bufgce_1.vhd", "entity bufgce_1 is\nend entity;\n")
+    create_file(unisim_path / "secureip" / "gtye4.vhd", "entity gtye4 is\nend entity;\n")
+
+    unimacro_path = libraries_path / "unimacro"
+    create_file(unimacro_path / "unimacro_VCOMP.vhd", "package vcomponents is\nend package;\n")
+    create_file(unimacro_path / "vhdl_analyze_order", "bram_sdp_macro.vhd\n")
+    create_file(
+        unimacro_path / "bram_sdp_macro.vhd",
+        "use unimacro.vcomponents.all;\nentity bram_sdp_macro is\nend entity;\n",
+    )
+
+    unifast_path = libraries_path / "unifast" / "primitive"
+    create_file(unifast_path / "vhdl_analyze_order", "dsp48e2.vhd\n")
+    create_file(unifast_path / "dsp48e2.vhd", "entity dsp48e2 is\nend entity;\n")
+
+    return libraries_path
+
+
+def get_simlib_with_libraries(tmp_path, simulator_name, num_threads, design_files=None):
+    vivado_path = tmp_path / "Vivado" / "2019.2" / "bin" / "vivado"
+    create_vivado_libraries(vivado_path=vivado_path)
+
+    with patch(f"tsfpga.vivado.simlib_{simulator_name}.run_command", autospec=True) as run_command:
+        run_command.return_value.stdout = (
+            "GHDL 0.36" if simulator_name == "ghdl" else "nvc 1.16.2 (Using LLVM 18.1.3)"
+        )
+
+        simulator_class = MagicMock()
+        simulator_class.name = simulator_name
+        simulator_class.find_prefix.return_value = "/usr/bin"
+
+        vunit_proj = MagicMock()
+        vunit_proj._simulator_class = simulator_class
+
+        return VivadoSimlib.init(
+            output_path=tmp_path / "simlib",
+            vunit_proj=vunit_proj,
+            vivado_path=vivado_path,
+            num_threads=num_threads,
+            design_files=design_files,
+        )
+
+
+def compile_and_get_calls(vivado_simlib, if_needed=False):
+    """
+    Compile with a mocked compile command.
+    Will use ``compile_if_needed`` instead of ``compile`` if ``if_needed`` is set.
+    Return a list of (library name, file names) for each compile command, in the order they
+    were started.
+    """
+    calls = []
+    lock = Lock()
+
+    def execute_compile(output_path, library_name, vhd_files):  # noqa: ARG001
+        with lock:
+            calls.append((library_name, sorted(Path(vhd_file).name for vhd_file in vhd_files)))
+
+    with (
+        patch.object(vivado_simlib, "_execute_compile", autospec=True, side_effect=execute_compile),
+        patch("tsfpga.vivado.simlib_open_source.system_is_windows", autospec=True) as is_windows,
+    ):
+        is_windows.return_value = False
+        if if_needed:
+            vivado_simlib.compile_if_needed()
+        else:
+            vivado_simlib.compile()
+
+    return calls
+
+
+def test_get_compile_levels(tmp_path):
+    vhd_files = [
+        create_file(tmp_path / "pkg.vhd", "package Pkg is\nend package;\n"),
+        create_file(tmp_path / "a.vhd", "use work.pkg.all;\nentity a is\nend entity;\n"),
+        create_file(
+            tmp_path / "b.vhd",
+            "entity b is\nend entity;\narchitecture x of b is\nbegin\n"
+            "  inst : entity unisim.a;\nend architecture;\n",
+        ),
+        # Reference in comment, component instantiation and reference to other library.
+        create_file(
+            tmp_path / "c.vhd",
+            "-- Uses work.b\nuse ieee.std_logic_1164.all;\nentity c is\nend entity;\n"
+            "architecture x of c is\nbegin\n  inst : b port map ();\nend architecture;\n",
+        ),
+        # Reference to a unit that is defined later in the compile order.
+        create_file(tmp_path / "d.vhd", "use work.e.all;\nentity d is\nend entity;\n"),
+        create_file(tmp_path / "e.vhd", "package e is\nend package;\n"),
+    ]
+
+    levels = VivadoSimlibGhdl._get_compile_levels(vhd_files=vhd_files, library_name="unisim")
+    assert [[vhd_file.name for vhd_file in level] for level in levels] == [
+        ["pkg.vhd", "c.vhd", "d.vhd", "e.vhd"],
+        ["a.vhd"],
+        ["b.vhd"],
+    ]
+
+
+def test_sequential_compile(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+
+    assert compile_and_get_calls(vivado_simlib) == [
+        (
+            "unisim",
+            [
+                "bufg.vhd",
+                "bufg_wrap.vhd",
+                "bufgce.vhd",
+                "bufgce_1.vhd",
+                "unisim_VPKG.vhd",
+                "unisim_retarget_VCOMP.vhd",
+            ],
+        ),
+        ("secureip", ["gtye4.vhd"]),
+        ("unimacro", ["bram_sdp_macro.vhd", "unimacro_VCOMP.vhd"]),
+        ("unifast", ["dsp48e2.vhd"]),
+    ]
+
+
+def test_parallel_compile_should_compile_unisim_first_and_libraries_in_one_command(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=4
+    )
+
+    calls = compile_and_get_calls(vivado_simlib)
+
+    # GHDL does not support parallel compile within a library.
+    assert calls[0] == (
+        "unisim",
+        [
+            "bufg.vhd",
+            "bufg_wrap.vhd",
+            "bufgce.vhd",
+            "bufgce_1.vhd",
+            "unisim_VPKG.vhd",
+            "unisim_retarget_VCOMP.vhd",
+        ],
+    )
+    assert sorted(calls[1:]) == [
+        ("secureip", ["gtye4.vhd"]),
+        ("unifast", ["dsp48e2.vhd"]),
+        ("unimacro", ["bram_sdp_macro.vhd", "unimacro_VCOMP.vhd"]),
+    ]
+    assert vivado_simlib._done_token.exists()
+
+
+def test_get_primitive_references(tmp_path):
+    vhd_file = create_file(
+        tmp_path / "apa.vhd",
+        """\
+library unisim;
+use unisim.vcomponents.all;
+
+architecture a of apa is
+begin
+  -- comment_inst : MMCME2_ADV port map ();
+  bufg_inst : BUFG port map ();
+  bufgce_inst: component BUFGCE
+    generic map ();
+  dsp_inst : entity unimacro.bram_sdp_macro;
+  fifo_inst : entity work.fifo;
+end architecture;
+""",
+    )
+
+    # Not all names are primitives, which is handled by the caller.
+    assert VivadoSimlibGhdl._get_primitive_references(vhd_file=vhd_file) == {
+        "all",
+        "bufg",
+        "bufgce",
+        "bram_sdp_macro",
+    }
+
+
+def test_subset_compile(tmp_path):
+    design_file = create_file(
+        tmp_path / "design" / "apa.vhd",
+        "architecture a of apa is\nbegin\n  inst : bufg_wrap port map ();\nend architecture;\n",
+    )
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1, design_files=[design_file]
+    )
+
+    # The wrapper uses "bufg", but nothing uses "bufgce" or the other libraries' primitives.
+    assert compile_and_get_calls(vivado_simlib) == [
+        (
+            "unisim",
+            ["bufg.vhd", "bufg_wrap.vhd", "unisim_VPKG.vhd", "unisim_retarget_VCOMP.vhd"],
+        ),
+        ("unimacro", ["unimacro_VCOMP.vhd"]),
+    ]
+
+    for library_name in ["unisim", "secureip", "unimacro", "unifast"]:
+        assert (vivado_simlib.output_path / library_name).exists()
+
+    assert not vivado_simlib.compile_is_needed
+
+
+def test_subset_compile_should_extend_library_with_new_primitives(tmp_path):
+    design_file = create_file(
+        tmp_path / "design" / "apa.vhd",
+        "architecture a of apa is\nbegin\n  inst : bufg port map ();\nend architecture;\n",
+    )
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1, design_files=[design_file]
+    )
+    compile_and_get_calls(vivado_simlib)
+    create_file(vivado_simlib.output_path / "unisim" / "unisim-obj08.cf")
+
+    assert compile_and_get_calls(vivado_simlib, if_needed=True) == []
+
+    create_file(
+        tmp_path / "design" / "hest.vhd",
+        "architecture a of hest is\nbegin\n  inst : entity unisim.bufgce;\n"
+        "  dsp_inst : dsp48e2 port map ();\nend architecture;\n",
+    )
+    vivado_simlib.design_files.append(tmp_path / "design" / "hest.vhd")
+    assert vivado_simlib.compile_is_needed
+
+    # Only the new files are compiled, into the existing libraries.
+    assert compile_and_get_calls(vivado_simlib, if_needed=True) == [
+        ("unisim", ["bufgce.vhd"]),
+        ("unifast", ["dsp48e2.vhd"]),
+    ]
+    assert (vivado_simlib.output_path / "unisim" / "unisim-obj08.cf").exists()
+    assert not vivado_simlib.compile_is_needed
+
+
+def test_full_compile_is_needed_after_subset_compile_but_not_the_opposite(tmp_path):
+    design_file = create_file(tmp_path / "design" / "apa.vhd")
+    subset_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1, design_files=[design_file]
+    )
+    full_simlib = get_simlib_with_libraries(tmp_path=tmp_path, simulator_name="ghdl", num_threads=1)
+
+    compile_and_get_calls(subset_simlib)
+    assert full_simlib.compile_is_needed
+
+    compile_and_get_calls(full_simlib)
+    assert not full_simlib.compile_is_needed
+    # The subset simlib finds the version that was published by the full compile.
+    assert compile_and_get_calls(subset_simlib, if_needed=True) == []
+
+
+def test_changed_unimacro_source_file_should_recompile_only_unimacro(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    compile_and_get_calls(vivado_simlib)
+    create_file(vivado_simlib.output_path / "unisim" / "unisim-obj08.cf")
+
+    create_file(
+        vivado_simlib._libraries_path / "unimacro" / "bram_sdp_macro.vhd",
+        "use unimacro.vcomponents.all;\nentity bram_sdp_macro is\nend entity; -- Patched\n",
+    )
+    assert vivado_simlib.compile_is_needed
+
+    assert compile_and_get_calls(vivado_simlib, if_needed=True) == [
+        ("unimacro", ["bram_sdp_macro.vhd", "unimacro_VCOMP.vhd"])
+    ]
+    assert (vivado_simlib.output_path / "unisim" / "unisim-obj08.cf").exists()
+    assert not vivado_simlib.compile_is_needed
+
+
+def test_changed_unisim_source_file_should_recompile_all_libraries(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    compile_and_get_calls(vivado_simlib)
+    unisim_file = create_file(vivado_simlib.output_path / "unisim" / "unisim-obj08.cf")
+
+    (vivado_simlib._libraries_path / "unisims" / "retarget" / "bufgce_1.vhd").unlink()
+    assert vivado_simlib.compile_is_needed
+
+    calls = compile_and_get_calls(vivado_simlib, if_needed=True)
+    assert [library_name for library_name, _ in calls] == [
+        "unisim",
+        "secureip",
+        "unimacro",
+        "unifast",
+    ]
+    assert "bufgce_1.vhd" not in calls[0][1]
+    assert not unisim_file.exists()
+    assert not vivado_simlib.compile_is_needed
+
+
+def test_unchanged_source_files_should_not_be_hashed(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    compile_and_get_calls(vivado_simlib)
+
+    with patch(
+        "tsfpga.vivado.simlib_open_source.calculate_file_hash", autospec=True
+    ) as calculate_file_hash:
+        assert not vivado_simlib.compile_is_needed
+
+    calculate_file_hash.assert_not_called()
+
+
+def test_source_file_with_new_modification_time_but_same_contents_should_not_recompile(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    compile_and_get_calls(vivado_simlib)
+
+    vhd_file = vivado_simlib._libraries_path / "unimacro" / "bram_sdp_macro.vhd"
+    stat = vhd_file.stat()
+    os.utime(vhd_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert not vivado_simlib.compile_is_needed
+
+    create_file(vhd_file, read_file(vhd_file).replace("entity", "ENTITY"))
+    os.utime(vhd_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+    assert vivado_simlib.compile_is_needed
+
+
+def test_changed_compile_flags_should_recompile(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    compile_and_get_calls(vivado_simlib)
+    assert not vivado_simlib.compile_is_needed
+
+    with patch.object(VivadoSimlibGhdl, "_compile_flags", ["--std=08"]):
+        assert vivado_simlib.compile_is_needed
+
+
+def test_compiled_simlib_without_manifest_should_be_recompiled(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    compile_and_get_calls(vivado_simlib)
+
+    vivado_simlib._get_manifest_file(library_name="secureip").unlink()
+
+    assert compile_and_get_calls(vivado_simlib, if_needed=True) == [
+        ("secureip", ["gtye4.vhd"]),
+    ]
+
+
+def get_sibling_folders(vivado_simlib):
+    return sorted(
+        path.name
+        for path in vivado_simlib.output_path.parent.iterdir()
+        if path.is_dir() and path != vivado_simlib.output_path
+    )
+
+
+def test_compile_should_be_done_in_temporary_folder(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    compile_paths = []
+
+    def execute_compile(output_path, library_name, vhd_files):  # noqa: ARG001
+        compile_paths.append(output_path)
+
+    with patch.object(
+        vivado_simlib, "_execute_compile", autospec=True, side_effect=execute_compile
+    ):
+        vivado_simlib.compile()
+
+    assert compile_paths
+    for compile_path in compile_paths:
+        assert compile_path.parent.name.endswith(".tmp")
+        assert compile_path.parent.parent == vivado_simlib.output_path.parent
+
+    assert vivado_simlib._done_token.exists()
+    assert get_sibling_folders(vivado_simlib) == []
+
+
+def test_failed_compile_should_keep_existing_compiled_simlib(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    compile_and_get_calls(vivado_simlib)
+
+    with (
+        patch.object(
+            vivado_simlib, "_execute_compile", autospec=True, side_effect=RuntimeError("apa")
+        ),
+        pytest.raises(RuntimeError),
+    ):
+        vivado_simlib.compile()
+
+    assert vivado_simlib._done_token.exists()
+    assert not vivado_simlib.compile_is_needed
+    assert get_sibling_folders(vivado_simlib) == []
+
+
+def test_compile_if_needed_should_wait_for_compile_in_other_process(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    other_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    result = []
+
+    with (
+        patch.object(vivado_simlib, "_execute_compile", autospec=True),
+        patch.object(other_simlib, "_execute_compile", autospec=True) as other_execute_compile,
+    ):
+        with vivado_simlib.lock():
+            thread = Thread(target=lambda: result.append(other_simlib.compile_if_needed()))
+            thread.start()
+
+            vivado_simlib._compile_all()
+
+        thread.join()
+
+    assert result == [False]
+    other_execute_compile.assert_not_called()
+
+
+def test_replaced_simlib_should_not_be_deleted_while_in_use(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    other_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    compile_and_get_calls(vivado_simlib)
+    other_simlib.add_to_vunit_project()
+    used_file = create_file(other_simlib.output_path / "unisim" / "unisim-obj08.cf", "apa")
+
+    with other_simlib.use():
+        compile_and_get_calls(vivado_simlib)
+
+        # The version that is in use is kept as it is, and a new version is published.
+        assert vivado_simlib.output_path != other_simlib.output_path
+        assert read_file(used_file) == "apa"
+        assert not (vivado_simlib.output_path / "unisim" / "unisim-obj08.cf").exists()
+
+    assert get_sibling_folders(vivado_simlib) == ["1"]
+
+    compile_and_get_calls(vivado_simlib)
+    assert get_sibling_folders(vivado_simlib) == []
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar.gz", "tar.zst"])
+def test_to_and_from_archive(tmp_path, archive_format):
+    if archive_format == "tar.zst":
+        pytest.importorskip("zstandard")
+
+    design_file = create_file(tmp_path / "design" / "apa.vhd")
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1, design_files=[design_file]
+    )
+    compile_and_get_calls(vivado_simlib)
+    create_file(vivado_simlib.output_path / "unisim" / "unisim-obj08.cf", "apa")
+
+    archive = vivado_simlib.to_archive(archive_format=archive_format)
+    assert archive.name == f"{vivado_simlib.artifact_name}.{archive_format}"
+
+    delete(vivado_simlib.output_path)
+    vivado_simlib.from_archive(archive=archive)
+
+    assert read_file(vivado_simlib.output_path / "unisim" / "unisim-obj08.cf") == "apa"
+    # Library with no files in the subset.
+    assert (vivado_simlib.output_path / "secureip").is_dir()
+    assert not vivado_simlib.compile_is_needed
+
+
+def test_cancelled_to_archive_should_not_leave_any_files(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    compile_and_get_calls(vivado_simlib)
+
+    cancel = Event()
+    cancel.set()
+    files_before = sorted(vivado_simlib._versions_path.parent.iterdir())
+
+    assert vivado_simlib.to_archive(archive_format="tar.gz", cancel=cancel) is None
+    assert sorted(vivado_simlib._versions_path.parent.iterdir()) == files_before
+
+
+def create_tar_archive(archive, files, manifest):
+    with tarfile.open(archive, "w:gz") as tar:
+        for name, data in [*files.items(), ("tsfpga_simlib_manifest.json", json.dumps(manifest))]:
+            tar_info = tarfile.TarInfo(name=name)
+            tar_info.size = len(data.encode())
+            tar.addfile(tar_info, fileobj=io.BytesIO(data.encode()))
+
+
+def test_from_archive_with_bad_contents_should_raise_exception_and_keep_existing(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+    compile_and_get_calls(vivado_simlib)
+
+    archive = tmp_path / "simlib.tar.gz"
+    create_tar_archive(
+        archive=archive,
+        files={"unisim/apa.txt": "apa", "unisim/hest.txt": "hest"},
+        manifest={
+            "unisim/apa.txt": "0" * 64,
+            "unisim/hest.txt": "b831b3e336ecb131ebc5014393c084bf5d1580854212f64df9ed9226feebc4ae",
+        },
+    )
+
+    with pytest.raises(ValueError) as exception_info:
+        vivado_simlib.from_archive(archive=archive)
+    assert str(exception_info.value) == (f"Archive {archive} has bad contents for: unisim/apa.txt")
+
+    assert vivado_simlib._done_token.exists()
+    assert not (vivado_simlib.output_path / "unisim" / "apa.txt").exists()
+
+
+def test_from_archive_with_bad_path_should_raise_exception(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+
+    archive = tmp_path / "simlib.tar.gz"
+    create_tar_archive(archive=archive, files={"unisim/../../apa.txt": "apa"}, manifest={})
+
+    with pytest.raises(ValueError) as exception_info:
+        vivado_simlib.from_archive(archive=archive)
+    assert str(exception_info.value) == f"Bad path in archive {archive}: unisim/../../apa.txt"
+
+
+def test_to_archive_with_unknown_format_should_raise_exception(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="ghdl", num_threads=1
+    )
+
+    with pytest.raises(ValueError) as exception_info:
+        vivado_simlib.to_archive(archive_format="rar")
+    assert str(exception_info.value) == "Unknown archive format: rar"
+
+
+def test_get_fast_archive_format():
+    with patch.object(simlib_common, "_import_zstandard", autospec=True) as import_zstandard:
+        import_zstandard.return_value = None
+        assert get_fast_archive_format() == "tar.gz"
+
+        import_zstandard.return_value = MagicMock()
+        assert get_fast_archive_format() == "tar.zst"
@@ -18,6 +18,7 @@ from vunit.sim_if import SimulatorInterface
 from vunit.ui import VUnit
 
 from tsfpga.vivado.simlib import VivadoSimlib
+from tsfpga.vivado.test.test_simlib_ghdl import compile_and_get_calls, get_simlib_with_libraries
 
 
 def test_version_string(tmp_path):
@@ -43,3 +44,35 @@ def test_version_string(tmp_path):
     )
 
     assert ".nvc_1_16_2." in get_artifact_name(version_string="nvc 1.16.2 (Using LLVM 18.1.3)")
+
+
+def test_parallel_compile_should_compile_each_level_in_parallel(tmp_path):
+    vivado_simlib = get_simlib_with_libraries(
+        tmp_path=tmp_path, simulator_name="nvc", num_threads=4
+    )
+
+    calls = compile_and_get_calls(vivado_simlib)
+
+    # Each file in a separate command, since there are fewer files than threads in each level.
+    assert all(len(vhd_files) == 1 for _, vhd_files in calls)
+    files = [(library_name, vhd_files[0]) for library_name, vhd_files in calls]
+
+    # Packages, and files that do not depend on them, first.
+    # Then files that use the packages, then files that instantiate those.
+    assert sorted(files[0:3]) == [
+        ("unisim", "bufgce_1.vhd"),
+        ("unisim", "unisim_VPKG.vhd"),
+        ("unisim", "unisim_retarget_VCOMP.vhd"),
+    ]
+    assert sorted(files[3:5]) == [("unisim", "bufg.vhd"), ("unisim", "bufgce.vhd")]
+    assert files[5] == ("unisim", "bufg_wrap.vhd")
+
+    assert sorted(files[6:]) == [
+        ("secureip", "gtye4.vhd"),
+        ("unifast", "dsp48e2.vhd"),
+        ("unimacro", "bram_sdp_macro.vhd"),
+        ("unimacro", "unimacro_VCOMP.vhd"),
+    ]
+    assert files.index(("unimacro", "unimacro_VCOMP.vhd")) < files.index(
+        ("unimacro", "bram_sdp_macro.vhd")
+    )
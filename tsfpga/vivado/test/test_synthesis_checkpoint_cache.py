@@ -0,0 +1,195 @@
+# --------------------------------------------------------------------------------------------------
+# Copyright (c) Lukas Vik. All rights reserved.
+#
+# This file is part of the tsfpga project, a project platform for modern FPGA development.
+# https://tsfpga.com
+# https://github.com/tsfpga/tsfpga
+# --------------------------------------------------------------------------------------------------
+
+import pytest
+
+from tsfpga.build_step_tcl_hook import BuildStepTclHook
+from tsfpga.constraint import Constraint
+from tsfpga.module import get_modules
+from tsfpga.system_utils import create_file, read_file
+from tsfpga.vivado.generics import StringGenericValue
+from tsfpga.vivado.synthesis_checkpoint_cache import SynthesisCheckpointCache
+
+
+@pytest.fixture
+def cache_test(tmp_path):
+    class CacheTest:
+        def __init__(self):
+            self.modules_folder = tmp_path / "modules"
+            self.a_vhd = create_file(self.modules_folder / "apa" / "a.vhd", "a")
+            self.tb_a_vhd = create_file(self.modules_folder / "apa" / "test" / "tb_a.vhd", "tb")
+            self.b_tcl = create_file(self.modules_folder / "apa" / "ip_cores" / "b.tcl", "b")
+            self.c_xdc = create_file(tmp_path / "c.xdc", "c")
+            self.d_tcl = create_file(tmp_path / "d.tcl", "d")
+            self.e_tcl = create_file(tmp_path / "e.tcl", "e")
+
+            self.cache = SynthesisCheckpointCache(cache_path=tmp_path / "cache")
+
+            self.arguments = {
+                "part": "part",
+                "top": "top",
+                "run_index": 1,
+                "generics": {"apa": 1},
+                "constraints": [Constraint(file=self.c_xdc)],
+                "tcl_sources": [self.d_tcl],
+                "build_step_hooks": [
+                    BuildStepTclHook(tcl_file=self.e_tcl, hook_step="STEPS.SYNTH_DESIGN.TCL.PRE")
+                ],
+                "vivado_version": "2023.2",
+            }
+
+        def get_key(self, **kwargs):
+            arguments = self.arguments.copy()
+            arguments.update(kwargs)
+
+            return self.cache.get_key(modules=get_modules(self.modules_folder), **arguments)
+
+    return CacheTest()
+
+
+def test_key_is_stable(cache_test):
+    assert cache_test.get_key() == cache_test.get_key()
+
+
+@pytest.mark.parametrize(
+    "argument",
+    [
+        {"part": "other_part"},
+        {"top": "other_top"},
+        {"run_index": 2},
+        {"generics": {"apa": 2}},
+        {"vivado_version": "2024.1"},
+        {"other_data": {"hest": True}},
+    ],
+)
+def test_key_changes_when_argument_changes(cache_test, argument):
+    assert cache_test.get_key() != cache_test.get_key(**argument)
+
+
+def test_key_changes_when_file_contents_change(cache_test):
+    for file in [
+        cache_test.a_vhd,
+        cache_test.b_tcl,
+        cache_test.c_xdc,
+        cache_test.d_tcl,
+        cache_test.e_tcl,
+    ]:
+        key = cache_test.get_key()
+        create_file(file, "changed")
+        assert cache_test.get_key() != key
+
+
+def test_key_does_not_change_when_testbench_changes(cache_test):
+    key = cache_test.get_key()
+    create_file(cache_test.tb_a_vhd, "changed")
+    assert cache_test.get_key() == key
+
+
+def test_key_does_not_depend_on_constraints_and_hooks_not_used_in_synthesis(cache_test, tmp_path):
+    impl_xdc = create_file(tmp_path / "impl.xdc", "impl")
+    impl_tcl = create_file(tmp_path / "impl.tcl", "impl")
+
+    constraints = [
+        *cache_test.arguments["constraints"],
+        Constraint(impl_xdc, used_in_synthesis=False),
+    ]
+    build_step_hooks = [
+        *cache_test.arguments["build_step_hooks"],
+        BuildStepTclHook(tcl_file=impl_tcl, hook_step="STEPS.ROUTE_DESIGN.TCL.PRE"),
+    ]
+
+    key = cache_test.get_key(constraints=constraints, build_step_hooks=build_step_hooks)
+    assert key == cache_test.get_key()
+
+    create_file(impl_xdc, "changed")
+    create_file(impl_tcl, "changed")
+    assert cache_test.get_key(constraints=constraints, build_step_hooks=build_step_hooks) == key
+
+
+def test_key_does_not_depend_on_location_of_files(cache_test, tmp_path):
+    key = cache_test.get_key()
+
+    cache_test.modules_folder.rename(tmp_path / "other_modules")
+    cache_test.modules_folder = tmp_path / "other_modules"
+
+    assert cache_test.get_key() == key
+
+
+def test_key_depends_on_contents_of_file_passed_as_string_generic(cache_test, tmp_path):
+    init_file = create_file(tmp_path / "init.mem", "0")
+    generics = {"init_file": StringGenericValue(str(init_file))}
+
+    key = cache_test.get_key(generics=generics)
+    create_file(init_file, "1")
+    assert cache_test.get_key(generics=generics) != key
+
+
+def test_store_and_restore(cache_test, tmp_path):
+    run_path = tmp_path / "project" / "apa.runs" / "synth_1"
+    create_file(run_path / "top.dcp", "checkpoint")
+    create_file(run_path / "hierarchical_utilization.rpt", "report")
+
+    key = cache_test.get_key()
+    assert not cache_test.cache.has_entry(key=key)
+
+    cache_test.cache.store(key=key, path=run_path)
+    assert cache_test.cache.has_entry(key=key)
+    assert list(cache_test.cache.cache_path.iterdir()) == [cache_test.cache.get_entry_path(key)]
+
+    restored_run_path = tmp_path / "other_project" / "apa.runs" / "synth_1"
+    create_file(restored_run_path / "old.txt")
+
+    assert cache_test.cache.restore(key=key, path=restored_run_path)
+    assert sorted(path.name for path in restored_run_path.iterdir()) == [
+        "hierarchical_utilization.rpt",
+        "top.dcp",
+    ]
+    assert read_file(restored_run_path / "top.dcp") == "checkpoint"
+
+
+def test_restore_with_no_entry_should_return_false(cache_test, tmp_path):
+    run_path = create_file(tmp_path / "synth_1" / "top.dcp").parent
+
+    assert not cache_test.cache.restore(key=cache_test.get_key(), path=run_path)
+    assert (run_path / "top.dcp").exists()
+
+
+def test_incomplete_entry_should_not_be_used(cache_test, tmp_path):
+    key = cache_test.get_key()
+    create_file(cache_test.cache.get_entry_path(key=key) / "top.dcp")
+
+    assert not cache_test.cache.has_entry(key=key)
+    assert not cache_test.cache.restore(key=key, path=tmp_path / "synth_1")
+
+
+def test_out_of_context_key(cache_test, tmp_path):
+    def get_key(files, top="a"):
+        return cache_test.cache.get_out_of_context_key(
+            files=files,
+            part="part",
+            top=top,
+            constraints=[],
+            tcl_sources=[cache_test.d_tcl],
+            build_step_hooks=[],
+            vivado_version="2023.2",
+        )
+
+    key = get_key(files=[cache_test.a_vhd])
+    assert get_key(files=[cache_test.a_vhd]) == key
+    assert get_key(files=[cache_test.a_vhd], top="b") != key
+
+    # Other files in the modules, that are not part of the block set, do not affect the key.
+    create_file(cache_test.b_tcl, "changed")
+    assert get_key(files=[cache_test.a_vhd]) == key
+
+    # Location of the file does not affect the key.
+    other_a_vhd = create_file(tmp_path / "other" / "a.vhd", "a")
+    assert get_key(files=[other_a_vhd]) == key
+
+    create_file(cache_test.a_vhd, "changed")
+    assert get_key(files=[cache_test.a_vhd]) != key
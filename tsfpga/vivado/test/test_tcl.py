@@ -12,14 +12,16 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from tsfpga import TSFPGA_TCL
 from tsfpga.build_step_tcl_hook import BuildStepTclHook
 from tsfpga.constraint import Constraint
 from tsfpga.ip_core_file import IpCoreFile
 from tsfpga.module import BaseModule, get_modules
-from tsfpga.system_utils import create_file
+from tsfpga.system_utils import create_file, read_file
 from tsfpga.vivado.common import to_tcl_path
 from tsfpga.vivado.generics import BitVectorGenericValue, StringGenericValue
-from tsfpga.vivado.tcl import VivadoTcl
+from tsfpga.vivado.reconfigurable_partition import ReconfigurableModule, ReconfigurablePartition
+from tsfpga.vivado.tcl import VIVADO_STRATEGIES, VivadoTcl
 
 
 def test_set_create_run_index():
@@ -331,6 +333,134 @@ def test_create_with_ip_cores_only(vivado_tcl_test):
     assert vivado_tcl_test.a_vhd not in tcl
 
 
+def test_create_with_ip_core_ips_file(vivado_tcl_test, tmp_path):
+    ip_core_ips_file = tmp_path / "ip_core_ips.txt"
+    tcl = vivado_tcl_test.tcl.create(
+        project_folder=Path(),
+        modules=vivado_tcl_test.modules,
+        part="part",
+        top="",
+        run_index=1,
+        ip_cores_only=True,
+        ip_core_ips_file=ip_core_ips_file,
+    )
+
+    assert f'set ip_core_ips_file [open {{{to_tcl_path(ip_core_ips_file)}}} "w"]' in tcl
+    assert (
+        """
+set ips_before [get_ips -quiet]
+create_ip_core_c
+puts ${ip_core_ips_file} "c [get_new_ips ${ips_before}]"
+"""
+        in tcl
+    )
+    assert "close ${ip_core_ips_file}" in tcl
+
+
+def test_update_ip_cores(vivado_tcl_test, tmp_path):
+    ip_core_ips_file = tmp_path / "ip_core_ips.txt"
+    tcl = vivado_tcl_test.tcl.update_ip_cores(
+        project_file=tmp_path / "apa.xpr",
+        ip_core_files=[IpCoreFile(path=Path(vivado_tcl_test.c_tcl))],
+        remove_ips=["fifo_0", "fifo_1"],
+        ip_core_ips_file=ip_core_ips_file,
+    )
+
+    assert tcl.startswith(f"open_project {{{to_tcl_path(tmp_path / 'apa.xpr')}}}\n")
+    assert 'foreach ip [get_ips -quiet {"fifo_0" "fifo_1"}] {' in tcl
+    assert "  remove_files ${ip_file}\n" in tcl
+    assert f"  source -notrace {{{vivado_tcl_test.c_tcl}}}\n" in tcl
+    assert "create_ip_core_c\n" in tcl
+    assert tcl.endswith("exit\n")
+
+    tcl = vivado_tcl_test.tcl.update_ip_cores(
+        project_file=tmp_path / "apa.xpr",
+        ip_core_files=[],
+        remove_ips=[],
+        ip_core_ips_file=ip_core_ips_file,
+    )
+    assert "get_ips" not in tcl
+    assert "source" not in tcl
+
+
+def test_create_with_num_ip_core_jobs(vivado_tcl_test):
+    tcl = vivado_tcl_test.tcl.create(
+        project_folder=Path(), modules=vivado_tcl_test.modules, part="part", top="", run_index=1
+    )
+    assert "create_ip_run" not in tcl
+
+    tcl = vivado_tcl_test.tcl.create(
+        project_folder=Path(),
+        modules=vivado_tcl_test.modules,
+        part="part",
+        top="",
+        run_index=1,
+        num_ip_core_jobs=6,
+    )
+    assert '  generate_target "all" ${ips}\n' in tcl
+    assert "      lappend ip_runs [create_ip_run ${ip_file}]\n" in tcl
+    assert "    launch_runs ${ip_runs} -jobs 6\n" in tcl
+
+    # IP cores shall be generated after they have been created, but before the project is closed.
+    assert tcl.index("create_ip_core_c\n") < tcl.index("create_ip_run") < tcl.index("\nexit\n")
+
+    # Not used in IP core projects, where only simulation models are of interest.
+    tcl = vivado_tcl_test.tcl.create(
+        project_folder=Path(),
+        modules=vivado_tcl_test.modules,
+        part="part",
+        top="",
+        run_index=1,
+        ip_cores_only=True,
+        num_ip_core_jobs=6,
+    )
+    assert "create_ip_run" not in tcl
+
+
+def test_pre_warm_ip_cache(vivado_tcl_test, tmp_path):
+    tcl = vivado_tcl_test.tcl.pre_warm_ip_cache(
+        project_folder=tmp_path / "project",
+        part="part",
+        ip_core_files=[IpCoreFile(path=Path(vivado_tcl_test.c_tcl))],
+        ip_cache_path=tmp_path / "cache",
+        num_jobs=3,
+    )
+
+    assert tcl.startswith(
+        f'create_project -part "part" "name" {{{to_tcl_path(tmp_path / "project")}}}\n'
+    )
+    assert f"config_ip_cache -use_cache_location {{{to_tcl_path(tmp_path / 'cache')}}}\n" in tcl
+    assert tcl.index("create_ip_core_c\n") < tcl.index("launch_runs ${ip_runs} -jobs 3\n")
+    assert tcl.endswith("exit\n")
+
+
+def test_bitstream_variants(tmp_path):
+    tcl = VivadoTcl.bitstream_variants(
+        routed_checkpoint=tmp_path / "top_routed.dcp",
+        bit_file=tmp_path / "top.bit",
+        memory_info_file=tmp_path / "top.mmi",
+        variants={
+            tmp_path / "a" / "apa.bit": {"ram_inst": tmp_path / "a.mem"},
+            tmp_path / "b" / "apa.bit": {
+                "ram_inst": tmp_path / "b.mem",
+                "cpu_inst": tmp_path / "b.elf",
+            },
+        },
+    )
+
+    assert tcl.startswith(f"open_checkpoint {{{to_tcl_path(tmp_path / 'top_routed.dcp')}}}\n")
+    assert f"write_mem_info -force {{{to_tcl_path(tmp_path / 'top.mmi')}}}\n" in tcl
+    assert tcl.count("exec -ignorestderr ${updatemem} -force") == 2
+
+    assert (
+        f" -data {{{to_tcl_path(tmp_path / 'b.mem')}}} -proc {{ram_inst}}"
+        f" -data {{{to_tcl_path(tmp_path / 'b.elf')}}} -proc {{cpu_inst}}"
+        f" -out {{{to_tcl_path(tmp_path / 'b' / 'apa.bit')}}}\n"
+    ) in tcl
+    assert "write_cfgmem" not in tcl
+    assert tcl.endswith("exit\n")
+
+
 def test_empty_library_not_in_create_project_tcl(vivado_tcl_test):
     tcl = vivado_tcl_test.tcl.create(
         project_folder=Path(), modules=vivado_tcl_test.modules, part="part", top="", run_index=1
@@ -427,3 +557,375 @@ def test_impl_explore(vivado_tcl_test):
         'wait_on_runs -quiet [get_runs -filter {STATUS != "Not started"} "impl_explore_*"]' in tcl
     )
     assert 'foreach run [get_runs -filter {PROGRESS == "100%"} "impl_explore_*"]' in tcl
+    assert "Stopping runs" not in tcl
+    assert "first_run" not in tcl
+
+
+def test_impl_explore_with_run_file_should_write_first_run_that_met_timing(vivado_tcl_test):
+    tcl = vivado_tcl_test.tcl.build(
+        project_file=Path(),
+        output_path=Path(),
+        num_threads=4,
+        run_index=1,
+        impl_explore=True,
+        impl_explore_run_file=Path("/apa/impl_explore_run.txt"),
+    )
+
+    expected = """
+wait_on_runs -quiet -exit_condition ANY_ONE_MET_TIMING [get_runs "impl_explore_*"]
+
+set first_run [lindex [get_runs -filter {PROGRESS == "100%"} "impl_explore_*"] 0]
+if {${first_run} != ""} {
+  set run_file [open {/apa/impl_explore_run.txt} w]
+  puts ${run_file} ${first_run}
+  close ${run_file}
+}
+
+reset_runs [get_runs -filter {STATUS == "Queued..."}]
+"""
+    assert expected in tcl
+
+
+def test_impl_explore_with_runs_should_launch_runs_in_order_and_divide_threads(vivado_tcl_test):
+    tcl = vivado_tcl_test.tcl.build(
+        project_file=Path(),
+        output_path=Path(),
+        num_threads=12,
+        run_index=1,
+        impl_explore=True,
+        impl_explore_runs=["impl_explore_5", "impl_explore_1", "impl_explore_3"],
+    )
+
+    # All runs are reset, so that no result from an earlier build is mistaken for a result
+    # of this build.
+    expected = """
+reset_runs [get_runs "impl_explore_*"]
+set explore_runs [list]
+foreach run_name {impl_explore_5 impl_explore_1 impl_explore_3} {
+  lappend explore_runs [get_runs ${run_name}]
+}
+launch_runs -jobs 12 ${explore_runs} -to_step "write_bitstream"
+
+wait_on_runs -quiet -exit_condition ANY_ONE_MET_TIMING ${explore_runs}
+"""
+    assert expected in tcl
+    assert 'set_param "general.maxThreads" 4\n' in tcl
+
+
+def test_impl_explore_with_terminate_runs(vivado_tcl_test):
+    tcl = vivado_tcl_test.tcl.build(
+        project_file=Path(),
+        output_path=Path(),
+        num_threads=4,
+        run_index=1,
+        impl_explore=True,
+        impl_explore_terminate_runs=True,
+    )
+
+    expected = """
+set in_progress_runs [
+  get_runs -filter {PROGRESS != "100%" && STATUS != "Not started"} "impl_explore_*"
+]
+if {${in_progress_runs} != ""} {
+  puts "Stopping runs that are still in progress: ${in_progress_runs}"
+  reset_runs ${in_progress_runs}
+}
+wait_on_runs -quiet [get_runs -filter {STATUS != "Not started"} "impl_explore_*"]
+"""
+    assert expected in tcl
+
+
+def test_vivado_strategies_are_in_sync_with_tcl_file():
+    tcl = read_file(TSFPGA_TCL / "vivado_strategies.tcl")
+    strategies_tcl = tcl.split("set vivado_strategies [list ")[1].split("]")[0]
+    strategies = [strategy.strip(" \\") for strategy in strategies_tcl.split("\n")]
+
+    # The first run uses the default strategy, which is not in the TCL list.
+    assert VIVADO_STRATEGIES[0] == "Vivado Implementation Defaults"
+    assert strategies == VIVADO_STRATEGIES[1:]
+
+
+def test_build_with_synthesis_checkpoint_restored():
+    tcl = VivadoTcl(name="").build(
+        project_file=Path(), output_path=Path(), num_threads=4, run_index=2
+    )
+    assert "NEEDS_REFRESH" not in tcl
+    assert tcl.count("launch_runs ${run} -jobs 4\n") == 1
+
+    tcl = VivadoTcl(name="").build(
+        project_file=Path(),
+        output_path=Path(),
+        num_threads=4,
+        run_index=2,
+        synthesis_checkpoint_restored=True,
+    )
+    restore_tcl = """
+set run [get_runs "synth_2"]
+set_property "NEEDS_REFRESH" false ${run}
+
+if {[get_property "PROGRESS" ${run}] != "100%"} {
+puts "WARNING: Restored run ${run} is not complete. Running synthesis instead."
+"""
+    assert restore_tcl in tcl
+    # Synthesis is launched only as a fallback, within the if-block.
+    assert tcl.index("launch_runs ${run} -jobs 4\n") > tcl.index(restore_tcl)
+    assert 'launch_runs ${run} -jobs 4 -to_step "write_bitstream"' in tcl
+
+
+def test_build_with_incremental_reference_checkpoint():
+    tcl = VivadoTcl(name="").build(
+        project_file=Path(), output_path=Path(), num_threads=4, run_index=2
+    )
+    assert "INCREMENTAL_CHECKPOINT" not in tcl
+
+    reference_checkpoint = Path("/apa/impl_2_routed.dcp")
+    tcl = VivadoTcl(name="").build(
+        project_file=Path(),
+        output_path=Path(),
+        num_threads=4,
+        run_index=2,
+        incremental_reference_checkpoint=reference_checkpoint,
+    )
+
+    expected = f"""
+set run [get_runs "impl_2"]
+set reference_checkpoint {{{to_tcl_path(reference_checkpoint)}}}
+
+if {{[file exists ${{reference_checkpoint}}]}} {{
+  puts "Using incremental implementation reference checkpoint: ${{reference_checkpoint}}"
+  set_property "INCREMENTAL_CHECKPOINT" ${{reference_checkpoint}} ${{run}}
+}} else {{
+  reset_property "INCREMENTAL_CHECKPOINT" ${{run}}
+}}
+
+reset_run ${{run}}
+launch_runs ${{run}} -jobs 4 -to_step "write_bitstream"
+wait_on_run ${{run}}
+"""
+    assert expected in tcl
+
+    # The fallback run is launched only if the incremental run failed.
+    assert tcl.count('launch_runs ${run} -jobs 4 -to_step "write_bitstream"') == 2
+    fallback = """
+  puts "WARNING: Incremental run ${run} failed. Running without reference checkpoint instead."
+  reset_property "INCREMENTAL_CHECKPOINT" ${run}
+  file delete -force ${reference_checkpoint}
+"""
+    assert fallback in tcl
+
+
+def test_build_with_impl_explore_should_not_use_incremental_reference_checkpoint():
+    tcl = VivadoTcl(name="").build(
+        project_file=Path(),
+        output_path=Path(),
+        num_threads=4,
+        run_index=2,
+        impl_explore=True,
+        incremental_reference_checkpoint=Path("/apa/impl_2_routed.dcp"),
+    )
+    assert "INCREMENTAL_CHECKPOINT" not in tcl
+
+
+def test_create_with_out_of_context_entities(vivado_tcl_test):
+    file_list = Path("/project/out_of_context/apa_files.txt")
+    tcl = vivado_tcl_test.tcl.create(
+        project_folder=Path(),
+        modules=vivado_tcl_test.modules,
+        part="",
+        top="",
+        run_index=1,
+        out_of_context_entities={"apa": file_list},
+    )
+
+    expected = f"""
+create_fileset -blockset -define_from "apa" "apa"
+
+file mkdir [file dirname {{{to_tcl_path(file_list)}}}]
+set file_handle [open {{{to_tcl_path(file_list)}}} "w"]
+foreach file [get_files -of_objects [get_filesets "apa"]] {{
+  puts ${{file_handle}} ${{file}}
+}}
+close ${{file_handle}}
+"""
+    assert expected in tcl
+
+    # Block set shall be created after the top level has been set.
+    assert tcl.index("create_fileset") > tcl.index('set_property "top"')
+
+
+def test_build_with_restored_out_of_context_runs():
+    tcl = VivadoTcl(name="").build(
+        project_file=Path(), output_path=Path(), num_threads=4, run_index=1
+    )
+    assert "NEEDS_REFRESH" not in tcl
+
+    tcl = VivadoTcl(name="").build(
+        project_file=Path(),
+        output_path=Path(),
+        num_threads=4,
+        run_index=1,
+        restored_out_of_context_runs=["apa_synth_1", "hest_synth_1"],
+    )
+    expected = """
+foreach run [get_runs {apa_synth_1 hest_synth_1}] {
+  if {[get_property "PROGRESS" ${run}] == "100%"} {
+    set_property "NEEDS_REFRESH" false ${run}
+  } else {
+"""
+    assert expected in tcl
+    assert tcl.index(expected) < tcl.index('set run [get_runs "synth_1"]')
+
+
+def test_create_with_block_designs(vivado_tcl_test):
+    apa_tcl = Path("/apa.tcl")
+    apa_folder = Path("/project/block_designs/apa")
+    hest_tcl = Path("/hest.tcl")
+    hest_folder = Path("/project/block_designs/hest")
+
+    def create(**kwargs):
+        return vivado_tcl_test.tcl.create(
+            project_folder=Path(),
+            modules=vivado_tcl_test.modules,
+            part="",
+            top="",
+            run_index=1,
+            block_designs={apa_tcl: apa_folder, hest_tcl: hest_folder},
+            **kwargs,
+        )
+
+    tcl = create()
+    expected = f"""
+set ::origin_dir_loc {{{to_tcl_path(apa_folder)}}}
+source -notrace {{{to_tcl_path(apa_tcl)}}}
+unset ::origin_dir_loc
+
+set ::origin_dir_loc {{{to_tcl_path(hest_folder)}}}
+source -notrace {{{to_tcl_path(hest_tcl)}}}
+unset ::origin_dir_loc
+"""
+    assert expected in tcl
+    assert "generate_target" not in tcl
+
+    tcl = create(restored_block_designs=[apa_tcl], generate_block_designs=True)
+    expected = f"""
+add_files -norecurse [glob -directory {{{to_tcl_path(apa_folder)}}} "*/*.bd"]
+
+set ::origin_dir_loc {{{to_tcl_path(hest_folder)}}}
+source -notrace {{{to_tcl_path(hest_tcl)}}}
+unset ::origin_dir_loc
+foreach bd_file [glob -directory {{{to_tcl_path(hest_folder)}}} "*/*.bd"] {{
+  generate_target "all" [get_files ${{bd_file}}]
+}}
+"""
+    assert expected in tcl
+    assert str(apa_tcl) not in tcl
+
+
+def test_create_with_reconfigurable_partitions(vivado_tcl_test, tmp_path):
+    lowpass_vhd = to_tcl_path(create_file(tmp_path / "rm" / "lowpass" / "lowpass.vhd"))
+    highpass_vhd = to_tcl_path(create_file(tmp_path / "rm" / "highpass" / "highpass.vhd"))
+    highpass_v = to_tcl_path(create_file(tmp_path / "rm" / "highpass" / "highpass.v"))
+    rm_modules = {module.name: module for module in get_modules(tmp_path / "rm")}
+
+    filter_partition = ReconfigurablePartition(
+        name="filter",
+        instance="processing_inst/filter_inst",
+        module="filter",
+        reconfigurable_modules=[
+            ReconfigurableModule(name="lowpass", modules=[rm_modules["lowpass"]]),
+            ReconfigurableModule(name="highpass", modules=[rm_modules["highpass"]]),
+        ],
+    )
+    counter_partition = ReconfigurablePartition(
+        name="counter",
+        instance="counter_inst",
+        module="counter",
+        reconfigurable_modules=[
+            ReconfigurableModule(name="count_up", modules=[rm_modules["lowpass"]])
+        ],
+    )
+
+    tcl = vivado_tcl_test.tcl.create(
+        project_folder=Path(),
+        modules=vivado_tcl_test.modules,
+        part="",
+        top="",
+        run_index=2,
+        reconfigurable_partitions=[filter_partition, counter_partition],
+    )
+
+    assert 'set_property "PR_FLOW" true [current_project]' in tcl
+    assert 'create_partition_def -name "filter" -module "filter"\n' in tcl
+    assert 'create_partition_def -name "counter" -module "counter"\n' in tcl
+
+    expected = f"""
+create_reconfig_module -name "lowpass" -partition_def [get_partition_defs "filter"]
+add_files -norecurse -of_objects [get_reconfig_modules "lowpass"] {{{lowpass_vhd}}}
+set_property -dict [list "LIBRARY" "lowpass" "FILE_TYPE" "VHDL 2008"] \
+[get_files -of_objects [get_reconfig_modules "lowpass"] {{{lowpass_vhd}}}]
+create_reconfig_module -name "highpass" -partition_def [get_partition_defs "filter"]
+"""
+    assert expected in tcl
+
+    # Order of files is not really deterministic.
+    assert (
+        f'add_files -norecurse -of_objects [get_reconfig_modules "highpass"] '
+        f"{{{{{highpass_vhd}}} {{{highpass_v}}}}}\n"
+    ) in tcl or (
+        f'add_files -norecurse -of_objects [get_reconfig_modules "highpass"] '
+        f"{{{{{highpass_v}}} {{{highpass_vhd}}}}}\n"
+    ) in tcl
+    assert f'[get_files -of_objects [get_reconfig_modules "highpass"] {{{highpass_vhd}}}]' in tcl
+
+    expected = (
+        'create_pr_configuration -name "config_1" -partitions '
+        "[list {processing_inst/filter_inst:lowpass} {counter_inst:count_up}]\n"
+        'set_property "PR_CONFIGURATION" "config_1" [get_runs "impl_2"]\n'
+        "\n"
+        'create_pr_configuration -name "config_2" -partitions '
+        "[list {processing_inst/filter_inst:highpass}] -greyboxes [list {counter_inst}]\n"
+        'create_run "impl_2_config_2" -parent_run [get_runs "impl_2"] '
+        '-flow [get_property "FLOW" [get_runs "impl_2"]] -pr_config "config_2"\n'
+    )
+    assert expected in tcl
+
+    # Child runs shall be created before the settings that are applied to all runs.
+    assert tcl.index("create_run") < tcl.index("STEPS.WRITE_BITSTREAM.ARGS.BIN_FILE")
+
+
+def test_build_with_reconfigurable_runs():
+    tcl = VivadoTcl(name="").build(
+        project_file=Path(),
+        output_path=Path(),
+        num_threads=4,
+        run_index=1,
+        reconfigurable_runs=["impl_1", "impl_1_config_2"],
+    )
+
+    expected = """
+set runs [get_runs {impl_1 impl_1_config_2}]
+reset_runs ${runs}
+launch_runs ${runs} -jobs 4 -to_step "write_bitstream"
+"""
+    assert expected in tcl
+    assert 'set run [get_runs "synth_1"]' in tcl
+    assert 'set run [get_runs "impl_1"]' not in tcl
+
+
+def test_build_with_only_reconfigurable_modules():
+    tcl = VivadoTcl(name="").build(
+        project_file=Path(),
+        output_path=Path(),
+        num_threads=4,
+        run_index=1,
+        reconfigurable_runs=["impl_1_config_3"],
+        reconfigurable_synthesis_runs=["highpass_synth_1"],
+    )
+
+    assert 'set run [get_runs "synth_1"]' not in tcl
+    assert (
+        "set runs [get_runs {highpass_synth_1}]\nreset_runs ${runs}\nlaunch_runs ${runs} -jobs 4\n"
+        in tcl
+    )
+    assert tcl.index("highpass_synth_1") < tcl.index("impl_1_config_3")
+    assert 'launch_runs ${runs} -jobs 4 -to_step "write_bitstream"' in tcl